@@ -0,0 +1,26 @@
+"""add composite index for appointment overlap checks
+
+Revision ID: 0012_add_appointment_overlap_index
+Revises: 0011_add_demo_reminder_fields
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0012_add_appointment_overlap_index"
+down_revision = "0011_add_demo_reminder_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_appointments_owner_status_start",
+        "appointments",
+        ["owner_user_id", "status", "appointment_datetime"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_appointments_owner_status_start", table_name="appointments")
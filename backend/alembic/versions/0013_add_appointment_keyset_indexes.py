@@ -0,0 +1,32 @@
+"""add keyset pagination indexes for appointments
+
+Revision ID: 0013_add_appointment_keyset_indexes
+Revises: 0012_add_appointment_overlap_index
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0013_add_appointment_keyset_indexes"
+down_revision = "0012_add_appointment_overlap_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_appointments_owner_start_id",
+        "appointments",
+        ["owner_user_id", "appointment_datetime", "id"],
+    )
+    op.create_index(
+        "ix_appointments_patient_start_id",
+        "appointments",
+        ["patient_id", "appointment_datetime", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_appointments_patient_start_id", table_name="appointments")
+    op.drop_index("ix_appointments_owner_start_id", table_name="appointments")
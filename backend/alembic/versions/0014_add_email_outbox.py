@@ -0,0 +1,81 @@
+"""add email_outbox table
+
+Revision ID: 0014_add_email_outbox
+Revises: 0013_add_appointment_keyset_indexes
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0014_add_email_outbox"
+down_revision = "0013_add_appointment_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+
+email_outbox_status = sa.Enum(
+    "pending",
+    "sending",
+    "sent",
+    "dead",
+    name="emailoutboxstatus",
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "email_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("idempotency_key", sa.String(), nullable=False),
+        sa.Column("owner_user_id", sa.Integer(), nullable=True),
+        sa.Column("recipient", sa.String(), nullable=False),
+        sa.Column("subject", sa.String(), nullable=False),
+        sa.Column("html_body", sa.Text(), nullable=False),
+        sa.Column("text_body", sa.Text(), nullable=True),
+        sa.Column("status", email_outbox_status, nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "next_attempt_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("sent_at", sa.DateTime(), nullable=True),
+        sa.Column(
+            "created_at",
+            sa.DateTime(),
+            nullable=False,
+            server_default=sa.text("CURRENT_TIMESTAMP"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["owner_user_id"],
+            ["users.id"],
+            name="fk_email_outbox_owner_user_id_users",
+        ),
+    )
+    op.create_index("ix_email_outbox_id", "email_outbox", ["id"])
+    op.create_index(
+        "ix_email_outbox_idempotency_key",
+        "email_outbox",
+        ["idempotency_key"],
+        unique=True,
+    )
+    op.create_index("ix_email_outbox_owner_user_id", "email_outbox", ["owner_user_id"])
+    op.create_index(
+        "ix_email_outbox_status_next_attempt_at",
+        "email_outbox",
+        ["status", "next_attempt_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_email_outbox_status_next_attempt_at", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_owner_user_id", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_idempotency_key", table_name="email_outbox")
+    op.drop_index("ix_email_outbox_id", table_name="email_outbox")
+    op.drop_table("email_outbox")
+    email_outbox_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,78 @@
+"""add dashboard rollup tables
+
+Revision ID: 0015_add_dashboard_rollups
+Revises: 0014_add_email_outbox
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0015_add_dashboard_rollups"
+down_revision = "0014_add_email_outbox"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "appointment_daily_rollups",
+        sa.Column("owner_user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("owner_user_id", "day", "status"),
+        sa.ForeignKeyConstraint(
+            ["owner_user_id"],
+            ["users.id"],
+            name="fk_appointment_daily_rollups_owner_user_id_users",
+        ),
+    )
+    op.create_table(
+        "patient_daily_rollups",
+        sa.Column("owner_user_id", sa.Integer(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False, server_default="0"),
+        sa.PrimaryKeyConstraint("owner_user_id", "day"),
+        sa.ForeignKeyConstraint(
+            ["owner_user_id"],
+            ["users.id"],
+            name="fk_patient_daily_rollups_owner_user_id_users",
+        ),
+    )
+
+    # Backfill from existing rows; statuses are stored by enum name and the
+    # dashboard folds the legacy "scheduled" status into "unconfirmed".
+    op.execute(
+        """
+        INSERT INTO appointment_daily_rollups (owner_user_id, day, status, count)
+        SELECT owner_user_id, day, status, COUNT(*)
+        FROM (
+            SELECT
+                owner_user_id,
+                DATE(appointment_datetime) AS day,
+                CASE
+                    WHEN LOWER(CAST(status AS VARCHAR)) = 'scheduled' THEN 'unconfirmed'
+                    ELSE LOWER(CAST(status AS VARCHAR))
+                END AS status
+            FROM appointments
+            WHERE owner_user_id IS NOT NULL
+        ) AS buckets
+        GROUP BY owner_user_id, day, status
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO patient_daily_rollups (owner_user_id, day, count)
+        SELECT owner_user_id, DATE(created_at), COUNT(*)
+        FROM patients
+        WHERE owner_user_id IS NOT NULL
+        GROUP BY owner_user_id, DATE(created_at)
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("patient_daily_rollups")
+    op.drop_table("appointment_daily_rollups")
@@ -0,0 +1,42 @@
+"""add per-channel reminder markers and due-queue index
+
+Revision ID: 0016_add_reminder_due_queue
+Revises: 0015_add_dashboard_rollups
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0016_add_reminder_due_queue"
+down_revision = "0015_add_dashboard_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "appointments",
+        sa.Column("reminder_email_sent_at", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "appointments",
+        sa.Column("reminder_sms_sent_at", sa.DateTime(), nullable=True),
+    )
+    # Email was the only channel the hourly job ever delivered.
+    op.execute(
+        "UPDATE appointments SET reminder_email_sent_at = reminder_sent_at "
+        "WHERE reminder_sent_at IS NOT NULL"
+    )
+    op.create_index(
+        "ix_appointments_reminder_next_run_at",
+        "appointments",
+        ["reminder_next_run_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_appointments_reminder_next_run_at", table_name="appointments")
+    op.drop_column("appointments", "reminder_sms_sent_at")
+    op.drop_column("appointments", "reminder_email_sent_at")
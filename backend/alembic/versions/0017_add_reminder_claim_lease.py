@@ -0,0 +1,31 @@
+"""add reminder claim lease columns
+
+Revision ID: 0017_add_reminder_claim_lease
+Revises: 0016_add_reminder_due_queue
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0017_add_reminder_claim_lease"
+down_revision = "0016_add_reminder_due_queue"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "appointments",
+        sa.Column("reminder_locked_until", sa.DateTime(), nullable=True),
+    )
+    op.add_column(
+        "appointments",
+        sa.Column("reminder_locked_by", sa.String(length=64), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("appointments", "reminder_locked_by")
+    op.drop_column("appointments", "reminder_locked_until")
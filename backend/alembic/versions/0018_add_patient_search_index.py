@@ -0,0 +1,54 @@
+"""add patient search index
+
+Revision ID: 0018_add_patient_search_index
+Revises: 0017_add_reminder_claim_lease
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0018_add_patient_search_index"
+down_revision = "0017_add_reminder_claim_lease"
+branch_labels = None
+depends_on = None
+
+# Must stay identical to app.services.patient_search.PG_DOCUMENT.
+PG_DOCUMENT = (
+    "lower(coalesce(patients.full_name, '') || ' ' || coalesce(patients.first_name, '')"
+    " || ' ' || coalesce(patients.last_name, '') || ' ' || coalesce(patients.email, '')"
+    " || ' ' || coalesce(patients.phone, '') || ' '"
+    " || regexp_replace(coalesce(patients.phone, ''), '[^0-9]', '', 'g'))"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX ix_patients_search_trgm ON patients "
+            f"USING gin (({PG_DOCUMENT}) gin_trgm_ops)"
+        )
+    elif dialect == "sqlite":
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS patient_search USING fts5("
+            "owner, full_name, first_name, last_name, email, phone, tokenize='trigram')"
+        )
+        # Punctuation-free phone copies are added by
+        # ``python -m app.services.patient_search``.
+        op.execute(
+            "INSERT INTO patient_search"
+            " (rowid, owner, full_name, first_name, last_name, email, phone)"
+            " SELECT id, '|' || owner_user_id || '|', coalesce(full_name, ''),"
+            " coalesce(first_name, ''), coalesce(last_name, ''), coalesce(email, ''),"
+            " coalesce(phone, '') FROM patients WHERE owner_user_id IS NOT NULL"
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_patients_search_trgm")
+    elif dialect == "sqlite":
+        op.execute("DROP TABLE IF EXISTS patient_search")
@@ -0,0 +1,64 @@
+"""add keyset pagination indexes for audit logs
+
+Revision ID: 0019_add_audit_log_keyset_indexes
+Revises: 0018_add_patient_search_index
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0019_add_audit_log_keyset_indexes"
+down_revision = "0018_add_patient_search_index"
+branch_labels = None
+depends_on = None
+
+KEYSET = [sa.text("created_at DESC"), sa.text("id DESC")]
+
+INDEXES = {
+    "ix_audit_logs_owner_created_id": ["owner_user_id", *KEYSET],
+    "ix_audit_logs_owner_entity_type_created_id": ["owner_user_id", "entity_type", *KEYSET],
+    "ix_audit_logs_owner_action_created_id": ["owner_user_id", "action", *KEYSET],
+    "ix_audit_logs_owner_entity_id_created_id": ["owner_user_id", "entity_id", *KEYSET],
+}
+
+# Superseded by the owner-leading composites above.
+SINGLE_COLUMN_INDEXES = {
+    "ix_audit_logs_owner_user_id": "owner_user_id",
+    "ix_audit_logs_action": "action",
+    "ix_audit_logs_entity_type": "entity_type",
+    "ix_audit_logs_entity_id": "entity_id",
+}
+
+
+def _create(options: dict) -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "audit_logs", columns, **options)
+    for name in SINGLE_COLUMN_INDEXES:
+        op.drop_index(name, table_name="audit_logs", **options)
+
+
+def _restore(options: dict) -> None:
+    for name, column in SINGLE_COLUMN_INDEXES.items():
+        op.create_index(name, "audit_logs", [column], **options)
+    for name in INDEXES:
+        op.drop_index(name, table_name="audit_logs", **options)
+
+
+def _run(step) -> None:
+    # audit_logs is the largest table; on Postgres build without holding a
+    # write lock, which requires running outside the migration transaction.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            step({"postgresql_concurrently": True})
+    else:
+        step({})
+
+
+def upgrade() -> None:
+    _run(_create)
+
+
+def downgrade() -> None:
+    _run(_restore)
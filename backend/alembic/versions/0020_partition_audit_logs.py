@@ -0,0 +1,152 @@
+"""partition audit_logs by month and add audit_log_archives
+
+Revision ID: 0020_partition_audit_logs
+Revises: 0019_add_audit_log_keyset_indexes
+Create Date: 2026-10-17 00:00:00.000000
+
+On Postgres ``audit_logs`` becomes a table range-partitioned on
+``created_at``, with one partition per month and a default partition. The
+existing rows are copied across, which on a large table takes a maintenance
+window. Other databases keep a single table; retention deletes archived
+months from it instead of dropping partitions.
+"""
+
+from datetime import date
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0020_partition_audit_logs"
+down_revision = "0019_add_audit_log_keyset_indexes"
+branch_labels = None
+depends_on = None
+
+MONTHS_AHEAD = 3
+
+INDEXES = {
+    "ix_audit_logs_owner_created_id": "owner_user_id, created_at DESC, id DESC",
+    "ix_audit_logs_owner_entity_type_created_id": (
+        "owner_user_id, entity_type, created_at DESC, id DESC"
+    ),
+    "ix_audit_logs_owner_action_created_id": "owner_user_id, action, created_at DESC, id DESC",
+    "ix_audit_logs_owner_entity_id_created_id": (
+        "owner_user_id, entity_id, created_at DESC, id DESC"
+    ),
+    "ix_audit_logs_request_id": "request_id",
+}
+
+COLUMNS = (
+    "id, created_at, owner_user_id, action, entity_type, entity_id, summary,"
+    " metadata_json, ip_address, user_agent, request_id"
+)
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_archive_table() -> None:
+    op.create_table(
+        "audit_log_archives",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("owner_user_id", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Date(), nullable=False),
+        sa.Column("path", sa.String(), nullable=False),
+        sa.Column("row_count", sa.Integer(), nullable=False),
+        sa.Column("newest_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("oldest_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["owner_user_id"],
+            ["users.id"],
+            name="fk_audit_log_archives_owner_user_id_users",
+        ),
+        sa.UniqueConstraint("owner_user_id", "month", name="uq_audit_log_archives_owner_month"),
+    )
+
+
+def _partition_postgres() -> None:
+    bind = op.get_bind()
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute(
+        "ALTER TABLE audit_logs_unpartitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+    )
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    # The primary key of a partitioned table must include the partition key.
+    op.execute(
+        """
+        CREATE TABLE audit_logs (
+            id integer NOT NULL DEFAULT nextval('audit_logs_id_seq'),
+            created_at timestamptz NOT NULL DEFAULT CURRENT_TIMESTAMP,
+            owner_user_id integer NOT NULL
+                CONSTRAINT fk_audit_logs_owner_user_id_users REFERENCES users (id),
+            action varchar NOT NULL,
+            entity_type varchar NOT NULL,
+            entity_id integer,
+            summary varchar,
+            metadata_json text,
+            ip_address varchar,
+            user_agent varchar,
+            request_id varchar,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    oldest = bind.execute(sa.text("SELECT min(created_at) FROM audit_logs_unpartitioned")).scalar()
+    current = date.today().replace(day=1)
+    month = date(oldest.year, oldest.month, 1) if oldest else current
+    last = _add_months(current, MONTHS_AHEAD)
+    while month <= last:
+        op.execute(
+            f"CREATE TABLE audit_logs_y{month.year}m{month.month:02d} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{_add_months(month, 1).isoformat()}')"
+        )
+        month = _add_months(month, 1)
+
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_unpartitioned"
+    )
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON audit_logs ({columns})")
+
+
+def _unpartition_postgres() -> None:
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    for name in INDEXES:
+        op.execute(f"DROP INDEX IF EXISTS {name}")
+    op.execute(
+        "CREATE TABLE audit_logs (LIKE audit_logs_partitioned INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE audit_logs ADD PRIMARY KEY (id)")
+    op.execute(
+        "ALTER TABLE audit_logs ADD CONSTRAINT fk_audit_logs_owner_user_id_users "
+        "FOREIGN KEY (owner_user_id) REFERENCES users (id)"
+    )
+    op.execute(
+        f"INSERT INTO audit_logs ({COLUMNS}) SELECT {COLUMNS} FROM audit_logs_partitioned"
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("DROP TABLE audit_logs_partitioned CASCADE")
+    for name, columns in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON audit_logs ({columns})")
+
+
+def upgrade() -> None:
+    _create_archive_table()
+    if op.get_bind().dialect.name == "postgresql":
+        _partition_postgres()
+
+
+def downgrade() -> None:
+    # Archived months are not restored; their NDJSON files stay on disk.
+    if op.get_bind().dialect.name == "postgresql":
+        _unpartition_postgres()
+    op.drop_table("audit_log_archives")
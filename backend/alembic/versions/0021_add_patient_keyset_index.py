@@ -0,0 +1,38 @@
+"""add keyset pagination index for patients
+
+Revision ID: 0021_add_patient_keyset_index
+Revises: 0020_partition_audit_logs
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+
+
+revision = "0021_add_patient_keyset_index"
+down_revision = "0020_partition_audit_logs"
+branch_labels = None
+depends_on = None
+
+INDEX = "ix_patients_owner_created_id"
+
+
+def _run(step) -> None:
+    # Build without holding a write lock on Postgres, which requires running
+    # outside the migration transaction.
+    if op.get_bind().dialect.name == "postgresql":
+        with op.get_context().autocommit_block():
+            step({"postgresql_concurrently": True})
+    else:
+        step({})
+
+
+def upgrade() -> None:
+    _run(
+        lambda options: op.create_index(
+            INDEX, "patients", ["owner_user_id", "created_at", "id"], **options
+        )
+    )
+
+
+def downgrade() -> None:
+    _run(lambda options: op.drop_index(INDEX, table_name="patients", **options))
@@ -0,0 +1,35 @@
+"""add appointments.email_sequence and email_outbox.batch_key
+
+Revision ID: 0022_add_email_sequence_and_batch_key
+Revises: 0021_add_patient_keyset_index
+Create Date: 2026-10-17 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0022_add_email_sequence_and_batch_key"
+down_revision = "0021_add_patient_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "appointments",
+        sa.Column("email_sequence", sa.Integer(), nullable=False, server_default="0"),
+    )
+    # Keys already queued used the stored-message count as their sequence;
+    # continue above it so new keys cannot collide with them.
+    op.execute(
+        "UPDATE appointments SET email_sequence = ("
+        "SELECT count(*) FROM email_outbox"
+        " WHERE email_outbox.idempotency_key LIKE 'appointment:' || appointments.id || ':%')"
+    )
+    op.add_column("email_outbox", sa.Column("batch_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("email_outbox", "batch_key")
+    op.drop_column("appointments", "email_sequence")
@@ -4,11 +4,14 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.principal_cache import Principal
 from app.core.security import get_current_admin
 from app.db.session import get_db
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
-from app.models.user import User
+from app.services.appointment_overlap import overlap_index
+from app.services.dashboard_rollups import rebuild_owner_rollups
+from app.services.patient_search import rebuild_owner_search_index
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
@@ -74,7 +77,7 @@ DEMO_APPOINTMENTS = [
 @router.post("/seed-demo", response_model=dict)
 def seed_demo_data(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
 ):
     if not settings.DEMO_MODE:
         raise HTTPException(
@@ -143,7 +146,10 @@ def seed_demo_data(
         db.add(appointment)
         created_appointments += 1
 
+    rebuild_owner_rollups(db, current_user.id)
+    rebuild_owner_search_index(db, current_user.id)
     db.commit()
+    overlap_index.invalidate(current_user.id)
 
     return {
         "patients_created": created_patients,
@@ -1,27 +1,49 @@
 from datetime import datetime, timedelta
+from typing import Literal
 
-from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 from sqlalchemy.orm import Session, selectinload
 
 from app.core.config import settings
+from app.core.pagination import apply_keyset, count_rows, fetch_page, set_page_headers
+from app.core.principal_cache import Principal
+from app.core.projection import parse_fields
+from app.core.responses import serialize
+from app.core.streaming import StreamFormat, stream_query
 from app.core.security import get_current_admin
 from app.db.session import get_db
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
 from app.models.user import User, UserRole
 from app.schemas.appointment import (
+    APPOINTMENT_FIELDS,
     AppointmentCreate,
     AppointmentResponse,
+    AppointmentSummary,
     AppointmentUpdate,
+    NormalizedAppointments,
+)
+from app.services.appointment_overlap import find_overlapping_appointment, overlap_index
+from app.services.appointment_queries import (
+    appointment_list_options,
+    apply_appointment_filters,
+    normalize_appointments,
+    normalized_fields,
+    project_appointment,
 )
 from app.services.audit_log import log_event
+from app.services.dashboard_rollups import appointment_rollup_key, track_appointment_change
 from app.services.email import (
-    EmailSendError,
     build_cancellation_email,
     build_confirmation_email,
     build_update_email,
-    send_email,
 )
+from app.services.email_outbox import (
+    build_idempotency_key,
+    enqueue_email,
+    next_event_sequence,
+)
+from app.services.reminder_service import next_reminder_run_at
 
 router = APIRouter(prefix="/appointments", tags=["appointments"])
 DEFAULT_DOCTOR_NAME = "TBD"
@@ -111,13 +133,7 @@ def _refresh_reminder_next_run_at(appointment: Appointment) -> None:
         appointment.reminder_email_minutes_before = 1440
     if appointment.reminder_sms_minutes_before is None:
         appointment.reminder_sms_minutes_before = 120
-    appointment.reminder_next_run_at = _compute_next_reminder_at(
-        appointment.appointment_datetime,
-        appointment.reminder_email_enabled,
-        appointment.reminder_email_minutes_before,
-        appointment.reminder_sms_enabled,
-        appointment.reminder_sms_minutes_before,
-    )
+    appointment.reminder_next_run_at = next_reminder_run_at(appointment)
 
 
 def _enforce_reminder_rules(
@@ -143,6 +159,15 @@ def _validate_time_range(start_time, end_time):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
             detail="Appointment end time must be after start time.",
         )
+    max_duration = timedelta(minutes=settings.APPOINTMENT_MAX_DURATION_MINUTES)
+    if end_time and start_time and end_time - start_time > max_duration:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=(
+                "Appointment cannot be longer than "
+                f"{settings.APPOINTMENT_MAX_DURATION_MINUTES} minutes."
+            ),
+        )
 
 
 def _resolve_end_time(start_time, end_time):
@@ -160,34 +185,14 @@ def _assert_no_overlapping_appointments(
     owner_user_id: int,
     appointment_id: int | None = None,
 ):
-    effective_end_time = _resolve_end_time(start_time, end_time)
-    if not start_time or not effective_end_time:
-        return
-
-    query = db.query(Appointment).filter(
-        Appointment.status.in_(
-            [
-                AppointmentStatus.unconfirmed,
-                AppointmentStatus.confirmed,
-                AppointmentStatus.scheduled,
-            ]
-        ),
-        Appointment.owner_user_id == owner_user_id,
+    overlapping_id = find_overlapping_appointment(
+        db, owner_user_id, start_time, end_time, exclude_id=appointment_id
     )
-    if appointment_id is not None:
-        query = query.filter(Appointment.id != appointment_id)
-
-    for existing in query.all():
-        existing_start = existing.appointment_datetime
-        existing_end = _resolve_end_time(
-            existing_start, existing.appointment_end_datetime
+    if overlapping_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Appointment time overlaps with an existing appointment.",
         )
-        if existing_start and existing_end:
-            if start_time < existing_end and effective_end_time > existing_start:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail="Appointment time overlaps with an existing appointment.",
-                )
 
 
 def _prepare_update_data(payload: AppointmentUpdate) -> dict:
@@ -218,6 +223,22 @@ def _snapshot_appointment(appointment: Appointment) -> dict:
     }
 
 
+def _rollup_key(appointment: Appointment):
+    return appointment_rollup_key(
+        appointment.owner_user_id,
+        appointment.appointment_datetime,
+        appointment.status,
+    )
+
+
+def _snapshot_rollup_key(appointment: Appointment, snapshot: dict):
+    return appointment_rollup_key(
+        appointment.owner_user_id,
+        snapshot["appointment_datetime"],
+        snapshot["status"],
+    )
+
+
 def _has_update_changes(old: dict, appointment: Appointment) -> bool:
     return any(
         [
@@ -273,17 +294,34 @@ def _patient_email(patient: Patient) -> str | None:
     return email or None
 
 
-def _dispatch_email(recipient: str, subject: str, html_body: str, text_body: str | None) -> None:
-    try:
-        send_email(recipient, subject, html_body, text_body)
-    except EmailSendError as exc:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=str(exc),
-        ) from exc
+def _queue_email(
+    db: Session,
+    appointment: Appointment,
+    event_label: str,
+    recipient: str,
+    subject: str,
+    html_body: str,
+    text_body: str | None,
+) -> None:
+    scope = f"appointment:{appointment.id}"
+    sequence = next_event_sequence(db, appointment.id)
+    enqueue_email(
+        db,
+        recipient,
+        subject,
+        html_body,
+        text_body,
+        idempotency_key=build_idempotency_key(
+            f"{scope}:{sequence}:{event_label}",
+            recipient,
+            subject,
+            text_body or html_body,
+        ),
+        owner_user_id=appointment.owner_user_id,
+    )
 
 
-def _send_confirmation_email(
+def _queue_confirmation_email(
     db: Session, appointment: Appointment, patient: Patient, event_label: str = "create"
 ) -> None:
     recipient = _patient_email(patient)
@@ -306,10 +344,10 @@ def _send_confirmation_email(
         appointment.department,
         appointment.notes,
     )
-    _dispatch_email(recipient, subject, html_body, text_body)
+    _queue_email(db, appointment, event_label, recipient, subject, html_body, text_body)
 
 
-def _send_update_email(
+def _queue_update_email(
     db: Session, appointment: Appointment, patient: Patient, old_snapshot: dict
 ) -> None:
     recipient = _patient_email(patient)
@@ -338,10 +376,10 @@ def _send_update_email(
         appointment.department,
         appointment.notes,
     )
-    _dispatch_email(recipient, subject, html_body, text_body)
+    _queue_email(db, appointment, "update", recipient, subject, html_body, text_body)
 
 
-def _send_cancellation_email(
+def _queue_cancellation_email(
     db: Session, appointment: Appointment, patient: Patient, old_snapshot: dict | None = None
 ) -> None:
     recipient = _patient_email(patient)
@@ -364,7 +402,21 @@ def _send_cancellation_email(
         snapshot["department"],
         snapshot["notes"],
     )
-    _dispatch_email(recipient, subject, html_body, text_body)
+    _queue_email(db, appointment, "cancel", recipient, subject, html_body, text_body)
+
+
+def _queue_change_emails(db: Session, appointment: Appointment, old_snapshot: dict) -> None:
+    if appointment.status == AppointmentStatus.cancelled:
+        if old_snapshot["status"] != AppointmentStatus.cancelled:
+            _queue_cancellation_email(db, appointment, appointment.patient, old_snapshot)
+    elif appointment.status == AppointmentStatus.confirmed and (
+        old_snapshot["status"] != AppointmentStatus.confirmed
+    ):
+        _queue_confirmation_email(db, appointment, appointment.patient, event_label="confirm")
+    elif _should_send_update_email(appointment.status) and _has_update_changes(
+        old_snapshot, appointment
+    ):
+        _queue_update_email(db, appointment, appointment.patient, old_snapshot)
 
 
 def _apply_appointment_update(appointment: Appointment, update_data: dict) -> Appointment:
@@ -373,16 +425,76 @@ def _apply_appointment_update(appointment: Appointment, update_data: dict) -> Ap
     return appointment
 
 
-@router.get("/", response_model=list[AppointmentResponse])
+@router.get(
+    "/",
+    response_model=list[AppointmentSummary] | NormalizedAppointments,
+    response_model_exclude_unset=True,
+)
 def list_appointments(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    order: Literal["asc", "desc"] = Query(default="asc"),
+    date_from: datetime | None = Query(default=None),
+    date_to: datetime | None = Query(default=None),
+    status_filter: list[AppointmentStatus] | None = Query(default=None, alias="status"),
+    doctor_name: str | None = Query(default=None),
+    department: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
+    fields: str | None = Query(default=None),
+    normalize: bool = Query(default=False),
+    stream: StreamFormat | None = Query(default=None),
 ):
-    return (
-        db.query(Appointment)
-        .options(selectinload(Appointment.patient))
-        .filter(Appointment.owner_user_id == current_user.id)
-        .all()
+    selected = parse_fields(fields, APPOINTMENT_FIELDS, APPOINTMENT_FIELDS)
+    if normalize or stream:
+        selected = normalized_fields(selected)
+    query = apply_appointment_filters(
+        db.query(Appointment).filter(Appointment.owner_user_id == current_user.id),
+        date_from,
+        date_to,
+        status_filter,
+        doctor_name,
+        department,
+    )
+    if stream:
+        # Every matching row from ``cursor`` on; ``limit`` does not apply.
+        query = apply_keyset(
+            query,
+            Appointment.appointment_datetime,
+            Appointment.id,
+            cursor,
+            descending=order == "desc",
+        )
+        return stream_query(
+            query, [getattr(Appointment, name) for name in selected], stream
+        )
+    total = count_rows(db, query) if include_total else None
+    query = apply_keyset(
+        query.options(*appointment_list_options(selected)),
+        Appointment.appointment_datetime,
+        Appointment.id,
+        cursor,
+        descending=order == "desc",
+    )
+    appointments, next_cursor = fetch_page(query, limit, "appointment_datetime")
+    set_page_headers(response, next_cursor, total)
+    if normalize:
+        return serialize(
+            request,
+            response,
+            NormalizedAppointments,
+            normalize_appointments(db, current_user.id, appointments, selected),
+            exclude_unset=True,
+        )
+    return serialize(
+        request,
+        response,
+        list[AppointmentSummary],
+        [project_appointment(appointment, selected) for appointment in appointments],
+        exclude_unset=True,
     )
 
 
@@ -390,7 +502,7 @@ def list_appointments(
 def create_appointment(
     payload: AppointmentCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     patient = _ensure_patient_exists(db, payload.patient_id, current_user.id)
@@ -427,10 +539,9 @@ def create_appointment(
         )
     appointment = Appointment(**payload_data)
     db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
-    appointment.patient = patient
-    _send_confirmation_email(db, appointment, patient)
+    db.flush()
+    track_appointment_change(db, None, _rollup_key(appointment))
+    _queue_confirmation_email(db, appointment, patient)
     log_event(
         db,
         current_user,
@@ -445,7 +556,12 @@ def create_appointment(
             "status": appointment.status,
         },
         request=request,
+        commit=False,
     )
+    db.commit()
+    db.refresh(appointment)
+    overlap_index.sync(appointment)
+    appointment.patient = patient
     return appointment
 
 
@@ -454,7 +570,7 @@ def update_appointment(
     appointment_id: int,
     payload: AppointmentUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
@@ -482,9 +598,10 @@ def update_appointment(
     user_touched_reminders = any(field in update_data for field in REMINDER_SETTING_FIELDS)
     _apply_appointment_update(appointment, update_data)
     auto_disabled = _enforce_reminder_rules(appointment, previous_reminder_enabled)
-    db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
+    _queue_change_emails(db, appointment, old_snapshot)
+    track_appointment_change(
+        db, _snapshot_rollup_key(appointment, old_snapshot), _rollup_key(appointment)
+    )
     metadata = _build_update_metadata(old_snapshot, appointment)
     action = "appointment.update"
     if old_snapshot["status"] != appointment.status:
@@ -516,6 +633,7 @@ def update_appointment(
         summary=summary,
         metadata=metadata,
         request=request,
+        commit=False,
     )
     reminder_changed_fields = _get_changed_reminder_fields(
         old_snapshot, appointment, REMINDER_SETTING_FIELDS
@@ -530,6 +648,7 @@ def update_appointment(
             summary="Updated reminder settings",
             metadata={"changed_fields": reminder_changed_fields},
             request=request,
+            commit=False,
         )
     if auto_disabled and previous_reminder_enabled:
         log_event(
@@ -541,18 +660,12 @@ def update_appointment(
             summary="Reminders disabled automatically",
             metadata={"status": appointment.status},
             request=request,
+            commit=False,
         )
-    if appointment.status == AppointmentStatus.cancelled:
-        if old_snapshot["status"] != AppointmentStatus.cancelled:
-            _send_cancellation_email(db, appointment, appointment.patient, old_snapshot)
-    elif appointment.status == AppointmentStatus.confirmed and (
-        old_snapshot["status"] != AppointmentStatus.confirmed
-    ):
-        _send_confirmation_email(db, appointment, appointment.patient, event_label="confirm")
-    elif _should_send_update_email(appointment.status) and _has_update_changes(
-        old_snapshot, appointment
-    ):
-        _send_update_email(db, appointment, appointment.patient, old_snapshot)
+    db.add(appointment)
+    db.commit()
+    db.refresh(appointment)
+    overlap_index.sync(appointment)
     return appointment
 
 
@@ -561,7 +674,7 @@ def patch_appointment(
     appointment_id: int,
     payload: AppointmentUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
@@ -589,9 +702,10 @@ def patch_appointment(
     user_touched_reminders = any(field in update_data for field in REMINDER_SETTING_FIELDS)
     _apply_appointment_update(appointment, update_data)
     auto_disabled = _enforce_reminder_rules(appointment, previous_reminder_enabled)
-    db.add(appointment)
-    db.commit()
-    db.refresh(appointment)
+    _queue_change_emails(db, appointment, old_snapshot)
+    track_appointment_change(
+        db, _snapshot_rollup_key(appointment, old_snapshot), _rollup_key(appointment)
+    )
     metadata = _build_update_metadata(old_snapshot, appointment)
     action = "appointment.update"
     if old_snapshot["status"] != appointment.status:
@@ -623,6 +737,7 @@ def patch_appointment(
         summary=summary,
         metadata=metadata,
         request=request,
+        commit=False,
     )
     reminder_changed_fields = _get_changed_reminder_fields(
         old_snapshot, appointment, REMINDER_SETTING_FIELDS
@@ -637,6 +752,7 @@ def patch_appointment(
             summary="Updated reminder settings",
             metadata={"changed_fields": reminder_changed_fields},
             request=request,
+            commit=False,
         )
     if auto_disabled and previous_reminder_enabled:
         log_event(
@@ -648,18 +764,12 @@ def patch_appointment(
             summary="Reminders disabled automatically",
             metadata={"status": appointment.status},
             request=request,
+            commit=False,
         )
-    if appointment.status == AppointmentStatus.cancelled:
-        if old_snapshot["status"] != AppointmentStatus.cancelled:
-            _send_cancellation_email(db, appointment, appointment.patient, old_snapshot)
-    elif appointment.status == AppointmentStatus.confirmed and (
-        old_snapshot["status"] != AppointmentStatus.confirmed
-    ):
-        _send_confirmation_email(db, appointment, appointment.patient, event_label="confirm")
-    elif _should_send_update_email(appointment.status) and _has_update_changes(
-        old_snapshot, appointment
-    ):
-        _send_update_email(db, appointment, appointment.patient, old_snapshot)
+    db.add(appointment)
+    db.commit()
+    db.refresh(appointment)
+    overlap_index.sync(appointment)
     return appointment
 
 
@@ -667,7 +777,7 @@ def patch_appointment(
 def cancel_appointment(
     appointment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
@@ -678,9 +788,10 @@ def cancel_appointment(
         old_snapshot = _snapshot_appointment(appointment)
         appointment.status = AppointmentStatus.cancelled
         auto_disabled = _enforce_reminder_rules(appointment, previous_reminder_enabled)
-        db.add(appointment)
-        db.commit()
-        db.refresh(appointment)
+        _queue_cancellation_email(db, appointment, appointment.patient, old_snapshot)
+        track_appointment_change(
+            db, _snapshot_rollup_key(appointment, old_snapshot), _rollup_key(appointment)
+        )
         log_event(
             db,
             current_user,
@@ -690,6 +801,7 @@ def cancel_appointment(
             summary="Cancelled appointment",
             metadata={"status": appointment.status},
             request=request,
+            commit=False,
         )
         if auto_disabled and previous_reminder_enabled:
             log_event(
@@ -701,8 +813,12 @@ def cancel_appointment(
                 summary="Reminders disabled automatically",
                 metadata={"status": appointment.status},
                 request=request,
+                commit=False,
             )
-        _send_cancellation_email(db, appointment, appointment.patient, old_snapshot)
+        db.add(appointment)
+        db.commit()
+        db.refresh(appointment)
+        overlap_index.sync(appointment)
     return appointment
 
 
@@ -710,7 +826,7 @@ def cancel_appointment(
 def complete_appointment(
     appointment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
@@ -718,11 +834,10 @@ def complete_appointment(
         previous_reminder_enabled = (
             appointment.reminder_email_enabled or appointment.reminder_sms_enabled
         )
+        previous_key = _rollup_key(appointment)
         appointment.status = AppointmentStatus.completed
         auto_disabled = _enforce_reminder_rules(appointment, previous_reminder_enabled)
-        db.add(appointment)
-        db.commit()
-        db.refresh(appointment)
+        track_appointment_change(db, previous_key, _rollup_key(appointment))
         log_event(
             db,
             current_user,
@@ -732,6 +847,7 @@ def complete_appointment(
             summary="Completed appointment",
             metadata={"status": appointment.status},
             request=request,
+            commit=False,
         )
         if auto_disabled and previous_reminder_enabled:
             log_event(
@@ -743,7 +859,12 @@ def complete_appointment(
                 summary="Reminders disabled automatically",
                 metadata={"status": appointment.status},
                 request=request,
+                commit=False,
             )
+        db.add(appointment)
+        db.commit()
+        db.refresh(appointment)
+        overlap_index.sync(appointment)
     return appointment
 
 
@@ -751,7 +872,7 @@ def complete_appointment(
 def simulate_reminder(
     appointment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
@@ -805,21 +926,24 @@ def simulate_reminder(
 def delete_appointment(
     appointment_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     appointment = _get_appointment(db, appointment_id, current_user.id)
+    track_appointment_change(db, _rollup_key(appointment), None)
     db.delete(appointment)
-    db.commit()
     log_event(
         db,
         current_user,
         action="appointment.delete",
         entity_type="appointment",
-        entity_id=appointment.id,
+        entity_id=appointment_id,
         summary="Deleted appointment",
         request=request,
+        commit=False,
     )
+    db.commit()
+    overlap_index.discard(current_user.id, appointment_id)
 
 def _ensure_patient_exists(
     db: Session, patient_id: int, owner_user_id: int
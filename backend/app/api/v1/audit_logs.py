@@ -1,17 +1,41 @@
 import json
 from datetime import datetime
+from itertools import islice
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.core.pagination import (
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    fetch_page,
+    set_page_headers,
+)
+from app.core.principal_cache import Principal
+from app.core.responses import serialize
+from app.core.streaming import StreamFormat, stream_query
 from app.core.security import get_current_admin
 from app.db.session import get_db
 from app.models.audit_log import AuditLog
-from app.models.user import User
 from app.schemas.audit_log import AuditLogResponse
+from app.services.audit_archive import archived_paths, iter_archived_rows
 
 router = APIRouter(prefix="/audit-logs", tags=["audit-logs"])
 
+STREAM_COLUMNS = [
+    AuditLog.id,
+    AuditLog.created_at,
+    AuditLog.action,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.summary,
+    AuditLog.metadata_json,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.request_id,
+]
+
 
 def _parse_metadata(raw: str | None) -> dict | None:
     if not raw:
@@ -22,46 +46,82 @@ def _parse_metadata(raw: str | None) -> dict | None:
         return None
 
 
+def _response_row(row: dict) -> dict:
+    """Shape a hot-table or archived row like ``AuditLogResponse``."""
+    return {
+        "id": row["id"],
+        "created_at": row["created_at"],
+        "action": row["action"],
+        "entity_type": row["entity_type"],
+        "entity_id": row["entity_id"],
+        "summary": row["summary"],
+        "metadata": _parse_metadata(row["metadata_json"]),
+        "ip_address": row["ip_address"],
+        "user_agent": row["user_agent"],
+        "request_id": row["request_id"],
+    }
+
+
 @router.get("/", response_model=list[AuditLogResponse])
 def list_audit_logs(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     entity_type: str | None = Query(default=None),
     action: str | None = Query(default=None),
     entity_id: int | None = Query(default=None),
     limit: int = Query(default=50, ge=1, le=200),
-    offset: int = Query(default=0, ge=0),
+    offset: int = Query(default=0, ge=0, deprecated=True),
+    before: str | None = Query(default=None),
     since: datetime | None = Query(default=None),
+    stream: StreamFormat | None = Query(default=None),
 ):
+    filters = {
+        column: value
+        for column, value in (
+            ("entity_type", entity_type),
+            ("action", action),
+            ("entity_id", entity_id),
+        )
+        if value is not None and value != ""
+    }
     query = db.query(AuditLog).filter(AuditLog.owner_user_id == current_user.id)
-    if entity_type:
-        query = query.filter(AuditLog.entity_type == entity_type)
-    if action:
-        query = query.filter(AuditLog.action == action)
-    if entity_id is not None:
-        query = query.filter(AuditLog.entity_id == entity_id)
+    for column, value in filters.items():
+        query = query.filter(getattr(AuditLog, column) == value)
     if since:
         query = query.filter(AuditLog.created_at >= since)
 
-    logs = (
-        query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
-        .offset(offset)
-        .limit(limit)
-        .all()
+    # ``before`` is the previous page's X-Next-Cursor; seeking on
+    # (created_at, id) keeps deep pages as cheap as the first one.
+    seek = decode_cursor(before) if before else None
+    query = apply_keyset(query, AuditLog.created_at, AuditLog.id, before, descending=True)
+    # Months past the retention window live in archive files (see
+    # app.services.audit_archive); they continue the hot table's order.
+    if stream:
+        # Every matching row; ``limit`` and ``offset`` do not apply.
+        paths = archived_paths(db, current_user.id, since, seek[0] if seek else None)
+        archived = iter_archived_rows(paths, seek, since, filters) if paths else None
+        return stream_query(query, STREAM_COLUMNS, stream, _response_row, tail=archived)
+
+    rows, next_cursor = fetch_page(
+        query.with_entities(*STREAM_COLUMNS).offset(offset), limit, "created_at"
     )
+    rows = [row._asdict() for row in rows]
+    # The deprecated ``offset`` only pages the hot table.
+    if next_cursor is None and not offset:
+        if rows:
+            seek = (rows[-1]["created_at"], rows[-1]["id"])
+        paths = archived_paths(db, current_user.id, since, seek[0] if seek else None)
+        remaining = limit - len(rows)
+        archived = list(islice(iter_archived_rows(paths, seek, since, filters), remaining + 1))
+        if len(archived) > remaining:
+            rows += archived[:remaining]
+            next_cursor = encode_cursor(rows[-1]["created_at"], rows[-1]["id"])
+        else:
+            rows += archived
+    set_page_headers(response, next_cursor)
 
-    return [
-        AuditLogResponse(
-            id=log.id,
-            created_at=log.created_at,
-            action=log.action,
-            entity_type=log.entity_type,
-            entity_id=log.entity_id,
-            summary=log.summary,
-            metadata=_parse_metadata(log.metadata_json),
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            request_id=log.request_id,
-        )
-        for log in logs
-    ]
+    return serialize(
+        request, response, list[AuditLogResponse], [_response_row(row) for row in rows]
+    )
@@ -1,12 +1,15 @@
 import secrets
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.limiter import get_ip_email_key, limiter
-from app.core.security import create_access_token, get_current_admin, get_password_hash, verify_password
+from app.core.principal_cache import Principal
+from app.core.password_pool import hash_password_async, login_guard, verify_password_async
+from app.core.security import create_access_token, get_current_admin
 from app.models.signup_otp import SignupOtp
 from app.models.user import User, UserRole
 from app.schemas.auth import SignupOtpRequest, SignupOtpVerify
@@ -23,6 +26,10 @@ OTP_COOLDOWN_SECONDS = 60
 OTP_MAX_SENDS_PER_HOUR = 5
 OTP_MAX_ATTEMPTS = 5
 
+# The handlers below are ``async def``: bcrypt runs on the password pool via
+# ``await`` and the blocking database work in ``run_in_threadpool`` helpers,
+# so a request waiting on a hash does not also hold an AnyIO worker thread.
+
 
 def _normalize_email(email: str) -> str:
     return email.strip().lower()
@@ -32,14 +39,18 @@ def _generate_otp() -> str:
     return f"{secrets.randbelow(10**OTP_LENGTH):0{OTP_LENGTH}d}"
 
 
+def _epoch(naive_utc: datetime) -> float:
+    return naive_utc.replace(tzinfo=timezone.utc).timestamp()
+
+
 def _get_primary_user(db: Session) -> User | None:
     return db.query(User).order_by(User.created_at.asc(), User.id.asc()).first()
 
 
-def _build_user_from_signup(payload: UserSignup, email: str) -> User:
+def _build_user_from_signup(payload: UserSignup, email: str, hashed_password: str) -> User:
     return User(
         email=email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=hashed_password,
         full_name=f"{payload.first_name} {payload.last_name}".strip(),
         first_name=payload.first_name,
         last_name=payload.last_name,
@@ -60,12 +71,44 @@ def _build_user_from_signup(payload: UserSignup, email: str) -> User:
     )
 
 
-@router.post("/login")
-@limiter.limit("5/minute", key_func=get_ip_email_key)
-@limiter.limit("20/minute")
-def login(payload: UserLogin, db: Session = Depends(get_db), request: Request = None):
+def _ensure_email_available(db: Session, email: str, status_code: int) -> None:
+    if db.query(User).filter(User.email == email).first():
+        raise HTTPException(status_code=status_code, detail="Email already registered")
+
+
+def _token_response(db: Session, user: User, action: str, summary: str, request: Request) -> dict:
+    token = create_access_token(
+        {"sub": str(user.id), "role": user.role.value},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    )
+    log_event(
+        db,
+        user,
+        action=action,
+        entity_type="user",
+        entity_id=user.id,
+        summary=summary,
+        metadata={"email": user.email},
+        request=request,
+    )
+    return {
+        "access_token": token,
+        "token_type": "bearer",
+        "user": UserResponse.from_orm(user),
+    }
+
+
+def _create_user(db: Session, user: User) -> User:
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return user
+
+
+def _load_login_user(db: Session, email: str, request: Request) -> User | None:
+    """Fetch the account for ``email``, refusing it while it is locked."""
     now = datetime.utcnow()
-    user = db.query(User).filter(User.email == payload.email).first()
+    user = db.query(User).filter(User.email == email).first()
     if user and user.locked_until:
         if user.locked_until > now:
             log_event(
@@ -78,6 +121,7 @@ def login(payload: UserLogin, db: Session = Depends(get_db), request: Request =
                 metadata={"locked_until": user.locked_until},
                 request=request,
             )
+            login_guard.record_lock(email, _epoch(user.locked_until))
             raise HTTPException(
                 status_code=status.HTTP_423_LOCKED,
                 detail="Account temporarily locked. Try again later.",
@@ -86,62 +130,70 @@ def login(payload: UserLogin, db: Session = Depends(get_db), request: Request =
         user.failed_login_attempts = 0
         db.add(user)
         db.commit()
-    if not user or not verify_password(payload.password, user.hashed_password):
-        if user:
-            user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
-            if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
-                user.failed_login_attempts = 0
-                user.locked_until = now + timedelta(
-                    minutes=settings.LOGIN_LOCK_MINUTES
-                )
-                db.add(user)
-                db.commit()
-                log_event(
-                    db,
-                    user,
-                    action="auth.locked",
-                    entity_type="user",
-                    entity_id=user.id,
-                    summary="Account locked after failed logins",
-                    metadata={"locked_until": user.locked_until},
-                    request=request,
-                )
-            else:
-                db.add(user)
-                db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password",
+    return user
+
+
+def _record_failed_login(db: Session, user: User | None, email: str, request: Request) -> None:
+    if not user:
+        login_guard.record_failure(email)
+        return
+    user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
+    if user.failed_login_attempts >= settings.MAX_LOGIN_ATTEMPTS:
+        user.failed_login_attempts = 0
+        user.locked_until = datetime.utcnow() + timedelta(
+            minutes=settings.LOGIN_LOCK_MINUTES
+        )
+        db.add(user)
+        log_event(
+            db,
+            user,
+            action="auth.locked",
+            entity_type="user",
+            entity_id=user.id,
+            summary="Account locked after failed logins",
+            metadata={"locked_until": user.locked_until},
+            request=request,
+            commit=False,
         )
+        db.commit()
+        login_guard.record_lock(email, _epoch(user.locked_until))
+    else:
+        db.add(user)
+        db.commit()
+
+
+def _complete_login(db: Session, user: User, email: str, request: Request) -> dict:
     if user.role != UserRole.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only clinic staff can access Medyra",
         )
+    login_guard.clear(email)
     if user.failed_login_attempts or user.locked_until:
         user.failed_login_attempts = 0
         user.locked_until = None
         db.add(user)
         db.commit()
-    token = create_access_token(
-        {"sub": str(user.id), "role": user.role.value},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
-    log_event(
-        db,
-        user,
-        action="auth.login",
-        entity_type="user",
-        entity_id=user.id,
-        summary="User logged in",
-        metadata={"email": user.email},
-        request=request,
-    )
-    return {"access_token": token, "token_type": "bearer", "user": UserResponse.from_orm(user)}
+    return _token_response(db, user, "auth.login", "User logged in", request)
+
+
+@router.post("/login")
+@limiter.limit("5/minute", key_func=get_ip_email_key)
+@limiter.limit("20/minute")
+async def login(payload: UserLogin, db: Session = Depends(get_db), request: Request = None):
+    login_guard.check(payload.email)
+    user = await run_in_threadpool(_load_login_user, db, payload.email, request)
+    if not user or not await verify_password_async(payload.password, user.hashed_password):
+        await run_in_threadpool(_record_failed_login, db, user, payload.email, request)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect email or password",
+        )
+    return await run_in_threadpool(_complete_login, db, user, payload.email, request)
 
 
 @router.post("/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
-def signup(
+async def signup(
     payload: UserSignup,
     db: Session = Depends(get_db),
     request: Request = None,
@@ -153,41 +205,25 @@ def signup(
         )
 
     email = _normalize_email(payload.email)
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered",
-        )
+    await run_in_threadpool(_ensure_email_available, db, email, status.HTTP_409_CONFLICT)
 
-    user = _build_user_from_signup(payload, email)
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    token = create_access_token(
-        {"sub": str(user.id), "role": user.role.value},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    hashed_password = await hash_password_async(payload.password)
+    user = await run_in_threadpool(
+        _create_user, db, _build_user_from_signup(payload, email, hashed_password)
     )
-    log_event(
+    return await run_in_threadpool(
+        _token_response,
         db,
         user,
-        action="auth.signup_verified",
-        entity_type="user",
-        entity_id=user.id,
-        summary="Signup completed (OTP disabled)",
-        metadata={"email": email},
-        request=request,
+        "auth.signup_verified",
+        "Signup completed (OTP disabled)",
+        request,
     )
-    return {
-        "access_token": token,
-        "token_type": "bearer",
-        "user": UserResponse.from_orm(user),
-    }
 
 
 # TEMPORARY / REMOVE BEFORE RELEASE.
 @router.post("/signup-bypass", response_model=dict, status_code=status.HTTP_201_CREATED)
-def signup_bypass(
+async def signup_bypass(
     payload: UserSignup,
     db: Session = Depends(get_db),
     request: Request = None,
@@ -199,80 +235,20 @@ def signup_bypass(
         )
 
     email = _normalize_email(payload.email)
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered",
-        )
-
-    user = User(
-        email=email,
-        hashed_password=get_password_hash(payload.password),
-        full_name=f"{payload.first_name} {payload.last_name}".strip(),
-        first_name=payload.first_name,
-        last_name=payload.last_name,
-        phone=payload.phone,
-        specialty=payload.specialty,
-        license_number=payload.license_number,
-        license_state=payload.license_state,
-        license_country=payload.license_country,
-        npi_number=payload.npi_number,
-        taxonomy_code=payload.taxonomy_code,
-        clinic_name=payload.clinic_name,
-        clinic_address=payload.clinic_address,
-        clinic_city=payload.clinic_city,
-        clinic_state=payload.clinic_state,
-        clinic_zip=payload.clinic_zip,
-        clinic_country=payload.clinic_country,
-        role=UserRole.admin,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
+    await run_in_threadpool(_ensure_email_available, db, email, status.HTTP_409_CONFLICT)
 
-    token = create_access_token(
-        {"sub": str(user.id), "role": user.role.value},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
+    hashed_password = await hash_password_async(payload.password)
+    user = await run_in_threadpool(
+        _create_user, db, _build_user_from_signup(payload, email, hashed_password)
     )
-    log_event(
-        db,
-        user,
-        action="auth.signup_bypass",
-        entity_type="user",
-        entity_id=user.id,
-        summary="Signup bypass used",
-        metadata={"email": email},
-        request=request,
+    return await run_in_threadpool(
+        _token_response, db, user, "auth.signup_bypass", "Signup bypass used", request
     )
-    return {
-        "access_token": token,
-        "token_type": "bearer",
-        "user": UserResponse.from_orm(user),
-    }
 
 
-@router.post("/signup/request-otp", response_model=dict)
-@limiter.limit("3/minute", key_func=get_ip_email_key)
-@limiter.limit("10/minute")
-def request_signup_otp(
-    payload: SignupOtpRequest,
-    db: Session = Depends(get_db),
-    request: Request = None,
-):
-    if not settings.ENABLE_EMAIL_OTP:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Not found",
-        )
-
-    email = _normalize_email(payload.email)
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered",
-        )
+def _claim_otp_send(db: Session, email: str) -> SignupOtp:
+    """Apply the cooldown and hourly cap; return the record to (re)issue."""
+    _ensure_email_available(db, email, status.HTTP_409_CONFLICT)
 
     now = datetime.utcnow()
     otp_record = db.query(SignupOtp).filter(SignupOtp.email == email).first()
@@ -296,9 +272,19 @@ def request_signup_otp(
     if not otp_record:
         otp_record = SignupOtp(email=email, send_count=0, attempts=0)
         db.add(otp_record)
+    return otp_record
 
-    otp_code = _generate_otp()
-    otp_record.otp_hash = get_password_hash(otp_code)
+
+def _store_and_send_otp(
+    db: Session,
+    otp_record: SignupOtp,
+    otp_code: str,
+    otp_hash: str,
+    request: Request,
+) -> None:
+    now = datetime.utcnow()
+    email = otp_record.email
+    otp_record.otp_hash = otp_hash
     otp_record.expires_at = now + timedelta(minutes=OTP_EXPIRY_MINUTES)
     otp_record.attempts = 0
     otp_record.last_sent_at = now
@@ -327,14 +313,12 @@ def request_signup_otp(
         request=request,
     )
 
-    return {"message": "OTP sent"}
-
 
-@router.post("/signup/verify-otp", response_model=dict, status_code=status.HTTP_201_CREATED)
-@limiter.limit("5/minute", key_func=get_ip_email_key)
-@limiter.limit("15/minute")
-def verify_signup_otp(
-    payload: SignupOtpVerify,
+@router.post("/signup/request-otp", response_model=dict)
+@limiter.limit("3/minute", key_func=get_ip_email_key)
+@limiter.limit("10/minute")
+async def request_signup_otp(
+    payload: SignupOtpRequest,
     db: Session = Depends(get_db),
     request: Request = None,
 ):
@@ -345,12 +329,17 @@ def verify_signup_otp(
         )
 
     email = _normalize_email(payload.email)
-    existing = db.query(User).filter(User.email == email).first()
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Email already registered",
-        )
+    otp_record = await run_in_threadpool(_claim_otp_send, db, email)
+    otp_code = _generate_otp()
+    otp_hash = await hash_password_async(otp_code)
+    await run_in_threadpool(_store_and_send_otp, db, otp_record, otp_code, otp_hash, request)
+
+    return {"message": "OTP sent"}
+
+
+def _load_signup_otp(db: Session, email: str) -> SignupOtp:
+    """Return the pending code for ``email``, dropping it once expired or exhausted."""
+    _ensure_email_available(db, email, status.HTTP_409_CONFLICT)
 
     otp_record = db.query(SignupOtp).filter(SignupOtp.email == email).first()
     if not otp_record:
@@ -375,67 +364,74 @@ def verify_signup_otp(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Too many attempts. Request a new code.",
         )
+    return otp_record
+
 
-    if not verify_password(payload.otp, otp_record.otp_hash):
-        otp_record.attempts += 1
+def _record_otp_failure(db: Session, otp_record: SignupOtp) -> None:
+    otp_record.attempts += 1
+    db.commit()
+    if otp_record.attempts >= OTP_MAX_ATTEMPTS:
+        db.delete(otp_record)
         db.commit()
-        if otp_record.attempts >= OTP_MAX_ATTEMPTS:
-            db.delete(otp_record)
-            db.commit()
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Too many attempts. Request a new code.",
-            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid verification code.",
+            detail="Too many attempts. Request a new code.",
         )
 
-    user = _build_user_from_signup(payload, email)
+
+def _complete_otp_signup(
+    db: Session, otp_record: SignupOtp, user: User, request: Request
+) -> dict:
     db.add(user)
     db.delete(otp_record)
     db.commit()
     db.refresh(user)
-    token = create_access_token(
-        {"sub": str(user.id), "role": user.role.value},
-        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES),
-    )
-    log_event(
-        db,
-        user,
-        action="auth.signup_verified",
-        entity_type="user",
-        entity_id=user.id,
-        summary="Signup verified",
-        metadata={"email": email},
-        request=request,
-    )
-    return {
-        "access_token": token,
-        "token_type": "bearer",
-        "user": UserResponse.from_orm(user),
-    }
+    return _token_response(db, user, "auth.signup_verified", "Signup verified", request)
 
 
-@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(
-    payload: UserCreate,
+@router.post("/signup/verify-otp", response_model=dict, status_code=status.HTTP_201_CREATED)
+@limiter.limit("5/minute", key_func=get_ip_email_key)
+@limiter.limit("15/minute")
+async def verify_signup_otp(
+    payload: SignupOtpVerify,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_admin),
+    request: Request = None,
 ):
-    existing = db.query(User).filter(User.email == payload.email).first()
-    if existing:
+    if not settings.ENABLE_EMAIL_OTP:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not found",
         )
+
+    email = _normalize_email(payload.email)
+    otp_record = await run_in_threadpool(_load_signup_otp, db, email)
+
+    if not await verify_password_async(payload.otp, otp_record.otp_hash):
+        await run_in_threadpool(_record_otp_failure, db, otp_record)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid verification code.",
+        )
+
+    hashed_password = await hash_password_async(payload.password)
+    user = _build_user_from_signup(payload, email, hashed_password)
+    return await run_in_threadpool(_complete_otp_signup, db, otp_record, user, request)
+
+
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_user(
+    payload: UserCreate,
+    db: Session = Depends(get_db),
+    _: Principal = Depends(get_current_admin),
+):
+    await run_in_threadpool(
+        _ensure_email_available, db, payload.email, status.HTTP_400_BAD_REQUEST
+    )
     user = User(
         email=payload.email,
-        hashed_password=get_password_hash(payload.password),
+        hashed_password=await hash_password_async(payload.password),
         full_name=payload.full_name,
         phone=payload.phone,
         role=UserRole.admin,
     )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return await run_in_threadpool(_create_user, db, user)
@@ -1,174 +1,116 @@
-from datetime import date, datetime, time, timedelta
+from datetime import date, datetime, timedelta
 
 from fastapi import APIRouter, Depends
 from sqlalchemy import func
 from sqlalchemy.orm import Session
 
+from app.core.principal_cache import Principal
 from app.core.security import get_current_admin
 from app.db.session import get_db
-from app.models.appointment import Appointment, AppointmentStatus
-from app.models.patient import Patient
-from app.models.user import User
+from app.models.dashboard_rollup import AppointmentDailyRollup, PatientDailyRollup
+from app.services.analytics_cache import analytics_cache
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-def _to_date_key(value: date | str) -> str:
-    if isinstance(value, date):
-        return value.isoformat()
-    return str(value)
-
-
 def _week_start(value: date) -> date:
     return value - timedelta(days=value.weekday())
 
 
-def _normalize_status(status) -> str:
-    if isinstance(status, AppointmentStatus):
-        status = status.value
-    normalized = str(status).lower()
-    if normalized == "scheduled":
-        return "unconfirmed"
-    return normalized
+STATUS_BUCKETS = [
+    "unconfirmed",
+    "confirmed",
+    "completed",
+    "cancelled",
+    "no_show",
+]
 
 
-@router.get("/analytics")
-def get_dashboard_analytics(
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
-):
-    today = datetime.now().date()
+def _compute_dashboard_analytics(db: Session, owner_user_id: int, today: date) -> dict:
     start_30d = today - timedelta(days=29)
-    start_30d_dt = datetime.combine(start_30d, time.min)
-    end_today_dt = datetime.combine(today, time.max)
-    upcoming_end_dt = datetime.combine(today + timedelta(days=6), time.max)
-
-    total_patients = (
-        db.query(func.count(Patient.id))
-        .filter(Patient.owner_user_id == current_user.id)
-        .scalar()
-        or 0
-    )
-    appointments_today = (
-        db.query(func.count(Appointment.id))
-        .filter(
-            Appointment.owner_user_id == current_user.id,
-            Appointment.appointment_datetime >= datetime.combine(today, time.min),
-            Appointment.appointment_datetime <= end_today_dt,
-        )
-        .scalar()
-        or 0
-    )
-    upcoming_appointments_7d = (
-        db.query(func.count(Appointment.id))
-        .filter(
-            Appointment.owner_user_id == current_user.id,
-            Appointment.appointment_datetime >= datetime.combine(today, time.min),
-            Appointment.appointment_datetime <= upcoming_end_dt,
-        )
-        .scalar()
-        or 0
-    )
-    new_patients_30d = (
-        db.query(func.count(Patient.id))
-        .filter(
-            Patient.owner_user_id == current_user.id,
-            Patient.created_at >= start_30d_dt,
-            Patient.created_at <= end_today_dt,
-        )
-        .scalar()
-        or 0
-    )
+    upcoming_end = today + timedelta(days=6)
+    week_end = _week_start(today)
+    week_start = week_end - timedelta(weeks=11)
 
     appointment_rows = (
         db.query(
-            func.date(Appointment.appointment_datetime).label("day"),
-            func.count(Appointment.id),
+            AppointmentDailyRollup.day,
+            AppointmentDailyRollup.status,
+            AppointmentDailyRollup.count,
         )
         .filter(
-            Appointment.owner_user_id == current_user.id,
-            Appointment.appointment_datetime >= start_30d_dt,
-            Appointment.appointment_datetime <= end_today_dt,
+            AppointmentDailyRollup.owner_user_id == owner_user_id,
+            AppointmentDailyRollup.day >= start_30d,
+            AppointmentDailyRollup.day <= upcoming_end,
         )
-        .group_by(func.date(Appointment.appointment_datetime))
         .all()
     )
-    appointment_counts = {
-        _to_date_key(row[0]): int(row[1]) for row in appointment_rows
-    }
+    appointment_counts: dict[date, int] = {}
+    status_counts: dict[str, int] = {}
+    other_count = 0
+    appointments_today = 0
+    upcoming_appointments_7d = 0
+    for day, status, count in appointment_rows:
+        if day == today:
+            appointments_today += count
+        if day >= today:
+            upcoming_appointments_7d += count
+        if day > today:
+            continue
+        appointment_counts[day] = appointment_counts.get(day, 0) + count
+        if status in STATUS_BUCKETS:
+            status_counts[status] = status_counts.get(status, 0) + count
+        else:
+            other_count += count
+
     appointments_by_day = []
     for offset in range(30):
         current_day = start_30d + timedelta(days=offset)
-        key = current_day.isoformat()
         appointments_by_day.append(
-            {"date": key, "count": appointment_counts.get(key, 0)}
+            {
+                "date": current_day.isoformat(),
+                "count": appointment_counts.get(current_day, 0),
+            }
         )
 
-    week_end = _week_start(today)
-    week_start = week_end - timedelta(weeks=11)
+    appointments_by_status = [
+        {"status": status, "count": status_counts.get(status, 0)}
+        for status in STATUS_BUCKETS
+    ]
+    if other_count:
+        appointments_by_status.append({"status": "other", "count": other_count})
+
+    total_patients = (
+        db.query(func.coalesce(func.sum(PatientDailyRollup.count), 0))
+        .filter(PatientDailyRollup.owner_user_id == owner_user_id)
+        .scalar()
+        or 0
+    )
     patient_rows = (
-        db.query(Patient.created_at)
+        db.query(PatientDailyRollup.day, PatientDailyRollup.count)
         .filter(
-            Patient.owner_user_id == current_user.id,
-            Patient.created_at
-            >= datetime.combine(week_start, time.min),
-            Patient.created_at <= end_today_dt,
+            PatientDailyRollup.owner_user_id == owner_user_id,
+            PatientDailyRollup.day >= min(week_start, start_30d),
+            PatientDailyRollup.day <= today,
         )
         .all()
     )
-    weekly_counts: dict[str, int] = {}
-    for (created_at,) in patient_rows:
-        created_date = created_at.date()
-        bucket = _week_start(created_date).isoformat()
-        weekly_counts[bucket] = weekly_counts.get(bucket, 0) + 1
+    new_patients_30d = 0
+    weekly_counts: dict[date, int] = {}
+    for day, count in patient_rows:
+        if day >= start_30d:
+            new_patients_30d += count
+        if day >= week_start:
+            bucket = _week_start(day)
+            weekly_counts[bucket] = weekly_counts.get(bucket, 0) + count
 
     new_patients_by_week = []
     for offset in range(12):
         current_week = week_start + timedelta(weeks=offset)
-        key = current_week.isoformat()
         new_patients_by_week.append(
-            {"weekStart": key, "count": weekly_counts.get(key, 0)}
+            {"weekStart": current_week.isoformat(), "count": weekly_counts.get(current_week, 0)}
         )
 
-    status_rows = (
-        db.query(Appointment.status, func.count(Appointment.id))
-        .filter(
-            Appointment.owner_user_id == current_user.id,
-            Appointment.appointment_datetime >= start_30d_dt,
-            Appointment.appointment_datetime <= end_today_dt,
-        )
-        .group_by(Appointment.status)
-        .all()
-    )
-    status_counts: dict[str, int] = {}
-    other_count = 0
-    for status, count in status_rows:
-        normalized = _normalize_status(status)
-        if normalized in {
-            "unconfirmed",
-            "confirmed",
-            "completed",
-            "cancelled",
-            "no_show",
-        }:
-            status_counts[normalized] = int(count)
-        else:
-            other_count += int(count)
-
-    status_buckets = [
-        "unconfirmed",
-        "confirmed",
-        "completed",
-        "cancelled",
-        "no_show",
-    ]
-    appointments_by_status = [
-        {"status": status, "count": status_counts.get(status, 0)}
-        for status in status_buckets
-    ]
-    if other_count:
-        appointments_by_status.append({"status": "other", "count": other_count})
-
     return {
         "kpis": {
             "totalPatients": total_patients,
@@ -186,3 +128,21 @@ def get_dashboard_analytics(
             "generatedAt": datetime.utcnow().isoformat(),
         },
     }
+
+
+@router.get("/analytics")
+def get_dashboard_analytics(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin),
+):
+    today = datetime.now().date()
+    return analytics_cache.get_or_compute(
+        current_user.id,
+        today,
+        lambda: _compute_dashboard_analytics(db, current_user.id, today),
+    )
+
+
+@router.get("/analytics/cache-stats")
+def get_dashboard_cache_stats(current_user: Principal = Depends(get_current_admin)):
+    return analytics_cache.stats(current_user.id)
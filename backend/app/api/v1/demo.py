@@ -4,18 +4,23 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.principal_cache import Principal
 from app.core.security import get_current_admin
 from app.db.session import get_db
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.audit_log import AuditLog
 from app.models.patient import Patient
-from app.models.user import User
+from app.services.appointment_overlap import overlap_index
+from app.services.audit_archive import purge_owner_archives
 from app.services.audit_log import log_event
+from app.services.dashboard_rollups import rebuild_owner_rollups
+from app.services.export_jobs import export_jobs
+from app.services.patient_search import rebuild_owner_search_index
 
 router = APIRouter(prefix="/demo", tags=["demo"])
 
 
-def _seed_demo_data(db: Session, owner: User) -> dict:
+def _seed_demo_data(db: Session, owner: Principal) -> dict:
     now = datetime.utcnow()
     patients = [
         Patient(
@@ -129,7 +134,7 @@ def _seed_demo_data(db: Session, owner: User) -> dict:
 def reset_demo_data(
     reseed: bool = True,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     if not settings.ENABLE_DEMO_RESET:
@@ -151,14 +156,20 @@ def reset_demo_data(
             .filter(AuditLog.owner_user_id == current_user.id)
             .delete(synchronize_session=False)
         )
+        purge_owner_archives(db, current_user.id)
 
         seeded = {"patients": 0, "appointments": 0}
         if reseed:
             seeded = _seed_demo_data(db, current_user)
+        rebuild_owner_rollups(db, current_user.id)
+        rebuild_owner_search_index(db, current_user.id)
         db.commit()
+        export_jobs.purge_owner(current_user.id)
     except Exception:
         db.rollback()
         raise
+    finally:
+        overlap_index.invalidate(current_user.id)
 
     log_event(
         db,
@@ -192,7 +203,7 @@ def reset_demo_data(
 @router.post("/load-sample")
 def load_sample_data(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     if not settings.ENABLE_DEMO_RESET:
@@ -218,10 +229,14 @@ def load_sample_data(
 
     try:
         seeded = _seed_demo_data(db, current_user)
+        rebuild_owner_rollups(db, current_user.id)
+        rebuild_owner_search_index(db, current_user.id)
         db.commit()
     except Exception:
         db.rollback()
         raise
+    finally:
+        overlap_index.invalidate(current_user.id)
 
     log_event(
         db,
@@ -1,28 +1,56 @@
-from datetime import datetime, timedelta
-from io import BytesIO
-
-from fastapi import APIRouter, Depends, HTTPException, Request, status
-from fastapi.responses import Response
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response, StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.pagination import (
+    apply_keyset,
+    count_rows,
+    decode_offset_cursor,
+    encode_offset_cursor,
+    fetch_page,
+    set_page_headers,
+)
+from app.core.principal_cache import Principal
+from app.core.projection import load_columns, parse_fields, project
+from app.core.responses import serialize
+from app.core.streaming import StreamFormat, stream_query
 from app.core.security import get_current_admin
 from app.db.session import get_db
-from app.models.appointment import Appointment
+from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
-from app.models.user import User
-from app.schemas.appointment import AppointmentResponse
+from app.schemas.appointment import APPOINTMENT_FIELDS, AppointmentSummary
 from app.schemas.patient import (
+    PATIENT_FIELDS,
+    PATIENT_SUMMARY_FIELDS,
     PatientCreate,
     PatientNotesUpdate,
     PatientResponse,
+    PatientSummary,
     PatientUpdate,
 )
+from app.services.appointment_overlap import overlap_index
+from app.services.appointment_queries import (
+    appointment_list_options,
+    apply_appointment_filters,
+    project_appointment,
+)
 from app.services.audit_log import log_event
+from app.services.dashboard_rollups import track_patient_change, track_patient_deleted
+from app.services.export_jobs import (
+    EXPORT_ID_HEADER,
+    JOB_DONE,
+    JOB_FAILED,
+    export_jobs,
+)
+from app.services.patient_pdf import build_snapshot
+from app.services.patient_search import index_patient, search_patients, unindex_patient
 
 router = APIRouter(prefix="/patients", tags=["patients"])
 
@@ -58,15 +86,148 @@ def _build_update_metadata(patient: Patient, updates: dict) -> dict:
     return {"changed_fields": list(changes.keys()), "changes": changes}
 
 
-@router.get("/", response_model=list[PatientResponse])
+@router.get("/", response_model=list[PatientSummary], response_model_exclude_unset=True)
 def list_patients(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
+    fields: str | None = Query(default=None),
+    stream: StreamFormat | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
 ):
-    return (
-        db.query(Patient)
-        .filter(Patient.owner_user_id == current_user.id)
-        .all()
+    selected = parse_fields(fields, PATIENT_FIELDS, PATIENT_SUMMARY_FIELDS)
+    if stream:
+        return stream_query(
+            db.query(Patient)
+            .filter(Patient.owner_user_id == current_user.id)
+            .order_by(Patient.id),
+            [getattr(Patient, name) for name in selected],
+            stream,
+        )
+    query = db.query(Patient).filter(Patient.owner_user_id == current_user.id)
+    if limit is None and cursor is None:
+        # Unpaged callers (patient pickers) still get every patient.
+        patients = query.options(load_columns(Patient, selected)).all()
+    else:
+        total = count_rows(db, query) if include_total else None
+        query = apply_keyset(
+            query.options(load_columns(Patient, (*selected, "created_at"))),
+            Patient.created_at,
+            Patient.id,
+            cursor,
+            descending=False,
+        )
+        patients, next_cursor = fetch_page(query, limit or 100, "created_at")
+        set_page_headers(response, next_cursor, total)
+    return serialize(
+        request,
+        response,
+        list[PatientSummary],
+        [project(patient, selected) for patient in patients],
+        exclude_unset=True,
+    )
+
+
+@router.get(
+    "/search", response_model=list[PatientSummary], response_model_exclude_unset=True
+)
+def search_patient_records(
+    request: Request,
+    response: Response,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=25, ge=1, le=100),
+    cursor: str | None = Query(default=None),
+    fields: str | None = Query(default=None),
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin),
+):
+    selected = parse_fields(fields, PATIENT_FIELDS, PATIENT_SUMMARY_FIELDS)
+    offset = decode_offset_cursor(cursor)
+    patients = search_patients(
+        db, current_user.id, q, limit + 1, offset, (load_columns(Patient, selected),)
+    )
+    if len(patients) > limit:
+        patients = patients[:limit]
+        set_page_headers(response, encode_offset_cursor(offset + limit))
+    return serialize(
+        request,
+        response,
+        list[PatientSummary],
+        [project(patient, selected) for patient in patients],
+        exclude_unset=True,
+    )
+
+
+def _bulk_export_payload(bulk: dict) -> dict:
+    return {
+        "export_id": bulk["id"],
+        "status": bulk["status"],
+        "total": bulk["total"],
+        "completed": bulk["completed"],
+        "failed": bulk["failed"],
+        "cancel_requested": bulk["cancel_requested"],
+        "created_at": bulk["created_at"],
+    }
+
+
+def _bulk_export_or_404(bulk: dict | None) -> dict:
+    if not bulk:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Bulk export not found"
+        )
+    return bulk
+
+
+@router.get("/export-bulk")
+def export_all_patient_records(
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin),
+    request: Request = None,
+):
+    total = (
+        db.query(func.count(Patient.id)).filter(Patient.owner_user_id == current_user.id).scalar()
+    )
+    bulk = export_jobs.start_bulk(current_user.id, total)
+    log_event(
+        db,
+        current_user,
+        action="patient.export_bulk",
+        entity_type="patient",
+        entity_id=None,
+        summary=f"Exported {total} patient records",
+        metadata={"export_id": bulk["id"], "total": total},
+        request=request,
+    )
+    return StreamingResponse(
+        export_jobs.iter_bulk_zip(bulk, _bulk_export_snapshots(db, current_user.id)),
+        media_type="application/zip",
+        headers={
+            "Content-Disposition": 'attachment; filename="patient_records.zip"',
+            EXPORT_ID_HEADER: bulk["id"],
+        },
+    )
+
+
+@router.get("/export-bulk/{export_id}")
+def get_bulk_export(
+    export_id: str,
+    current_user: Principal = Depends(get_current_admin),
+):
+    return _bulk_export_payload(
+        _bulk_export_or_404(export_jobs.get_bulk(export_id, current_user.id))
+    )
+
+
+@router.delete("/export-bulk/{export_id}")
+def cancel_bulk_export(
+    export_id: str,
+    current_user: Principal = Depends(get_current_admin),
+):
+    return _bulk_export_payload(
+        _bulk_export_or_404(export_jobs.cancel_bulk(export_id, current_user.id))
     )
 
 
@@ -74,174 +235,156 @@ def list_patients(
 def get_patient(
     patient_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
 ):
     patient = _get_patient(db, patient_id, current_user.id)
     return patient
 
 
-@router.get("/{patient_id}/appointments", response_model=list[AppointmentResponse])
+@router.get(
+    "/{patient_id}/appointments",
+    response_model=list[AppointmentSummary],
+    response_model_exclude_unset=True,
+)
 def list_patient_appointments(
     patient_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
+    limit: int = Query(default=100, ge=1, le=500),
+    cursor: str | None = Query(default=None),
+    order: Literal["asc", "desc"] = Query(default="desc"),
+    date_from: datetime | None = Query(default=None),
+    date_to: datetime | None = Query(default=None),
+    status_filter: list[AppointmentStatus] | None = Query(default=None, alias="status"),
+    doctor_name: str | None = Query(default=None),
+    department: str | None = Query(default=None),
+    include_total: bool = Query(default=False),
+    fields: str | None = Query(default=None),
 ):
+    selected = parse_fields(fields, APPOINTMENT_FIELDS, APPOINTMENT_FIELDS)
     patient = _get_patient(db, patient_id, current_user.id)
-    return (
-        db.query(Appointment)
-        .filter(
+    query = apply_appointment_filters(
+        db.query(Appointment).filter(
             Appointment.patient_id == patient.id,
             Appointment.owner_user_id == current_user.id,
-        )
-        .order_by(Appointment.appointment_datetime.desc())
-        .all()
+        ),
+        date_from,
+        date_to,
+        status_filter,
+        doctor_name,
+        department,
     )
-
-
-def _resolve_end_time(start_time, end_time):
-    if not start_time:
-        return end_time
-    return end_time or start_time + timedelta(
-        minutes=settings.APPOINTMENT_DEFAULT_DURATION_MINUTES
+    total = count_rows(db, query) if include_total else None
+    query = apply_keyset(
+        query.options(*appointment_list_options(selected)),
+        Appointment.appointment_datetime,
+        Appointment.id,
+        cursor,
+        descending=order == "desc",
+    )
+    appointments, next_cursor = fetch_page(query, limit, "appointment_datetime")
+    set_page_headers(response, next_cursor, total)
+    return serialize(
+        request,
+        response,
+        list[AppointmentSummary],
+        [project_appointment(appointment, selected) for appointment in appointments],
+        exclude_unset=True,
     )
 
 
-def _format_datetime(value: datetime) -> str:
-    formatted = value.strftime("%b %d, %Y %I:%M %p")
-    return formatted.replace(" 0", " ")
-
-
-def _format_time_range(start_time, end_time):
-    if not start_time:
-        return "—"
-    if not end_time:
-        return _format_datetime(start_time)
-    return f"{_format_datetime(start_time)} - {_format_datetime(end_time)}"
+def _snapshot(patient: Patient, appointments: list[Appointment]) -> dict:
+    return build_snapshot(
+        patient,
+        appointments,
+        settings.PROJECT_NAME,
+        settings.APPOINTMENT_DEFAULT_DURATION_MINUTES,
+    )
 
 
-@router.get("/{patient_id}/export")
-def export_patient_record(
-    patient_id: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
-    request: Request = None,
-):
-    patient = _get_patient(db, patient_id, current_user.id)
+def _export_snapshot(db: Session, patient: Patient, owner_user_id: int) -> dict:
     appointments = (
         db.query(Appointment)
         .filter(
             Appointment.patient_id == patient.id,
-            Appointment.owner_user_id == current_user.id,
+            Appointment.owner_user_id == owner_user_id,
         )
-        .order_by(Appointment.appointment_datetime.asc())
+        .order_by(Appointment.appointment_datetime.asc(), Appointment.id.asc())
         .all()
     )
-
-    buffer = BytesIO()
+    return _snapshot(patient, appointments)
+
+
+def _bulk_export_snapshots(db: Session, owner_user_id: int) -> Iterator[tuple[int, dict]]:
+    """Yield every patient's snapshot, two queries per batch of patients.
+
+    Patients stream with ``yield_per`` and each batch's appointments are read
+    only when the ZIP writer reaches it, so memory follows the batch size
+    rather than the tenant. The generator runs after the request's ``get_db``
+    cleanup, so it closes ``db`` itself.
+    """
+    patients = db.execute(
+        select(Patient)
+        .where(Patient.owner_user_id == owner_user_id)
+        .order_by(Patient.id.asc())
+        .execution_options(yield_per=settings.EXPORT_BULK_BATCH_SIZE)
+    ).scalars()
     try:
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=LETTER,
-            leftMargin=36,
-            rightMargin=36,
-            topMargin=36,
-            bottomMargin=36,
-        )
-        styles = getSampleStyleSheet()
-        story = []
-
-        clinic_name = settings.PROJECT_NAME
-        export_time = datetime.utcnow()
-
-        story.append(Paragraph(clinic_name, styles["Title"]))
-        story.append(Paragraph("Patient Record Export", styles["Heading2"]))
-        story.append(
-            Paragraph(
-                f"Exported {_format_datetime(export_time)} UTC", styles["Normal"]
-            )
-        )
-        story.append(Spacer(1, 12))
-
-        story.append(Paragraph("Patient Demographics", styles["Heading3"]))
-        demographics = [
-            ["Full name", patient.full_name],
-            ["Date of birth", patient.date_of_birth or "—"],
-            ["Sex", patient.sex or "—"],
-            ["Email", patient.email or "—"],
-            ["Phone", patient.phone or "—"],
-            ["Address", patient.address or "—"],
-        ]
-        demo_table = Table(demographics, colWidths=[140, 360])
-        demo_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
-                    ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
-                    ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
-                    ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
+        for batch in patients.partitions():
+            history: dict[int, list[Appointment]] = defaultdict(list)
+            appointments = (
+                db.query(Appointment)
+                .filter(
+                    Appointment.owner_user_id == owner_user_id,
+                    Appointment.patient_id.in_([patient.id for patient in batch]),
+                )
+                .order_by(
+                    Appointment.patient_id.asc(),
+                    Appointment.appointment_datetime.asc(),
+                    Appointment.id.asc(),
+                )
             )
-        )
-        story.append(demo_table)
-        story.append(Spacer(1, 12))
-
-        story.append(Paragraph("Medical Notes", styles["Heading3"]))
-        notes_text = patient.notes or "—"
-        story.append(Paragraph(notes_text.replace("\n", "<br/>"), styles["BodyText"]))
-        story.append(Spacer(1, 12))
-
-        story.append(Paragraph("Appointment History", styles["Heading3"]))
-        table_data = [
-            [
-                "Start / End",
-                "Doctor",
-                "Department",
-                "Status",
-                "Notes",
-            ]
-        ]
-        for appointment in appointments:
-            end_time = _resolve_end_time(
-                appointment.appointment_datetime,
-                appointment.appointment_end_datetime,
-            )
-            doctor = appointment.doctor_name or "TBD"
-            table_data.append(
-                [
-                    Paragraph(
-                        _format_time_range(appointment.appointment_datetime, end_time),
-                        styles["BodyText"],
-                    ),
-                    Paragraph(doctor, styles["BodyText"]),
-                    Paragraph(appointment.department or "—", styles["BodyText"]),
-                    Paragraph(appointment.status.value, styles["BodyText"]),
-                    Paragraph(appointment.notes or "—", styles["BodyText"]),
-                ]
-            )
-        history_table = Table(table_data, colWidths=[150, 90, 90, 70, 160])
-        history_table.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                    ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
-                    ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
-                    ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
-                    ("VALIGN", (0, 0), (-1, -1), "TOP"),
-                ]
-            )
-        )
-        story.append(history_table)
+            for appointment in appointments:
+                history[appointment.patient_id].append(appointment)
+            snapshots = []
+            for patient in batch:
+                snapshots.append((patient.id, _snapshot(patient, history[patient.id])))
+                # Drop the batch from the identity map so the session stays small.
+                for row in (patient, *history[patient.id]):
+                    db.expunge(row)
+            yield from snapshots
+    finally:
+        patients.close()
+        db.close()
+
+
+def _export_job_payload(job: dict) -> dict:
+    return {
+        "job_id": job["id"],
+        "patient_id": job["patient_id"],
+        "status": job["status"],
+        "cached": job["cached"],
+        "error": job["error"],
+        "created_at": job["created_at"],
+        "download_url": (
+            f"{settings.API_V1_STR}/patients/export-jobs/{job['id']}/download"
+            if job["status"] == JOB_DONE
+            else None
+        ),
+    }
+
+
+def _pdf_response(job: dict) -> FileResponse:
+    return FileResponse(
+        job["path"],
+        media_type="application/pdf",
+        filename=f"patient_{job['patient_id']}_record.pdf",
+    )
 
-        doc.build(story)
-    except Exception as exc:  # pragma: no cover - PDF generation guardrail
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate patient record PDF.",
-        ) from exc
 
-    pdf_bytes = buffer.getvalue()
-    buffer.close()
+def _log_export(db: Session, current_user: Principal, patient: Patient, job: dict, request):
     log_event(
         db,
         current_user,
@@ -249,23 +392,91 @@ def export_patient_record(
         entity_type="patient",
         entity_id=patient.id,
         summary="Exported patient record PDF",
-        metadata={"full_name": patient.full_name},
+        metadata={"full_name": patient.full_name, "job_id": job["id"], "cached": job["cached"]},
         request=request,
     )
-    return Response(
-        content=pdf_bytes,
-        media_type="application/pdf",
-        headers={
-            "Content-Disposition": f'attachment; filename="patient_{patient.id}_record.pdf"'
-        },
-    )
+
+
+@router.post("/{patient_id}/export-jobs", status_code=status.HTTP_202_ACCEPTED)
+def create_export_job(
+    patient_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin),
+    request: Request = None,
+):
+    patient = _get_patient(db, patient_id, current_user.id)
+    snapshot = _export_snapshot(db, patient, current_user.id)
+    job = export_jobs.submit(current_user.id, patient.id, snapshot)
+    _log_export(db, current_user, patient, job, request)
+    return _export_job_payload(job)
+
+
+def _get_export_job(job_id: str, owner_user_id: int) -> dict:
+    job = export_jobs.get(job_id, owner_user_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found"
+        )
+    return job
+
+
+@router.get("/export-jobs/{job_id}")
+def get_export_job(
+    job_id: str,
+    current_user: Principal = Depends(get_current_admin),
+):
+    return _export_job_payload(_get_export_job(job_id, current_user.id))
+
+
+@router.get("/export-jobs/{job_id}/download")
+def download_export_job(
+    job_id: str,
+    current_user: Principal = Depends(get_current_admin),
+):
+    job = _get_export_job(job_id, current_user.id)
+    if job["status"] == JOB_FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=job["error"]
+        )
+    if job["status"] != JOB_DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT, detail="Export is not ready yet."
+        )
+    return _pdf_response(job)
+
+
+@router.get("/{patient_id}/export")
+def export_patient_record(
+    patient_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_admin),
+    request: Request = None,
+):
+    patient = _get_patient(db, patient_id, current_user.id)
+    snapshot = _export_snapshot(db, patient, current_user.id)
+    job = export_jobs.submit(current_user.id, patient.id, snapshot)
+    try:
+        export_jobs.wait(job, timeout=settings.EXPORT_SYNC_WAIT_SECONDS)
+    except TimeoutError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Patient record PDF is still rendering; poll the export job instead.",
+            headers={"Retry-After": "5"},
+        ) from exc
+    if job["status"] != JOB_DONE:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to generate patient record PDF.",
+        )
+    _log_export(db, current_user, patient, job, request)
+    return _pdf_response(job)
 
 
 @router.post("/", response_model=PatientResponse, status_code=status.HTTP_201_CREATED)
 def create_patient(
     payload: PatientCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     payload_data = payload.dict(exclude_unset=True)
@@ -283,8 +494,9 @@ def create_patient(
     payload_data["owner_user_id"] = current_user.id
     patient = Patient(**payload_data)
     db.add(patient)
-    db.commit()
-    db.refresh(patient)
+    db.flush()
+    track_patient_change(db, patient, 1)
+    index_patient(db, patient)
     log_event(
         db,
         current_user,
@@ -294,7 +506,10 @@ def create_patient(
         summary=f"Created patient {patient.full_name}",
         metadata={"full_name": patient.full_name, "email": patient.email},
         request=request,
+        commit=False,
     )
+    db.commit()
+    db.refresh(patient)
     return patient
 
 
@@ -303,7 +518,7 @@ def update_patient(
     patient_id: int,
     payload: PatientUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     patient = _get_patient(db, patient_id, current_user.id)
@@ -320,8 +535,7 @@ def update_patient(
     for field, value in payload_data.items():
         setattr(patient, field, value)
     db.add(patient)
-    db.commit()
-    db.refresh(patient)
+    index_patient(db, patient)
     log_event(
         db,
         current_user,
@@ -331,7 +545,11 @@ def update_patient(
         summary=f"Updated patient {patient.full_name}",
         metadata=metadata,
         request=request,
+        commit=False,
     )
+    db.commit()
+    export_jobs.purge_patient(current_user.id, patient.id)
+    db.refresh(patient)
     return patient
 
 
@@ -340,7 +558,7 @@ def update_patient_notes(
     patient_id: int,
     payload: PatientNotesUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     patient = _get_patient(db, patient_id, current_user.id)
@@ -349,8 +567,6 @@ def update_patient_notes(
     if "notes" in update_data:
         patient.notes = update_data["notes"]
     db.add(patient)
-    db.commit()
-    db.refresh(patient)
     log_event(
         db,
         current_user,
@@ -360,7 +576,11 @@ def update_patient_notes(
         summary=f"Updated patient {patient.full_name}",
         metadata=metadata,
         request=request,
+        commit=False,
     )
+    db.commit()
+    export_jobs.purge_patient(current_user.id, patient.id)
+    db.refresh(patient)
     return patient
 
 
@@ -368,19 +588,24 @@ def update_patient_notes(
 def delete_patient(
     patient_id: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin),
+    current_user: Principal = Depends(get_current_admin),
     request: Request = None,
 ):
     patient = _get_patient(db, patient_id, current_user.id)
+    track_patient_deleted(db, patient)
+    unindex_patient(db, patient.id)
     db.delete(patient)
-    db.commit()
     log_event(
         db,
         current_user,
         action="patient.delete",
         entity_type="patient",
-        entity_id=patient.id,
+        entity_id=patient_id,
         summary=f"Deleted patient {patient.full_name}",
         metadata={"full_name": patient.full_name, "email": patient.email},
         request=request,
+        commit=False,
     )
+    db.commit()
+    export_jobs.purge_patient(current_user.id, patient_id)
+    overlap_index.invalidate(current_user.id)
@@ -4,19 +4,22 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
-from app.core.security import (
-    get_current_active_user,
-    get_current_admin,
-    get_password_hash,
-    verify_password,
-)
+from app.core.password_pool import hash_password_pooled, verify_password_pooled
+from app.core.principal_cache import Principal, invalidate_principal
+from app.core.security import get_current_admin, get_current_user_record
 from app.db.session import get_db
 from app.models.appointment import Appointment
 from app.models.audit_log import AuditLog
+from app.models.email_outbox import EmailOutbox
 from app.models.patient import Patient
 from app.models.user import User
 from app.schemas.user import PasswordChange, UserProfileUpdate, UserResponse, UserUpdate
+from app.services.appointment_overlap import overlap_index
+from app.services.audit_archive import purge_owner_archives
 from app.services.audit_log import log_event
+from app.services.dashboard_rollups import clear_owner_rollups
+from app.services.export_jobs import export_jobs
+from app.services.patient_search import rebuild_owner_search_index
 
 router = APIRouter(prefix="/users", tags=["users"])
 logger = logging.getLogger("medyra.account")
@@ -24,7 +27,7 @@ logger = logging.getLogger("medyra.account")
 
 @router.get("/me", response_model=UserResponse)
 def read_current_user(
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
 ) -> User:
     return current_user
 
@@ -33,13 +36,11 @@ def read_current_user(
 def update_me(
     payload: UserProfileUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
     request: Request = None,
 ):
     changed_fields = _apply_profile_update(payload, current_user)
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
     if changed_fields:
         log_event(
             db,
@@ -50,7 +51,11 @@ def update_me(
             summary="Profile updated",
             metadata={"changed_fields": changed_fields},
             request=request,
+            commit=False,
         )
+    db.commit()
+    invalidate_principal(current_user.id)
+    db.refresh(current_user)
     return current_user
 
 
@@ -58,13 +63,11 @@ def update_me(
 def patch_me(
     payload: UserProfileUpdate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
     request: Request = None,
 ):
     changed_fields = _apply_profile_update(payload, current_user)
     db.add(current_user)
-    db.commit()
-    db.refresh(current_user)
     if changed_fields:
         log_event(
             db,
@@ -75,14 +78,18 @@ def patch_me(
             summary="Profile updated",
             metadata={"changed_fields": changed_fields},
             request=request,
+            commit=False,
         )
+    db.commit()
+    invalidate_principal(current_user.id)
+    db.refresh(current_user)
     return current_user
 
 
 @router.delete("/me", status_code=status.HTTP_204_NO_CONTENT)
 def delete_me(
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
 ):
     if not settings.ENABLE_ACCOUNT_DELETION:
         raise HTTPException(
@@ -93,6 +100,7 @@ def delete_me(
     logger.warning(
         "Account deletion requested for user_id=%s", current_user.id
     )
+    user_id = current_user.id
 
     try:
         db.query(Appointment).filter(
@@ -104,10 +112,19 @@ def delete_me(
         db.query(AuditLog).filter(
             AuditLog.owner_user_id == current_user.id
         ).delete(synchronize_session=False)
+        purge_owner_archives(db, current_user.id)
+        db.query(EmailOutbox).filter(
+            EmailOutbox.owner_user_id == current_user.id
+        ).delete(synchronize_session=False)
+        clear_owner_rollups(db, current_user.id)
+        rebuild_owner_search_index(db, current_user.id)
         db.query(User).filter(User.id == current_user.id).delete(
             synchronize_session=False
         )
+        overlap_index.invalidate(current_user.id)
         db.commit()
+        export_jobs.purge_owner(user_id)
+        invalidate_principal(user_id)
     except Exception as exc:
         db.rollback()
         logger.exception("Account deletion failed for user_id=%s", current_user.id)
@@ -162,14 +179,13 @@ def _apply_password_change(
     current_user: User,
     request: Request,
 ):
-    if not verify_password(payload.old_password, current_user.hashed_password):
+    if not verify_password_pooled(payload.old_password, current_user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Old password is incorrect",
         )
-    current_user.hashed_password = get_password_hash(payload.new_password)
+    current_user.hashed_password = hash_password_pooled(payload.new_password)
     db.add(current_user)
-    db.commit()
     log_event(
         db,
         current_user,
@@ -178,7 +194,10 @@ def _apply_password_change(
         entity_id=current_user.id,
         summary="Password changed",
         request=request,
+        commit=False,
     )
+    db.commit()
+    invalidate_principal(current_user.id)
     return {"detail": "Password updated successfully"}
 
 
@@ -186,7 +205,7 @@ def _apply_password_change(
 def change_password_post(
     payload: PasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
     request: Request = None,
 ):
     return _apply_password_change(payload, db, current_user, request)
@@ -196,7 +215,7 @@ def change_password_post(
 def change_password_put(
     payload: PasswordChange,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user),
+    current_user: User = Depends(get_current_user_record),
     request: Request = None,
 ):
     return _apply_password_change(payload, db, current_user, request)
@@ -205,7 +224,7 @@ def change_password_put(
 @router.get("/", response_model=list[UserResponse])
 def list_users(
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_admin),
+    _: Principal = Depends(get_current_admin),
 ):
     return db.query(User).all()
 
@@ -214,7 +233,7 @@ def list_users(
 def get_user(
     user_id: int,
     db: Session = Depends(get_db),
-    _: User = Depends(get_current_admin),
+    _: Principal = Depends(get_current_admin),
 ):
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
@@ -22,7 +22,42 @@ class Settings(BaseSettings):
     RESEND_API_KEY: str | None = None
     EMAIL_FROM: str = "onboarding@resend.dev"
     EMAIL_ENABLED: bool = False
+    EMAIL_TIMEOUT_SECONDS: int = 10
+    SMTP_POOL_SIZE: int = 4
+    SMTP_POOL_NOOP_AFTER_SECONDS: int = 30
+    SMTP_POOL_MAX_IDLE_SECONDS: int = 240
+    RESEND_POOL_SIZE: int = 10
+    RESEND_RATE_PER_SECOND: float = 10.0
+    SMTP_RATE_PER_SECOND: float = 20.0
+    SMS_ENABLED: bool = False
+    SMS_PROVIDER: str = "dev"
+    SMS_FROM: str | None = None
+    SMS_API_KEY: str | None = None
+    SMS_HTTP_URL: str | None = None
+    SMS_STUB_PATH: str = "sms_outbox.jsonl"
+    SMS_BATCH_SIZE: int = 50
+    SMS_WORKERS: int = 4
+    SMS_RATE_PER_SECOND: float = 10.0
+    SMS_TIMEOUT_SECONDS: int = 10
+    EMAIL_OUTBOX_POLL_SECONDS: int = 10
+    EMAIL_OUTBOX_BATCH_SIZE: int = 50
+    EMAIL_OUTBOX_WORKERS: int = 4
+    EMAIL_OUTBOX_MAX_ATTEMPTS: int = 6
+    EMAIL_OUTBOX_BACKOFF_SECONDS: int = 30
+    EMAIL_OUTBOX_MAX_BACKOFF_SECONDS: int = 3600
+    EMAIL_OUTBOX_LEASE_SECONDS: int = 120
+    EMAIL_OUTBOX_RETENTION_DAYS: int = 30
     ENABLE_EMAIL_OTP: bool = False
+    AUDIT_LOG_WRITE_BEHIND: bool = False
+    DASHBOARD_CACHE_TTL_SECONDS: int = 60
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 15
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 4096
+    TOKEN_CACHE_MAX_ENTRIES: int = 4096
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+    DASHBOARD_CACHE_MAX_ENTRIES: int = 1024
+    AUDIT_LOG_BATCH_SIZE: int = 200
+    AUDIT_LOG_FLUSH_SECONDS: float = 1.0
+    AUDIT_LOG_QUEUE_SIZE: int = 10000
     ENABLE_DEV_AUTH_BYPASS: bool = False
     ENABLE_DEMO_RESET: bool = False
     ENABLE_ACCOUNT_DELETION: bool = False
@@ -30,13 +65,41 @@ class Settings(BaseSettings):
     DEMO_MODE: bool = True
     MAX_LOGIN_ATTEMPTS: int = 5
     LOGIN_LOCK_MINUTES: int = 15
+    LOGIN_GUARD_MAX_ENTRIES: int = 10000
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 16
     ENV: str = "development"
     CSP_ENABLED: bool = True
     HSTS_ENABLED: bool = False
     REMINDER_HOURS_BEFORE: int = 24
     REMINDER_WINDOW_HOURS: int = 24
     REMINDER_LOOKAHEAD_MINUTES: int = 5
+    REMINDER_POLL_SECONDS: int = 30
+    REMINDER_BATCH_SIZE: int = 500
+    REMINDER_RETRY_MINUTES: int = 5
+    REMINDER_MAX_RETRY_MINUTES: int = 60
+    REMINDER_LEASE_SECONDS: int = 120
+    REMINDER_SEND_WORKERS: int = 8
+    RUN_SCHEDULER_IN_WEB: bool = True
+    SCHEDULER_JOBSTORE_URL: str = ""
+    SCHEDULER_MISFIRE_GRACE_SECONDS: int = 60
+    SCHEDULER_LOCK_RETRY_SECONDS: int = 15
+    EXPORT_CACHE_DIR: str = "export_cache"
+    EXPORT_PROCESS_WORKERS: int = 2
+    EXPORT_JOB_TTL_SECONDS: int = 3600
+    EXPORT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    EXPORT_SYNC_WAIT_SECONDS: int = 60
+    EXPORT_BULK_BATCH_SIZE: int = 200
     APPOINTMENT_DEFAULT_DURATION_MINUTES: int = 30
+    APPOINTMENT_MAX_DURATION_MINUTES: int = 1440
+    APPOINTMENT_OVERLAP_INDEX_ENABLED: bool = False
+    PAGINATION_EXACT_COUNT_LIMIT: int = 10000
+    STREAM_CHUNK_SIZE: int = 500
+    AUDIT_RETENTION_MONTHS: int = 12
+    AUDIT_ARCHIVE_DIR: str = "audit_archive"
+    AUDIT_ARCHIVE_DELETE_BATCH: int = 5000
+    AUDIT_PARTITION_MONTHS_AHEAD: int = 2
+    AUDIT_RETENTION_POLL_SECONDS: int = 24 * 3600
     ADMIN_DEFAULT_EMAIL: str = "admin@meditrack.com"
     ADMIN_DEFAULT_PASSWORD: str = "ChangeMe123!"
 
@@ -0,0 +1,138 @@
+import base64
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import func, literal_column, or_, select, text
+from sqlalchemy.orm import Query, Session
+
+from app.core.config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+TOTAL_COUNT_HEADER = "X-Total-Count"
+TOTAL_ESTIMATED_HEADER = "X-Total-Count-Estimated"
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    raw = json.dumps([sort_value.isoformat(), row_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        ) from exc
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Opaque cursor for ranked results, which have no stable sort key to seek on."""
+    raw = json.dumps({"offset": offset}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_offset_cursor(cursor: str | None) -> int:
+    if not cursor:
+        return 0
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded))["offset"])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        ) from exc
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor.",
+        )
+    return offset
+
+
+def apply_keyset(query: Query, sort_column, id_column, cursor: str | None, descending: bool) -> Query:
+    """Order ``query`` by (sort_column, id_column) and seek past ``cursor``."""
+    if cursor:
+        sort_value, row_id = decode_cursor(cursor)
+        # Written as ``sort <= v AND (sort < v OR id < r)`` rather than
+        # ``sort < v OR (sort = v AND id < r)``: the leading range bound lets
+        # the planner seek into the (owner, sort, id) index instead of
+        # walking it from the start.
+        if descending:
+            query = query.filter(
+                sort_column <= sort_value,
+                or_(sort_column < sort_value, id_column < row_id),
+            )
+        else:
+            query = query.filter(
+                sort_column >= sort_value,
+                or_(sort_column > sort_value, id_column > row_id),
+            )
+    if descending:
+        return query.order_by(sort_column.desc(), id_column.desc())
+    return query.order_by(sort_column.asc(), id_column.asc())
+
+
+def fetch_page(query: Query, limit: int, sort_attr: str) -> tuple[list, str | None]:
+    """Fetch ``limit`` rows plus one to detect whether another page exists."""
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, encode_cursor(getattr(last, sort_attr), last.id)
+
+
+def _estimate_rows(db: Session, query: Query) -> int | None:
+    statement = query.statement.compile(
+        dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+    )
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {statement}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def count_rows(db: Session, query: Query) -> tuple[int, bool]:
+    """Return ``(count, is_estimate)`` for ``query``.
+
+    Counts exactly up to ``PAGINATION_EXACT_COUNT_LIMIT`` rows. Past that the
+    Postgres planner estimate is used; other databases report the limit as a
+    lower bound.
+    """
+    threshold = settings.PAGINATION_EXACT_COUNT_LIMIT
+    bounded = (
+        query.order_by(None)
+        .with_entities(literal_column("1"))
+        .limit(threshold + 1)
+        .subquery()
+    )
+    exact = db.execute(select(func.count()).select_from(bounded)).scalar() or 0
+    if exact <= threshold:
+        return exact, False
+    if db.get_bind().dialect.name == "postgresql":
+        estimate = _estimate_rows(db, query.order_by(None))
+        if estimate is not None:
+            return max(estimate, exact), True
+    return exact, True
+
+
+def set_page_headers(
+    response: Response,
+    next_cursor: str | None,
+    total: tuple[int, bool] | None = None,
+) -> None:
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    if total is not None:
+        count, is_estimate = total
+        response.headers[TOTAL_COUNT_HEADER] = str(count)
+        response.headers[TOTAL_ESTIMATED_HEADER] = "true" if is_estimate else "false"
@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.principal_cache import TTLCache
+from app.core.security import get_password_hash, verify_password
+
+
+class PasswordHashPool:
+    """Dedicated, bounded executor for bcrypt work.
+
+    bcrypt releases the GIL, so a small thread pool gives real parallelism
+    without borrowing the AnyIO worker threads that serve other endpoints.
+    Async endpoints await ``run_async`` so a request waiting on a hash holds
+    neither an AnyIO thread nor the event loop. Once ``max_pending`` calls are
+    running or queued, new callers are turned away with a 503 instead of
+    piling up behind a credential-stuffing burst.
+    """
+
+    def __init__(self, workers: int, max_pending: int) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="password-hash"
+        )
+        self._max_pending = max(1, max_pending)
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._pending >= self._max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Authentication is busy. Please retry shortly.",
+                    headers={"Retry-After": "1"},
+                )
+            self._pending += 1
+
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def run(self, func, *args):
+        self._acquire()
+        try:
+            return self._executor.submit(func, *args).result()
+        finally:
+            self._release()
+
+    async def run_async(self, func, *args):
+        self._acquire()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._release()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHashPool(
+    settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_MAX_PENDING
+)
+
+
+def verify_password_pooled(plain_password: str, hashed_password: str) -> bool:
+    return password_pool.run(verify_password, plain_password, hashed_password)
+
+
+def hash_password_pooled(password: str) -> str:
+    return password_pool.run(get_password_hash, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_pool.run_async(verify_password, plain_password, hashed_password)
+
+
+async def hash_password_async(password: str) -> str:
+    return await password_pool.run_async(get_password_hash, password)
+
+
+class LoginGuard:
+    """In-memory lockout mirror consulted before any database or bcrypt work.
+
+    Keeps, per normalized email, the lock expiry already written to the
+    ``users`` row plus a short-window failure count, so repeated attempts
+    against a locked account are refused without touching the database.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self._locks = TTLCache(max_entries, ttl=settings.LOGIN_LOCK_MINUTES * 60)
+        self._failures = TTLCache(max_entries, ttl=settings.LOGIN_LOCK_MINUTES * 60)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(email: str) -> str:
+        return email.strip().lower()
+
+    def check(self, email: str) -> None:
+        locked_until = self._locks.get(self._key(email))
+        if locked_until is not None and locked_until > time.time():
+            raise HTTPException(
+                status_code=status.HTTP_423_LOCKED,
+                detail="Account temporarily locked. Try again later.",
+            )
+
+    def record_lock(self, email: str, locked_until_epoch: float) -> None:
+        ttl = locked_until_epoch - time.time()
+        if ttl > 0:
+            self._locks.set(self._key(email), locked_until_epoch, ttl=ttl)
+
+    def record_failure(self, email: str) -> int:
+        """Count a failed attempt for an email with no account row to lock."""
+        key = self._key(email)
+        with self._lock:
+            failures = (self._failures.get(key) or 0) + 1
+            self._failures.set(key, failures)
+        if failures >= settings.MAX_LOGIN_ATTEMPTS:
+            self.record_lock(email, time.time() + settings.LOGIN_LOCK_MINUTES * 60)
+            self._failures.pop(key)
+        return failures
+
+    def clear(self, email: str) -> None:
+        key = self._key(email)
+        self._locks.pop(key)
+        self._failures.pop(key)
+
+    def reset(self) -> None:
+        self._locks.clear()
+        self._failures.clear()
+
+
+login_guard = LoginGuard(settings.LOGIN_GUARD_MAX_ENTRIES)
@@ -0,0 +1,97 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import settings
+from app.models.user import UserRole
+
+
+class Principal:
+    """Slim, session-independent view of the authenticated user.
+
+    Most routers only need ``id`` and ``role``; endpoints that edit the
+    account load the full row with ``get_current_user_record``.
+    """
+
+    __slots__ = ("id", "email", "full_name", "role")
+
+    def __init__(self, id: int, email: str, full_name: str, role: UserRole) -> None:
+        self.id = id
+        self.email = email
+        self.full_name = full_name
+        self.role = role
+
+    def __repr__(self) -> str:
+        return f"Principal(id={self.id!r}, role={self.role!r})"
+
+
+class TTLCache:
+    """Thread-safe LRU map whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Any, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, now: float | None = None) -> Any | None:
+        current = time.monotonic() if now is None else now
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= current:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: Any, value: Any, ttl: float | None = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: Any) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+principal_cache = TTLCache(
+    settings.PRINCIPAL_CACHE_MAX_ENTRIES, settings.PRINCIPAL_CACHE_TTL_SECONDS
+)
+token_cache = TTLCache(settings.TOKEN_CACHE_MAX_ENTRIES, settings.TOKEN_CACHE_TTL_SECONDS)
+
+
+def token_cache_key(token: str) -> bytes:
+    # Keyed by digest so raw bearer tokens are not kept in memory.
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop ``user_id`` from this process's cache.
+
+    Other worker processes keep their copy until it expires, so a role change
+    or deletion is only guaranteed everywhere after
+    ``PRINCIPAL_CACHE_TTL_SECONDS``.
+    """
+    principal_cache.pop(user_id)
+
+
+def clear_auth_caches() -> None:
+    principal_cache.clear()
+    token_cache.clear()
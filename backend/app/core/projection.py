@@ -0,0 +1,37 @@
+"""Sparse fieldsets for list endpoints (``?fields=id,full_name,phone``).
+
+Endpoints load only the requested columns with ``load_only`` and return
+plain dicts, which response models declared with ``exclude_unset`` serialise
+without the fields that were not selected.
+"""
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import load_only
+
+
+def parse_fields(
+    fields: str | None,
+    allowed: tuple[str, ...],
+    default: tuple[str, ...],
+) -> tuple[str, ...]:
+    """Validate a comma-separated ``fields`` value; ``id`` is always included."""
+    if not fields:
+        return default
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(requested) - set(allowed))
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}.",
+        )
+    return tuple(dict.fromkeys(["id", *requested]))
+
+
+def load_columns(model, names):
+    """``load_only`` option for the column attributes among ``names``."""
+    columns = model.__table__.columns
+    return load_only(*(getattr(model, name) for name in dict.fromkeys(names) if name in columns))
+
+
+def project(instance, fields: tuple[str, ...]) -> dict:
+    return {name: getattr(instance, name) for name in fields}
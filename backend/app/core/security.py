@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta, timezone
 from typing import Annotated
 
@@ -8,6 +9,13 @@ from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.principal_cache import (
+    Principal,
+    invalidate_principal,
+    principal_cache,
+    token_cache,
+    token_cache_key,
+)
 from app.db.session import get_db
 from app.models.user import User, UserRole
 
@@ -44,35 +52,81 @@ def decode_token(token: str) -> dict:
         ) from exc
 
 
+def _decode_cached(token: str) -> dict:
+    """Decode ``token``, skipping signature verification for recently seen tokens."""
+    key = token_cache_key(token)
+    payload = token_cache.get(key)
+    if payload is not None and payload.get("exp", 0) > time.time():
+        return payload
+    payload = decode_token(token)
+    ttl = settings.TOKEN_CACHE_TTL_SECONDS
+    if "exp" in payload:
+        ttl = min(ttl, payload["exp"] - time.time())
+    if ttl > 0:
+        token_cache.set(key, payload, ttl=ttl)
+    return payload
+
+
+def _load_principal(db: Session, user_id: int) -> Principal | None:
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    row = (
+        db.query(User.id, User.email, User.full_name, User.role)
+        .filter(User.id == user_id)
+        .first()
+    )
+    if row is None:
+        return None
+    principal = Principal(*row)
+    principal_cache.set(user_id, principal)
+    return principal
+
+
 async def get_current_user(
     token: Annotated[str, Depends(oauth2_scheme)],
     db: Annotated[Session, Depends(get_db)],
-) -> User:
-    payload = decode_token(token)
+) -> Principal:
+    payload = _decode_cached(token)
     user_id = payload.get("sub")
     if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid authentication credentials",
         )
-    user = db.query(User).filter(User.id == int(user_id)).first()
-    if not user:
+    principal = _load_principal(db, int(user_id))
+    if not principal:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
-    return user
+    return principal
 
 
 async def get_current_active_user(
-    current_user: Annotated[User, Depends(get_current_user)]
-) -> User:
+    current_user: Annotated[Principal, Depends(get_current_user)]
+) -> Principal:
     return current_user
 
 
-async def get_current_admin(
-    current_user: Annotated[User, Depends(get_current_active_user)]
+async def get_current_user_record(
+    current_user: Annotated[Principal, Depends(get_current_active_user)],
+    db: Annotated[Session, Depends(get_db)],
 ) -> User:
+    """Full ``User`` row for endpoints that read or modify the account itself."""
+    user = db.query(User).filter(User.id == current_user.id).first()
+    if not user:
+        invalidate_principal(current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found",
+        )
+    return user
+
+
+async def get_current_admin(
+    current_user: Annotated[Principal, Depends(get_current_active_user)]
+) -> Principal:
     if current_user.role != UserRole.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
@@ -0,0 +1,89 @@
+"""Streamed list responses (``?stream=json`` or ``?stream=ndjson``).
+
+A streamed list selects plain columns instead of ORM entities, so rows never
+enter a session's identity map. It reads them through a server-side cursor
+(``stream_results`` with ``yield_per``) and encodes each partition as soon as
+it arrives. Memory is therefore bounded by ``STREAM_CHUNK_SIZE`` rows, not by
+the size of the tenant.
+
+The cursor runs on its own connection. FastAPI closes the request session
+before a ``StreamingResponse`` body is sent.
+"""
+
+from itertools import chain, islice
+from typing import Callable, Iterable, Iterator, Literal
+
+import orjson
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query
+
+from app.core.config import settings
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+StreamFormat = Literal["json", "ndjson"]
+
+
+def _dumps(row: dict) -> bytes:
+    return orjson.dumps(row, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+def iter_partitions(bind, statement, chunk_size: int) -> Iterator[list]:
+    with bind.connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=chunk_size
+        ).execute(statement)
+        yield from result.partitions()
+
+
+def _batched(rows: Iterable[dict], size: int) -> Iterator[list[dict]]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def encode_stream(
+    partitions: Iterator[list],
+    fmt: StreamFormat,
+    transform: Callable[[dict], dict] | None = None,
+) -> Iterator[bytes]:
+    """Encode row partitions as one JSON array or as newline-delimited JSON.
+
+    Partitions hold result rows or plain dicts.
+    """
+    if fmt == "json":
+        yield b"["
+    separator = b""
+    for partition in partitions:
+        rows = (row if isinstance(row, dict) else row._asdict() for row in partition)
+        encoded = [_dumps(transform(row) if transform else row) for row in rows]
+        if fmt == "json":
+            yield separator + b",".join(encoded)
+            separator = b","
+        else:
+            yield b"\n".join(encoded) + b"\n"
+    if fmt == "json":
+        yield b"]"
+
+
+def stream_query(
+    query: Query,
+    columns: list,
+    fmt: StreamFormat,
+    transform: Callable[[dict], dict] | None = None,
+    tail: Iterable[dict] | None = None,
+) -> StreamingResponse:
+    """Stream every row of ``query`` as ``columns``; filters and ordering are kept.
+
+    ``tail`` rows, already in order, are sent after the query's rows.
+    """
+    statement = query.with_entities(*columns).statement
+    partitions = iter_partitions(
+        query.session.get_bind(), statement, settings.STREAM_CHUNK_SIZE
+    )
+    if tail is not None:
+        partitions = chain(partitions, _batched(tail, settings.STREAM_CHUNK_SIZE))
+    return StreamingResponse(
+        encode_stream(partitions, fmt, transform),
+        media_type="application/json" if fmt == "json" else NDJSON_MEDIA_TYPE,
+    )
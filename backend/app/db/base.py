@@ -1,6 +1,8 @@
 from app.db.session import Base  # noqa
-from app.models.audit_log import AuditLog  # noqa
+from app.models.audit_log import AuditLog, AuditLogArchive  # noqa
 from app.models.appointment import Appointment  # noqa
+from app.models.dashboard_rollup import AppointmentDailyRollup, PatientDailyRollup  # noqa
+from app.models.email_outbox import EmailOutbox  # noqa
 from app.models.patient import Patient  # noqa
 from app.models.signup_otp import SignupOtp  # noqa
 from app.models.user import User  # noqa
@@ -23,12 +23,22 @@ from app.api.v1 import (
 )
 from app.core.config import settings
 from app.core.limiter import limiter
+from app.core.pagination import (
+    NEXT_CURSOR_HEADER,
+    TOTAL_COUNT_HEADER,
+    TOTAL_ESTIMATED_HEADER,
+)
 from app.core.security import get_password_hash
 from app.db import base  # noqa: F401 ensures models imported
 from app.db.session import SessionLocal, engine
 from app.middleware.security_headers import SecurityHeadersMiddleware
 from app.models.user import User, UserRole
-from app.services.reminder_service import scheduler
+from app.services.audit_log import audit_writer
+from app.services.email_transport import close_transports
+from app.services.export_jobs import EXPORT_ID_HEADER, export_jobs
+from app.services.patient_search import ensure_search_index
+from app.services.scheduler import scheduler
+from app.services.sms import close_sms_provider
 
 logger = logging.getLogger("meditrack")
 
@@ -46,6 +56,10 @@ def ensure_schema_columns():
         "appointments": [
             ("appointment_end_datetime", DateTime()),
             ("reminder_sent_at", DateTime()),
+            ("reminder_email_sent_at", DateTime()),
+            ("reminder_sms_sent_at", DateTime()),
+            ("reminder_locked_until", DateTime()),
+            ("reminder_locked_by", String(64)),
             ("owner_user_id", Integer()),
         ],
         "users": [
@@ -100,6 +114,7 @@ async def lifespan(app: FastAPI):
     try:
         base.Base.metadata.create_all(bind=engine)
         ensure_schema_columns()
+        ensure_search_index(engine)
         create_default_admin()
     except Exception as exc:  # pragma: no cover - keeps app booting during migrations/tests
         logger.warning("Database bootstrap skipped: %s", exc)
@@ -107,11 +122,15 @@ async def lifespan(app: FastAPI):
         logger.warning(
             "WARNING: DEMO/DEV BYPASS ENABLED — DO NOT USE IN PRODUCTION"
         )
-    if not scheduler.running:
+    if settings.RUN_SCHEDULER_IN_WEB and not scheduler.running:
         scheduler.start()
     yield
     if scheduler.running:
         scheduler.shutdown()
+    audit_writer.stop()
+    close_transports()
+    close_sms_provider()
+    export_jobs.shutdown()
 
 
 app = FastAPI(
@@ -168,6 +187,13 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[
+        "X-Request-ID",
+        NEXT_CURSOR_HEADER,
+        TOTAL_COUNT_HEADER,
+        TOTAL_ESTIMATED_HEADER,
+        EXPORT_ID_HEADER,
+    ],
 )
 
 app.include_router(auth.router, prefix=settings.API_V1_STR)
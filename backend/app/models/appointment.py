@@ -1,7 +1,17 @@
 from datetime import datetime
 from enum import Enum as PyEnum
 
-from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Boolean,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
 from sqlalchemy.orm import relationship
 
 from app.db.session import Base
@@ -17,6 +27,27 @@ class AppointmentStatus(str, PyEnum):
 
 class Appointment(Base):
     __tablename__ = "appointments"
+    __table_args__ = (
+        Index(
+            "ix_appointments_owner_status_start",
+            "owner_user_id",
+            "status",
+            "appointment_datetime",
+        ),
+        Index(
+            "ix_appointments_owner_start_id",
+            "owner_user_id",
+            "appointment_datetime",
+            "id",
+        ),
+        Index(
+            "ix_appointments_patient_start_id",
+            "patient_id",
+            "appointment_datetime",
+            "id",
+        ),
+        Index("ix_appointments_reminder_next_run_at", "reminder_next_run_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
@@ -26,11 +57,16 @@ class Appointment(Base):
     appointment_datetime = Column(DateTime, nullable=False)
     appointment_end_datetime = Column(DateTime, nullable=True)
     reminder_sent_at = Column(DateTime, nullable=True)
+    reminder_email_sent_at = Column(DateTime, nullable=True)
+    reminder_sms_sent_at = Column(DateTime, nullable=True)
     reminder_email_enabled = Column(Boolean, nullable=False, default=False)
     reminder_sms_enabled = Column(Boolean, nullable=False, default=False)
     reminder_email_minutes_before = Column(Integer, nullable=False, default=1440)
     reminder_sms_minutes_before = Column(Integer, nullable=False, default=120)
     reminder_next_run_at = Column(DateTime, nullable=True)
+    reminder_locked_until = Column(DateTime, nullable=True)
+    reminder_locked_by = Column(String(64), nullable=True)
+    email_sequence = Column(Integer, nullable=False, default=0, server_default="0")
     notes = Column(Text, nullable=True)
     status = Column(
         Enum(AppointmentStatus),
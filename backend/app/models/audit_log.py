@@ -1,11 +1,23 @@
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import (
+    Column,
+    Date,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+    UniqueConstraint,
+)
 
 from app.db.session import Base
 
 
 class AuditLog(Base):
+    # On Postgres the table is range-partitioned by month with a primary key
+    # of (id, created_at) (migration 0020); ``id`` alone stays unique.
     __tablename__ = "audit_logs"
 
     id = Column(Integer, primary_key=True, index=True)
@@ -14,12 +26,61 @@ class AuditLog(Base):
         default=lambda: datetime.now(timezone.utc),
         nullable=False,
     )
-    owner_user_id = Column(Integer, ForeignKey("users.id"), index=True, nullable=False)
-    action = Column(String, index=True, nullable=False)
-    entity_type = Column(String, index=True, nullable=False)
-    entity_id = Column(Integer, index=True, nullable=True)
+    owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    action = Column(String, nullable=False)
+    entity_type = Column(String, nullable=False)
+    entity_id = Column(Integer, nullable=True)
     summary = Column(String, nullable=True)
     metadata_json = Column(Text, nullable=True)
     ip_address = Column(String, nullable=True)
     user_agent = Column(String, nullable=True)
     request_id = Column(String, index=True, nullable=True)
+
+
+# Every audit query is scoped to one owner and pages newest first, so each
+# index leads with ``owner_user_id`` and ends in the (created_at, id) keyset.
+Index(
+    "ix_audit_logs_owner_created_id",
+    AuditLog.owner_user_id,
+    AuditLog.created_at.desc(),
+    AuditLog.id.desc(),
+)
+Index(
+    "ix_audit_logs_owner_entity_type_created_id",
+    AuditLog.owner_user_id,
+    AuditLog.entity_type,
+    AuditLog.created_at.desc(),
+    AuditLog.id.desc(),
+)
+Index(
+    "ix_audit_logs_owner_action_created_id",
+    AuditLog.owner_user_id,
+    AuditLog.action,
+    AuditLog.created_at.desc(),
+    AuditLog.id.desc(),
+)
+Index(
+    "ix_audit_logs_owner_entity_id_created_id",
+    AuditLog.owner_user_id,
+    AuditLog.entity_id,
+    AuditLog.created_at.desc(),
+    AuditLog.id.desc(),
+)
+
+
+class AuditLogArchive(Base):
+    """One owner's archived month of audit rows (gzipped NDJSON, newest first)."""
+
+    __tablename__ = "audit_log_archives"
+    __table_args__ = (
+        UniqueConstraint("owner_user_id", "month", name="uq_audit_log_archives_owner_month"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    owner_user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    month = Column(Date, nullable=False)
+    path = Column(String, nullable=False)
+    row_count = Column(Integer, nullable=False)
+    newest_at = Column(DateTime(timezone=True), nullable=True)
+    oldest_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Date, ForeignKey, Integer, String
+
+from app.db.session import Base
+
+
+class AppointmentDailyRollup(Base):
+    __tablename__ = "appointment_daily_rollups"
+
+    owner_user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+class PatientDailyRollup(Base):
+    __tablename__ = "patient_daily_rollups"
+
+    owner_user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
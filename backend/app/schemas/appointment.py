@@ -3,7 +3,7 @@ from enum import Enum
 
 from pydantic import BaseModel
 
-from app.schemas.patient import PatientResponse
+from app.schemas.patient import PatientResponse, PatientSummary
 
 
 class AppointmentStatus(str, Enum):
@@ -49,9 +49,44 @@ class AppointmentResponse(AppointmentBase):
     id: int
     patient: PatientResponse | None = None
     reminder_sent_at: datetime | None = None
+    reminder_email_sent_at: datetime | None = None
+    reminder_sms_sent_at: datetime | None = None
     reminder_next_run_at: datetime | None = None
     created_at: datetime
 
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class AppointmentSummary(BaseModel):
+    """List-view shape with a slim nested patient; ``fields`` can narrow it."""
+
+    id: int
+    patient_id: int | None = None
+    patient: PatientSummary | None = None
+    doctor_name: str | None = None
+    department: str | None = None
+    appointment_datetime: datetime | None = None
+    appointment_end_datetime: datetime | None = None
+    notes: str | None = None
+    status: AppointmentStatus | None = None
+    reminder_email_enabled: bool | None = None
+    reminder_sms_enabled: bool | None = None
+    reminder_email_minutes_before: int | None = None
+    reminder_sms_minutes_before: int | None = None
+    reminder_sent_at: datetime | None = None
+    reminder_email_sent_at: datetime | None = None
+    reminder_sms_sent_at: datetime | None = None
+    reminder_next_run_at: datetime | None = None
+    created_at: datetime | None = None
+
+
+APPOINTMENT_FIELDS = tuple(AppointmentSummary.model_fields)
+
+
+class NormalizedAppointments(BaseModel):
+    """Appointments referencing ``patient_id`` plus each distinct patient once."""
+
+    appointments: list[AppointmentSummary]
+    patients: list[PatientSummary]
@@ -47,3 +47,35 @@ class PatientResponse(PatientBase):
     class Config:
         orm_mode = True
         from_attributes = True
+
+
+class PatientSummary(BaseModel):
+    """List-view shape; the Text blobs appear only when requested via ``fields``."""
+
+    id: int
+    full_name: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    date_of_birth: date | None = None
+    sex: str | None = None
+    phone: str | None = None
+    email: str | None = None
+    created_at: datetime | None = None
+    address: str | None = None
+    medical_history: str | None = None
+    medications: str | None = None
+    notes: str | None = None
+
+
+PATIENT_FIELDS = tuple(PatientSummary.model_fields)
+PATIENT_SUMMARY_FIELDS = (
+    "id",
+    "full_name",
+    "first_name",
+    "last_name",
+    "date_of_birth",
+    "sex",
+    "phone",
+    "email",
+    "created_at",
+)
@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import Counter, OrderedDict, defaultdict
+from datetime import date
+from typing import Any, Callable
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+_DIRTY_OWNERS_KEY = "analytics_dirty_owners"
+
+
+class _InFlight:
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: BaseException | None = None
+
+
+class AnalyticsCache:
+    """Per-(owner, day) cache for dashboard analytics.
+
+    Concurrent misses for the same key share a single computation. Each
+    owner carries a generation counter that ``invalidate`` bumps, so a
+    computation that started before a write never repopulates the cache
+    with pre-write numbers.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple[int, date], tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[tuple[int, date], _InFlight] = {}
+        self._generations: dict[int, int] = {}
+        self._epoch = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.invalidations = 0
+        self._owner_counts: defaultdict[int, Counter] = defaultdict(Counter)
+
+    def get_or_compute(self, owner_user_id: int, day: date, compute: Callable[[], Any]) -> Any:
+        key = (owner_user_id, day)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                self._owner_counts[owner_user_id]["hits"] += 1
+                return entry[1]
+            call = self._in_flight.get(key)
+            if call is not None:
+                self.coalesced += 1
+                self._owner_counts[owner_user_id]["coalesced"] += 1
+                leader = False
+            else:
+                self.misses += 1
+                self._owner_counts[owner_user_id]["misses"] += 1
+                call = _InFlight()
+                self._in_flight[key] = call
+                generation = self._generation(owner_user_id)
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+                if call.error is None and self._generation(owner_user_id) == generation:
+                    self._store(key, call.value)
+            call.done.set()
+        return call.value
+
+    def _generation(self, owner_user_id: int) -> tuple[int, int]:
+        return self._epoch, self._generations.get(owner_user_id, 0)
+
+    def _store(self, key: tuple[int, date], value: Any) -> None:
+        self._entries[key] = (time.monotonic() + settings.DASHBOARD_CACHE_TTL_SECONDS, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > settings.DASHBOARD_CACHE_MAX_ENTRIES:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, owner_user_id: int | None = None) -> None:
+        with self._lock:
+            self.invalidations += 1
+            if owner_user_id is None:
+                self._epoch += 1
+                self._entries.clear()
+                return
+            self._owner_counts[owner_user_id]["invalidations"] += 1
+            self._generations[owner_user_id] = self._generations.get(owner_user_id, 0) + 1
+            for key in [key for key in self._entries if key[0] == owner_user_id]:
+                del self._entries[key]
+
+    def stats(self, owner_user_id: int | None = None) -> dict:
+        """Counters for the whole cache, or only for ``owner_user_id``.
+
+        An owner's ``invalidations`` include the cache-wide ones.
+        """
+        with self._lock:
+            if owner_user_id is None:
+                return {
+                    "hits": self.hits,
+                    "misses": self.misses,
+                    "coalesced": self.coalesced,
+                    "invalidations": self.invalidations,
+                    "entries": len(self._entries),
+                }
+            counts = self._owner_counts.get(owner_user_id, Counter())
+            return {
+                "hits": counts["hits"],
+                "misses": counts["misses"],
+                "coalesced": counts["coalesced"],
+                "invalidations": counts["invalidations"] + self._epoch,
+                "entries": sum(1 for key in self._entries if key[0] == owner_user_id),
+            }
+
+
+analytics_cache = AnalyticsCache()
+
+
+def mark_owner_dirty(db: Session, owner_user_id: int | None) -> None:
+    """Invalidate ``owner_user_id``'s analytics once ``db`` commits."""
+    if owner_user_id is not None:
+        db.info.setdefault(_DIRTY_OWNERS_KEY, set()).add(owner_user_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session) -> None:
+    for owner_user_id in session.info.pop(_DIRTY_OWNERS_KEY, ()):
+        analytics_cache.invalidate(owner_user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_after_rollback(session: Session) -> None:
+    session.info.pop(_DIRTY_OWNERS_KEY, None)
@@ -0,0 +1,208 @@
+import threading
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, or_, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatus
+
+ACTIVE_STATUSES = (
+    AppointmentStatus.unconfirmed,
+    AppointmentStatus.confirmed,
+    AppointmentStatus.scheduled,
+)
+
+
+def _default_duration() -> timedelta:
+    return timedelta(minutes=settings.APPOINTMENT_DEFAULT_DURATION_MINUTES)
+
+
+def _lookback() -> timedelta:
+    """Longest span an active appointment may cover.
+
+    Any appointment that ends after ``start`` must have started after
+    ``start - lookback``, which is what keeps the SQL range scan bounded.
+    """
+    return max(
+        _default_duration(),
+        timedelta(minutes=settings.APPOINTMENT_MAX_DURATION_MINUTES),
+    )
+
+
+def _resolve_end_time(start_time, end_time):
+    if not start_time:
+        return end_time
+    return end_time or start_time + _default_duration()
+
+
+class AppointmentIntervalIndex:
+    """Sorted in-memory interval index for a single owner's active appointments.
+
+    Intervals are kept ordered by start time; a lookup bisects to the last
+    interval starting before the requested end and walks backwards until the
+    start falls outside the widest span seen so far.
+    """
+
+    def __init__(self) -> None:
+        self._starts: list[tuple[datetime, int]] = []
+        self._intervals: dict[int, tuple[datetime, datetime]] = {}
+        self._max_span = timedelta(0)
+
+    def __len__(self) -> int:
+        return len(self._intervals)
+
+    def add(self, appointment_id: int, start_time: datetime, end_time: datetime) -> None:
+        self.discard(appointment_id)
+        insort(self._starts, (start_time, appointment_id))
+        self._intervals[appointment_id] = (start_time, end_time)
+        self._max_span = max(self._max_span, end_time - start_time)
+
+    def discard(self, appointment_id: int) -> None:
+        interval = self._intervals.pop(appointment_id, None)
+        if interval is None:
+            return
+        position = bisect_left(self._starts, (interval[0], appointment_id))
+        del self._starts[position]
+
+    def find_overlap(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_id: int | None = None,
+    ) -> int | None:
+        lower_bound = start_time - self._max_span
+        position = bisect_left(self._starts, (end_time,)) - 1
+        while position >= 0:
+            existing_start, appointment_id = self._starts[position]
+            if existing_start <= lower_bound:
+                break
+            if appointment_id != exclude_id:
+                if self._intervals[appointment_id][1] > start_time:
+                    return appointment_id
+            position -= 1
+        return None
+
+
+class OverlapIndexRegistry:
+    """Process-local interval indexes, loaded lazily per owner.
+
+    Only safe when a single process writes appointments for a given owner;
+    enable with ``APPOINTMENT_OVERLAP_INDEX_ENABLED``.
+    """
+
+    def __init__(self) -> None:
+        self._owners: dict[int, AppointmentIntervalIndex] = {}
+        self._lock = threading.RLock()
+
+    def _load(self, db: Session, owner_user_id: int) -> AppointmentIntervalIndex:
+        index = AppointmentIntervalIndex()
+        rows = db.execute(
+            select(
+                Appointment.id,
+                Appointment.appointment_datetime,
+                Appointment.appointment_end_datetime,
+            ).where(
+                Appointment.owner_user_id == owner_user_id,
+                Appointment.status.in_(ACTIVE_STATUSES),
+            )
+        )
+        for appointment_id, start_time, end_time in rows:
+            index.add(appointment_id, start_time, _resolve_end_time(start_time, end_time))
+        return index
+
+    def find_overlap(
+        self,
+        db: Session,
+        owner_user_id: int,
+        start_time: datetime,
+        end_time: datetime,
+        exclude_id: int | None = None,
+    ) -> int | None:
+        with self._lock:
+            index = self._owners.get(owner_user_id)
+            if index is None:
+                index = self._load(db, owner_user_id)
+                self._owners[owner_user_id] = index
+            return index.find_overlap(start_time, end_time, exclude_id)
+
+    def sync(self, appointment: Appointment) -> None:
+        with self._lock:
+            index = self._owners.get(appointment.owner_user_id)
+            if index is None:
+                return
+            if appointment.status in ACTIVE_STATUSES and appointment.appointment_datetime:
+                index.add(
+                    appointment.id,
+                    appointment.appointment_datetime,
+                    _resolve_end_time(
+                        appointment.appointment_datetime,
+                        appointment.appointment_end_datetime,
+                    ),
+                )
+            else:
+                index.discard(appointment.id)
+
+    def discard(self, owner_user_id: int, appointment_id: int) -> None:
+        with self._lock:
+            index = self._owners.get(owner_user_id)
+            if index is not None:
+                index.discard(appointment_id)
+
+    def invalidate(self, owner_user_id: int | None = None) -> None:
+        with self._lock:
+            if owner_user_id is None:
+                self._owners.clear()
+            else:
+                self._owners.pop(owner_user_id, None)
+
+
+overlap_index = OverlapIndexRegistry()
+
+
+def _query_overlap(
+    db: Session,
+    owner_user_id: int,
+    start_time: datetime,
+    end_time: datetime,
+    exclude_id: int | None = None,
+) -> int | None:
+    statement = (
+        select(Appointment.id)
+        .where(
+            Appointment.owner_user_id == owner_user_id,
+            Appointment.status.in_(ACTIVE_STATUSES),
+            Appointment.appointment_datetime < end_time,
+            Appointment.appointment_datetime > start_time - _lookback(),
+            or_(
+                Appointment.appointment_end_datetime > start_time,
+                and_(
+                    Appointment.appointment_end_datetime.is_(None),
+                    Appointment.appointment_datetime
+                    > start_time - _default_duration(),
+                ),
+            ),
+        )
+        .limit(1)
+    )
+    if exclude_id is not None:
+        statement = statement.where(Appointment.id != exclude_id)
+    return db.execute(statement).scalar()
+
+
+def find_overlapping_appointment(
+    db: Session,
+    owner_user_id: int,
+    start_time: datetime | None,
+    end_time: datetime | None,
+    exclude_id: int | None = None,
+) -> int | None:
+    effective_end_time = _resolve_end_time(start_time, end_time)
+    if not start_time or not effective_end_time:
+        return None
+    if settings.APPOINTMENT_OVERLAP_INDEX_ENABLED:
+        return overlap_index.find_overlap(
+            db, owner_user_id, start_time, effective_end_time, exclude_id
+        )
+    return _query_overlap(db, owner_user_id, start_time, effective_end_time, exclude_id)
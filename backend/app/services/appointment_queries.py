@@ -0,0 +1,84 @@
+from datetime import datetime
+
+from sqlalchemy.orm import selectinload
+
+from app.core.projection import load_columns, project
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.patient import Patient
+from app.schemas.patient import PATIENT_SUMMARY_FIELDS
+
+
+def apply_appointment_filters(
+    query,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    statuses: list[AppointmentStatus] | None = None,
+    doctor_name: str | None = None,
+    department: str | None = None,
+):
+    if date_from:
+        query = query.filter(Appointment.appointment_datetime >= date_from)
+    if date_to:
+        query = query.filter(Appointment.appointment_datetime <= date_to)
+    if statuses:
+        query = query.filter(Appointment.status.in_(statuses))
+    if doctor_name:
+        query = query.filter(Appointment.doctor_name == doctor_name.strip())
+    if department:
+        query = query.filter(Appointment.department == department.strip())
+    return query
+
+
+def appointment_list_options(fields: tuple[str, ...]) -> list:
+    """Loader options for a projected appointment list.
+
+    The keyset columns and ``patient_id`` are always loaded so paging and the
+    patient relationship work whatever ``fields`` asked for.
+    """
+    options = [
+        load_columns(Appointment, [*fields, "appointment_datetime", "patient_id"])
+    ]
+    if "patient" in fields:
+        options.append(
+            selectinload(Appointment.patient).options(
+                load_columns(Patient, PATIENT_SUMMARY_FIELDS)
+            )
+        )
+    return options
+
+
+def project_appointment(appointment: Appointment, fields: tuple[str, ...]) -> dict:
+    data = project(appointment, tuple(name for name in fields if name != "patient"))
+    if "patient" in fields:
+        patient = appointment.patient
+        data["patient"] = project(patient, PATIENT_SUMMARY_FIELDS) if patient else None
+    return data
+
+
+def normalized_fields(fields: tuple[str, ...]) -> tuple[str, ...]:
+    """``fields`` for a normalized list: ``patient_id`` in place of ``patient``."""
+    return tuple(dict.fromkeys(name for name in (*fields, "patient_id") if name != "patient"))
+
+
+def normalize_appointments(
+    db, owner_user_id: int, appointments: list[Appointment], fields: tuple[str, ...]
+) -> dict:
+    """Project a page of appointments with one batched fetch of their patients.
+
+    Each distinct patient is loaded and serialised once, however many of the
+    page's appointments point at it.
+    """
+    patient_ids = sorted({appointment.patient_id for appointment in appointments})
+    patients = []
+    if patient_ids:
+        patients = (
+            db.query(Patient)
+            .options(load_columns(Patient, PATIENT_SUMMARY_FIELDS))
+            .filter(Patient.id.in_(patient_ids), Patient.owner_user_id == owner_user_id)
+            .order_by(Patient.id)
+            .all()
+        )
+    return {
+        "appointments": [project(appointment, fields) for appointment in appointments],
+        "patients": [project(patient, PATIENT_SUMMARY_FIELDS) for patient in patients],
+    }
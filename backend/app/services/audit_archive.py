@@ -0,0 +1,450 @@
+"""Monthly audit-log retention and cold archive.
+
+Only the newest ``AUDIT_RETENTION_MONTHS`` calendar months stay in
+``audit_logs``. Older months are written to gzipped NDJSON files, one per
+owner and month, under ``AUDIT_ARCHIVE_DIR``. ``audit_log_archives`` records
+each file. The API reads these files back, so ``AUDIT_ARCHIVE_DIR`` must be
+storage shared by every process that runs the retention job or serves
+``/audit-logs`` (the ``audit_archive`` volume in ``docker-compose.yml``).
+Each file is read back and checked against the table before its month
+leaves the hot table:
+
+* Postgres: ``audit_logs`` is range-partitioned by month (migration 0020).
+  The month's partition is detached and dropped, so its indexes go with it.
+* Other databases: the month's rows are deleted in batches, and the freed
+  pages are reused by new rows.
+
+``list_audit_logs`` reads the archive files when the hot table runs out, so
+cursor paging continues into archived months.
+
+Run a retention pass by hand from ``backend/``::
+
+    python -m app.services.audit_archive
+"""
+
+import gzip
+import logging
+import os
+from datetime import date, datetime, timezone
+from typing import Iterable, Iterator
+
+import orjson
+from sqlalchemy import delete, event, func, select, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.audit_log import AuditLog, AuditLogArchive
+from app.models.user import User
+
+logger = logging.getLogger("meditrack.audit_archive")
+
+_PURGED_PATHS_KEY = "audit_archive_purged_paths"
+
+ARCHIVE_COLUMNS = [
+    AuditLog.id,
+    AuditLog.created_at,
+    AuditLog.owner_user_id,
+    AuditLog.action,
+    AuditLog.entity_type,
+    AuditLog.entity_id,
+    AuditLog.summary,
+    AuditLog.metadata_json,
+    AuditLog.ip_address,
+    AuditLog.user_agent,
+    AuditLog.request_id,
+]
+
+
+def month_start(value: datetime | date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_logs_y{month.year}m{month.month:02d}"
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def _month_bounds(month: date) -> tuple[datetime, datetime]:
+    return (
+        datetime(month.year, month.month, 1),
+        datetime.combine(add_months(month, 1), datetime.min.time()),
+    )
+
+
+def ensure_partitions(db: Session, now: datetime | None = None) -> list[str]:
+    """Create this month's and the next ``AUDIT_PARTITION_MONTHS_AHEAD`` partitions.
+
+    Rows for a month without a partition land in ``audit_logs_default``. Creating
+    partitions ahead of time keeps that partition empty.
+    """
+    if not _is_postgres(db):
+        return []
+    current = month_start(now or datetime.utcnow())
+    created = []
+    for offset in range(settings.AUDIT_PARTITION_MONTHS_AHEAD + 1):
+        month = add_months(current, offset)
+        name = partition_name(month)
+        exists = db.execute(text("SELECT to_regclass(:name)"), {"name": name}).scalar()
+        if exists:
+            continue
+        db.execute(
+            text(
+                f"CREATE TABLE {name} PARTITION OF audit_logs "
+                f"FOR VALUES FROM ('{month.isoformat()}') "
+                f"TO ('{add_months(month, 1).isoformat()}')"
+            )
+        )
+        created.append(name)
+    db.commit()
+    return created
+
+
+def archive_path(owner_user_id: int, month: date) -> str:
+    return os.path.join(
+        settings.AUDIT_ARCHIVE_DIR, f"{month:%Y-%m}", f"owner_{owner_user_id}.ndjson.gz"
+    )
+
+
+def _read_archive(path: str) -> list[dict]:
+    with gzip.open(path, "rb") as handle:
+        return [orjson.loads(line) for line in handle]
+
+
+def _merge_archive(tmp_path: str, path: str) -> list[dict]:
+    """Fold an existing archive (an earlier, interrupted or late run) into ``tmp_path``."""
+    rows = {row["id"]: row for row in _read_archive(path)}
+    rows.update((row["id"], row) for row in _read_archive(tmp_path))
+    merged = sorted(
+        rows.values(),
+        key=lambda row: (datetime.fromisoformat(row["created_at"]), row["id"]),
+        reverse=True,
+    )
+    with gzip.open(tmp_path, "wb") as handle:
+        for row in merged:
+            handle.write(orjson.dumps(row) + b"\n")
+    return merged
+
+
+def _owner_month(owner_user_id: int, month: date):
+    start, end = _month_bounds(month)
+    return (
+        AuditLog.owner_user_id == owner_user_id,
+        AuditLog.created_at >= start,
+        AuditLog.created_at < end,
+    )
+
+
+def _write_owner_month(db: Session, owner_user_id: int, month: date) -> dict | None:
+    """Write one owner's month, newest first, from the owner/created_at index."""
+    statement = (
+        select(*ARCHIVE_COLUMNS)
+        .where(*_owner_month(owner_user_id, month))
+        .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+    )
+    path = archive_path(owner_user_id, month)
+    tmp_path = f"{path}.tmp"
+    handle = None
+    entry = {"owner_user_id": owner_user_id, "month": month, "path": path, "row_count": 0}
+    with db.get_bind().connect() as connection:
+        result = connection.execution_options(
+            stream_results=True, yield_per=settings.STREAM_CHUNK_SIZE
+        ).execute(statement)
+        for row in result:
+            if handle is None:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                handle = gzip.open(tmp_path, "wb")
+                entry["newest_at"] = row.created_at
+            data = row._asdict()
+            data["created_at"] = row.created_at.isoformat()
+            handle.write(orjson.dumps(data) + b"\n")
+            entry["row_count"] += 1
+            entry["oldest_at"] = row.created_at
+    if handle is None:
+        return None
+    handle.close()
+    if os.path.exists(path):
+        merged = _merge_archive(tmp_path, path)
+        entry["row_count"] = len(merged)
+        entry["newest_at"] = datetime.fromisoformat(merged[0]["created_at"])
+        entry["oldest_at"] = datetime.fromisoformat(merged[-1]["created_at"])
+    os.replace(tmp_path, path)
+    return entry
+
+
+def _verify_archive(db: Session, entry: dict) -> bool:
+    """Read ``entry``'s file back and check it holds every hot row of its month."""
+    try:
+        ids = {row["id"] for row in _read_archive(entry["path"])}
+    except (OSError, EOFError, orjson.JSONDecodeError) as exc:
+        logger.error("Audit archive unreadable: %s (%s)", entry["path"], exc)
+        return False
+    if len(ids) != entry["row_count"]:
+        logger.error("Audit archive row count mismatch: %s", entry["path"])
+        return False
+    hot = db.execute(
+        select(AuditLog.id).where(*_owner_month(entry["owner_user_id"], entry["month"]))
+    ).scalars()
+    missing = sum(1 for row_id in hot if row_id not in ids)
+    if missing:
+        logger.error("Audit archive %s is missing %s rows", entry["path"], missing)
+        return False
+    return True
+
+
+def _record(db: Session, entry: dict) -> None:
+    archive = (
+        db.query(AuditLogArchive)
+        .filter(
+            AuditLogArchive.owner_user_id == entry["owner_user_id"],
+            AuditLogArchive.month == entry["month"],
+        )
+        .first()
+    )
+    if archive is None:
+        archive = AuditLogArchive(owner_user_id=entry["owner_user_id"], month=entry["month"])
+        db.add(archive)
+    archive.path = entry["path"]
+    archive.row_count = entry["row_count"]
+    archive.newest_at = entry["newest_at"]
+    archive.oldest_at = entry["oldest_at"]
+    archive.archived_at = datetime.utcnow()
+    db.commit()
+
+
+def _delete_owner_month(db: Session, owner_user_id: int, month: date) -> int:
+    # Batches keep each transaction (and on SQLite, each write lock) short.
+    removed = 0
+    while True:
+        batch = (
+            select(AuditLog.id)
+            .where(*_owner_month(owner_user_id, month))
+            .limit(settings.AUDIT_ARCHIVE_DELETE_BATCH)
+        )
+        deleted = db.execute(
+            delete(AuditLog).where(AuditLog.id.in_(batch.scalar_subquery()))
+        ).rowcount
+        db.commit()
+        removed += deleted
+        if deleted < settings.AUDIT_ARCHIVE_DELETE_BATCH:
+            return removed
+
+
+class ArchiveVerificationError(RuntimeError):
+    pass
+
+
+def archive_owner_month(db: Session, owner_user_id: int, month: date) -> dict | None:
+    """Archive one owner's month; rows leave the hot table once the file is verified.
+
+    Raises ``ArchiveVerificationError`` (leaving the rows in place) when the
+    file cannot be read back intact.
+    """
+    entry = _write_owner_month(db, owner_user_id, month)
+    if entry is None:
+        return None
+    if not _verify_archive(db, entry):
+        raise ArchiveVerificationError(entry["path"])
+    _record(db, entry)
+    if not _is_postgres(db):
+        _delete_owner_month(db, owner_user_id, month)
+    return entry
+
+
+def _drop_partitions(db: Session, cutoff: date, blocked: set[date]) -> list[str]:
+    """Detach and drop monthly partitions that end on or before ``cutoff``.
+
+    Rows that were routed to ``audit_logs_default`` instead are deleted from it.
+    Months in ``blocked`` have an unverified archive and are kept.
+    """
+    names = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " JOIN pg_class parent ON parent.oid = pg_inherits.inhparent"
+            " WHERE parent.relname = 'audit_logs' AND child.relname LIKE 'audit_logs_y%'"
+        )
+    ).scalars()
+    dropped = []
+    for name in sorted(names):
+        month = date(int(name[12:16]), int(name[17:19]), 1)
+        if month >= cutoff or month in blocked:
+            continue
+        db.execute(text(f"ALTER TABLE audit_logs DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        db.commit()
+        dropped.append(name)
+    sql = "DELETE FROM audit_logs_default WHERE created_at < :cutoff"
+    params = {"cutoff": datetime.combine(cutoff, datetime.min.time())}
+    for index, month in enumerate(sorted(blocked)):
+        sql += f" AND NOT (created_at >= :start_{index} AND created_at < :end_{index})"
+        params[f"start_{index}"], params[f"end_{index}"] = _month_bounds(month)
+    db.execute(text(sql), params)
+    db.commit()
+    return dropped
+
+
+def apply_retention(db: Session, now: datetime | None = None) -> list[dict]:
+    """Archive every owner's months older than the retention window."""
+    now = now or datetime.utcnow()
+    ensure_partitions(db, now)
+    cutoff = add_months(month_start(now), 1 - settings.AUDIT_RETENTION_MONTHS)
+    cutoff_at = datetime.combine(cutoff, datetime.min.time())
+    archived = []
+    blocked: set[date] = set()
+    for owner_user_id in db.execute(select(User.id).order_by(User.id)).scalars():
+        oldest = db.execute(
+            select(func.min(AuditLog.created_at)).where(AuditLog.owner_user_id == owner_user_id)
+        ).scalar()
+        if oldest is None or oldest >= _align(cutoff_at, oldest):
+            continue
+        month = month_start(oldest)
+        while month < cutoff:
+            try:
+                entry = archive_owner_month(db, owner_user_id, month)
+            except ArchiveVerificationError:
+                blocked.add(month)
+                entry = None
+            if entry:
+                archived.append(entry)
+            month = add_months(month, 1)
+    if _is_postgres(db):
+        _drop_partitions(db, cutoff, blocked)
+    if blocked:
+        logger.error(
+            "Audit months %s kept in the database: their archives did not verify",
+            ", ".join(f"{month:%Y-%m}" for month in sorted(blocked)),
+        )
+    if archived:
+        logger.info(
+            "Archived %s audit rows into %s files before %s",
+            sum(entry["row_count"] for entry in archived),
+            len(archived),
+            f"{cutoff:%Y-%m}",
+        )
+    return archived
+
+
+def run_audit_retention() -> None:
+    try:
+        db: Session = SessionLocal()
+    except Exception as exc:  # pragma: no cover - scheduler resilience
+        logger.warning("Audit retention unavailable: %s", exc)
+        return
+    try:
+        apply_retention(db)
+    except Exception as exc:  # pragma: no cover - scheduler resilience
+        db.rollback()
+        logger.warning("Audit retention run failed: %s", exc)
+    finally:
+        db.close()
+
+
+def archived_paths(
+    db: Session,
+    owner_user_id: int,
+    since: datetime | None = None,
+    before: datetime | None = None,
+) -> list[str]:
+    """The owner's archive files, newest month first.
+
+    Files entirely before ``since`` or entirely after ``before`` (a cursor's
+    timestamp) are left out, so a deep page opens only the months it reads.
+    """
+    query = db.query(AuditLogArchive.path).filter(
+        AuditLogArchive.owner_user_id == owner_user_id
+    )
+    if since:
+        query = query.filter(AuditLogArchive.newest_at >= since)
+    if before:
+        query = query.filter(AuditLogArchive.oldest_at <= before)
+    return [path for (path,) in query.order_by(AuditLogArchive.month.desc())]
+
+
+def _align(value: datetime | None, like: datetime) -> datetime | None:
+    """Make ``value`` comparable with ``like``; SQLite stores naive UTC."""
+    if value is None or (value.tzinfo is None) == (like.tzinfo is None):
+        return value
+    if like.tzinfo is None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(tzinfo=timezone.utc)
+
+
+def iter_archived_rows(
+    paths: Iterable[str],
+    before: tuple[datetime, int] | None = None,
+    since: datetime | None = None,
+    filters: dict | None = None,
+) -> Iterator[dict]:
+    """Yield archived rows newest first, filtered like the hot-table query.
+
+    ``before`` is a decoded keyset cursor; rows at or after it are skipped.
+    """
+    filters = filters or {}
+    for path in paths:
+        try:
+            handle = gzip.open(path, "rb")
+        except FileNotFoundError:
+            logger.warning("Audit archive missing: %s", path)
+            continue
+        with handle:
+            for line in handle:
+                row = orjson.loads(line)
+                created_at = datetime.fromisoformat(row["created_at"])
+                if since and created_at < _align(since, created_at):
+                    return
+                if before and (created_at, row["id"]) >= (
+                    _align(before[0], created_at),
+                    before[1],
+                ):
+                    continue
+                if any(row[column] != value for column, value in filters.items()):
+                    continue
+                row["created_at"] = created_at
+                yield row
+
+
+def purge_owner_archives(db: Session, owner_user_id: int) -> int:
+    """Delete an owner's archive records; the files go once ``db`` commits."""
+    paths = archived_paths(db, owner_user_id)
+    db.info.setdefault(_PURGED_PATHS_KEY, []).extend(paths)
+    db.query(AuditLogArchive).filter(
+        AuditLogArchive.owner_user_id == owner_user_id
+    ).delete(synchronize_session=False)
+    return len(paths)
+
+
+@event.listens_for(Session, "after_commit")
+def _remove_purged_after_commit(session: Session) -> None:
+    for path in session.info.pop(_PURGED_PATHS_KEY, ()):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+@event.listens_for(Session, "after_rollback")
+def _keep_purged_after_rollback(session: Session) -> None:
+    session.info.pop(_PURGED_PATHS_KEY, None)
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO)
+    with SessionLocal() as db:
+        for entry in apply_retention(db):
+            print(
+                f"{entry['month']:%Y-%m} owner {entry['owner_user_id']}: "
+                f"{entry['row_count']} rows"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,18 @@
 import json
 import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from typing import Any
 
 from fastapi import Request
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
+from app.core.principal_cache import Principal
+from app.db.session import SessionLocal
 from app.models.audit_log import AuditLog
 from app.models.user import User
 
@@ -50,32 +58,155 @@ def _get_request_ip(request: Request | None) -> str | None:
     return None
 
 
+class AuditLogWriter:
+    """Write-behind queue for audit events that are not tied to a transaction.
+
+    A daemon thread collects rows and inserts them with a single multi-row
+    INSERT once ``AUDIT_LOG_BATCH_SIZE`` rows are waiting or
+    ``AUDIT_LOG_FLUSH_SECONDS`` have passed. ``stop`` drains the queue.
+    """
+
+    _STOP = object()
+
+    def __init__(self, session_factory=SessionLocal) -> None:
+        self._session_factory = session_factory
+        self._queue: queue.Queue = queue.Queue(maxsize=settings.AUDIT_LOG_QUEUE_SIZE)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self) -> None:
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def submit(self, row: dict) -> bool:
+        """Queue ``row``; returns False when the queue is full."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far has been written."""
+        if self._thread is None or not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def stop(self, timeout: float = 10.0) -> None:
+        with self._lock:
+            thread = self._thread
+            self._thread = None
+        if thread is None or not thread.is_alive():
+            return
+        self._queue.put(self._STOP)
+        thread.join(timeout)
+
+    def _run(self) -> None:
+        pending: list[dict] = []
+        deadline = None
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=wait)
+            except queue.Empty:
+                item = None
+            if isinstance(item, dict):
+                pending.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + settings.AUDIT_LOG_FLUSH_SECONDS
+                if len(pending) < settings.AUDIT_LOG_BATCH_SIZE:
+                    continue
+            if pending:
+                self._write(pending)
+                pending = []
+            deadline = None
+            if isinstance(item, threading.Event):
+                item.set()
+            elif item is self._STOP:
+                return
+
+    def _write(self, rows: list[dict]) -> None:
+        db = self._session_factory()
+        try:
+            db.execute(insert(AuditLog), rows)
+            db.commit()
+        except Exception as exc:
+            db.rollback()
+            logger.warning("Audit batch of %s failed, writing rows one by one: %s", len(rows), exc)
+            for row in rows:
+                try:
+                    db.execute(insert(AuditLog), [row])
+                    db.commit()
+                except Exception as row_exc:
+                    db.rollback()
+                    logger.error("Audit log dropped (%s): %s", row.get("action"), row_exc)
+        finally:
+            db.close()
+
+
+audit_writer = AuditLogWriter()
+
+
+def _build_row(
+    user: User | Principal,
+    action: str,
+    entity_type: str,
+    entity_id: int | None,
+    summary: str,
+    metadata: dict | None,
+    request: Request | None,
+) -> dict:
+    return {
+        "created_at": datetime.now(timezone.utc),
+        "owner_user_id": user.id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "summary": summary,
+        "metadata_json": _serialize_metadata(metadata),
+        "ip_address": _get_request_ip(request),
+        "user_agent": request.headers.get("user-agent") if request else None,
+        "request_id": getattr(request.state, "request_id", None) if request else None,
+    }
+
+
 def log_event(
     db: Session,
-    user: User | None,
+    user: User | Principal | None,
     action: str,
     entity_type: str,
     entity_id: int | None = None,
     summary: str = "",
     metadata: dict | None = None,
     request: Request | None = None,
+    commit: bool = True,
 ) -> None:
+    """Record an audit event.
+
+    With ``commit=False`` the row joins the caller's transaction and is
+    written by the caller's own commit. Otherwise the event stands alone: it
+    goes to the background writer when ``AUDIT_LOG_WRITE_BEHIND`` is enabled,
+    or is committed immediately.
+    """
     if not user:
         return
     try:
-        audit_log = AuditLog(
-            owner_user_id=user.id,
-            action=action,
-            entity_type=entity_type,
-            entity_id=entity_id,
-            summary=summary,
-            metadata_json=_serialize_metadata(metadata),
-            ip_address=_get_request_ip(request),
-            user_agent=request.headers.get("user-agent") if request else None,
-            request_id=getattr(request.state, "request_id", None) if request else None,
-        )
-        db.add(audit_log)
+        row = _build_row(user, action, entity_type, entity_id, summary, metadata, request)
+        if not commit:
+            db.add(AuditLog(**row))
+            return
+        if settings.AUDIT_LOG_WRITE_BEHIND and audit_writer.submit(row):
+            return
+        db.add(AuditLog(**row))
         db.commit()
     except Exception as exc:  # pragma: no cover - best effort logging
-        db.rollback()
+        if commit:
+            db.rollback()
         logger.warning("Audit log failed: %s", exc)
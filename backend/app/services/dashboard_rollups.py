@@ -0,0 +1,218 @@
+"""Per-owner daily counters behind the dashboard analytics endpoint.
+
+Routers call ``track_appointment_change`` / ``track_patient_change`` inside
+the same transaction as the write they describe. Bulk paths (demo reset,
+seeding, account deletion) call ``rebuild_owner_rollups`` instead.
+
+Backfill every owner from the base tables with::
+
+    python -m app.services.dashboard_rollups [--owner USER_ID]
+"""
+
+import argparse
+import logging
+from collections import Counter
+from datetime import date, datetime
+from enum import Enum
+
+from sqlalchemy import update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.appointment import Appointment
+from app.models.dashboard_rollup import AppointmentDailyRollup, PatientDailyRollup
+from app.models.patient import Patient
+from app.services.analytics_cache import mark_owner_dirty
+
+logger = logging.getLogger("meditrack.dashboard_rollups")
+
+AppointmentKey = tuple[int, date, str]
+
+
+def normalize_status(status) -> str:
+    if isinstance(status, Enum):
+        status = status.value
+    normalized = str(status).lower()
+    if normalized == "scheduled":
+        return "unconfirmed"
+    return normalized
+
+
+def appointment_rollup_key(
+    owner_user_id: int | None,
+    appointment_datetime: datetime | None,
+    status,
+) -> AppointmentKey | None:
+    if owner_user_id is None or appointment_datetime is None or status is None:
+        return None
+    return owner_user_id, appointment_datetime.date(), normalize_status(status)
+
+
+def _bump(db: Session, model, keys: dict, delta: int) -> None:
+    if not delta:
+        return
+    table = model.__table__
+    dialect = db.get_bind().dialect.name
+    if dialect in {"postgresql", "sqlite"}:
+        insert = pg_insert if dialect == "postgresql" else sqlite_insert
+        statement = insert(table).values(**keys, count=delta)
+        db.execute(
+            statement.on_conflict_do_update(
+                index_elements=list(keys),
+                set_={"count": table.c.count + delta},
+            )
+        )
+        return
+    result = db.execute(
+        update(table)
+        .where(*(table.c[name] == value for name, value in keys.items()))
+        .values(count=table.c.count + delta)
+    )
+    if not result.rowcount:
+        db.execute(table.insert().values(**keys, count=delta))
+
+
+def _bump_appointment(db: Session, key: AppointmentKey, delta: int) -> None:
+    owner_user_id, day, status = key
+    _bump(
+        db,
+        AppointmentDailyRollup,
+        {"owner_user_id": owner_user_id, "day": day, "status": status},
+        delta,
+    )
+
+
+def track_appointment_change(
+    db: Session,
+    before: AppointmentKey | None,
+    after: AppointmentKey | None,
+) -> None:
+    """Move one appointment between rollup buckets; a no-op if the bucket is unchanged."""
+    if before == after:
+        return
+    if before is not None:
+        _bump_appointment(db, before, -1)
+        mark_owner_dirty(db, before[0])
+    if after is not None:
+        _bump_appointment(db, after, 1)
+        mark_owner_dirty(db, after[0])
+
+
+def track_patient_change(db: Session, patient: Patient, delta: int) -> None:
+    if patient.owner_user_id is None:
+        return
+    created_at = patient.created_at or datetime.utcnow()
+    mark_owner_dirty(db, patient.owner_user_id)
+    _bump(
+        db,
+        PatientDailyRollup,
+        {"owner_user_id": patient.owner_user_id, "day": created_at.date()},
+        delta,
+    )
+
+
+def track_patient_deleted(db: Session, patient: Patient) -> None:
+    """Remove a patient and its cascaded appointments from the rollups."""
+    track_patient_change(db, patient, -1)
+    buckets = Counter(
+        appointment_rollup_key(
+            appointment.owner_user_id,
+            appointment.appointment_datetime,
+            appointment.status,
+        )
+        for appointment in patient.appointments
+    )
+    for key, count in buckets.items():
+        if key is not None:
+            _bump_appointment(db, key, -count)
+
+
+def clear_owner_rollups(db: Session, owner_user_id: int) -> None:
+    mark_owner_dirty(db, owner_user_id)
+    db.query(AppointmentDailyRollup).filter(
+        AppointmentDailyRollup.owner_user_id == owner_user_id
+    ).delete(synchronize_session=False)
+    db.query(PatientDailyRollup).filter(
+        PatientDailyRollup.owner_user_id == owner_user_id
+    ).delete(synchronize_session=False)
+
+
+def rebuild_owner_rollups(db: Session, owner_user_id: int) -> None:
+    """Recompute an owner's rollups from the base tables (no commit)."""
+    db.flush()
+    clear_owner_rollups(db, owner_user_id)
+    appointment_counts: Counter = Counter()
+    rows = (
+        db.query(Appointment.appointment_datetime, Appointment.status)
+        .filter(Appointment.owner_user_id == owner_user_id)
+        .yield_per(1000)
+    )
+    for appointment_datetime, status in rows:
+        appointment_counts[
+            appointment_rollup_key(owner_user_id, appointment_datetime, status)
+        ] += 1
+    patient_counts: Counter = Counter()
+    rows = (
+        db.query(Patient.created_at)
+        .filter(Patient.owner_user_id == owner_user_id)
+        .yield_per(1000)
+    )
+    for (created_at,) in rows:
+        patient_counts[created_at.date()] += 1
+
+    db.bulk_insert_mappings(
+        AppointmentDailyRollup,
+        [
+            {"owner_user_id": owner, "day": day, "status": status, "count": count}
+            for (owner, day, status), count in appointment_counts.items()
+        ],
+    )
+    db.bulk_insert_mappings(
+        PatientDailyRollup,
+        [
+            {"owner_user_id": owner_user_id, "day": day, "count": count}
+            for day, count in patient_counts.items()
+        ],
+    )
+
+
+def backfill(db: Session, owner_user_id: int | None = None) -> int:
+    if owner_user_id is not None:
+        owner_ids = [owner_user_id]
+    else:
+        owner_ids = sorted(
+            {
+                owner
+                for (owner,) in db.query(Appointment.owner_user_id).distinct()
+                if owner is not None
+            }
+            | {
+                owner
+                for (owner,) in db.query(Patient.owner_user_id).distinct()
+                if owner is not None
+            }
+        )
+    for owner in owner_ids:
+        rebuild_owner_rollups(db, owner)
+        db.commit()
+        logger.info("Rebuilt dashboard rollups for owner %s", owner)
+    return len(owner_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild dashboard rollup tables.")
+    parser.add_argument("--owner", type=int, default=None, help="only this user id")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rebuilt = backfill(db, args.owner)
+    finally:
+        db.close()
+    print(f"Rebuilt dashboard rollups for {rebuilt} owner(s).")
+
+
+if __name__ == "__main__":
+    main()
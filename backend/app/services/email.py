@@ -1,11 +1,19 @@
+import hashlib
 import logging
-import smtplib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from email.message import EmailMessage
 
 import requests
 
 from app.core.config import settings
+from app.services.email_transport import (
+    RESEND_BATCH_LIMIT,
+    RESEND_VALIDATION_STATUSES,
+    SendRateLimited,
+    get_resend_transport,
+    get_smtp_pool,
+)
 
 logger = logging.getLogger("meditrack.email")
 
@@ -195,11 +203,49 @@ def build_signup_otp_email(otp_code: str, expires_in_minutes: int):
     return subject, html_body.strip(), text_body
 
 
+def _resend_payload(
+    to: str,
+    subject: str,
+    html_body: str,
+    text_body: str | None,
+) -> dict:
+    payload = {
+        "from": settings.EMAIL_FROM,
+        "to": [to],
+        "subject": subject,
+        "html": html_body,
+    }
+    if text_body:
+        payload["text"] = text_body
+    return payload
+
+
+def _require_resend_config() -> None:
+    if not settings.RESEND_API_KEY:
+        message = "Resend API key is missing."
+        print(f"EMAIL_ERROR provider=resend error={message}")
+        raise EmailSendError(message)
+    if not settings.EMAIL_FROM:
+        message = "EMAIL_FROM is not configured."
+        print(f"EMAIL_ERROR provider=resend error={message}")
+        raise EmailSendError(message)
+
+
+def _raise_for_resend_status(response) -> None:
+    if response.status_code >= 400:
+        body_preview = response.text.strip().replace("\n", " ")[:200]
+        print(
+            f"EMAIL_ERROR provider=resend status={response.status_code} body={body_preview}"
+        )
+        raise EmailSendError(f"Resend rejected the email ({response.status_code}).")
+
+
 def send_email(
     to: str,
     subject: str,
     html_body: str,
     text_body: str | None = None,
+    idempotency_key: str | None = None,
 ) -> None:
     preview_source = text_body or html_body
     preview = " ".join(preview_source.split())[:200]
@@ -211,45 +257,16 @@ def send_email(
         return
 
     if provider == "resend":
-        if not settings.RESEND_API_KEY:
-            message = "Resend API key is missing."
-            print(f"EMAIL_ERROR provider=resend error={message}")
-            raise EmailSendError(message)
-        if not settings.EMAIL_FROM:
-            message = "EMAIL_FROM is not configured."
-            print(f"EMAIL_ERROR provider=resend error={message}")
-            raise EmailSendError(message)
-
-        payload = {
-            "from": settings.EMAIL_FROM,
-            "to": [to],
-            "subject": subject,
-            "html": html_body,
-        }
-        if text_body:
-            payload["text"] = text_body
-
+        _require_resend_config()
         try:
-            response = requests.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {settings.RESEND_API_KEY}",
-                    "Content-Type": "application/json",
-                },
-                json=payload,
-                timeout=10,
+            response = get_resend_transport().send(
+                _resend_payload(to, subject, html_body, text_body), idempotency_key
             )
-        except requests.RequestException as exc:
+        except (requests.RequestException, SendRateLimited) as exc:
             logger.error("Failed to send email via resend to %s: %s", to, exc)
-            return
-
-        if response.status_code >= 400:
-            body_preview = response.text.strip().replace("\n", " ")[:200]
-            print(
-                f"EMAIL_ERROR provider=resend status={response.status_code} body={body_preview}"
-            )
-            return
+            raise EmailSendError(f"Resend request failed: {exc}") from exc
 
+        _raise_for_resend_status(response)
         print(f"EMAIL_SENT to={to} subject={subject}")
         return
 
@@ -272,12 +289,102 @@ def send_email(
     message.add_alternative(html_body, subtype="html")
 
     try:
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            if settings.SMTP_USE_TLS:
-                server.starttls()
-            if smtp_username and settings.SMTP_PASSWORD:
-                server.login(smtp_username, settings.SMTP_PASSWORD)
-            server.send_message(message)
+        get_smtp_pool(smtp_username).send(message)
         print(f"EMAIL_SENT to={to} subject={subject}")
     except Exception as exc:  # pragma: no cover - network dependent
         logger.error("Failed to send email to %s: %s", to, exc)
+        raise EmailSendError(f"SMTP delivery failed: {exc}") from exc
+
+
+def _error_text(exc: Exception) -> str:
+    return str(exc) or exc.__class__.__name__
+
+
+def batch_idempotency_key(keys: list[str]) -> str:
+    """Provider idempotency key for a batch; equal only for the same messages in order."""
+    return "batch:" + hashlib.sha256("\x1f".join(keys).encode("utf-8")).hexdigest()[:32]
+
+
+def _send_one(
+    message: tuple[str, str, str, str | None], idempotency_key: str | None = None
+) -> str | None:
+    try:
+        if idempotency_key:
+            send_email(*message, idempotency_key=idempotency_key)
+        else:
+            send_email(*message)
+    except Exception as exc:
+        return _error_text(exc)
+    return None
+
+
+def _send_resend_batch(
+    messages: list[tuple[str, str, str, str | None]], keys: list[str | None]
+) -> list[str | None]:
+    try:
+        _require_resend_config()
+    except EmailSendError as exc:
+        return [_error_text(exc)] * len(messages)
+
+    transport = get_resend_transport()
+    errors: list[str | None] = []
+    for offset in range(0, len(messages), RESEND_BATCH_LIMIT):
+        chunk = messages[offset : offset + RESEND_BATCH_LIMIT]
+        chunk_keys = keys[offset : offset + RESEND_BATCH_LIMIT]
+        if len(chunk) == 1:
+            errors.append(_send_one(chunk[0], chunk_keys[0]))
+            continue
+        batch_key = batch_idempotency_key(chunk_keys) if all(chunk_keys) else None
+        try:
+            response = transport.send_batch(
+                [_resend_payload(*message) for message in chunk], batch_key
+            )
+        except (requests.RequestException, SendRateLimited) as exc:
+            logger.error("Resend batch of %s emails failed: %s", len(chunk), exc)
+            errors.extend([f"Resend request failed: {exc}"] * len(chunk))
+            continue
+        if response.status_code in RESEND_VALIDATION_STATUSES and len(chunk) > 1:
+            # The batch endpoint rejects the whole chunk when one message is
+            # invalid; resend one by one so only that message fails.
+            logger.warning(
+                "Resend rejected a batch of %s emails (%s); sending them singly",
+                len(chunk),
+                response.status_code,
+            )
+            errors.extend(map(_send_one, chunk, chunk_keys))
+            continue
+        try:
+            _raise_for_resend_status(response)
+        except EmailSendError as exc:
+            errors.extend([_error_text(exc)] * len(chunk))
+            continue
+        print(f"EMAIL_SENT batch={len(chunk)}")
+        errors.extend([None] * len(chunk))
+    return errors
+
+
+def send_email_batch(
+    messages: list[tuple[str, str, str, str | None]],
+    workers: int | None = None,
+    idempotency_keys: list[str] | None = None,
+) -> list[str | None]:
+    """Send ``(to, subject, html_body, text_body)`` tuples.
+
+    Returns one entry per message: ``None`` on success, otherwise the error
+    text. Resend messages go through the batch endpoint; SMTP messages are
+    spread across the connection pool. ``idempotency_keys`` (one per message)
+    are sent to Resend as ``Idempotency-Key``; a batch request carries
+    ``batch_idempotency_key`` of its messages' keys.
+    """
+    if not messages:
+        return []
+    keys = idempotency_keys or [None] * len(messages)
+    provider = (settings.EMAIL_PROVIDER or "dev").strip().lower()
+    if settings.EMAIL_ENABLED and provider == "resend":
+        return _send_resend_batch(messages, keys)
+
+    workers = max(1, min(workers or settings.SMTP_POOL_SIZE, len(messages)))
+    if workers == 1:
+        return list(map(_send_one, messages, keys))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_send_one, messages, keys))
@@ -0,0 +1,244 @@
+import hashlib
+import logging
+from datetime import datetime, timedelta
+
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.appointment import Appointment
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.services.email import batch_idempotency_key, send_email_batch
+from app.services.email_transport import RESEND_BATCH_LIMIT
+
+logger = logging.getLogger("meditrack.email_outbox")
+
+_EVENT_SEQUENCES_KEY = "email_event_sequences"
+
+
+def build_idempotency_key(scope: str, recipient: str, subject: str, body: str) -> str:
+    digest = hashlib.sha256(
+        "\x1f".join([recipient, subject, body]).encode("utf-8")
+    ).hexdigest()[:32]
+    return f"{scope}:{digest}"
+
+
+def next_event_sequence(db: Session, appointment_id: int) -> int:
+    """Bump the appointment's email counter, once per transaction.
+
+    Putting the count in a key makes each later event distinct even when its
+    email reads the same as an earlier one (Confirm, Unconfirm, Confirm). The
+    increment is a single UPDATE, which row-locks the appointment, so two
+    concurrent requests never get the same number. Repeats within one
+    transaction share the number and are deduplicated.
+    """
+    sequences = db.info.setdefault(_EVENT_SEQUENCES_KEY, {})
+    if appointment_id not in sequences:
+        sequences[appointment_id] = db.execute(
+            update(Appointment)
+            .where(Appointment.id == appointment_id)
+            .values(email_sequence=Appointment.email_sequence + 1)
+            .returning(Appointment.email_sequence)
+            .execution_options(synchronize_session=False)
+        ).scalar_one()
+    return sequences[appointment_id]
+
+
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_rollback")
+def _forget_event_sequences(session: Session) -> None:
+    session.info.pop(_EVENT_SEQUENCES_KEY, None)
+
+
+def enqueue_email(
+    db: Session,
+    recipient: str,
+    subject: str,
+    html_body: str,
+    text_body: str | None,
+    idempotency_key: str,
+    owner_user_id: int | None = None,
+) -> EmailOutbox | None:
+    """Stage an email in the caller's transaction; the worker delivers it after commit."""
+    existing = (
+        db.query(EmailOutbox.id)
+        .filter(EmailOutbox.idempotency_key == idempotency_key)
+        .first()
+    )
+    if existing:
+        return None
+    for pending in db.new:
+        if isinstance(pending, EmailOutbox) and pending.idempotency_key == idempotency_key:
+            return None
+    message = EmailOutbox(
+        idempotency_key=idempotency_key,
+        owner_user_id=owner_user_id,
+        recipient=recipient,
+        subject=subject,
+        html_body=html_body,
+        text_body=text_body,
+        status=EmailOutboxStatus.pending,
+        attempts=0,
+        next_attempt_at=datetime.utcnow(),
+    )
+    db.add(message)
+    return message
+
+
+def _backoff(attempts: int) -> timedelta:
+    seconds = settings.EMAIL_OUTBOX_BACKOFF_SECONDS * (2 ** max(attempts - 1, 0))
+    return timedelta(seconds=min(seconds, settings.EMAIL_OUTBOX_MAX_BACKOFF_SECONDS))
+
+
+def _claimable(now: datetime):
+    return or_(
+        and_(
+            EmailOutbox.status == EmailOutboxStatus.pending,
+            EmailOutbox.next_attempt_at <= now,
+        ),
+        and_(
+            EmailOutbox.status == EmailOutboxStatus.sending,
+            EmailOutbox.locked_until <= now,
+        ),
+    )
+
+
+def _claim_batch(db: Session, now: datetime, batch_size: int) -> list[EmailOutbox]:
+    candidate_ids = db.execute(
+        select(EmailOutbox.id)
+        .where(_claimable(now))
+        .order_by(EmailOutbox.next_attempt_at, EmailOutbox.id)
+        .limit(batch_size)
+    ).scalars().all()
+    claimed_ids = []
+    lease_until = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE_SECONDS)
+    for message_id in candidate_ids:
+        result = db.execute(
+            update(EmailOutbox)
+            .where(EmailOutbox.id == message_id, _claimable(now))
+            .values(
+                status=EmailOutboxStatus.sending,
+                locked_until=lease_until,
+                attempts=EmailOutbox.attempts + 1,
+            )
+        )
+        if result.rowcount:
+            claimed_ids.append(message_id)
+    db.commit()
+    if not claimed_ids:
+        return []
+    return db.query(EmailOutbox).filter(EmailOutbox.id.in_(claimed_ids)).all()
+
+
+def _chunks(db: Session, messages: list[EmailOutbox]) -> list[list[EmailOutbox]]:
+    """Group claimed messages into provider batches and record each one's batch.
+
+    A message that was handed to the provider before (e.g. the worker died
+    before recording the outcome) goes out again with the same companions, so
+    the batch's idempotency key repeats and the provider does not deliver it
+    twice. The grouping is committed before anything is sent.
+    """
+    chunks: dict[str, list[EmailOutbox]] = {}
+    fresh = []
+    for message in sorted(messages, key=lambda message: message.id):
+        if message.batch_key:
+            chunks.setdefault(message.batch_key, []).append(message)
+        else:
+            fresh.append(message)
+    for offset in range(0, len(fresh), RESEND_BATCH_LIMIT):
+        chunk = fresh[offset : offset + RESEND_BATCH_LIMIT]
+        batch_key = batch_idempotency_key([message.idempotency_key for message in chunk])
+        for message in chunk:
+            message.batch_key = batch_key
+        chunks[batch_key] = chunk
+    db.commit()
+    return list(chunks.values())
+
+
+def deliver_pending(
+    db: Session,
+    now: datetime | None = None,
+    batch_size: int | None = None,
+) -> dict:
+    current_time = now or datetime.utcnow()
+    messages = _claim_batch(
+        db, current_time, batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    )
+    if not messages:
+        return {"claimed": 0, "sent": 0, "retrying": 0, "dead": 0}
+
+    results = []
+    for chunk in _chunks(db, messages):
+        errors = send_email_batch(
+            [
+                (message.recipient, message.subject, message.html_body, message.text_body)
+                for message in chunk
+            ],
+            workers=settings.EMAIL_OUTBOX_WORKERS,
+            idempotency_keys=[message.idempotency_key for message in chunk],
+        )
+        results.extend(zip(chunk, errors))
+
+    sent = retrying = dead = 0
+    finished_at = datetime.utcnow() if now is None else current_time
+    for message, error in results:
+        message.locked_until = None
+        if error is None:
+            message.status = EmailOutboxStatus.sent
+            message.sent_at = finished_at
+            message.last_error = None
+            sent += 1
+            continue
+        message.last_error = error[:1000]
+        if message.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+            message.status = EmailOutboxStatus.dead
+            logger.error(
+                "Email outbox message %s dead-lettered after %s attempts: %s",
+                message.id,
+                message.attempts,
+                error,
+            )
+            dead += 1
+        else:
+            message.status = EmailOutboxStatus.pending
+            message.next_attempt_at = finished_at + _backoff(message.attempts)
+            retrying += 1
+    db.commit()
+    return {"claimed": len(messages), "sent": sent, "retrying": retrying, "dead": dead}
+
+
+def purge_sent(db: Session, now: datetime | None = None) -> int:
+    """Delete sent messages older than ``EMAIL_OUTBOX_RETENTION_DAYS``, in batches."""
+    cutoff = (now or datetime.utcnow()) - timedelta(days=settings.EMAIL_OUTBOX_RETENTION_DAYS)
+    removed = 0
+    while True:
+        batch = (
+            select(EmailOutbox.id)
+            .where(EmailOutbox.status == EmailOutboxStatus.sent, EmailOutbox.sent_at < cutoff)
+            .limit(settings.EMAIL_OUTBOX_BATCH_SIZE)
+        )
+        deleted = db.execute(
+            delete(EmailOutbox).where(EmailOutbox.id.in_(batch.scalar_subquery()))
+        ).rowcount
+        db.commit()
+        removed += deleted
+        if deleted < settings.EMAIL_OUTBOX_BATCH_SIZE:
+            return removed
+
+
+def process_email_outbox():
+    try:
+        db: Session = SessionLocal()
+    except Exception as exc:  # pragma: no cover - scheduler resilience
+        logger.warning("Email outbox unavailable: %s", exc)
+        return
+    try:
+        while deliver_pending(db)["claimed"] >= settings.EMAIL_OUTBOX_BATCH_SIZE:
+            continue
+        purge_sent(db)
+    except Exception as exc:  # pragma: no cover - scheduler resilience
+        db.rollback()
+        logger.warning("Email outbox run failed: %s", exc)
+    finally:
+        db.close()
@@ -0,0 +1,317 @@
+import logging
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from email.message import EmailMessage
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+
+logger = logging.getLogger("meditrack.email_transport")
+
+RESEND_EMAILS_URL = "https://api.resend.com/emails"
+RESEND_BATCH_URL = "https://api.resend.com/emails/batch"
+RESEND_BATCH_LIMIT = 100
+# Batch responses that reject the request's content rather than the caller.
+RESEND_VALIDATION_STATUSES = frozenset({400, 422})
+
+# Errors that mean the connection itself is unusable, as opposed to the
+# server rejecting this particular message.
+_CONNECTION_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+class SendRateLimited(RuntimeError):
+    """A send gave up waiting for its provider's rate limit."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``rate`` tokens per second, up to ``capacity``.
+
+    A non-positive ``rate`` disables limiting.
+    """
+
+    def __init__(self, rate: float, capacity: float, clock=time.monotonic) -> None:
+        self.rate = rate
+        self.capacity = max(1.0, capacity)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """Take a token if one is available, else return seconds until one is."""
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self, timeout: float | None = None) -> bool:
+        if self.rate <= 0:
+            return True
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self._reserve()
+            if not wait:
+                return True
+            if deadline is not None and self._clock() + wait > deadline:
+                return False
+            time.sleep(wait)
+
+    def throttle(self, timeout: float | None, provider: str) -> None:
+        if not self.acquire(timeout):
+            raise SendRateLimited(
+                f"{provider} rate limit of {self.rate:g}/s not available within {timeout}s"
+            )
+
+
+class SMTPConnectionPool:
+    """Bounded pool of authenticated SMTP connections.
+
+    Idle connections are reused LIFO. One that has sat idle longer than
+    ``SMTP_POOL_NOOP_AFTER_SECONDS`` is checked with NOOP before reuse, and
+    one idle longer than ``SMTP_POOL_MAX_IDLE_SECONDS`` is closed and
+    replaced, since most servers drop quiet sessions on their own.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str | None,
+        password: str | None,
+        use_tls: bool,
+        size: int,
+        timeout: float,
+        noop_after: float,
+        max_idle: float,
+        rate: float = 0,
+        smtp_class=smtplib.SMTP,
+    ) -> None:
+        self.config = (host, port, username, password, use_tls, size, timeout, rate)
+        self._host = host
+        self._port = port
+        self._username = username
+        self._password = password
+        self._use_tls = use_tls
+        self._timeout = timeout
+        self._noop_after = noop_after
+        self._max_idle = max_idle
+        self._smtp_class = smtp_class
+        self.limiter = TokenBucket(rate, capacity=max(1, size))
+        self._slots = threading.BoundedSemaphore(max(1, size))
+        self._idle: list[tuple[smtplib.SMTP, float]] = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self) -> smtplib.SMTP:
+        server = self._smtp_class(self._host, self._port, timeout=self._timeout)
+        try:
+            if self._use_tls:
+                server.starttls()
+            if self._username and self._password:
+                server.login(self._username, self._password)
+        except Exception:
+            self._discard(server)
+            raise
+        return server
+
+    @staticmethod
+    def _discard(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _is_healthy(self, server: smtplib.SMTP) -> bool:
+        try:
+            code, _ = server.noop()
+        except Exception:
+            return False
+        return code == 250
+
+    def _checkout(self) -> smtplib.SMTP:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                server, last_used = self._idle.pop()
+            idle_for = time.monotonic() - last_used
+            if idle_for > self._max_idle:
+                self._discard(server)
+                continue
+            if idle_for > self._noop_after and not self._is_healthy(server):
+                self._discard(server)
+                continue
+            return server
+        return self._connect()
+
+    def _checkin(self, server: smtplib.SMTP) -> None:
+        with self._lock:
+            if not self._closed:
+                self._idle.append((server, time.monotonic()))
+                return
+        self._discard(server)
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            server = self._checkout()
+            try:
+                yield server
+            except _CONNECTION_ERRORS:
+                self._discard(server)
+                raise
+            except Exception:
+                # A rejected message leaves the session usable once reset.
+                try:
+                    server.rset()
+                except Exception:
+                    self._discard(server)
+                else:
+                    self._checkin(server)
+                raise
+            self._checkin(server)
+        finally:
+            self._slots.release()
+
+    def send(self, message: EmailMessage) -> None:
+        """Send ``message``, reconnecting once if a pooled connection went stale."""
+        self.limiter.throttle(self._timeout, "SMTP")
+        for attempt in range(2):
+            try:
+                with self.connection() as server:
+                    server.send_message(message)
+                return
+            except _CONNECTION_ERRORS as exc:
+                if attempt:
+                    raise
+                logger.info("SMTP connection dropped, reconnecting: %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for server, _ in idle:
+            self._discard(server)
+
+
+class ResendTransport:
+    """Keep-alive HTTP session for the Resend API."""
+
+    def __init__(
+        self, api_key: str, pool_size: int, timeout: float, rate: float = 0
+    ) -> None:
+        self.config = (api_key, pool_size, timeout, rate)
+        self._timeout = timeout
+        self.limiter = TokenBucket(rate, capacity=max(1, pool_size))
+        self._headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Content-Type": "application/json",
+        }
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, pool_size))
+        self.session.mount("https://", adapter)
+
+    def _request_headers(self, idempotency_key: str | None) -> dict:
+        if not idempotency_key:
+            return self._headers
+        # Resend replays the original response for a repeated key, so a send
+        # retried after a crash does not deliver twice.
+        return {**self._headers, "Idempotency-Key": idempotency_key}
+
+    def send(self, payload: dict, idempotency_key: str | None = None):
+        self.limiter.throttle(self._timeout, "Resend")
+        return self.session.post(
+            RESEND_EMAILS_URL,
+            headers=self._request_headers(idempotency_key),
+            json=payload,
+            timeout=self._timeout,
+        )
+
+    def send_batch(self, payloads: list[dict], idempotency_key: str | None = None):
+        self.limiter.throttle(self._timeout, "Resend")
+        return self.session.post(
+            RESEND_BATCH_URL,
+            headers=self._request_headers(idempotency_key),
+            json=payloads,
+            timeout=self._timeout,
+        )
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_transport_lock = threading.Lock()
+_smtp_pool: SMTPConnectionPool | None = None
+_resend_transport: ResendTransport | None = None
+
+
+def get_smtp_pool(username: str | None) -> SMTPConnectionPool:
+    """Return the shared pool, rebuilding it if the SMTP settings changed."""
+    global _smtp_pool
+    config = (
+        settings.SMTP_HOST,
+        settings.SMTP_PORT,
+        username,
+        settings.SMTP_PASSWORD,
+        settings.SMTP_USE_TLS,
+        settings.SMTP_POOL_SIZE,
+        settings.EMAIL_TIMEOUT_SECONDS,
+        settings.SMTP_RATE_PER_SECOND,
+    )
+    with _transport_lock:
+        if _smtp_pool is None or _smtp_pool.config != config:
+            if _smtp_pool is not None:
+                _smtp_pool.close()
+            _smtp_pool = SMTPConnectionPool(
+                *config[:-1],
+                noop_after=settings.SMTP_POOL_NOOP_AFTER_SECONDS,
+                max_idle=settings.SMTP_POOL_MAX_IDLE_SECONDS,
+                rate=settings.SMTP_RATE_PER_SECOND,
+            )
+        return _smtp_pool
+
+
+def get_resend_transport() -> ResendTransport:
+    global _resend_transport
+    config = (
+        settings.RESEND_API_KEY,
+        settings.RESEND_POOL_SIZE,
+        settings.EMAIL_TIMEOUT_SECONDS,
+        settings.RESEND_RATE_PER_SECOND,
+    )
+    with _transport_lock:
+        if _resend_transport is None or _resend_transport.config != config:
+            if _resend_transport is not None:
+                _resend_transport.close()
+            _resend_transport = ResendTransport(*config)
+        return _resend_transport
+
+
+def close_transports() -> None:
+    global _smtp_pool, _resend_transport
+    with _transport_lock:
+        if _smtp_pool is not None:
+            _smtp_pool.close()
+        if _resend_transport is not None:
+            _resend_transport.close()
+        _smtp_pool = None
+        _resend_transport = None
@@ -0,0 +1,467 @@
+import json
+import logging
+import multiprocessing
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from app.core.config import settings
+from app.services.patient_pdf import render_to_file, snapshot_digest
+
+logger = logging.getLogger("meditrack.export_jobs")
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+ZIP_COPY_CHUNK_BYTES = 64 * 1024
+EXPORT_ID_HEADER = "X-Export-Id"
+EXPORT_FAILED_DETAIL = "Failed to generate patient record PDF."
+EXPORT_POLL_SECONDS = 0.1
+PENDING_SUFFIX = ".pending"
+FAILED_SUFFIX = ".failed"
+JOB_ID_PATTERN = re.compile(r"(\d+)-([0-9a-f]{64})")
+BULK_ID_PATTERN = re.compile(r"[0-9a-f]{32}")
+BULK_FIELDS = (
+    "id",
+    "owner_user_id",
+    "status",
+    "total",
+    "completed",
+    "failed",
+    "created_at",
+)
+
+
+class _ZipSink:
+    """Write-only buffer that lets ``zipfile`` emit an archive incrementally.
+
+    It has no ``seek``/``tell``, so ``zipfile`` falls back to data descriptors
+    and never rewinds; whatever it wrote so far can be drained and sent.
+    """
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportJobManager:
+    """Renders patient PDFs in worker processes behind a content-addressed cache.
+
+    The cache key is the digest of the export snapshot, so an unchanged record
+    is served straight from disk and edits invalidate it naturally. Concurrent
+    requests for the same digest share one render.
+
+    Job state lives on disk next to the PDF, not in this process: a job id is
+    ``<patient_id>-<digest>`` and its status is read from ``<digest>.pdf``
+    (done), ``<digest>.failed`` or a fresh ``<digest>.pending``. Bulk exports
+    keep their progress in ``bulk/<export_id>.json``. Any web worker that sees
+    ``EXPORT_CACHE_DIR`` can therefore answer for a job another one started.
+
+    The PDFs hold patient data, so they are filed per owner and patient. A
+    render for a new digest removes the patient's older copies, and
+    ``purge_patient``/``purge_owner`` remove them when the patient is edited
+    or deleted, or the account is deleted or reset.
+    """
+
+    def __init__(self, executor=None) -> None:
+        self._executor = executor
+        self._inflight: dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn: forking a threaded web process is unsafe.
+                self._executor = ProcessPoolExecutor(
+                    max_workers=max(1, settings.EXPORT_PROCESS_WORKERS),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    @property
+    def cache_dir(self) -> str:
+        return settings.EXPORT_CACHE_DIR
+
+    def _owner_dir(self, owner_user_id: int) -> str:
+        return os.path.join(self.cache_dir, str(owner_user_id))
+
+    def _patient_dir(self, owner_user_id: int, patient_id: int) -> str:
+        return os.path.join(self._owner_dir(owner_user_id), str(patient_id))
+
+    def cache_path(self, owner_user_id: int, patient_id: int, digest: str) -> str:
+        return os.path.join(self._patient_dir(owner_user_id, patient_id), f"{digest}.pdf")
+
+    def _marker(self, path: str, suffix: str) -> str:
+        return f"{path[: -len('.pdf')]}{suffix}"
+
+    def cached(self, owner_user_id: int, patient_id: int, snapshot: dict) -> str | None:
+        path = self.cache_path(owner_user_id, patient_id, snapshot_digest(snapshot))
+        return path if os.path.exists(path) else None
+
+    def purge_patient(self, owner_user_id: int, patient_id: int) -> None:
+        shutil.rmtree(self._patient_dir(owner_user_id, patient_id), ignore_errors=True)
+
+    def purge_owner(self, owner_user_id: int) -> None:
+        shutil.rmtree(self._owner_dir(owner_user_id), ignore_errors=True)
+
+    def _drop_stale(self, patient_dir: str, keep: str) -> None:
+        """Remove a patient's files for earlier snapshots that are not being rendered."""
+        try:
+            entries = list(os.scandir(patient_dir))
+        except FileNotFoundError:
+            return
+        cutoff = time.time() - settings.EXPORT_JOB_TTL_SECONDS
+        rendering = set()
+        for entry in entries:
+            try:
+                if entry.name.endswith(PENDING_SUFFIX) and entry.stat().st_mtime >= cutoff:
+                    rendering.add(entry.name[: -len(PENDING_SUFFIX)])
+            except OSError:
+                continue
+        for entry in entries:
+            digest = entry.name.split(".", 1)[0]
+            if digest == keep or digest in rendering:
+                continue
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+
+    def _prune(self) -> None:
+        self._prune_jobs()
+        self._prune_cache()
+
+    def _prune_jobs(self) -> None:
+        cutoff = time.time() - settings.EXPORT_JOB_TTL_SECONDS
+        try:
+            entries = list(os.scandir(self._bulk_dir))
+        except FileNotFoundError:
+            return
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+            except OSError:
+                continue
+
+    def _prune_cache(self) -> None:
+        # Walks the whole cache directory, so bulk exports run it once up front.
+        file_cutoff = time.time() - settings.EXPORT_CACHE_TTL_SECONDS
+        for root, dirs, files in os.walk(self.cache_dir, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                try:
+                    if os.stat(path).st_mtime < file_cutoff:
+                        os.remove(path)
+                except OSError:
+                    continue
+            if root != self.cache_dir:
+                try:
+                    os.rmdir(root)
+                except OSError:
+                    pass
+
+    def _claim(self, path: str) -> bool:
+        """Mark ``path`` as rendering; False while another process holds a fresh mark."""
+        marker = self._marker(path, PENDING_SUFFIX)
+        try:
+            os.remove(self._marker(path, FAILED_SUFFIX))
+        except FileNotFoundError:
+            pass
+        try:
+            os.close(os.open(marker, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            pass
+        try:
+            if os.stat(marker).st_mtime >= time.time() - settings.EXPORT_JOB_TTL_SECONDS:
+                return False
+        except FileNotFoundError:
+            pass
+        # The process that made the mark died mid-render; take it over.
+        open(marker, "a").close()
+        os.utime(marker)
+        return True
+
+    def _finish(self, job: dict, future: Future) -> None:
+        error = future.exception()
+        with self._lock:
+            if self._inflight.get(job["path"]) is future:
+                del self._inflight[job["path"]]
+                if error is not None:
+                    open(self._marker(job["path"], FAILED_SUFFIX), "a").close()
+                try:
+                    os.remove(self._marker(job["path"], PENDING_SUFFIX))
+                except FileNotFoundError:
+                    pass
+            if error is None:
+                job["status"] = JOB_DONE
+            else:
+                job["status"] = JOB_FAILED
+                job["error"] = EXPORT_FAILED_DETAIL
+        if error is not None:
+            logger.error("Patient export %s failed: %s", job["id"], error)
+
+    def _job(self, owner_user_id: int, patient_id: int, digest: str) -> dict:
+        return {
+            "id": f"{patient_id}-{digest}",
+            "owner_user_id": owner_user_id,
+            "patient_id": patient_id,
+            "digest": digest,
+            "path": self.cache_path(owner_user_id, patient_id, digest),
+            "status": JOB_PENDING,
+            "cached": False,
+            "error": None,
+            "future": None,
+            "created_at": datetime.utcnow(),
+        }
+
+    def submit(
+        self, owner_user_id: int, patient_id: int, snapshot: dict, prune: bool = True
+    ) -> dict:
+        if prune:
+            self._prune()
+        job = self._job(owner_user_id, patient_id, snapshot_digest(snapshot))
+        path = job["path"]
+        if os.path.exists(path):
+            os.utime(path)
+            job["status"] = JOB_DONE
+            job["cached"] = True
+            return job
+
+        patient_dir = os.path.dirname(path)
+        os.makedirs(patient_dir, exist_ok=True)
+        self._drop_stale(patient_dir, keep=job["digest"])
+        executor = self._get_executor()
+        with self._lock:
+            job["status"] = JOB_RUNNING
+            future = self._inflight.get(path)
+            if future is None:
+                if not self._claim(path):
+                    # Another process is rendering this snapshot; ``wait`` polls its marker.
+                    return job
+                future = executor.submit(render_to_file, snapshot, path)
+                self._inflight[path] = future
+            job["future"] = future
+        future.add_done_callback(lambda done: self._finish(job, done))
+        return job
+
+    def get(self, job_id: str, owner_user_id: int) -> dict | None:
+        """Resolve a job from the cache directory; None if unknown or expired."""
+        match = JOB_ID_PATTERN.fullmatch(job_id)
+        if match is None:
+            return None
+        job = self._job(owner_user_id, int(match[1]), match[2])
+        cutoff = time.time() - settings.EXPORT_JOB_TTL_SECONDS
+        for status_value, path in (
+            (JOB_DONE, job["path"]),
+            (JOB_FAILED, self._marker(job["path"], FAILED_SUFFIX)),
+            (JOB_RUNNING, self._marker(job["path"], PENDING_SUFFIX)),
+        ):
+            try:
+                modified = os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if status_value == JOB_RUNNING and modified < cutoff:
+                return None
+            job["status"] = status_value
+            job["created_at"] = datetime.utcfromtimestamp(modified)
+            if status_value == JOB_FAILED:
+                job["error"] = EXPORT_FAILED_DETAIL
+            return job
+        return None
+
+    def wait(self, job: dict, timeout: float | None = None) -> dict:
+        future = job["future"]
+        if future is not None:
+            future.exception(timeout=timeout)
+            # The done-callback may still be running on the pool's thread.
+            deadline = time.monotonic() + 1
+            while job["status"] == JOB_RUNNING and time.monotonic() < deadline:
+                time.sleep(0.005)
+            return job
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while job["status"] == JOB_RUNNING:
+            current = self.get(job["id"], job["owner_user_id"])
+            if current is None:
+                job["status"] = JOB_FAILED
+                job["error"] = EXPORT_FAILED_DETAIL
+            elif current["status"] != JOB_RUNNING:
+                job["status"] = current["status"]
+                job["error"] = current["error"]
+            elif deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(job["id"])
+            else:
+                time.sleep(EXPORT_POLL_SECONDS)
+        return job
+
+    @property
+    def _bulk_dir(self) -> str:
+        return os.path.join(self.cache_dir, "bulk")
+
+    def _bulk_path(self, export_id: str, suffix: str = ".json") -> str:
+        return os.path.join(self._bulk_dir, f"{export_id}{suffix}")
+
+    def _save_bulk(self, bulk: dict) -> None:
+        os.makedirs(self._bulk_dir, exist_ok=True)
+        path = self._bulk_path(bulk["id"])
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({field: bulk[field] for field in BULK_FIELDS}, handle, default=str)
+        os.replace(tmp_path, path)
+
+    def start_bulk(self, owner_user_id: int, total: int) -> dict:
+        self._prune()
+        bulk = {
+            "id": uuid.uuid4().hex,
+            "owner_user_id": owner_user_id,
+            "status": JOB_RUNNING,
+            "total": total,
+            "completed": 0,
+            "failed": 0,
+            "cancel_requested": False,
+            "created_at": datetime.utcnow(),
+        }
+        self._save_bulk(bulk)
+        return bulk
+
+    def get_bulk(self, export_id: str, owner_user_id: int) -> dict | None:
+        if BULK_ID_PATTERN.fullmatch(export_id) is None:
+            return None
+        try:
+            with open(self._bulk_path(export_id), encoding="utf-8") as handle:
+                bulk = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        if bulk["owner_user_id"] != owner_user_id:
+            return None
+        bulk["created_at"] = datetime.fromisoformat(bulk["created_at"])
+        bulk["cancel_requested"] = os.path.exists(self._bulk_path(export_id, ".cancel"))
+        return bulk
+
+    def cancel_bulk(self, export_id: str, owner_user_id: int) -> dict | None:
+        """Ask the process streaming ``export_id`` to stop after its current file."""
+        bulk = self.get_bulk(export_id, owner_user_id)
+        if bulk is None:
+            return None
+        open(self._bulk_path(export_id, ".cancel"), "a").close()
+        bulk["cancel_requested"] = True
+        return bulk
+
+    def _zip_entry(self, archive: zipfile.ZipFile, sink: _ZipSink, job: dict) -> Iterator[bytes]:
+        info = zipfile.ZipInfo(
+            f"patient_{job['patient_id']}_record.pdf",
+            date_time=job["created_at"].timetuple()[:6],
+        )
+        info.compress_type = zipfile.ZIP_DEFLATED
+        with open(job["path"], "rb") as source, archive.open(info, "w") as dest:
+            while chunk := source.read(ZIP_COPY_CHUNK_BYTES):
+                dest.write(chunk)
+                if data := sink.drain():
+                    yield data
+        yield sink.drain()
+
+    def iter_bulk_zip(self, bulk: dict, items: Iterable[tuple[int, dict]]) -> Iterator[bytes]:
+        """Render ``(patient_id, snapshot)`` items and stream a ZIP as each one finishes.
+
+        ``items`` is consumed lazily and at most twice the pool size is
+        submitted at once, so a cancelled export leaves little queued work
+        behind and unread items are never built. The archive ends with
+        ``manifest.json`` listing failures and whether the export was cancelled.
+        """
+        sink = _ZipSink()
+        archive = zipfile.ZipFile(sink, "w")
+        pending = iter(items)
+        upcoming = next(pending, None)
+        running: dict[Future, dict] = {}
+        failed: list[int] = []
+        window = max(1, settings.EXPORT_PROCESS_WORKERS) * 2
+        cancel_path = self._bulk_path(bulk["id"], ".cancel")
+        saved = (0, 0)
+        try:
+            while (upcoming or running) and not os.path.exists(cancel_path):
+                while upcoming and len(running) < window:
+                    patient_id, snapshot = upcoming
+                    upcoming = next(pending, None)
+                    job = self.submit(
+                        bulk["owner_user_id"], patient_id, snapshot, prune=False
+                    )
+                    if job["future"] is not None:
+                        running[job["future"]] = job
+                    elif self.wait(job)["status"] == JOB_DONE:
+                        yield from self._zip_entry(archive, sink, job)
+                        bulk["completed"] += 1
+                    else:
+                        failed.append(job["patient_id"])
+                        bulk["failed"] += 1
+                if running:
+                    done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        job = running.pop(future)
+                        if future.exception() is None:
+                            yield from self._zip_entry(archive, sink, job)
+                            bulk["completed"] += 1
+                        else:
+                            failed.append(job["patient_id"])
+                            bulk["failed"] += 1
+                if (bulk["completed"], bulk["failed"]) != saved:
+                    saved = (bulk["completed"], bulk["failed"])
+                    self._save_bulk(bulk)
+
+            cancelled = os.path.exists(cancel_path)
+            bulk["status"] = JOB_CANCELLED if cancelled else JOB_DONE
+            bulk["cancel_requested"] = cancelled
+            self._save_bulk(bulk)
+            archive.writestr(
+                "manifest.json",
+                json.dumps(
+                    {
+                        "total": bulk["total"],
+                        "exported": bulk["completed"],
+                        "failed_patient_ids": failed,
+                        "cancelled": cancelled,
+                    },
+                    indent=2,
+                ),
+            )
+            archive.close()
+            yield sink.drain()
+        finally:
+            if hasattr(pending, "close"):
+                # Release whatever the item generator holds (a cursor, a session).
+                pending.close()
+            if bulk["status"] == JOB_RUNNING:
+                # The client went away mid-stream.
+                bulk["status"] = JOB_CANCELLED
+                self._save_bulk(bulk)
+                logger.info("Bulk export %s cancelled after %s files", bulk["id"], bulk["completed"])
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+export_jobs = ExportJobManager()
@@ -0,0 +1,211 @@
+"""Patient record PDF rendering.
+
+Everything here works on a plain ``snapshot`` dict (see ``build_snapshot``) so
+rendering can run in a worker process without a database session.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from io import BytesIO
+from typing import BinaryIO
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+# Bump when the layout changes so cached PDFs are not served for old layouts.
+RENDERER_VERSION = 2
+
+HISTORY_CHUNK_ROWS = 200
+HISTORY_COL_WIDTHS = [150, 90, 90, 70, 160]
+
+# Building the sample stylesheet and table styles is not free; do it once per process.
+_STYLES = getSampleStyleSheet()
+_BODY = _STYLES["BodyText"]
+DEMOGRAPHICS_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, -1), colors.whitesmoke),
+        ("TEXTCOLOR", (0, 0), (-1, -1), colors.black),
+        ("FONTNAME", (0, 0), (0, -1), "Helvetica-Bold"),
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+)
+HISTORY_BODY_STYLE = TableStyle(
+    [
+        ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+    ]
+)
+HISTORY_TABLE_STYLE = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.black),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+    ],
+    parent=HISTORY_BODY_STYLE,
+)
+
+
+def _format_datetime(value: datetime) -> str:
+    formatted = value.strftime("%b %d, %Y %I:%M %p")
+    return formatted.replace(" 0", " ")
+
+
+def _format_time_range(start_time, end_time):
+    if not start_time:
+        return "—"
+    if not end_time:
+        return _format_datetime(start_time)
+    return f"{_format_datetime(start_time)} -\n{_format_datetime(end_time)}"
+
+
+def build_snapshot(
+    patient,
+    appointments,
+    clinic_name: str,
+    default_duration_minutes: int,
+) -> dict:
+    """Copy everything the PDF shows out of the ORM objects."""
+    rows = []
+    for appointment in appointments:
+        start_time = appointment.appointment_datetime
+        end_time = appointment.appointment_end_datetime
+        if start_time and not end_time:
+            end_time = start_time + timedelta(minutes=default_duration_minutes)
+        rows.append(
+            {
+                "start": start_time,
+                "end": end_time,
+                "doctor": appointment.doctor_name or "TBD",
+                "department": appointment.department or "—",
+                "status": appointment.status.value,
+                "notes": appointment.notes or "—",
+            }
+        )
+    return {
+        "clinic_name": clinic_name,
+        "patient": {
+            "id": patient.id,
+            "full_name": patient.full_name,
+            "date_of_birth": patient.date_of_birth or "—",
+            "sex": patient.sex or "—",
+            "email": patient.email or "—",
+            "phone": patient.phone or "—",
+            "address": patient.address or "—",
+            "notes": patient.notes or "—",
+        },
+        "appointments": rows,
+    }
+
+
+def snapshot_digest(snapshot: dict) -> str:
+    """Content hash of a snapshot; equal digests render identical records."""
+    canonical = json.dumps(
+        {"renderer": RENDERER_VERSION, "snapshot": snapshot},
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _cell(text: str, max_chars: int):
+    """Plain strings are drawn directly; only text that needs wrapping pays for a Paragraph."""
+    if len(text) <= max_chars and "\n" not in text:
+        return text
+    return Paragraph(escape(text), _BODY)
+
+
+def _history_tables(rows: list[dict]) -> list[Table]:
+    # Splitting one huge Table across pages is quadratic; fixed-size chunks keep
+    # layout linear in the number of appointments.
+    header = ["Start / End", "Doctor", "Department", "Status", "Notes"]
+    limits = [(width - 12) // 6 for width in HISTORY_COL_WIDTHS]
+    tables = []
+    for offset in range(0, max(len(rows), 1), HISTORY_CHUNK_ROWS):
+        data = [header] if offset == 0 else []
+        for row in rows[offset : offset + HISTORY_CHUNK_ROWS]:
+            data.append(
+                [
+                    _format_time_range(row["start"], row["end"]),
+                    _cell(row["doctor"], limits[1]),
+                    _cell(row["department"], limits[2]),
+                    _cell(row["status"], limits[3]),
+                    _cell(row["notes"], limits[4]),
+                ]
+            )
+        table = Table(data, colWidths=HISTORY_COL_WIDTHS, repeatRows=1 if offset == 0 else 0)
+        table.setStyle(HISTORY_TABLE_STYLE if offset == 0 else HISTORY_BODY_STYLE)
+        tables.append(table)
+    return tables
+
+
+def render_patient_pdf(
+    snapshot: dict,
+    target: BinaryIO | None = None,
+    exported_at: datetime | None = None,
+) -> bytes | None:
+    """Render into ``target`` (any writable binary file); returns bytes only without one."""
+    buffer = BytesIO() if target is None else None
+    doc = SimpleDocTemplate(
+        buffer if target is None else target,
+        pagesize=LETTER,
+        leftMargin=36,
+        rightMargin=36,
+        topMargin=36,
+        bottomMargin=36,
+    )
+    patient = snapshot["patient"]
+    story = [
+        Paragraph(escape(snapshot["clinic_name"]), _STYLES["Title"]),
+        Paragraph("Patient Record Export", _STYLES["Heading2"]),
+        Paragraph(
+            f"Exported {_format_datetime(exported_at or datetime.utcnow())} UTC",
+            _STYLES["Normal"],
+        ),
+        Spacer(1, 12),
+        Paragraph("Patient Demographics", _STYLES["Heading3"]),
+    ]
+    demographics = Table(
+        [
+            ["Full name", _cell(patient["full_name"], 58)],
+            ["Date of birth", str(patient["date_of_birth"])],
+            ["Sex", _cell(patient["sex"], 58)],
+            ["Email", _cell(patient["email"], 58)],
+            ["Phone", _cell(patient["phone"], 58)],
+            ["Address", _cell(patient["address"], 58)],
+        ],
+        colWidths=[140, 360],
+    )
+    demographics.setStyle(DEMOGRAPHICS_TABLE_STYLE)
+    story += [
+        demographics,
+        Spacer(1, 12),
+        Paragraph("Medical Notes", _STYLES["Heading3"]),
+        Paragraph(escape(patient["notes"]).replace("\n", "<br/>"), _BODY),
+        Spacer(1, 12),
+        Paragraph("Appointment History", _STYLES["Heading3"]),
+    ]
+    story += _history_tables(snapshot["appointments"])
+
+    doc.build(story)
+    return buffer.getvalue() if buffer is not None else None
+
+
+def render_to_file(snapshot: dict, path: str) -> str:
+    """Render into ``path`` atomically; the process-pool entry point."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as handle:
+            render_patient_pdf(snapshot, handle)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
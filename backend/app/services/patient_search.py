@@ -0,0 +1,481 @@
+"""Server-side patient search over name, email and phone.
+
+SQLite keeps an FTS5 ``trigram`` table (``patient_search``, rowid = patient
+id) that the patient routers update inside the same transaction as the write
+(``index_patient`` / ``unindex_patient``); bulk paths call
+``rebuild_owner_search_index``. Postgres uses a ``pg_trgm`` GIN expression
+index on ``patients`` (migration 0018) that the database maintains itself, so
+the sync calls are no-ops there.
+
+Each term must appear as a substring (which covers prefixes) of one of the
+searched fields. When nothing matches, the query falls back to trigram
+similarity so small typos still find the patient. Terms shorter than three
+characters cannot use a trigram index and are matched as word prefixes.
+
+Rebuild the SQLite index from the base table with::
+
+    python -m app.services.patient_search [--owner USER_ID]
+"""
+
+import argparse
+import json
+import logging
+import re
+
+from sqlalchemy import DDL, event, func, literal, text
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.patient import Patient
+
+logger = logging.getLogger("meditrack.patient_search")
+
+SEARCH_FIELDS = ("full_name", "first_name", "last_name", "email", "phone")
+MIN_TRIGRAM_TERM = 3
+MAX_TERMS = 8
+
+SEARCH_RANK_CANDIDATES = 200
+
+# Relevance weight per field, in SEARCH_FIELDS order.
+_FIELD_WEIGHTS = (3.0, 2.0, 2.0, 1.0, 1.0)
+_FTS_COLUMNS = "{full_name first_name last_name email phone}"
+# bm25 is lower for better matches; the owner column carries no weight.
+_SQLITE_RANK = "bm25(patient_search, 0.0, {})".format(", ".join(map(str, _FIELD_WEIGHTS)))
+
+SQLITE_CREATE = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS patient_search USING fts5("
+    "owner, full_name, first_name, last_name, email, phone, tokenize='trigram')"
+)
+SQLITE_DROP = "DROP TABLE IF EXISTS patient_search"
+
+# Must match the expression indexed by migration 0018 for the planner to use it.
+PG_DOCUMENT = (
+    "lower(coalesce(patients.full_name, '') || ' ' || coalesce(patients.first_name, '')"
+    " || ' ' || coalesce(patients.last_name, '') || ' ' || coalesce(patients.email, '')"
+    " || ' ' || coalesce(patients.phone, '') || ' '"
+    " || regexp_replace(coalesce(patients.phone, ''), '[^0-9]', '', 'g'))"
+)
+
+event.listen(
+    Patient.__table__, "after_create", DDL(SQLITE_CREATE).execute_if(dialect="sqlite")
+)
+event.listen(
+    Patient.__table__, "before_drop", DDL(SQLITE_DROP).execute_if(dialect="sqlite")
+)
+
+
+def _uses_fts(db: Session) -> bool:
+    return db.get_bind().dialect.name == "sqlite"
+
+
+def _digits(value: str) -> str:
+    return re.sub(r"[^0-9]", "", value)
+
+
+def _owner_token(owner_user_id: int | None) -> str:
+    # Delimited so the trigram phrase for owner 1 never matches owner 12.
+    return f"|{owner_user_id}|"
+
+
+def _document(patient: Patient) -> dict:
+    phone = patient.phone or ""
+    return {
+        "id": patient.id,
+        "owner": _owner_token(patient.owner_user_id),
+        "full_name": patient.full_name or "",
+        "first_name": patient.first_name or "",
+        "last_name": patient.last_name or "",
+        "email": patient.email or "",
+        "phone": f"{phone} {_digits(phone)}".strip(),
+    }
+
+
+def index_patient(db: Session, patient: Patient) -> None:
+    """Upsert ``patient`` into the search index (no commit)."""
+    if not _uses_fts(db):
+        return
+    db.flush()
+    db.execute(text("DELETE FROM patient_search WHERE rowid = :id"), {"id": patient.id})
+    db.execute(
+        text(
+            "INSERT INTO patient_search"
+            " (rowid, owner, full_name, first_name, last_name, email, phone)"
+            " VALUES (:id, :owner, :full_name, :first_name, :last_name, :email, :phone)"
+        ),
+        _document(patient),
+    )
+
+
+def unindex_patient(db: Session, patient_id: int) -> None:
+    if not _uses_fts(db):
+        return
+    db.execute(text("DELETE FROM patient_search WHERE rowid = :id"), {"id": patient_id})
+
+
+def rebuild_owner_search_index(db: Session, owner_user_id: int) -> None:
+    """Re-index every patient of an owner from the base table (no commit)."""
+    if not _uses_fts(db):
+        return
+    db.flush()
+    db.execute(
+        text("DELETE FROM patient_search WHERE owner MATCH :owner"),
+        {"owner": _quote(_owner_token(owner_user_id))},
+    )
+    patients = db.query(Patient).filter(Patient.owner_user_id == owner_user_id).yield_per(1000)
+    batch = []
+    for patient in patients:
+        batch.append(_document(patient))
+        if len(batch) >= 1000:
+            _insert_documents(db, batch)
+            batch = []
+    _insert_documents(db, batch)
+
+
+def _insert_documents(db: Session, documents: list[dict]) -> None:
+    if not documents:
+        return
+    db.execute(
+        text(
+            "INSERT INTO patient_search"
+            " (rowid, owner, full_name, first_name, last_name, email, phone)"
+            " VALUES (:id, :owner, :full_name, :first_name, :last_name, :email, :phone)"
+        ),
+        documents,
+    )
+
+
+def ensure_search_index(bind) -> None:
+    """Create and backfill the SQLite index for databases created before it existed."""
+    if bind.dialect.name != "sqlite":
+        return
+    with bind.connect() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'patient_search'")
+        ).first()
+    if exists:
+        return
+    with bind.begin() as connection:
+        connection.execute(text(SQLITE_CREATE))
+    with Session(bind=bind) as db:
+        backfill(db)
+
+
+def search_terms(query: str) -> list[str]:
+    terms = []
+    for raw in query.lower().split()[:MAX_TERMS]:
+        term = raw.strip("\"'()*,;")
+        # Phone numbers are indexed with and without punctuation.
+        if _digits(term) and not re.search(r"[a-z@]", term):
+            term = _digits(term)
+        if term:
+            terms.append(term)
+    return terms
+
+
+def _quote(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _trigrams(term: str) -> list[str]:
+    return sorted({term[index : index + 3] for index in range(len(term) - 2)})
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_word_prefix(term: str) -> str:
+    return f"% {_escape_like(term)}%"
+
+
+def _word_prefix_filter(term: str):
+    """Match ``term`` at the start of any word of any searched field (unindexed)."""
+    document = literal(" ")
+    for field in SEARCH_FIELDS:
+        document = document + func.coalesce(getattr(Patient, field), "") + " "
+    return document.ilike(_like_word_prefix(term), escape="\\")
+
+
+def _sqlite_match(owner_user_id: int, terms: list[str], fuzzy: bool) -> tuple[list[str], str, dict]:
+    """FTS ``MATCH`` clauses, extra SQL for short terms, and their parameters."""
+    clauses = [f"owner : {_quote(_owner_token(owner_user_id))}"]
+    params = {}
+    short_sql = ""
+    for index, term in enumerate(terms):
+        if len(term) < MIN_TRIGRAM_TERM:
+            short_sql += (
+                " AND (' ' || full_name || ' ' || first_name || ' ' || last_name"
+                f" || ' ' || email || ' ' || phone || ' ') LIKE :short_{index} ESCAPE '\\'"
+            )
+            params[f"short_{index}"] = _like_word_prefix(term)
+        elif not fuzzy:
+            clauses.append(f"{_FTS_COLUMNS} : {_quote(term)}")
+        else:
+            grams = _trigrams(term)
+            # Longer terms must share two trigrams, which keeps the candidate
+            # set small and still tolerates a typo; a typo in a short term
+            # can leave only one trigram intact.
+            if len(grams) <= 3:
+                options = [_quote(gram) for gram in grams]
+            else:
+                options = [
+                    f"({_quote(first)} AND {_quote(second)})"
+                    for position, first in enumerate(grams)
+                    for second in grams[position + 1 :]
+                ]
+            clauses.append(f"{_FTS_COLUMNS} : ({' OR '.join(options)})")
+    return clauses, short_sql, params
+
+
+def _sqlite_rows(
+    db: Session,
+    match: str,
+    short_sql: str,
+    params: dict,
+    limit: int,
+    skip: int = 0,
+    exclude: list[int] = (),
+) -> list[tuple]:
+    exclude_sql = " AND rowid NOT IN (SELECT value FROM json_each(:exclude))" if exclude else ""
+    statement = text(
+        "SELECT rowid, full_name, first_name, last_name, email, phone"
+        f" FROM patient_search WHERE patient_search MATCH :match{short_sql}{exclude_sql}"
+        f" ORDER BY {_SQLITE_RANK}, rowid LIMIT :limit OFFSET :skip"
+    )
+    return db.execute(
+        statement,
+        {
+            **params,
+            "match": match,
+            "limit": limit,
+            "skip": skip,
+            "exclude": json.dumps(list(exclude)),
+        },
+    ).all()
+
+
+def _sqlite_candidates(
+    db: Session,
+    owner_user_id: int,
+    terms: list[str],
+    limit: int,
+    fuzzy: bool,
+    skip: int = 0,
+    exclude: list[int] = (),
+) -> list[tuple]:
+    clauses, short_sql, params = _sqlite_match(owner_user_id, terms, fuzzy)
+    rows = []
+    if not fuzzy and not exclude:
+        # Fields that start with the longest term rank highest, so fetch those
+        # first; bm25 alone favours short fields over prefix matches.
+        anchor = max((term for term in terms if len(term) >= MIN_TRIGRAM_TERM), key=len)
+        anchored = [
+            f"{_FTS_COLUMNS} : ^{_quote(anchor)}" if clause == f"{_FTS_COLUMNS} : {_quote(anchor)}" else clause
+            for clause in clauses
+        ]
+        rows = _sqlite_rows(db, " AND ".join(anchored), short_sql, params, limit)
+        if len(rows) >= limit:
+            return rows
+    seen = {row[0] for row in rows}
+    general = _sqlite_rows(
+        db, " AND ".join(clauses), short_sql, params, limit, skip, exclude
+    )
+    return rows + [row for row in general if row[0] not in seen][: limit - len(rows)]
+
+
+def _pg_candidates(
+    db: Session,
+    owner_user_id: int,
+    terms: list[str],
+    limit: int,
+    fuzzy: bool,
+    skip: int = 0,
+    exclude: list[int] = (),
+) -> list[tuple]:
+    query = db.query(Patient.id, *(getattr(Patient, field) for field in SEARCH_FIELDS)).filter(
+        Patient.owner_user_id == owner_user_id
+    )
+    if exclude:
+        query = query.filter(Patient.id.notin_(exclude))
+    phrase = " ".join(terms)
+    if fuzzy:
+        query = query.filter(text(f":phrase <% {PG_DOCUMENT}").bindparams(phrase=phrase))
+    else:
+        for index, term in enumerate(terms):
+            if len(term) < MIN_TRIGRAM_TERM:
+                query = query.filter(_word_prefix_filter(term))
+            else:
+                query = query.filter(
+                    text(f"{PG_DOCUMENT} LIKE :term_{index}").bindparams(
+                        **{f"term_{index}": f"%{_escape_like(term)}%"}
+                    )
+                )
+    return (
+        query.order_by(
+            text(f"word_similarity(:rank_phrase, {PG_DOCUMENT}) DESC").bindparams(
+                rank_phrase=phrase
+            ),
+            Patient.id.asc(),
+        )
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def _prefix_candidates(
+    db: Session,
+    owner_user_id: int,
+    terms: list[str],
+    limit: int,
+    fuzzy: bool = False,
+    skip: int = 0,
+    exclude: list[int] = (),
+) -> list[tuple]:
+    # Ordered by id so the scan along the owner index stops once ``limit`` rows match.
+    query = db.query(Patient.id, *(getattr(Patient, field) for field in SEARCH_FIELDS)).filter(
+        Patient.owner_user_id == owner_user_id
+    )
+    if exclude:
+        query = query.filter(Patient.id.notin_(exclude))
+    for term in terms:
+        query = query.filter(_word_prefix_filter(term))
+    return query.order_by(Patient.id.asc()).offset(skip).limit(limit).all()
+
+
+_WORD_SEPARATORS = str.maketrans({char: " " for char in "@.,()+-_/"})
+
+
+def _score(fields: tuple, terms: list[str], fuzzy: bool) -> float:
+    """Field-weighted relevance: whole-field prefix > word prefix > substring."""
+    values = [
+        (weight, value.lower())
+        for weight, value in zip(_FIELD_WEIGHTS, fields)
+        if value
+    ]
+    spaced = [(weight, value, " " + value.translate(_WORD_SEPARATORS)) for weight, value in values]
+    score = 0.0
+    for term in terms:
+        best = 0.0
+        for weight, value, words in spaced:
+            if value.startswith(term):
+                match = 3.0
+            elif " " + term in words:
+                match = 2.0
+            elif term in value:
+                match = 1.0
+            elif fuzzy:
+                grams = set(_trigrams(term))
+                match = max(
+                    (len(grams & set(_trigrams(word))) / len(grams) for word in words.split()),
+                    default=0.0,
+                ) if grams else 0.0
+            else:
+                continue
+            best = max(best, weight * match)
+        score += best
+    return score
+
+
+def _load_in_order(
+    db: Session, owner_user_id: int, ids: list[int], options: tuple = ()
+) -> list[Patient]:
+    if not ids:
+        return []
+    patients = (
+        db.query(Patient)
+        .options(*options)
+        .filter(Patient.id.in_(ids), Patient.owner_user_id == owner_user_id)
+        .all()
+    )
+    by_id = {patient.id: patient for patient in patients}
+    return [by_id[patient_id] for patient_id in ids if patient_id in by_id]
+
+
+def search_patients(
+    db: Session,
+    owner_user_id: int,
+    query: str,
+    limit: int,
+    offset: int = 0,
+    options: tuple = (),
+) -> list[Patient]:
+    """Return up to ``limit`` of the owner's patients ranked by relevance.
+
+    The index's best ``SEARCH_RANK_CANDIDATES`` matches (bm25 on SQLite,
+    ``word_similarity`` on Postgres) are re-ranked here by field weight and
+    prefix; those fill the first pages. Later pages continue in the index's
+    own rank order, leaving out that window, so paging reaches every match.
+    ``options`` are loader options for the returned rows (e.g. ``load_only``).
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    cap = SEARCH_RANK_CANDIDATES
+    dialect = db.get_bind().dialect.name
+    has_trigram_term = any(len(term) >= MIN_TRIGRAM_TERM for term in terms)
+    fuzzy = False
+    if not has_trigram_term or dialect not in ("sqlite", "postgresql"):
+        fetch = _prefix_candidates
+        candidates = fetch(db, owner_user_id, terms, cap, fuzzy)
+    else:
+        fetch = _sqlite_candidates if dialect == "sqlite" else _pg_candidates
+        candidates = fetch(db, owner_user_id, terms, cap, fuzzy)
+        if not candidates:
+            fuzzy = True
+            candidates = fetch(db, owner_user_id, terms, cap, fuzzy)
+    ranked = sorted(
+        candidates,
+        key=lambda row: (
+            -_score(tuple(row[1:]), terms, fuzzy),
+            len(row[1] or ""),
+            (row[1] or "").lower(),
+            row[0],
+        ),
+    )
+    page = [row[0] for row in ranked[offset : offset + limit]]
+    if len(candidates) >= cap and len(page) < limit:
+        tail = fetch(
+            db,
+            owner_user_id,
+            terms,
+            limit - len(page),
+            fuzzy,
+            skip=max(0, offset - len(ranked)),
+            exclude=[row[0] for row in ranked],
+        )
+        page += [row[0] for row in tail]
+    return _load_in_order(db, owner_user_id, page, options)
+
+
+def backfill(db: Session, owner_user_id: int | None = None) -> int:
+    if owner_user_id is not None:
+        owner_ids = [owner_user_id]
+    else:
+        owner_ids = sorted(
+            owner
+            for (owner,) in db.query(Patient.owner_user_id).distinct()
+            if owner is not None
+        )
+    for owner in owner_ids:
+        rebuild_owner_search_index(db, owner)
+        db.commit()
+        logger.info("Rebuilt patient search index for owner %s", owner)
+    return len(owner_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild the patient search index.")
+    parser.add_argument("--owner", type=int, default=None, help="only this user id")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        rebuilt = backfill(db, args.owner)
+    finally:
+        db.close()
+    print(f"Rebuilt patient search index for {rebuilt} owner(s).")
+
+
+if __name__ == "__main__":
+    main()
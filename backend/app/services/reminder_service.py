@@ -1,18 +1,25 @@
 import logging
+import threading
+import uuid
+from collections.abc import Collection
 from datetime import datetime, timedelta
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, or_, select, update
+from sqlalchemy.orm import Session, joinedload
 
 from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
 from app.models.user import User, UserRole
-from app.services.email import EmailSendError, build_reminder_email, send_email
+from app.services.email import build_reminder_email, send_email_batch
+from app.services.sms import SmsSendError, build_reminder_sms, get_sms_provider, send_sms_batch
 
 logger = logging.getLogger("reminders")
 
+REMINDER_CHANNELS = ("email", "sms")
+DISPATCHABLE_STATUSES = (AppointmentStatus.confirmed, AppointmentStatus.scheduled)
+
 
 def _resolve_end_time(start_time, end_time):
     if not start_time:
@@ -31,49 +38,85 @@ def _get_clinic_name(db: Session) -> str:
     return clinic.clinic_name if clinic and clinic.clinic_name else settings.PROJECT_NAME
 
 
-def dispatch_reminders(db: Session, now: datetime | None = None) -> dict:
-    current_time = now or datetime.utcnow()
-    window_start = current_time
-    window_end = current_time + timedelta(hours=settings.REMINDER_WINDOW_HOURS)
-    lookahead_end = current_time + timedelta(
-        minutes=settings.REMINDER_LOOKAHEAD_MINUTES
-    )
-    if lookahead_end > window_end:
-        window_end = lookahead_end
+def channel_due_at(appointment: Appointment, channel: str) -> datetime | None:
+    """When ``channel``'s reminder should fire, or None if it never will."""
+    if not getattr(appointment, f"reminder_{channel}_enabled"):
+        return None
+    if getattr(appointment, f"reminder_{channel}_sent_at") is not None:
+        return None
+    minutes = getattr(appointment, f"reminder_{channel}_minutes_before")
+    if appointment.appointment_datetime is None or minutes is None:
+        return None
+    return appointment.appointment_datetime - timedelta(minutes=minutes)
 
-    appointments = (
-        db.query(Appointment)
-        .join(Patient)
-        .filter(
-            Appointment.status.in_(
-                [AppointmentStatus.confirmed, AppointmentStatus.scheduled]
-            ),
-            Appointment.reminder_sent_at.is_(None),
-            Appointment.appointment_datetime >= window_start,
-            Appointment.appointment_datetime <= window_end,
-            Patient.email.isnot(None),
-            Patient.email != "",
+
+def next_reminder_run_at(
+    appointment: Appointment, delivered: Collection[str] = ()
+) -> datetime | None:
+    due_times = [
+        due_at
+        for due_at in (
+            channel_due_at(appointment, channel)
+            for channel in REMINDER_CHANNELS
+            if channel not in delivered
         )
-        .all()
+        if due_at is not None
+    ]
+    return min(due_times) if due_times else None
+
+
+def _is_due(appointment: Appointment, channel: str, current_time: datetime) -> bool:
+    due_at = channel_due_at(appointment, channel)
+    return due_at is not None and due_at <= current_time
+
+
+def _owner_contexts(db: Session, appointments: list[Appointment]) -> dict:
+    """Template context per owner, loaded with one query for the whole batch."""
+    owner_ids = {appointment.owner_user_id for appointment in appointments}
+    clinic_names = dict(
+        db.execute(
+            select(User.id, User.clinic_name).where(
+                User.id.in_(owner_ids - {None})
+            )
+        ).all()
     )
+    contexts = {}
+    for owner_id in owner_ids:
+        if owner_id is None:
+            clinic_name = _get_clinic_name(db)
+        else:
+            clinic_name = clinic_names.get(owner_id) or settings.PROJECT_NAME
+        contexts[owner_id] = {"clinic_name": clinic_name}
+    return contexts
 
-    processed = len(appointments)
-    sent = 0
-    skipped = 0
 
-    for appointment in appointments:
+SENT = "sent"
+SKIPPED = "skipped"
+DEFERRED = "deferred"
+FAILED = "failed"
+
+
+def _send_email_reminders(jobs: list[tuple[Appointment, dict]]) -> list[str]:
+    """Render every due email in the batch and hand them to the transport at once.
+
+    ``send_email_batch`` fans SMTP sends out across ``REMINDER_SEND_WORKERS``
+    pooled connections, or uses Resend's batch endpoint. Either way each
+    provider's token bucket paces the requests.
+    """
+    outcomes = [SKIPPED] * len(jobs)
+    messages = []
+    positions = []
+    for position, (appointment, context) in enumerate(jobs):
         patient: Patient = appointment.patient
         recipient = patient.email.strip() if patient and patient.email else None
         if not recipient:
-            skipped += 1
             continue
         print(
             f"EMAIL_TRIGGER event=reminder appointment_id={appointment.id} patient_email={recipient}"
         )
-        clinic_name = _get_clinic_name(db)
         subject, html_body, text_body = build_reminder_email(
             patient.full_name,
-            clinic_name,
+            context["clinic_name"],
             appointment.appointment_datetime,
             _resolve_end_time(
                 appointment.appointment_datetime, appointment.appointment_end_datetime
@@ -82,21 +125,300 @@ def dispatch_reminders(db: Session, now: datetime | None = None) -> dict:
             appointment.department,
             appointment.notes,
         )
-        try:
-            send_email(recipient, subject, html_body, text_body)
-        except EmailSendError as exc:
-            logger.error("Reminder email failed: %s", exc)
-            skipped += 1
+        messages.append((recipient, subject, html_body, text_body))
+        positions.append(position)
+
+    errors = send_email_batch(messages, workers=settings.REMINDER_SEND_WORKERS)
+    for position, error in zip(positions, errors):
+        if error is None:
+            outcomes[position] = SENT
+            continue
+        logger.error(
+            "Reminder email for appointment %s failed: %s", jobs[position][0].id, error
+        )
+        outcomes[position] = FAILED
+    return outcomes
+
+
+def _send_sms_reminders(jobs: list[tuple[Appointment, dict]]) -> list[str]:
+    outcomes = [SKIPPED] * len(jobs)
+    messages = []
+    positions = []
+    for position, (appointment, context) in enumerate(jobs):
+        patient: Patient = appointment.patient
+        recipient = patient.phone.strip() if patient and patient.phone else None
+        if not recipient:
+            continue
+        messages.append(
+            (
+                recipient,
+                build_reminder_sms(
+                    patient.full_name,
+                    context["clinic_name"],
+                    appointment.appointment_datetime,
+                    appointment.doctor_name,
+                ),
+            )
+        )
+        positions.append(position)
+    if not messages:
+        return outcomes
+    try:
+        get_sms_provider()
+    except SmsSendError as exc:
+        # A misconfigured provider can be fixed; try these again later.
+        logger.error("SMS reminders deferred, provider unavailable: %s", exc)
+        for position in positions:
+            outcomes[position] = DEFERRED
+        return outcomes
+
+    errors = send_sms_batch(messages)
+    for position, error in zip(positions, errors):
+        if error is None:
+            outcomes[position] = SENT
             continue
-        appointment.reminder_sent_at = current_time
-        db.add(appointment)
-        sent += 1
+        logger.error(
+            "Reminder SMS for appointment %s failed: %s", jobs[position][0].id, error
+        )
+        outcomes[position] = FAILED
+    return outcomes
+
+
+CHANNEL_SENDERS = {"email": _send_email_reminders, "sms": _send_sms_reminders}
 
-    if sent:
+
+def _expire_stale_reminders(db: Session, current_time: datetime) -> None:
+    """Drop due-queue entries for appointments that can no longer be reminded."""
+    db.query(Appointment).filter(
+        Appointment.reminder_next_run_at <= current_time,
+        or_(
+            Appointment.appointment_datetime <= current_time,
+            Appointment.status.notin_(DISPATCHABLE_STATUSES),
+        ),
+    ).update({Appointment.reminder_next_run_at: None}, synchronize_session=False)
+
+
+def _claimable(current_time: datetime):
+    return and_(
+        Appointment.reminder_next_run_at <= current_time,
+        or_(
+            Appointment.reminder_locked_until.is_(None),
+            Appointment.reminder_locked_until <= current_time,
+        ),
+    )
+
+
+def _supports_skip_locked(db: Session) -> bool:
+    return db.get_bind().dialect.name in ("postgresql", "mysql", "mariadb")
+
+
+def _claim_batch(db: Session, current_time: datetime, claim_token: str) -> list[Appointment]:
+    """Lease a batch of due appointments to ``claim_token``.
+
+    On Postgres/MySQL the candidate rows are read ``FOR UPDATE SKIP LOCKED`` so
+    concurrent dispatchers split the queue instead of queueing behind each
+    other. SQLite has no row locks; there the conditional UPDATE is the guard,
+    since it re-checks the lease under SQLite's single writer lock.
+    """
+    candidates = (
+        select(Appointment.id)
+        .where(_claimable(current_time))
+        .order_by(Appointment.reminder_next_run_at.asc(), Appointment.id.asc())
+        .limit(settings.REMINDER_BATCH_SIZE)
+    )
+    if _supports_skip_locked(db):
+        candidates = candidates.with_for_update(skip_locked=True)
+    candidate_ids = db.execute(candidates).scalars().all()
+    if not candidate_ids:
         db.commit()
+        return []
+    db.execute(
+        update(Appointment)
+        .where(Appointment.id.in_(candidate_ids), _claimable(current_time))
+        .values(
+            reminder_locked_until=current_time
+            + timedelta(seconds=settings.REMINDER_LEASE_SECONDS),
+            reminder_locked_by=claim_token,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return (
+        db.query(Appointment)
+        .options(joinedload(Appointment.patient))
+        .populate_existing()
+        .filter(Appointment.reminder_locked_by == claim_token)
+        .order_by(Appointment.reminder_next_run_at.asc(), Appointment.id.asc())
+        .all()
+    )
+
+
+class _LeaseHeartbeat:
+    """Extends a claimed batch's leases while its sends are in flight.
+
+    Runs on its own connection so the renewals commit independently of the
+    dispatch session.
+    """
+
+    def __init__(self, bind, claim_token: str, lease_start) -> None:
+        self._bind = bind
+        self._claim_token = claim_token
+        self._lease_start = lease_start
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="reminder-lease-heartbeat", daemon=True
+        )
 
-    skipped += processed - sent
-    return {"processed": processed, "sent": sent, "skipped": skipped}
+    def _run(self) -> None:
+        interval = settings.REMINDER_LEASE_SECONDS / 3
+        while not self._stop.wait(interval):
+            lease_until = self._lease_start() + timedelta(
+                seconds=settings.REMINDER_LEASE_SECONDS
+            )
+            try:
+                with self._bind.begin() as connection:
+                    connection.execute(
+                        update(Appointment)
+                        .where(Appointment.reminder_locked_by == self._claim_token)
+                        .values(reminder_locked_until=lease_until)
+                    )
+            except Exception as exc:  # pragma: no cover - best effort
+                logger.warning("Reminder lease renewal failed: %s", exc)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def _retry_delay(
+    appointment: Appointment, outcomes: dict[str, str], current_time: datetime
+) -> timedelta:
+    """How long to wait before retrying a due channel that was not settled.
+
+    A failed send is retried after ``REMINDER_RETRY_MINUTES``. A channel whose
+    provider is unavailable backs off instead: each wait is as long as the
+    reminder is already overdue, capped at ``REMINDER_MAX_RETRY_MINUTES``.
+    """
+    retry = timedelta(minutes=settings.REMINDER_RETRY_MINUTES)
+    deferred = [channel for channel, outcome in outcomes.items() if outcome == DEFERRED]
+    if FAILED in outcomes.values() or not deferred:
+        return retry
+    overdue = max(
+        current_time - channel_due_at(appointment, channel) for channel in deferred
+    )
+    return min(max(overdue, retry), timedelta(minutes=settings.REMINDER_MAX_RETRY_MINUTES))
+
+
+def _record_outcome(
+    db: Session,
+    appointment: Appointment,
+    outcomes: dict[str, str],
+    current_time: datetime,
+    claim_token: str,
+) -> None:
+    # Sent channels and permanent skips (no recipient) are settled; failed and
+    # deferred (provider unavailable) channels are scheduled for a retry.
+    delivered = [channel for channel, outcome in outcomes.items() if outcome == SENT]
+    settled = [
+        channel for channel, outcome in outcomes.items() if outcome in (SENT, SKIPPED)
+    ]
+    next_run_at = next_reminder_run_at(appointment, settled)
+    if next_run_at is not None and next_run_at <= current_time:
+        next_run_at = current_time + _retry_delay(appointment, outcomes, current_time)
+    changes = {f"reminder_{channel}_sent_at": current_time for channel in delivered}
+    if delivered:
+        changes["reminder_sent_at"] = current_time
+    db.execute(
+        update(Appointment)
+        .where(
+            Appointment.id == appointment.id,
+            Appointment.reminder_locked_by == claim_token,
+        )
+        .values(
+            **changes,
+            reminder_next_run_at=next_run_at,
+            reminder_locked_until=None,
+            reminder_locked_by=None,
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _dispatch_batch(
+    db: Session,
+    appointments: list[Appointment],
+    current_time: datetime,
+    claim_token: str,
+    totals: dict,
+) -> None:
+    contexts = _owner_contexts(db, appointments)
+    outcomes_by_id = {appointment.id: {} for appointment in appointments}
+    for channel in REMINDER_CHANNELS:
+        due = [
+            appointment
+            for appointment in appointments
+            if _is_due(appointment, channel, current_time)
+        ]
+        if not due:
+            continue
+        outcomes = CHANNEL_SENDERS[channel](
+            [(appointment, contexts[appointment.owner_user_id]) for appointment in due]
+        )
+        totals["processed"] += len(due)
+        for appointment, outcome in zip(due, outcomes):
+            totals[outcome] += 1
+            outcomes_by_id[appointment.id][channel] = outcome
+    for appointment in appointments:
+        _record_outcome(
+            db, appointment, outcomes_by_id[appointment.id], current_time, claim_token
+        )
+    db.commit()
+
+
+def dispatch_reminders(db: Session, now: datetime | None = None) -> dict:
+    """Send every channel reminder whose fire time has passed.
+
+    Only rows whose ``reminder_next_run_at`` is due are read, straight off its
+    index, and each batch is leased to this run first so that any number of
+    workers can dispatch against the same database without double-sending.
+    Each channel is marked once delivered; ``reminder_next_run_at`` then moves
+    to the next unsent channel, or is pushed back by ``REMINDER_RETRY_MINUTES``
+    when a due channel failed. A channel whose provider is unavailable is
+    deferred with a growing delay (see ``_retry_delay``); one with no recipient
+    is skipped and not retried. A run that dies mid-batch
+    leaves its leases to expire after ``REMINDER_LEASE_SECONDS``.
+
+    A batch costs a constant number of reads: the claim, the appointments with
+    their patients, and one clinic lookup for all owners in the batch. Its
+    emails are sent concurrently, paced per provider.
+
+    Returns channel-reminder counts: ``processed`` = ``sent`` + ``skipped``
+    (no recipient) + ``deferred`` (provider unavailable) + ``failed``
+    (provider errors).
+    """
+    current_time = now or datetime.utcnow()
+    claim_token = uuid.uuid4().hex
+    totals = {"processed": 0, SENT: 0, SKIPPED: 0, DEFERRED: 0, FAILED: 0}
+
+    _expire_stale_reminders(db, current_time)
+    db.commit()
+
+    def lease_start() -> datetime:
+        return datetime.utcnow() if now is None else current_time
+
+    while True:
+        appointments = _claim_batch(db, current_time, claim_token)
+        if appointments:
+            with _LeaseHeartbeat(db.get_bind(), claim_token, lease_start):
+                _dispatch_batch(db, appointments, current_time, claim_token, totals)
+        if len(appointments) < settings.REMINDER_BATCH_SIZE:
+            break
+
+    return totals
 
 
 def process_reminders():
@@ -110,6 +432,3 @@ def process_reminders():
     finally:
         db.close()
 
-
-scheduler = BackgroundScheduler()
-scheduler.add_job(process_reminders, "interval", hours=1, id="reminder_job")
@@ -0,0 +1,108 @@
+import logging
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.db.session import engine
+from app.services.audit_archive import run_audit_retention
+from app.services.email_outbox import process_email_outbox
+from app.services.reminder_service import process_reminders
+
+logger = logging.getLogger("meditrack.scheduler")
+
+# Key of the Postgres advisory lock held by the worker that runs the jobs.
+SCHEDULER_LOCK_KEY = 0x4D454459
+
+
+def _job_defaults() -> dict:
+    return {
+        "coalesce": True,
+        "max_instances": 1,
+        "misfire_grace_time": settings.SCHEDULER_MISFIRE_GRACE_SECONDS,
+    }
+
+
+def register_jobs(scheduler) -> None:
+    """Add every background job; safe to call against a persistent job store."""
+    scheduler.add_job(
+        process_reminders,
+        "interval",
+        seconds=settings.REMINDER_POLL_SECONDS,
+        id="reminder_job",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        process_email_outbox,
+        "interval",
+        seconds=settings.EMAIL_OUTBOX_POLL_SECONDS,
+        id="email_outbox_job",
+        replace_existing=True,
+    )
+    scheduler.add_job(
+        run_audit_retention,
+        "interval",
+        seconds=settings.AUDIT_RETENTION_POLL_SECONDS,
+        id="audit_retention_job",
+        replace_existing=True,
+    )
+
+
+def build_scheduler(jobstore=None, scheduler_class=BackgroundScheduler):
+    """Create a scheduler with all jobs registered.
+
+    ``jobstore`` is an APScheduler job store; None keeps jobs in memory,
+    which is what the in-web scheduler uses.
+    """
+    jobstores = {"default": jobstore} if jobstore is not None else {}
+    scheduler = scheduler_class(jobstores=jobstores, job_defaults=_job_defaults())
+    register_jobs(scheduler)
+    return scheduler
+
+
+@contextmanager
+def scheduler_lock(bind: Engine, stop_event: threading.Event) -> Iterator[bool]:
+    """Hold the single-scheduler lock for the duration of the block.
+
+    APScheduler 3 does not coordinate schedulers that share a job store: each
+    one would run every job. On Postgres the worker takes a session advisory
+    lock first, so extra replicas wait as standbys and take over when the
+    active one exits. Yields False if ``stop_event`` is set while waiting.
+    Other databases are single-host and take no lock.
+    """
+    if bind.dialect.name != "postgresql":
+        yield True
+        return
+    connection = bind.connect()
+    try:
+        lock = text("SELECT pg_try_advisory_lock(:key)").bindparams(key=SCHEDULER_LOCK_KEY)
+        while not connection.execute(lock).scalar():
+            connection.commit()
+            logger.info("Another worker holds the scheduler lock; waiting")
+            if stop_event.wait(settings.SCHEDULER_LOCK_RETRY_SECONDS):
+                yield False
+                return
+        connection.commit()
+        try:
+            yield True
+        finally:
+            connection.execute(
+                text("SELECT pg_advisory_unlock(:key)").bindparams(key=SCHEDULER_LOCK_KEY)
+            )
+            connection.commit()
+    finally:
+        connection.close()
+
+
+def build_persistent_jobstore() -> SQLAlchemyJobStore:
+    if settings.SCHEDULER_JOBSTORE_URL:
+        return SQLAlchemyJobStore(url=settings.SCHEDULER_JOBSTORE_URL)
+    return SQLAlchemyJobStore(engine=engine)
+
+
+scheduler = build_scheduler()
@@ -0,0 +1,228 @@
+import json
+import logging
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from app.core.config import settings
+from app.services.email_transport import SendRateLimited, TokenBucket
+
+logger = logging.getLogger("meditrack.sms")
+
+SMS_MAX_LENGTH = 320
+
+
+class SmsSendError(RuntimeError):
+    pass
+
+
+def build_reminder_sms(
+    patient_name: str,
+    clinic_name: str,
+    start_time: datetime,
+    doctor: str | None,
+) -> str:
+    when = start_time.strftime("%b %d at %I:%M %p").replace(" 0", " ")
+    body = (
+        f"Hi {patient_name}, reminder: your appointment with {clinic_name}"
+        f" is on {when}"
+        f"{f' with {doctor}' if doctor else ''}. Contact the clinic to reschedule."
+    )
+    return body[:SMS_MAX_LENGTH]
+
+
+class SmsProvider(ABC):
+    """Delivers ``(to, body)`` messages; one error entry (or None) per message."""
+
+    name = "base"
+
+    @abstractmethod
+    def send_batch(self, messages: list[tuple[str, str]]) -> list[str | None]:
+        ...
+
+    def close(self) -> None:
+        pass
+
+
+class LogSmsProvider(SmsProvider):
+    """Development provider: prints each message instead of sending it."""
+
+    name = "dev"
+
+    def send_batch(self, messages: list[tuple[str, str]]) -> list[str | None]:
+        for to, body in messages:
+            print(f"SMS_DEV_MODE to={to} body={body[:160]}")
+        return [None] * len(messages)
+
+
+class FileSmsProvider(SmsProvider):
+    """Local stub: appends each message as a JSON line to ``path``."""
+
+    name = "file"
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+
+    def send_batch(self, messages: list[tuple[str, str]]) -> list[str | None]:
+        sent_at = datetime.utcnow().isoformat()
+        lines = "".join(
+            json.dumps({"to": to, "body": body, "sent_at": sent_at}) + "\n"
+            for to, body in messages
+        )
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as handle:
+                handle.write(lines)
+        except OSError as exc:
+            return [f"SMS stub write failed: {exc}"] * len(messages)
+        return [None] * len(messages)
+
+
+class HttpSmsProvider(SmsProvider):
+    """Posts batches to an HTTP gateway (or a local stub server).
+
+    Request body: ``{"from": ..., "messages": [{"to": ..., "body": ...}]}``.
+    A 2xx response marks the chunk delivered unless it carries a ``results``
+    list with per-message ``error`` entries; any other status fails the chunk.
+    """
+
+    name = "http"
+
+    def __init__(
+        self,
+        url: str,
+        api_key: str | None,
+        sender: str | None,
+        batch_size: int,
+        workers: int,
+        rate: float,
+        timeout: float,
+    ) -> None:
+        self.url = url
+        self.sender = sender
+        self.batch_size = max(1, batch_size)
+        self.workers = max(1, workers)
+        self.timeout = timeout
+        self.limiter = TokenBucket(rate, capacity=self.workers)
+        self.session = requests.Session()
+        self.session.mount(
+            url, HTTPAdapter(pool_connections=1, pool_maxsize=self.workers)
+        )
+        self.headers = {"Content-Type": "application/json"}
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+
+    def _send_chunk(self, chunk: list[tuple[str, str]]) -> list[str | None]:
+        try:
+            self.limiter.throttle(self.timeout, "SMS")
+            response = self.session.post(
+                self.url,
+                headers=self.headers,
+                json={
+                    "from": self.sender,
+                    "messages": [{"to": to, "body": body} for to, body in chunk],
+                },
+                timeout=self.timeout,
+            )
+        except (requests.RequestException, SendRateLimited) as exc:
+            logger.error("SMS batch of %s messages failed: %s", len(chunk), exc)
+            return [f"SMS request failed: {exc}"] * len(chunk)
+        if response.status_code >= 400:
+            preview = response.text.strip().replace("\n", " ")[:200]
+            logger.error("SMS gateway rejected batch (%s): %s", response.status_code, preview)
+            return [f"SMS gateway rejected the batch ({response.status_code})."] * len(chunk)
+        try:
+            results = response.json().get("results")
+        except (ValueError, AttributeError):
+            results = None
+        if not isinstance(results, list) or len(results) != len(chunk):
+            return [None] * len(chunk)
+        return [
+            result.get("error") if isinstance(result, dict) else None
+            for result in results
+        ]
+
+    def send_batch(self, messages: list[tuple[str, str]]) -> list[str | None]:
+        chunks = [
+            messages[offset : offset + self.batch_size]
+            for offset in range(0, len(messages), self.batch_size)
+        ]
+        if len(chunks) == 1:
+            return self._send_chunk(chunks[0])
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(chunks))) as pool:
+            return [error for errors in pool.map(self._send_chunk, chunks) for error in errors]
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_provider_lock = threading.Lock()
+_provider: SmsProvider | None = None
+_provider_config: tuple | None = None
+
+
+def get_sms_provider() -> SmsProvider:
+    """Return the shared provider, rebuilding it if the SMS settings changed."""
+    global _provider, _provider_config
+    name = (settings.SMS_PROVIDER or "dev").strip().lower()
+    if not settings.SMS_ENABLED or name in {"dev", "disabled"}:
+        name = "dev"
+    config = (
+        name,
+        settings.SMS_STUB_PATH,
+        settings.SMS_HTTP_URL,
+        settings.SMS_API_KEY,
+        settings.SMS_FROM,
+        settings.SMS_BATCH_SIZE,
+        settings.SMS_WORKERS,
+        settings.SMS_RATE_PER_SECOND,
+        settings.SMS_TIMEOUT_SECONDS,
+    )
+    with _provider_lock:
+        if _provider is not None and _provider_config == config:
+            return _provider
+        if _provider is not None:
+            _provider.close()
+        if name == "file":
+            _provider = FileSmsProvider(settings.SMS_STUB_PATH)
+        elif name == "http":
+            if not settings.SMS_HTTP_URL:
+                raise SmsSendError("SMS_HTTP_URL is not configured.")
+            _provider = HttpSmsProvider(*config[2:])
+        elif name == "dev":
+            _provider = LogSmsProvider()
+        else:
+            raise SmsSendError(f"Unknown SMS provider '{name}'.")
+        _provider_config = config
+        return _provider
+
+
+def send_sms_batch(messages: list[tuple[str, str]]) -> list[str | None]:
+    """Send ``(to, body)`` pairs; returns None per delivered message, else the error."""
+    if not messages:
+        return []
+    try:
+        provider = get_sms_provider()
+    except SmsSendError as exc:
+        logger.error("SMS provider unavailable: %s", exc)
+        return [str(exc)] * len(messages)
+    return provider.send_batch(messages)
+
+
+def send_sms(to: str, body: str) -> None:
+    error = send_sms_batch([(to, body)])[0]
+    if error:
+        raise SmsSendError(error)
+
+
+def close_sms_provider() -> None:
+    global _provider, _provider_config
+    with _provider_lock:
+        if _provider is not None:
+            _provider.close()
+        _provider = None
+        _provider_config = None
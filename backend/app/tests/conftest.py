@@ -3,12 +3,16 @@ from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+from app.core.config import settings
 from app.core.security import get_password_hash
 from app.core.limiter import limiter
+from app.core.password_pool import login_guard
+from app.core.principal_cache import clear_auth_caches
 from app.db.base import Base
 from app.db.session import get_db
 from app.main import app
 from app.models.user import User, UserRole
+from app.services.analytics_cache import analytics_cache
 
 SQLALCHEMY_DATABASE_URL = "sqlite:///./test.db"
 
@@ -25,6 +29,15 @@ def setup_db():
     Base.metadata.create_all(bind=engine)
     yield
     Base.metadata.drop_all(bind=engine)
+    analytics_cache.invalidate()
+    clear_auth_caches()
+    login_guard.reset()
+
+
+@pytest.fixture(autouse=True)
+def export_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_CACHE_DIR", str(tmp_path / "export_cache"))
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DIR", str(tmp_path / "audit_archive"))
 
 
 @pytest.fixture(autouse=True)
@@ -0,0 +1,113 @@
+import threading
+import time
+from datetime import date
+
+from app.services.analytics_cache import AnalyticsCache
+
+from .test_auth import get_admin_headers
+
+DAY = date(2030, 1, 1)
+
+
+def test_cache_hits_until_owner_is_invalidated():
+    cache = AnalyticsCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert cache.get_or_compute(1, DAY, compute) == {"n": 1}
+    assert cache.get_or_compute(1, DAY, compute) == {"n": 1}
+    assert cache.get_or_compute(2, DAY, compute) == {"n": 2}
+
+    cache.invalidate(1)
+    assert cache.get_or_compute(1, DAY, compute) == {"n": 3}
+    assert cache.get_or_compute(2, DAY, compute) == {"n": 2}
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_concurrent_misses_share_one_computation():
+    cache = AnalyticsCache()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return "value"
+
+    def request():
+        results.append(cache.get_or_compute(1, DAY, compute))
+
+    leader = threading.Thread(target=request)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=request) for _ in range(5)]
+    for thread in followers:
+        thread.start()
+    deadline = time.monotonic() + 5
+    while cache.stats()["coalesced"] < 5 and time.monotonic() < deadline:
+        time.sleep(0.001)
+    release.set()
+    for thread in [leader, *followers]:
+        thread.join(5)
+
+    assert calls == [1]
+    assert results == ["value"] * 6
+    assert cache.stats()["coalesced"] == 5
+
+
+def test_invalidation_during_computation_is_not_cached():
+    cache = AnalyticsCache()
+
+    def compute_then_write():
+        cache.invalidate(1)
+        return "stale"
+
+    assert cache.get_or_compute(1, DAY, compute_then_write) == "stale"
+    assert cache.get_or_compute(1, DAY, lambda: "fresh") == "fresh"
+
+
+def test_stats_can_be_scoped_to_one_owner():
+    cache = AnalyticsCache()
+    cache.get_or_compute(1, DAY, lambda: "one")
+    cache.get_or_compute(1, DAY, lambda: "one")
+    cache.get_or_compute(2, DAY, lambda: "two")
+    cache.invalidate(2)
+    cache.invalidate()
+
+    assert cache.stats(1) == {
+        "hits": 1,
+        "misses": 1,
+        "coalesced": 0,
+        "invalidations": 1,
+        "entries": 0,
+    }
+    assert cache.stats(2)["invalidations"] == 2
+    assert cache.stats(3)["misses"] == 0
+    assert cache.stats()["misses"] == 2
+
+
+def test_patient_write_invalidates_dashboard(client):
+    headers = get_admin_headers(client)
+    first = client.get("/api/v1/dashboard/analytics", headers=headers).json()
+    assert first["kpis"]["totalPatients"] == 0
+    cached = client.get("/api/v1/dashboard/analytics", headers=headers).json()
+    assert cached["meta"]["generatedAt"] == first["meta"]["generatedAt"]
+
+    client.post(
+        "/api/v1/patients/",
+        headers=headers,
+        json={"full_name": "Cache Patient", "email": "cache@example.com"},
+    )
+    refreshed = client.get("/api/v1/dashboard/analytics", headers=headers).json()
+    assert refreshed["kpis"]["totalPatients"] == 1
+
+    stats = client.get("/api/v1/dashboard/analytics/cache-stats", headers=headers).json()
+    assert stats["hits"] >= 1
+    assert stats["invalidations"] >= 1
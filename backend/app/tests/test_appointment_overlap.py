@@ -0,0 +1,162 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.patient import Patient
+from app.models.user import User
+from app.services.appointment_overlap import (
+    AppointmentIntervalIndex,
+    find_overlapping_appointment,
+    overlap_index,
+)
+
+from .test_auth import get_admin_headers
+
+BASE_TIME = datetime(2030, 1, 1, 9, 0, 0)
+
+
+def _create_patient(db_session) -> Patient:
+    admin = db_session.query(User).first()
+    patient = Patient(
+        full_name="Overlap Patient",
+        email="overlap@test.com",
+        owner_user_id=admin.id,
+    )
+    db_session.add(patient)
+    db_session.commit()
+    db_session.refresh(patient)
+    return patient
+
+
+def _add_appointment(db_session, patient, start, end=None, status=AppointmentStatus.unconfirmed):
+    appointment = Appointment(
+        patient_id=patient.id,
+        owner_user_id=patient.owner_user_id,
+        doctor_name="Dr. Overlap",
+        appointment_datetime=start,
+        appointment_end_datetime=end,
+        status=status,
+    )
+    db_session.add(appointment)
+    db_session.commit()
+    db_session.refresh(appointment)
+    return appointment
+
+
+def test_interval_index_finds_overlaps_and_ignores_touching_edges():
+    index = AppointmentIntervalIndex()
+    index.add(1, BASE_TIME, BASE_TIME + timedelta(minutes=30))
+    index.add(2, BASE_TIME + timedelta(hours=1), BASE_TIME + timedelta(hours=5))
+
+    assert index.find_overlap(BASE_TIME + timedelta(minutes=10), BASE_TIME + timedelta(minutes=20)) == 1
+    assert index.find_overlap(BASE_TIME + timedelta(minutes=30), BASE_TIME + timedelta(hours=1)) is None
+    assert index.find_overlap(BASE_TIME + timedelta(hours=4), BASE_TIME + timedelta(hours=6)) == 2
+    assert index.find_overlap(BASE_TIME + timedelta(hours=4), BASE_TIME + timedelta(hours=6), exclude_id=2) is None
+
+    index.discard(2)
+    assert len(index) == 1
+    assert index.find_overlap(BASE_TIME + timedelta(hours=4), BASE_TIME + timedelta(hours=6)) is None
+
+
+def test_query_only_matches_active_appointments_in_window(db_session):
+    patient = _create_patient(db_session)
+    _add_appointment(db_session, patient, BASE_TIME - timedelta(days=30))
+    _add_appointment(
+        db_session,
+        patient,
+        BASE_TIME,
+        BASE_TIME + timedelta(minutes=30),
+        status=AppointmentStatus.cancelled,
+    )
+    open_ended = _add_appointment(db_session, patient, BASE_TIME + timedelta(hours=2))
+
+    assert (
+        find_overlapping_appointment(
+            db_session,
+            patient.owner_user_id,
+            BASE_TIME,
+            BASE_TIME + timedelta(minutes=30),
+        )
+        is None
+    )
+    assert (
+        find_overlapping_appointment(
+            db_session,
+            patient.owner_user_id,
+            BASE_TIME + timedelta(hours=2, minutes=20),
+            BASE_TIME + timedelta(hours=3),
+        )
+        == open_ended.id
+    )
+    assert (
+        find_overlapping_appointment(
+            db_session,
+            patient.owner_user_id,
+            BASE_TIME + timedelta(hours=2, minutes=30),
+            BASE_TIME + timedelta(hours=3),
+        )
+        is None
+    )
+
+
+def test_query_finds_long_appointment_starting_before_window(db_session):
+    patient = _create_patient(db_session)
+    long_visit = _add_appointment(
+        db_session, patient, BASE_TIME, BASE_TIME + timedelta(hours=10)
+    )
+
+    assert (
+        find_overlapping_appointment(
+            db_session,
+            patient.owner_user_id,
+            BASE_TIME + timedelta(hours=9),
+            None,
+        )
+        == long_visit.id
+    )
+
+
+def test_appointment_longer_than_max_duration_rejected(client, db_session):
+    patient = _create_patient(db_session)
+    headers = get_admin_headers(client)
+    response = client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json={
+            "patient_id": patient.id,
+            "doctor_name": "Dr. Marathon",
+            "appointment_datetime": BASE_TIME.isoformat(),
+            "appointment_end_datetime": (
+                BASE_TIME
+                + timedelta(minutes=settings.APPOINTMENT_MAX_DURATION_MINUTES + 1)
+            ).isoformat(),
+            "status": "Unconfirmed",
+        },
+    )
+    assert response.status_code == 422
+
+
+def test_in_memory_index_tracks_router_writes(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "APPOINTMENT_OVERLAP_INDEX_ENABLED", True)
+    overlap_index.invalidate()
+    patient = _create_patient(db_session)
+    headers = get_admin_headers(client)
+    payload = {
+        "patient_id": patient.id,
+        "doctor_name": "Dr. Cache",
+        "appointment_datetime": BASE_TIME.isoformat(),
+        "appointment_end_datetime": (BASE_TIME + timedelta(minutes=30)).isoformat(),
+        "status": "Unconfirmed",
+    }
+    try:
+        first = client.post("/api/v1/appointments/", headers=headers, json=payload)
+        assert first.status_code == 201
+
+        blocked = client.post("/api/v1/appointments/", headers=headers, json=payload)
+        assert blocked.status_code == 400
+
+        client.patch(f"/api/v1/appointments/{first.json()['id']}/cancel", headers=headers)
+        allowed = client.post("/api/v1/appointments/", headers=headers, json=payload)
+        assert allowed.status_code == 201
+    finally:
+        overlap_index.invalidate()
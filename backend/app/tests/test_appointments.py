@@ -1,6 +1,11 @@
+import json
 from datetime import datetime, timedelta
 
-from app.api.v1 import appointments as appointments_api
+import msgpack
+
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
 from app.models.patient import Patient
 from app.models.user import User
 
@@ -61,6 +66,49 @@ def test_admin_lists_appointments_with_patient_details(client, db_session):
     assert response.json()[0]["patient"]["full_name"] == patient.full_name
 
 
+def test_normalized_appointment_list_includes_each_patient_once(client, db_session):
+    patient = _create_patient(db_session)
+    admin = db_session.query(User).first()
+    other = Patient(full_name="Second Patient", owner_user_id=admin.id)
+    db_session.add(other)
+    db_session.commit()
+    for index, patient_id in enumerate([patient.id, patient.id, other.id, patient.id]):
+        db_session.add(
+            Appointment(
+                patient_id=patient_id,
+                owner_user_id=admin.id,
+                doctor_name="Dr. Smith",
+                appointment_datetime=BASE_TIME + timedelta(hours=index),
+            )
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    response = client.get(
+        "/api/v1/appointments/", headers=headers, params={"normalize": "true"}
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert [row["patient_id"] for row in body["appointments"]] == [
+        patient.id,
+        patient.id,
+        other.id,
+        patient.id,
+    ]
+    assert all("patient" not in row for row in body["appointments"])
+    assert [row["full_name"] for row in body["patients"]] == [
+        "Appointment Patient",
+        "Second Patient",
+    ]
+
+    response = client.get(
+        "/api/v1/appointments/",
+        headers=headers,
+        params={"normalize": "true", "fields": "doctor_name"},
+    )
+    assert set(response.json()["appointments"][0]) == {"id", "doctor_name", "patient_id"}
+
+
 def test_admin_can_cancel_appointment(client, db_session):
     patient = _create_patient(db_session)
     headers = get_admin_headers(client)
@@ -322,19 +370,16 @@ def test_null_end_time_uses_default_duration(client, db_session):
     )
 
 
-def test_email_sent_on_create_update_and_cancel(client, db_session, monkeypatch):
+def test_email_queued_on_create_update_and_cancel(client, db_session):
     patient = _create_patient(db_session)
     patient.email = "notify@example.com"
     db_session.add(patient)
     db_session.commit()
     db_session.refresh(patient)
     headers = get_admin_headers(client)
-    sent = []
 
-    def fake_send_email(to, subject, html_body, text_body=None):
-        sent.append({"to": to, "subject": subject})
-
-    monkeypatch.setattr(appointments_api, "send_email", fake_send_email)
+    def queued():
+        return db_session.query(EmailOutbox).all()
 
     create_response = client.post(
         "/api/v1/appointments/",
@@ -349,7 +394,7 @@ def test_email_sent_on_create_update_and_cancel(client, db_session, monkeypatch)
     )
     assert create_response.status_code == 201
     appointment_id = create_response.json()["id"]
-    assert len(sent) == 0
+    assert len(queued()) == 0
 
     confirm_response = client.patch(
         f"/api/v1/appointments/{appointment_id}",
@@ -357,7 +402,7 @@ def test_email_sent_on_create_update_and_cancel(client, db_session, monkeypatch)
         json={"status": "Confirmed"},
     )
     assert confirm_response.status_code == 200
-    assert len(sent) == 1
+    assert len(queued()) == 1
 
     update_response = client.patch(
         f"/api/v1/appointments/{appointment_id}",
@@ -368,28 +413,62 @@ def test_email_sent_on_create_update_and_cancel(client, db_session, monkeypatch)
         },
     )
     assert update_response.status_code == 200
-    assert len(sent) == 2
+    assert len(queued()) == 2
 
     cancel_response = client.patch(
         f"/api/v1/appointments/{appointment_id}/cancel", headers=headers
     )
     assert cancel_response.status_code == 200
-    assert len(sent) == 3
+    messages = queued()
+    assert len(messages) == 3
+    assert {message.recipient for message in messages} == {"notify@example.com"}
+    assert all(message.status == EmailOutboxStatus.pending for message in messages)
+    assert len({message.idempotency_key for message in messages}) == 3
+
 
 
-def test_no_email_sent_when_patient_missing_email(client, db_session, monkeypatch):
+def test_repeated_events_with_identical_emails_are_all_queued(client, db_session):
+    patient = _create_patient(db_session)
+    patient.email = "repeat@example.com"
+    db_session.add(patient)
+    db_session.commit()
+    headers = get_admin_headers(client)
+    appointment_id = client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json={
+            "patient_id": patient.id,
+            "doctor_name": "Dr. Repeat",
+            "appointment_datetime": (BASE_TIME + timedelta(hours=9)).isoformat(),
+            "status": "Unconfirmed",
+        },
+    ).json()["id"]
+
+    statuses = ["Confirmed", "Unconfirmed", "Confirmed", "Cancelled", "Unconfirmed", "Cancelled"]
+    for status in statuses:
+        response = client.patch(
+            f"/api/v1/appointments/{appointment_id}",
+            headers=headers,
+            json={"status": status},
+        )
+        assert response.status_code == 200
+
+    subjects = [message.subject for message in db_session.query(EmailOutbox).all()]
+    assert len(subjects) == 4
+    assert subjects[0] == subjects[1]
+    assert subjects[2] == subjects[3]
+
+
+def test_no_email_queued_when_patient_missing_email(client, db_session):
     patient = _create_patient(db_session)
     patient.email = None
     db_session.add(patient)
     db_session.commit()
     db_session.refresh(patient)
     headers = get_admin_headers(client)
-    sent = []
 
-    def fake_send_email(to, subject, html_body, text_body=None):
-        sent.append({"to": to, "subject": subject})
-
-    monkeypatch.setattr(appointments_api, "send_email", fake_send_email)
+    def queued():
+        return db_session.query(EmailOutbox).all()
 
     create_response = client.post(
         "/api/v1/appointments/",
@@ -403,7 +482,7 @@ def test_no_email_sent_when_patient_missing_email(client, db_session, monkeypatc
         },
     )
     assert create_response.status_code == 201
-    assert len(sent) == 0
+    assert len(queued()) == 0
 
     confirm_response = client.patch(
         f"/api/v1/appointments/{create_response.json()['id']}",
@@ -411,4 +490,161 @@ def test_no_email_sent_when_patient_missing_email(client, db_session, monkeypatc
         json={"status": "Confirmed"},
     )
     assert confirm_response.status_code == 200
-    assert len(sent) == 0
+    assert len(queued()) == 0
+
+
+def _seed_appointments(db_session, patient, count: int, **overrides):
+    appointments = []
+    for offset in range(count):
+        values = {
+            "patient_id": patient.id,
+            "owner_user_id": patient.owner_user_id,
+            "doctor_name": "Dr. Page",
+            "department": "General",
+            "appointment_datetime": BASE_TIME + timedelta(hours=offset),
+            "status": AppointmentStatus.unconfirmed,
+        }
+        values.update(overrides)
+        appointments.append(Appointment(**values))
+    db_session.add_all(appointments)
+    db_session.commit()
+    return appointments
+
+
+def test_list_appointments_keyset_pagination(client, db_session):
+    patient = _create_patient(db_session)
+    _seed_appointments(db_session, patient, 5)
+    headers = get_admin_headers(client)
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/appointments/", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(item["appointment_datetime"] for item in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+
+def test_list_appointments_filters_and_total(client, db_session):
+    patient = _create_patient(db_session)
+    _seed_appointments(db_session, patient, 3)
+    _seed_appointments(
+        db_session,
+        patient,
+        2,
+        doctor_name="Dr. Filter",
+        department="Cardiology",
+        status=AppointmentStatus.confirmed,
+    )
+    headers = get_admin_headers(client)
+
+    response = client.get(
+        "/api/v1/appointments/",
+        headers=headers,
+        params={
+            "status": "Confirmed",
+            "doctor_name": "Dr. Filter",
+            "department": "Cardiology",
+            "include_total": "true",
+        },
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 2
+    assert response.headers["X-Total-Count"] == "2"
+    assert response.headers["X-Total-Count-Estimated"] == "false"
+
+    window = client.get(
+        "/api/v1/appointments/",
+        headers=headers,
+        params={
+            "date_from": BASE_TIME.isoformat(),
+            "date_to": (BASE_TIME + timedelta(hours=1)).isoformat(),
+        },
+    )
+    assert len(window.json()) == 4
+
+
+def test_list_appointments_rejects_invalid_cursor(client):
+    headers = get_admin_headers(client)
+    response = client.get(
+        "/api/v1/appointments/", headers=headers, params={"cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+
+
+def test_appointment_list_negotiates_msgpack(client, db_session):
+    patient = _create_patient(db_session)
+    admin = db_session.query(User).first()
+    for index in range(3):
+        db_session.add(
+            Appointment(
+                patient_id=patient.id,
+                owner_user_id=admin.id,
+                doctor_name="Dr. Pack",
+                appointment_datetime=BASE_TIME + timedelta(hours=index),
+            )
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    json_response = client.get(
+        "/api/v1/appointments/", headers=headers, params={"limit": 2}
+    )
+    packed_response = client.get(
+        "/api/v1/appointments/",
+        headers={**headers, "Accept": "application/msgpack"},
+        params={"limit": 2},
+    )
+    assert packed_response.status_code == 200
+    assert packed_response.headers["content-type"] == "application/msgpack"
+    assert packed_response.headers["x-next-cursor"] == json_response.headers["x-next-cursor"]
+    assert msgpack.unpackb(packed_response.content) == json_response.json()
+    assert json_response.json()[0]["appointment_datetime"] == "2030-01-01T09:00:00"
+
+
+def test_appointment_list_streams_json_array(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 2)
+    patient = _create_patient(db_session)
+    admin = db_session.query(User).first()
+    for index in range(5):
+        db_session.add(
+            Appointment(
+                patient_id=patient.id,
+                owner_user_id=admin.id,
+                doctor_name="Dr. Stream",
+                appointment_datetime=BASE_TIME + timedelta(hours=index),
+            )
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    listed = client.get(
+        "/api/v1/appointments/", headers=headers, params={"normalize": "true"}
+    ).json()["appointments"]
+    streamed = client.get(
+        "/api/v1/appointments/", headers=headers, params={"stream": "json", "limit": 1}
+    )
+    assert streamed.status_code == 200
+    assert streamed.json() == listed
+
+    first_page = client.get("/api/v1/appointments/", headers=headers, params={"limit": 2})
+    rest = client.get(
+        "/api/v1/appointments/",
+        headers=headers,
+        params={
+            "stream": "ndjson",
+            "fields": "doctor_name",
+            "cursor": first_page.headers["x-next-cursor"],
+        },
+    )
+    rows = [json.loads(line) for line in rest.text.splitlines()]
+    assert [row["id"] for row in rows] == [row["id"] for row in listed[2:]]
+    assert set(rows[0]) == {"id", "doctor_name", "patient_id"}
@@ -1,8 +1,23 @@
-from datetime import datetime, timedelta
+import json
+import os
+from datetime import date, datetime, timedelta
 
+from sqlalchemy import event
+
+from app.core.config import settings
 from app.core.security import get_password_hash
+from app.models.audit_log import AuditLog, AuditLogArchive
 from app.models.user import User, UserRole
+from app.services import audit_archive, audit_log
+from app.services.audit_archive import (
+    apply_retention,
+    archive_path,
+    archived_paths,
+    purge_owner_archives,
+)
+from app.services.audit_log import AuditLogWriter
 
+from .conftest import TestingSessionLocal
 from .test_auth import get_admin_headers
 
 
@@ -118,3 +133,248 @@ def test_audit_logs_filtering(client):
     )
     assert filtered.status_code == 200
     assert all(log["entity_type"] == "patient" for log in filtered.json())
+
+
+def test_patch_appointment_writes_audit_in_single_commit(client, db_session):
+    headers = get_admin_headers(client)
+    patient_id = client.post(
+        "/api/v1/patients/",
+        headers=headers,
+        json={"full_name": "Commit Patient", "email": "commit@example.com"},
+    ).json()["id"]
+    appointment_id = client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json={
+            "patient_id": patient_id,
+            "doctor_name": "Dr. Commit",
+            "appointment_datetime": (datetime.utcnow() + timedelta(days=3)).isoformat(),
+            "status": "Confirmed",
+            "reminder_email_enabled": True,
+        },
+    ).json()["id"]
+
+    commits = []
+
+    def on_commit(session):
+        commits.append(session)
+
+    event.listen(db_session, "after_commit", on_commit)
+    try:
+        response = client.patch(
+            f"/api/v1/appointments/{appointment_id}",
+            headers=headers,
+            json={"status": "Cancelled"},
+        )
+    finally:
+        event.remove(db_session, "after_commit", on_commit)
+
+    assert response.status_code == 200
+    assert len(commits) == 1
+    actions = {
+        log.action
+        for log in db_session.query(AuditLog)
+        .filter(AuditLog.entity_id == appointment_id)
+        .all()
+    }
+    assert {"appointment.cancel", "appointment.reminder_disabled_auto"} <= actions
+
+
+def test_write_behind_writer_batches_and_drains(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_LOG_BATCH_SIZE", 3)
+    monkeypatch.setattr(settings, "AUDIT_LOG_FLUSH_SECONDS", 60)
+    admin = db_session.query(User).first()
+    writer = AuditLogWriter(session_factory=TestingSessionLocal)
+    monkeypatch.setattr(audit_log, "audit_writer", writer)
+    monkeypatch.setattr(settings, "AUDIT_LOG_WRITE_BEHIND", True)
+
+    def count() -> int:
+        db_session.expire_all()
+        return db_session.query(AuditLog).filter(AuditLog.action == "test.event").count()
+
+    try:
+        for _ in range(3):
+            audit_log.log_event(db_session, admin, action="test.event", entity_type="test")
+        writer.flush()
+        assert count() == 3
+
+        audit_log.log_event(db_session, admin, action="test.event", entity_type="test")
+        assert not db_session.new
+    finally:
+        writer.stop()
+    assert count() == 4
+
+
+def test_audit_logs_stream_as_ndjson(client, monkeypatch):
+    monkeypatch.setattr(settings, "STREAM_CHUNK_SIZE", 2)
+    headers = get_admin_headers(client)
+    for index in range(3):
+        client.post(
+            "/api/v1/patients/",
+            headers=headers,
+            json={"full_name": f"Stream Patient {index}"},
+        )
+
+    listed = client.get("/api/v1/audit-logs/", headers=headers).json()
+    streamed = client.get(
+        "/api/v1/audit-logs/?stream=ndjson&limit=1", headers=headers
+    )
+    assert streamed.status_code == 200
+    assert streamed.headers["content-type"] == "application/x-ndjson"
+    assert [json.loads(line) for line in streamed.text.splitlines()] == listed
+
+
+def test_audit_logs_page_with_before_cursor(client, db_session):
+    admin = db_session.query(User).first()
+    stamp = datetime(2030, 1, 1, 9, 0)
+    for index in range(5):
+        db_session.add(
+            AuditLog(
+                owner_user_id=admin.id,
+                created_at=stamp + timedelta(minutes=index // 2),
+                action="patient.update",
+                entity_type="patient",
+                entity_id=index,
+            )
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    everything = client.get(
+        "/api/v1/audit-logs/?limit=200&entity_type=patient", headers=headers
+    )
+    assert "x-next-cursor" not in everything.headers
+
+    seen = []
+    params = {"limit": 2, "entity_type": "patient"}
+    while True:
+        response = client.get("/api/v1/audit-logs/", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(log["id"] for log in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        params["before"] = cursor
+    assert seen == [log["id"] for log in everything.json()]
+    assert len(seen) == 5
+
+    response = client.get("/api/v1/audit-logs/?before=not-a-cursor", headers=headers)
+    assert response.status_code == 400
+
+
+def test_retention_archives_old_months_and_listing_reads_them(
+    client, db_session, monkeypatch
+):
+    monkeypatch.setattr(settings, "AUDIT_RETENTION_MONTHS", 2)
+    monkeypatch.setattr(settings, "AUDIT_ARCHIVE_DELETE_BATCH", 2)
+    admin = db_session.query(User).first()
+    stamps = [datetime(2029, month, 10, 12, 0) for month in (1, 1, 1, 3, 3)]
+    stamps += [datetime(2029, 12, 5, 8, 0), datetime(2030, 1, 2, 8, 0)]
+    for index, stamp in enumerate(stamps):
+        db_session.add(
+            AuditLog(
+                owner_user_id=admin.id,
+                created_at=stamp,
+                action="patient.update" if index % 2 else "patient.create",
+                entity_type="patient",
+                entity_id=index,
+            )
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    everything = client.get(
+        "/api/v1/audit-logs/?limit=200&entity_type=patient", headers=headers
+    ).json()
+    updates = client.get(
+        "/api/v1/audit-logs/?limit=200&action=patient.update", headers=headers
+    ).json()
+
+    archived = apply_retention(db_session, now=datetime(2030, 1, 15))
+    assert {(entry["month"].isoformat(), entry["row_count"]) for entry in archived} >= {
+        ("2029-01-01", 3),
+        ("2029-03-01", 2),
+    }
+    hot = db_session.query(AuditLog).filter(AuditLog.entity_type == "patient").count()
+    assert hot == 2
+    paths = [record.path for record in db_session.query(AuditLogArchive)]
+    assert paths and all(os.path.exists(path) for path in paths)
+
+    # A cursor inside February never opens the March file.
+    opened = archived_paths(db_session, admin.id, before=datetime(2029, 2, 1))
+    assert archive_path(admin.id, date(2029, 1, 1)) in opened
+    assert archive_path(admin.id, date(2029, 3, 1)) not in opened
+
+    # A second pass finds nothing left to archive.
+    assert apply_retention(db_session, now=datetime(2030, 1, 15)) == []
+
+    seen = []
+    params = {"limit": 2, "entity_type": "patient"}
+    while True:
+        response = client.get("/api/v1/audit-logs/", headers=headers, params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            break
+        params["before"] = cursor
+    assert seen == everything
+
+    assert (
+        client.get("/api/v1/audit-logs/?limit=200&action=patient.update", headers=headers).json()
+        == updates
+    )
+    since = client.get(
+        "/api/v1/audit-logs/?limit=200&entity_type=patient&since=2029-03-01T00:00:00",
+        headers=headers,
+    ).json()
+    assert [log["entity_id"] for log in since] == [6, 5, 4, 3]
+
+    streamed = client.get(
+        "/api/v1/audit-logs/?stream=ndjson&entity_type=patient", headers=headers
+    )
+    assert [json.loads(line) for line in streamed.text.splitlines()] == everything
+
+    # Files outlive a rolled-back purge and go with a committed one.
+    assert purge_owner_archives(db_session, admin.id) == len(paths)
+    assert all(os.path.exists(path) for path in paths)
+    db_session.rollback()
+    assert all(os.path.exists(path) for path in paths)
+    assert db_session.query(AuditLogArchive).count() == len(paths)
+    assert purge_owner_archives(db_session, admin.id) == len(paths)
+    db_session.commit()
+    assert not any(os.path.exists(path) for path in paths)
+    assert db_session.query(AuditLogArchive).count() == 0
+
+
+def test_retention_keeps_month_whose_archive_does_not_verify(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "AUDIT_RETENTION_MONTHS", 2)
+    admin = db_session.query(User).first()
+    for day in (3, 4):
+        db_session.add(
+            AuditLog(
+                owner_user_id=admin.id,
+                created_at=datetime(2029, 2, day, 9, 0),
+                action="patient.create",
+                entity_type="patient",
+                entity_id=day,
+            )
+        )
+    db_session.commit()
+
+    # A file that cannot be read back (e.g. written to a volume the API
+    # does not share) must not cost the rows.
+    read_archive = audit_archive._read_archive
+    monkeypatch.setattr(audit_archive, "_read_archive", lambda path: [])
+    assert apply_retention(db_session, now=datetime(2030, 1, 15)) == []
+    assert db_session.query(AuditLog).filter(AuditLog.entity_type == "patient").count() == 2
+    assert db_session.query(AuditLogArchive).count() == 0
+
+    monkeypatch.setattr(audit_archive, "_read_archive", read_archive)
+    archived = apply_retention(db_session, now=datetime(2030, 1, 15))
+    assert [(entry["month"].isoformat(), entry["row_count"]) for entry in archived] == [
+        ("2029-02-01", 2)
+    ]
+    assert db_session.query(AuditLog).filter(AuditLog.entity_type == "patient").count() == 0
+    purge_owner_archives(db_session, admin.id)
+    db_session.commit()
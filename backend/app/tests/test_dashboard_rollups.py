@@ -0,0 +1,151 @@
+from datetime import datetime, timedelta
+
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.dashboard_rollup import AppointmentDailyRollup, PatientDailyRollup
+from app.models.patient import Patient
+from app.models.user import User
+from app.services.dashboard_rollups import backfill, rebuild_owner_rollups
+
+from .test_auth import get_admin_headers
+
+
+def _rollup_totals(db_session) -> dict:
+    db_session.expire_all()
+    totals: dict = {}
+    for row in db_session.query(AppointmentDailyRollup).all():
+        totals[row.status] = totals.get(row.status, 0) + row.count
+    return totals
+
+
+def _nonzero(totals: dict) -> dict:
+    return {status: count for status, count in totals.items() if count}
+
+
+def _analytics(client, headers) -> dict:
+    response = client.get("/api/v1/dashboard/analytics", headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_rollups_follow_patient_and_appointment_writes(client, db_session):
+    headers = get_admin_headers(client)
+    patient_id = client.post(
+        "/api/v1/patients/",
+        headers=headers,
+        json={"full_name": "Rollup Patient", "email": "rollup@example.com"},
+    ).json()["id"]
+    start = datetime.now().replace(microsecond=0) + timedelta(hours=1)
+    appointment_id = client.post(
+        "/api/v1/appointments/",
+        headers=headers,
+        json={
+            "patient_id": patient_id,
+            "doctor_name": "Dr. Rollup",
+            "appointment_datetime": start.isoformat(),
+            "status": "Unconfirmed",
+        },
+    ).json()["id"]
+
+    data = _analytics(client, headers)
+    assert data["kpis"]["totalPatients"] == 1
+    assert data["kpis"]["newPatients30d"] == 1
+    assert data["kpis"]["upcomingAppointments7d"] == 1
+    assert _rollup_totals(db_session) == {"unconfirmed": 1}
+
+    client.patch(f"/api/v1/appointments/{appointment_id}/cancel", headers=headers)
+    assert _rollup_totals(db_session) == {"unconfirmed": 0, "cancelled": 1}
+
+    client.delete(f"/api/v1/patients/{patient_id}", headers=headers)
+    assert _rollup_totals(db_session) == {"unconfirmed": 0, "cancelled": 0}
+    data = _analytics(client, headers)
+    assert data["kpis"]["totalPatients"] == 0
+    assert data["kpis"]["upcomingAppointments7d"] == 0
+
+
+def test_backfill_rebuilds_from_base_tables(client, db_session):
+    admin = db_session.query(User).first()
+    now = datetime.now()
+    patient = Patient(
+        full_name="Backfill Patient",
+        owner_user_id=admin.id,
+        created_at=now - timedelta(days=3),
+    )
+    db_session.add(patient)
+    db_session.flush()
+    db_session.add_all(
+        [
+            Appointment(
+                patient_id=patient.id,
+                owner_user_id=admin.id,
+                doctor_name="Dr. Backfill",
+                appointment_datetime=now - timedelta(days=day_offset),
+                status=status,
+            )
+            for day_offset, status in [
+                (1, AppointmentStatus.completed),
+                (2, AppointmentStatus.scheduled),
+                (2, AppointmentStatus.confirmed),
+            ]
+        ]
+    )
+    db_session.commit()
+    assert db_session.query(PatientDailyRollup).count() == 0
+
+    assert backfill(db_session) == 1
+
+    assert _rollup_totals(db_session) == {
+        "completed": 1,
+        "unconfirmed": 1,
+        "confirmed": 1,
+    }
+    data = _analytics(client, get_admin_headers(client))
+    assert data["kpis"]["totalPatients"] == 1
+    by_status = {
+        item["status"]: item["count"]
+        for item in data["breakdowns"]["appointmentsByStatus30d"]
+    }
+    assert by_status["completed"] == 1
+    assert by_status["unconfirmed"] == 1
+    assert sum(item["count"] for item in data["trends"]["appointmentsByDay30d"]) == 3
+
+
+def test_cancel_through_put_and_patch_matches_rebuild(client, db_session):
+    headers = get_admin_headers(client)
+    patient_id = client.post(
+        "/api/v1/patients/",
+        headers=headers,
+        json={"full_name": "Cancel Rollup Patient"},
+    ).json()["id"]
+    start = datetime.now().replace(microsecond=0) + timedelta(days=1)
+    appointment_ids = [
+        client.post(
+            "/api/v1/appointments/",
+            headers=headers,
+            json={
+                "patient_id": patient_id,
+                "doctor_name": "Dr. Rollup",
+                "appointment_datetime": (start + timedelta(hours=offset)).isoformat(),
+                "status": "Unconfirmed",
+            },
+        ).json()["id"]
+        for offset in range(2)
+    ]
+
+    response = client.patch(
+        f"/api/v1/appointments/{appointment_ids[0]}",
+        headers=headers,
+        json={"status": "Cancelled"},
+    )
+    assert response.status_code == 200
+    response = client.put(
+        f"/api/v1/appointments/{appointment_ids[1]}",
+        headers=headers,
+        json={"status": "Cancelled"},
+    )
+    assert response.status_code == 200
+
+    tracked = _nonzero(_rollup_totals(db_session))
+    assert tracked == {"cancelled": 2}
+    rebuild_owner_rollups(db_session, db_session.query(User).first().id)
+    db_session.commit()
+    assert _nonzero(_rollup_totals(db_session)) == tracked
@@ -0,0 +1,185 @@
+from datetime import datetime, timedelta
+
+from app.core.config import settings
+from app.models.appointment import Appointment
+from app.models.email_outbox import EmailOutbox, EmailOutboxStatus
+from app.models.patient import Patient
+from app.services import email as email_service
+from app.services import email_outbox
+from app.services.email import EmailSendError
+from app.services.email_transport import RESEND_BATCH_URL, RESEND_EMAILS_URL
+
+from .conftest import TestingSessionLocal
+
+BASE_TIME = datetime(2030, 1, 1, 9, 0, 0)
+
+
+def _enqueue(db_session, key: str, recipient: str = "outbox@example.com") -> EmailOutbox:
+    message = email_outbox.enqueue_email(
+        db_session,
+        recipient,
+        "Outbox subject",
+        "<p>Hello</p>",
+        "Hello",
+        idempotency_key=key,
+    )
+    db_session.commit()
+    if message is not None:
+        message.next_attempt_at = BASE_TIME
+        db_session.commit()
+    return message
+
+
+def _patch_send(monkeypatch, fake_send_email) -> None:
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "smtp")
+    monkeypatch.setattr(email_service, "send_email", fake_send_email)
+
+
+def test_enqueue_is_idempotent(db_session):
+    first = _enqueue(db_session, "test:duplicate")
+    second = _enqueue(db_session, "test:duplicate")
+
+    assert first is not None
+    assert second is None
+    assert db_session.query(EmailOutbox).count() == 1
+
+
+def test_build_idempotency_key_depends_on_content():
+    key = email_outbox.build_idempotency_key("appointment:1:created", "a@b.com", "Hi", "x")
+    assert key.startswith("appointment:1:created:")
+    assert key == email_outbox.build_idempotency_key(
+        "appointment:1:created", "a@b.com", "Hi", "x"
+    )
+    assert key != email_outbox.build_idempotency_key(
+        "appointment:1:created", "a@b.com", "Hi", "y"
+    )
+
+
+def test_next_event_sequence_is_atomic_per_transaction(db_session):
+    patient = Patient(full_name="Sequence Patient")
+    db_session.add(patient)
+    db_session.commit()
+    appointment = Appointment(
+        patient_id=patient.id, doctor_name="Dr. Seq", appointment_datetime=BASE_TIME
+    )
+    db_session.add(appointment)
+    db_session.commit()
+
+    first = email_outbox.next_event_sequence(db_session, appointment.id)
+    assert email_outbox.next_event_sequence(db_session, appointment.id) == first
+    db_session.commit()
+    # A concurrent request reads the committed counter, not a stored-row count.
+    with TestingSessionLocal() as other:
+        assert email_outbox.next_event_sequence(other, appointment.id) == first + 1
+        other.commit()
+    assert email_outbox.next_event_sequence(db_session, appointment.id) == first + 2
+    db_session.rollback()
+
+
+def test_deliver_pending_sends_and_marks_sent(db_session, monkeypatch):
+    _enqueue(db_session, "test:one", "one@example.com")
+    _enqueue(db_session, "test:two", "two@example.com")
+    sent = []
+
+    def fake_send_email(to, subject, html_body, text_body=None, idempotency_key=None):
+        sent.append(to)
+
+    _patch_send(monkeypatch, fake_send_email)
+
+    result = email_outbox.deliver_pending(db_session, now=BASE_TIME)
+    assert result == {"claimed": 2, "sent": 2, "retrying": 0, "dead": 0}
+    assert sorted(sent) == ["one@example.com", "two@example.com"]
+
+    again = email_outbox.deliver_pending(db_session, now=BASE_TIME)
+    assert again["claimed"] == 0
+    assert len(sent) == 2
+    assert all(
+        message.status == EmailOutboxStatus.sent
+        for message in db_session.query(EmailOutbox).all()
+    )
+
+
+def test_failed_delivery_retries_with_backoff_then_dead_letters(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_MAX_ATTEMPTS", 2)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BACKOFF_SECONDS", 60)
+    message = _enqueue(db_session, "test:flaky")
+
+    def failing_send_email(to, subject, html_body, text_body=None, idempotency_key=None):
+        raise EmailSendError("provider down")
+
+    _patch_send(monkeypatch, failing_send_email)
+
+    result = email_outbox.deliver_pending(db_session, now=BASE_TIME)
+    assert result["retrying"] == 1
+    db_session.refresh(message)
+    assert message.status == EmailOutboxStatus.pending
+    assert message.attempts == 1
+    assert message.last_error == "provider down"
+    assert message.next_attempt_at == BASE_TIME + timedelta(seconds=60)
+
+    too_early = email_outbox.deliver_pending(db_session, now=BASE_TIME + timedelta(seconds=30))
+    assert too_early["claimed"] == 0
+
+    result = email_outbox.deliver_pending(db_session, now=BASE_TIME + timedelta(seconds=60))
+    assert result["dead"] == 1
+    db_session.refresh(message)
+    assert message.status == EmailOutboxStatus.dead
+    assert message.attempts == 2
+
+
+def test_expired_lease_is_reclaimed(db_session, monkeypatch):
+    message = _enqueue(db_session, "test:stuck")
+    message.status = EmailOutboxStatus.sending
+    message.attempts = 1
+    message.locked_until = BASE_TIME - timedelta(seconds=1)
+    db_session.commit()
+    _patch_send(monkeypatch, lambda *args, **kwargs: None)
+
+    result = email_outbox.deliver_pending(db_session, now=BASE_TIME)
+    assert result["sent"] == 1
+    db_session.refresh(message)
+    assert message.status == EmailOutboxStatus.sent
+    assert message.attempts == 2
+
+
+def test_reclaimed_batch_is_resent_with_the_same_idempotency_key(db_session, monkeypatch):
+    for index in range(3):
+        _enqueue(db_session, f"test:batch:{index}", f"batch{index}@example.com")
+    requests_seen = []
+
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        requests_seen.append((url, headers.get("Idempotency-Key")))
+        raise email_service.requests.ConnectionError("reset after send")
+
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
+    monkeypatch.setattr(settings, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
+    monkeypatch.setattr(settings, "RESEND_API_KEY", "test-key")
+
+    assert email_outbox.deliver_pending(db_session, now=BASE_TIME)["retrying"] == 3
+    # A new message joins the queue before the retry; it does not change the
+    # retried batch.
+    _enqueue(db_session, "test:batch:late", "late@example.com")
+    email_outbox.deliver_pending(db_session, now=BASE_TIME + timedelta(days=1))
+
+    first = requests_seen[0]
+    assert first[0] == RESEND_BATCH_URL and first[1].startswith("batch:")
+    assert sorted(requests_seen[1:]) == sorted(
+        [first, (RESEND_EMAILS_URL, "test:batch:late")]
+    )
+
+
+def test_purge_sent_keeps_recent_and_unsent_messages(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_RETENTION_DAYS", 30)
+    monkeypatch.setattr(settings, "EMAIL_OUTBOX_BATCH_SIZE", 1)
+    old = [_enqueue(db_session, f"test:old:{index}") for index in range(2)]
+    recent = _enqueue(db_session, "test:recent")
+    pending = _enqueue(db_session, "test:pending")
+    for message, sent_at in ((old[0], 40), (old[1], 31), (recent, 5)):
+        message.status = EmailOutboxStatus.sent
+        message.sent_at = BASE_TIME - timedelta(days=sent_at)
+    db_session.commit()
+
+    assert email_outbox.purge_sent(db_session, now=BASE_TIME) == 2
+    remaining = {message.idempotency_key for message in db_session.query(EmailOutbox)}
+    assert remaining == {recent.idempotency_key, pending.idempotency_key}
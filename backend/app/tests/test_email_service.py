@@ -13,7 +13,7 @@ def test_send_email_dev_mode_does_not_call_resend(monkeypatch, capsys):
         called["count"] += 1
         raise AssertionError("Resend should not be called in dev mode")
 
-    monkeypatch.setattr(email_service.requests, "post", fake_post)
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
     monkeypatch.setattr(settings, "EMAIL_ENABLED", False)
     monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
 
@@ -51,14 +51,14 @@ def test_send_email_resend_missing_key_raises(monkeypatch, capsys):
 def test_send_email_resend_sends(monkeypatch, capsys):
     captured = {}
 
-    def fake_post(url, headers=None, json=None, timeout=None):
+    def fake_post(session, url, headers=None, json=None, timeout=None):
         captured["url"] = url
         captured["headers"] = headers
         captured["json"] = json
         captured["timeout"] = timeout
         return SimpleNamespace(status_code=200, text="ok")
 
-    monkeypatch.setattr(email_service.requests, "post", fake_post)
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
     monkeypatch.setattr(settings, "EMAIL_ENABLED", True)
     monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
     monkeypatch.setattr(settings, "RESEND_API_KEY", "test-key")
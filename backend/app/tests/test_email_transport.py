@@ -0,0 +1,209 @@
+import smtplib
+from email.message import EmailMessage
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.services import email as email_service
+from app.services.email_transport import (
+    RESEND_BATCH_URL,
+    RESEND_EMAILS_URL,
+    SendRateLimited,
+    SMTPConnectionPool,
+    TokenBucket,
+)
+
+
+class FakeSMTP:
+    instances: list["FakeSMTP"] = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = 0
+        self.logins = 0
+        self.closed = False
+        self.drop_next_send = False
+        self.noop_code = 250
+        FakeSMTP.instances.append(self)
+
+    def starttls(self):
+        pass
+
+    def login(self, username, password):
+        self.logins += 1
+
+    def noop(self):
+        return self.noop_code, b"OK"
+
+    def rset(self):
+        pass
+
+    def send_message(self, message):
+        if self.drop_next_send:
+            self.drop_next_send = False
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent += 1
+
+    def quit(self):
+        self.closed = True
+
+
+def _pool(**overrides) -> SMTPConnectionPool:
+    FakeSMTP.instances = []
+    options = {
+        "host": "smtp.test",
+        "port": 587,
+        "username": "user",
+        "password": "secret",
+        "use_tls": True,
+        "size": 2,
+        "timeout": 5,
+        "noop_after": 30,
+        "max_idle": 240,
+        "smtp_class": FakeSMTP,
+    }
+    options.update(overrides)
+    return SMTPConnectionPool(**options)
+
+
+def _message() -> EmailMessage:
+    message = EmailMessage()
+    message["To"] = "pool@example.com"
+    message["Subject"] = "Pooled"
+    message.set_content("Hello")
+    return message
+
+
+def test_pool_reuses_authenticated_connection():
+    pool = _pool()
+    for _ in range(3):
+        pool.send(_message())
+
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert FakeSMTP.instances[0].sent == 3
+
+
+def test_pool_reconnects_after_server_disconnect():
+    pool = _pool()
+    pool.send(_message())
+    FakeSMTP.instances[0].drop_next_send = True
+
+    pool.send(_message())
+
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].closed
+    assert FakeSMTP.instances[1].sent == 1
+
+
+def test_pool_replaces_idle_connection_failing_noop():
+    pool = _pool(noop_after=0)
+    pool.send(_message())
+    FakeSMTP.instances[0].noop_code = 421
+
+    pool.send(_message())
+
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[0].closed
+
+
+def test_resend_batch_uses_batch_endpoint(monkeypatch):
+    calls = []
+
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        calls.append((url, json))
+        return SimpleNamespace(status_code=200, text="ok")
+
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
+    monkeypatch.setattr(email_service, "RESEND_BATCH_LIMIT", 2)
+    monkeypatch.setattr(settings, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
+    monkeypatch.setattr(settings, "RESEND_API_KEY", "test-key")
+
+    messages = [
+        (f"batch{index}@example.com", "Batch", "<p>Hi</p>", "Hi") for index in range(3)
+    ]
+    errors = email_service.send_email_batch(messages)
+
+    assert errors == [None, None, None]
+    # A one-message remainder goes to the single-send endpoint.
+    assert [url for url, _ in calls] == [RESEND_BATCH_URL, RESEND_EMAILS_URL]
+    assert len(calls[0][1]) == 2
+    assert calls[0][1][0]["to"] == ["batch0@example.com"]
+    assert calls[1][1]["to"] == ["batch2@example.com"]
+
+
+def test_resend_batch_failure_marks_whole_chunk(monkeypatch):
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        return SimpleNamespace(status_code=500, text="boom")
+
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
+    monkeypatch.setattr(settings, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
+    monkeypatch.setattr(settings, "RESEND_API_KEY", "test-key")
+
+    errors = email_service.send_email_batch(
+        [("a@example.com", "S", "<p>b</p>", None), ("b@example.com", "S", "<p>b</p>", None)]
+    )
+
+    assert len(errors) == 2
+    assert all(error and "500" in error for error in errors)
+
+
+def test_rejected_resend_batch_falls_back_to_single_sends(monkeypatch):
+    calls = []
+
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        calls.append(url)
+        if url == RESEND_BATCH_URL:
+            return SimpleNamespace(status_code=422, text="invalid `to` field")
+        if json["to"] == ["not-an-address"]:
+            return SimpleNamespace(status_code=422, text="invalid `to` field")
+        return SimpleNamespace(status_code=200, text="ok")
+
+    monkeypatch.setattr(email_service.requests.Session, "post", fake_post)
+    monkeypatch.setattr(settings, "EMAIL_ENABLED", True)
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "resend")
+    monkeypatch.setattr(settings, "RESEND_API_KEY", "test-key")
+
+    errors = email_service.send_email_batch(
+        [
+            ("a@example.com", "S", "<p>b</p>", None),
+            ("not-an-address", "S", "<p>b</p>", None),
+            ("c@example.com", "S", "<p>b</p>", None),
+        ]
+    )
+
+    assert errors[0] is None and errors[2] is None
+    assert "422" in errors[1]
+    assert calls == [RESEND_BATCH_URL, RESEND_EMAILS_URL, RESEND_EMAILS_URL, RESEND_EMAILS_URL]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_refills_at_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=2, clock=clock)
+
+    assert bucket.acquire(timeout=0)
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+    clock.now = 0.5
+    assert bucket.acquire(timeout=0)
+    assert not bucket.acquire(timeout=0)
+
+
+def test_pool_send_fails_fast_when_rate_limited():
+    pool = _pool(rate=1, size=1, timeout=0)
+    pool.send(_message())
+
+    with pytest.raises(SendRateLimited):
+        pool.send(_message())
+    assert FakeSMTP.instances[0].sent == 1
@@ -0,0 +1,135 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from app.core import password_pool as password_pool_module
+from app.core.config import settings
+from app.core.limiter import limiter
+from app.core.password_pool import PasswordHashPool, login_guard
+
+from .conftest import engine
+
+
+def _reset_limiter():
+    reset = getattr(limiter, "reset", None)
+    if callable(reset):
+        reset()
+    else:
+        limiter.storage.reset()
+
+
+def test_pool_rejects_when_saturated():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow():
+        started.set()
+        release.wait(5)
+        return "done"
+
+    result = {}
+    worker = threading.Thread(target=lambda: result.setdefault("value", pool.run(slow)))
+    worker.start()
+    started.wait(5)
+    try:
+        with pytest.raises(HTTPException) as exc:
+            pool.run(lambda: "second")
+        assert exc.value.status_code == 503
+        assert exc.value.headers == {"Retry-After": "1"}
+        assert pool.rejected == 1
+    finally:
+        release.set()
+        worker.join(5)
+        pool.shutdown()
+    assert result["value"] == "done"
+    assert pool.pending == 0
+
+
+def test_login_returns_503_when_hash_pool_busy(client, monkeypatch):
+    busy = PasswordHashPool(workers=1, max_pending=1)
+    monkeypatch.setattr(busy, "_pending", 1)
+    monkeypatch.setattr(password_pool_module, "password_pool", busy)
+
+    response = client.post(
+        "/api/v1/auth/login",
+        json={"email": "admin@test.com", "password": "adminpass"},
+    )
+
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+    busy.shutdown()
+
+
+def test_locked_account_is_refused_before_db_and_bcrypt(client, monkeypatch):
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS):
+        client.post(
+            "/api/v1/auth/login",
+            json={"email": "admin@test.com", "password": "wrong"},
+        )
+    _reset_limiter()
+
+    def fail(*_args):
+        raise AssertionError("bcrypt should not run for a locked account")
+
+    monkeypatch.setattr(password_pool_module, "verify_password", fail)
+    statements = []
+
+    def on_execute(conn, cursor, statement, *_args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "Admin@Test.com", "password": "adminpass"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert response.status_code == 423
+    assert statements == []
+
+
+def test_unknown_email_is_locked_locally_after_repeated_failures(client):
+    for _ in range(settings.MAX_LOGIN_ATTEMPTS):
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "nobody@test.com", "password": "wrong"},
+        )
+        assert response.status_code == 401
+    _reset_limiter()
+
+    blocked = client.post(
+        "/api/v1/auth/login",
+        json={"email": "nobody@test.com", "password": "wrong"},
+    )
+    assert blocked.status_code == 423
+
+    login_guard.clear("nobody@test.com")
+    _reset_limiter()
+    assert (
+        client.post(
+            "/api/v1/auth/login",
+            json={"email": "nobody@test.com", "password": "wrong"},
+        ).status_code
+        == 401
+    )
+
+
+def test_async_run_shares_the_pending_cap():
+    pool = PasswordHashPool(workers=1, max_pending=1)
+    try:
+        assert asyncio.run(pool.run_async(lambda value: value * 2, 21)) == 42
+        assert pool.pending == 0
+
+        pool._pending = 1
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(pool.run_async(lambda: "second"))
+        assert exc.value.status_code == 503
+        assert pool.rejected == 1
+    finally:
+        pool.shutdown()
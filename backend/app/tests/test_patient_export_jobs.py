@@ -0,0 +1,310 @@
+import io
+import json
+import os
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.api.v1.patients import _bulk_export_snapshots
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+from app.services.export_jobs import ExportJobManager, export_jobs
+from app.services.patient_pdf import (
+    HISTORY_CHUNK_ROWS,
+    _history_tables,
+    render_patient_pdf,
+    snapshot_digest,
+)
+
+from .conftest import TestingSessionLocal, engine
+from .test_auth import get_admin_headers
+
+
+def _create_patient_with_history(db_session) -> Patient:
+    admin = db_session.query(User).first()
+    patient = Patient(full_name="Job Patient", email="job@example.com", owner_user_id=admin.id)
+    db_session.add(patient)
+    db_session.commit()
+    db_session.add(
+        Appointment(
+            patient_id=patient.id,
+            owner_user_id=admin.id,
+            doctor_name="Dr. Job",
+            appointment_datetime=datetime(2030, 5, 1, 9, 0),
+            status=AppointmentStatus.confirmed,
+            notes="Follow-up",
+        )
+    )
+    db_session.commit()
+    db_session.refresh(patient)
+    return patient
+
+
+def _cached_pdfs() -> list[str]:
+    return [
+        os.path.join(root, name)
+        for root, _, files in os.walk(export_jobs.cache_dir)
+        for name in files
+        if name.endswith(".pdf")
+    ]
+
+
+def _wait_for_job(client, headers, job_id: str) -> dict:
+    deadline = time.monotonic() + 60
+    while True:
+        job = client.get(f"/api/v1/patients/export-jobs/{job_id}", headers=headers).json()
+        if job["status"] in ("done", "failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def test_export_job_renders_and_downloads_pdf(client, db_session):
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+
+    response = client.post(f"/api/v1/patients/{patient.id}/export-jobs", headers=headers)
+    assert response.status_code == 202
+    job_id = response.json()["job_id"]
+    assert response.json()["cached"] is False
+
+    job = _wait_for_job(client, headers, job_id)
+    assert job["status"] == "done"
+    download = client.get(job["download_url"], headers=headers)
+    assert download.status_code == 200
+    assert download.headers["content-type"] == "application/pdf"
+    assert download.content.startswith(b"%PDF")
+
+
+def test_unchanged_record_is_served_from_cache(client, db_session):
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+
+    first = client.get(f"/api/v1/patients/{patient.id}/export", headers=headers)
+    assert first.status_code == 200
+    assert len(_cached_pdfs()) == 1
+
+    repeat = client.post(f"/api/v1/patients/{patient.id}/export-jobs", headers=headers)
+    assert repeat.json()["status"] == "done"
+    assert repeat.json()["cached"] is True
+    cached = client.get(repeat.json()["download_url"], headers=headers)
+    assert cached.content == first.content
+
+    appointment = db_session.query(Appointment).filter_by(patient_id=patient.id).one()
+    appointment.notes = "Changed after export"
+    db_session.commit()
+
+    changed = client.post(f"/api/v1/patients/{patient.id}/export-jobs", headers=headers)
+    assert changed.json()["cached"] is False
+    assert _wait_for_job(client, headers, changed.json()["job_id"])["status"] == "done"
+    # The copy of the earlier snapshot is removed, not left for the TTL.
+    assert len(_cached_pdfs()) == 1
+
+
+def test_cached_pdfs_are_purged_on_edit_and_delete(client, db_session):
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+
+    assert client.get(f"/api/v1/patients/{patient.id}/export", headers=headers).status_code == 200
+    assert len(_cached_pdfs()) == 1
+    client.patch(f"/api/v1/patients/{patient.id}", headers=headers, json={"notes": "Edited"})
+    assert _cached_pdfs() == []
+
+    assert client.get(f"/api/v1/patients/{patient.id}/export", headers=headers).status_code == 200
+    assert len(_cached_pdfs()) == 1
+    assert client.delete(f"/api/v1/patients/{patient.id}", headers=headers).status_code == 204
+    assert _cached_pdfs() == []
+
+
+def test_demo_reset_purges_owner_pdfs(client, db_session, monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_DEMO_RESET", True)
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+    assert client.get(f"/api/v1/patients/{patient.id}/export", headers=headers).status_code == 200
+
+    assert client.post("/api/v1/demo/reset?reseed=false", headers=headers).status_code == 200
+    assert _cached_pdfs() == []
+
+
+def test_export_jobs_are_scoped_to_owner(client, db_session):
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+    job_id = client.post(
+        f"/api/v1/patients/{patient.id}/export-jobs", headers=headers
+    ).json()["job_id"]
+
+    db_session.add(
+        User(
+            email="other@test.com",
+            hashed_password=get_password_hash("otherpass"),
+            full_name="Other Admin",
+            role=UserRole.admin,
+        )
+    )
+    db_session.commit()
+    other_token = client.post(
+        "/api/v1/auth/login", json={"email": "other@test.com", "password": "otherpass"}
+    ).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+
+    assert client.get(f"/api/v1/patients/export-jobs/{job_id}", headers=other_headers).status_code == 404
+    assert (
+        client.get(f"/api/v1/patients/export-jobs/{job_id}/download", headers=other_headers).status_code
+        == 404
+    )
+    _wait_for_job(client, headers, job_id)
+
+
+def test_renderer_streams_long_histories_in_chunks():
+    start = datetime(2030, 1, 1, 9, 0)
+    rows = [
+        {
+            "start": start + timedelta(days=index),
+            "end": None,
+            "doctor": "Dr. Smith & Partners",
+            "department": "Cardiology",
+            "status": "completed",
+            "notes": "<b>unescaped</b> markup and a note long enough to need wrapping",
+        }
+        for index in range(HISTORY_CHUNK_ROWS * 2 + 1)
+    ]
+    snapshot = {
+        "clinic_name": "Medyra",
+        "patient": {
+            "id": 1,
+            "full_name": "Long History",
+            "date_of_birth": "—",
+            "sex": "—",
+            "email": "—",
+            "phone": "—",
+            "address": "—",
+            "notes": "Line one\nLine two",
+        },
+        "appointments": rows,
+    }
+
+    assert len(_history_tables(rows)) == 3
+    with tempfile.TemporaryFile() as handle:
+        assert render_patient_pdf(snapshot, handle) is None
+        handle.seek(0)
+        assert handle.read(4) == b"%PDF"
+
+
+def test_bulk_export_streams_zip_with_progress(client, db_session, monkeypatch):
+    admin = db_session.query(User).first()
+    patients = [
+        Patient(full_name=f"Bulk Patient {index}", owner_user_id=admin.id) for index in range(3)
+    ]
+    db_session.add_all(patients)
+    db_session.commit()
+    headers = get_admin_headers(client)
+    client.get(f"/api/v1/patients/{patients[0].id}/export", headers=headers)
+    cache_scans = []
+    prune_cache = export_jobs._prune_cache
+    monkeypatch.setattr(
+        export_jobs, "_prune_cache", lambda: cache_scans.append(1) or prune_cache()
+    )
+
+    response = client.get("/api/v1/patients/export-bulk", headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/zip"
+    archive = zipfile.ZipFile(io.BytesIO(response.content))
+    assert sorted(archive.namelist()) == sorted(
+        [f"patient_{patient.id}_record.pdf" for patient in patients] + ["manifest.json"]
+    )
+    assert archive.read(f"patient_{patients[1].id}_record.pdf").startswith(b"%PDF")
+    manifest = json.loads(archive.read("manifest.json"))
+    assert manifest == {"total": 3, "exported": 3, "failed_patient_ids": [], "cancelled": False}
+    assert len(cache_scans) == 1
+
+    progress = client.get(
+        f"/api/v1/patients/export-bulk/{response.headers['x-export-id']}", headers=headers
+    ).json()
+    assert progress["status"] == "done"
+    assert progress["completed"] == 3
+
+
+def test_bulk_snapshots_load_one_batch_at_a_time(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BULK_BATCH_SIZE", 2)
+    patients = [_create_patient_with_history(db_session) for _ in range(3)]
+    admin = db_session.query(User).first()
+    statements = []
+
+    def on_execute(conn, cursor, statement, *_args):
+        if "FROM appointments" in statement:
+            statements.append(statement)
+
+    session = TestingSessionLocal()
+    snapshots = _bulk_export_snapshots(session, admin.id)
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        first = next(snapshots)
+        assert len(statements) == 1
+        rest = list(snapshots)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert len(statements) == 2
+    assert [patient_id for patient_id, _ in [first, *rest]] == [p.id for p in patients]
+    assert all(len(snapshot["appointments"]) == 1 for _, snapshot in [first, *rest])
+
+
+def test_bulk_export_can_be_cancelled(client, db_session):
+    admin = db_session.query(User).first()
+    patient = _create_patient_with_history(db_session)
+    headers = get_admin_headers(client)
+    bulk = export_jobs.start_bulk(admin.id, 1)
+
+    cancelled = client.delete(f"/api/v1/patients/export-bulk/{bulk['id']}", headers=headers)
+    assert cancelled.json()["cancel_requested"] is True
+
+    body = b"".join(export_jobs.iter_bulk_zip(bulk, [(patient.id, {"patient": {}})]))
+    archive = zipfile.ZipFile(io.BytesIO(body))
+    assert archive.namelist() == ["manifest.json"]
+    assert json.loads(archive.read("manifest.json"))["cancelled"] is True
+    progress = client.get(f"/api/v1/patients/export-bulk/{bulk['id']}", headers=headers).json()
+    assert progress["status"] == "cancelled"
+
+
+def test_jobs_resolve_from_the_cache_in_another_worker(client, db_session):
+    patient = _create_patient_with_history(db_session)
+    admin = db_session.query(User).first()
+    headers = get_admin_headers(client)
+    job_id = client.post(
+        f"/api/v1/patients/{patient.id}/export-jobs", headers=headers
+    ).json()["job_id"]
+    assert _wait_for_job(client, headers, job_id)["status"] == "done"
+
+    # A second manager shares nothing with the one that rendered the PDF,
+    # like a manager in another web worker process.
+    other_worker = ExportJobManager()
+    job = other_worker.get(job_id, admin.id)
+    assert job["status"] == "done"
+    assert job["path"] in _cached_pdfs()
+    assert other_worker.get(job_id, admin.id + 1) is None
+    assert other_worker.get("../../etc", admin.id) is None
+
+    # A render claimed elsewhere is reported as running and waited on.
+    snapshot = {"patient": {"id": patient.id}, "appointments": []}
+    path = export_jobs.cache_path(admin.id, patient.id, snapshot_digest(snapshot))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    open(path[: -len(".pdf")] + ".pending", "w").close()
+    waiting = other_worker.submit(admin.id, patient.id, snapshot)
+    assert waiting["status"] == "running" and waiting["future"] is None
+    with pytest.raises(TimeoutError):
+        other_worker.wait(waiting, timeout=0.2)
+    open(path[: -len(".pdf")] + ".failed", "w").close()
+    assert other_worker.wait(waiting, timeout=5)["status"] == "failed"
+
+    bulk = export_jobs.start_bulk(admin.id, 1)
+    cancelled = client.delete(f"/api/v1/patients/export-bulk/{bulk['id']}", headers=headers)
+    assert cancelled.json()["cancel_requested"] is True
+    assert other_worker.get_bulk(bulk["id"], admin.id)["cancel_requested"] is True
+    assert other_worker.get_bulk(bulk["id"], admin.id + 1) is None
@@ -0,0 +1,126 @@
+from app.core.security import get_password_hash
+from app.models.user import User, UserRole
+from app.services import patient_search
+
+from .test_auth import get_admin_headers
+
+
+def _create(client, headers, first_name, last_name, **extra) -> int:
+    response = client.post(
+        "/api/v1/patients/",
+        headers=headers,
+        json={"first_name": first_name, "last_name": last_name, **extra},
+    )
+    assert response.status_code == 201
+    return response.json()["id"]
+
+
+def _search(client, headers, q, **params) -> list[str]:
+    response = client.get(
+        "/api/v1/patients/search", headers=headers, params={"q": q, **params}
+    )
+    assert response.status_code == 200
+    return [patient["full_name"] for patient in response.json()]
+
+
+def test_search_matches_prefixes_substrings_and_phone_digits(client):
+    headers = get_admin_headers(client)
+    _create(client, headers, "John", "Smith", email="jsmith@example.com", phone="(555) 010-2000")
+    _create(client, headers, "Joanna", "Smithers", email="joanna@example.com")
+    _create(client, headers, "Maria", "Lopez", phone="555-777-1234")
+
+    assert _search(client, headers, "john smith") == ["John Smith"]
+    assert set(_search(client, headers, "smith")) == {"John Smith", "Joanna Smithers"}
+    assert set(_search(client, headers, "jo sm")) == {"John Smith", "Joanna Smithers"}
+    assert _search(client, headers, "ithers") == ["Joanna Smithers"]
+    assert _search(client, headers, "joanna@") == ["Joanna Smithers"]
+    assert _search(client, headers, "5557771234") == ["Maria Lopez"]
+    assert _search(client, headers, "555-010") == ["John Smith"]
+
+
+def test_search_falls_back_to_fuzzy_matches(client):
+    headers = get_admin_headers(client)
+    _create(client, headers, "Maria", "Lopez")
+    _create(client, headers, "Peter", "Novak")
+
+    assert _search(client, headers, "lopes")[0] == "Maria Lopez"
+
+
+def test_search_index_follows_updates_and_deletes(client):
+    headers = get_admin_headers(client)
+    patient_id = _create(client, headers, "Anna", "Berg")
+
+    client.put(
+        f"/api/v1/patients/{patient_id}",
+        headers=headers,
+        json={"first_name": "Anna", "last_name": "Lindqvist"},
+    )
+    assert _search(client, headers, "lindqvist") == ["Anna Lindqvist"]
+    assert _search(client, headers, "berg") == []
+
+    client.delete(f"/api/v1/patients/{patient_id}", headers=headers)
+    assert _search(client, headers, "lindqvist") == []
+
+
+def test_search_is_scoped_to_owner_and_paginated(client, db_session):
+    headers = get_admin_headers(client)
+    for index in range(5):
+        _create(client, headers, "Parker", f"Number{index}")
+    db_session.add(
+        User(
+            email="other@test.com",
+            hashed_password=get_password_hash("otherpass"),
+            full_name="Other Admin",
+            role=UserRole.admin,
+        )
+    )
+    db_session.commit()
+    other_token = client.post(
+        "/api/v1/auth/login", json={"email": "other@test.com", "password": "otherpass"}
+    ).json()["access_token"]
+    other_headers = {"Authorization": f"Bearer {other_token}"}
+    _create(client, other_headers, "Parker", "Elsewhere")
+
+    first = client.get(
+        "/api/v1/patients/search", headers=headers, params={"q": "parker", "limit": 3}
+    )
+    assert len(first.json()) == 3
+    second = client.get(
+        "/api/v1/patients/search",
+        headers=headers,
+        params={"q": "parker", "limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert "X-Next-Cursor" not in second.headers
+    names = [patient["full_name"] for patient in first.json() + second.json()]
+    assert sorted(names) == [f"Parker Number{index}" for index in range(5)]
+    assert _search(client, other_headers, "parker") == ["Parker Elsewhere"]
+
+
+def test_search_pages_past_the_ranked_window(client, monkeypatch):
+    monkeypatch.setattr(patient_search, "SEARCH_RANK_CANDIDATES", 7)
+    headers = get_admin_headers(client)
+    for index in range(6):
+        _create(client, headers, "Smith", f"Anchored{index}")
+        _create(client, headers, "Ana", f"Smithson{index}")
+        _create(client, headers, "Ben", f"Goldsmith{index}")
+
+    ids = []
+    params = {"q": "smith", "limit": 2}
+    while True:
+        response = client.get("/api/v1/patients/search", headers=headers, params=params)
+        assert response.status_code == 200
+        ids.extend(patient["id"] for patient in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params["cursor"] = cursor
+    # The first pages come from the re-ranked window, with the whole-name
+    # prefix matches first; later pages continue in index order.
+    assert len(ids) == len(set(ids)) == 18
+    first_names = [
+        patient["full_name"]
+        for patient in client.get(
+            "/api/v1/patients/search", headers=headers, params={"q": "smith", "limit": 6}
+        ).json()
+    ]
+    assert all(name.startswith("Smith ") for name in first_names)
@@ -1,3 +1,4 @@
+import json
 from datetime import date, datetime, timedelta
 
 from app.models.appointment import Appointment, AppointmentStatus
@@ -97,3 +98,159 @@ def test_admin_can_export_patient_record_pdf(client, db_session):
     assert response.status_code == 200
     assert response.headers["content-type"] == "application/pdf"
     assert len(response.content) > 1000
+
+
+def test_patient_appointments_are_paginated_newest_first(client, db_session):
+    admin = db_session.query(User).first()
+    patient = Patient(full_name="History Patient", owner_user_id=admin.id)
+    db_session.add(patient)
+    db_session.commit()
+    base_time = datetime(2030, 3, 1, 9, 0)
+    db_session.add_all(
+        [
+            Appointment(
+                patient_id=patient.id,
+                owner_user_id=admin.id,
+                doctor_name="Dr. History",
+                appointment_datetime=base_time + timedelta(days=offset),
+                status=AppointmentStatus.completed,
+            )
+            for offset in range(3)
+        ]
+    )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    first_page = client.get(
+        f"/api/v1/patients/{patient.id}/appointments",
+        headers=headers,
+        params={"limit": 2, "include_total": "true"},
+    )
+    assert first_page.status_code == 200
+    assert len(first_page.json()) == 2
+    assert first_page.headers["X-Total-Count"] == "3"
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    second_page = client.get(
+        f"/api/v1/patients/{patient.id}/appointments",
+        headers=headers,
+        params={"limit": 2, "cursor": cursor},
+    )
+    assert len(second_page.json()) == 1
+    assert "X-Next-Cursor" not in second_page.headers
+    dates = [item["appointment_datetime"] for item in first_page.json() + second_page.json()]
+    assert dates == sorted(dates, reverse=True)
+
+
+def test_patient_list_pages_with_total(client, db_session):
+    admin = db_session.query(User).first()
+    created = datetime(2030, 1, 1, 9, 0)
+    db_session.add_all(
+        [
+            Patient(full_name=f"Paged {index}", owner_user_id=admin.id, created_at=created)
+            for index in range(5)
+        ]
+    )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    first = client.get(
+        "/api/v1/patients/", headers=headers, params={"limit": 3, "include_total": "true"}
+    )
+    assert first.status_code == 200
+    assert first.headers["X-Total-Count"] == "5"
+    second = client.get(
+        "/api/v1/patients/",
+        headers=headers,
+        params={"limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert "X-Next-Cursor" not in second.headers
+    names = [patient["full_name"] for patient in first.json() + second.json()]
+    assert names == [f"Paged {index}" for index in range(5)]
+    assert len(client.get("/api/v1/patients/", headers=headers).json()) == 5
+
+
+def test_patient_list_omits_text_blobs_by_default(client, db_session):
+    admin = db_session.query(User).first()
+    db_session.add(
+        Patient(
+            full_name="Slim List",
+            phone="555-3030",
+            medical_history="Long history",
+            notes="Long notes",
+            owner_user_id=admin.id,
+        )
+    )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    response = client.get("/api/v1/patients/", headers=headers)
+    assert response.status_code == 200
+    row = response.json()[0]
+    assert row["full_name"] == "Slim List"
+    assert row["phone"] == "555-3030"
+    assert "medical_history" not in row
+    assert "notes" not in row
+
+    response = client.get(
+        "/api/v1/patients/", headers=headers, params={"fields": "full_name,notes"}
+    )
+    assert response.json() == [
+        {"id": row["id"], "full_name": "Slim List", "notes": "Long notes"}
+    ]
+
+
+def test_patient_list_rejects_unknown_fields(client):
+    headers = get_admin_headers(client)
+    response = client.get(
+        "/api/v1/patients/", headers=headers, params={"fields": "full_name,owner_user_id"}
+    )
+    assert response.status_code == 400
+    assert "owner_user_id" in response.json()["detail"]
+
+
+def test_appointment_list_nests_slim_patient(client, db_session):
+    admin = db_session.query(User).first()
+    patient = Patient(full_name="Nested", notes="Private", owner_user_id=admin.id)
+    db_session.add(patient)
+    db_session.commit()
+    db_session.add(
+        Appointment(
+            patient_id=patient.id,
+            owner_user_id=admin.id,
+            doctor_name="Dr. Slim",
+            appointment_datetime=datetime(2030, 1, 1, 9, 0),
+        )
+    )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    response = client.get("/api/v1/appointments/", headers=headers)
+    assert response.status_code == 200
+    nested = response.json()[0]["patient"]
+    assert nested["full_name"] == "Nested"
+    assert "notes" not in nested
+
+    response = client.get(
+        f"/api/v1/patients/{patient.id}/appointments",
+        headers=headers,
+        params={"fields": "doctor_name"},
+    )
+    assert response.json() == [{"id": response.json()[0]["id"], "doctor_name": "Dr. Slim"}]
+
+
+def test_patient_list_streams_ndjson(client, db_session):
+    admin = db_session.query(User).first()
+    for index in range(3):
+        db_session.add(
+            Patient(full_name=f"Streamed {index}", notes="Private", owner_user_id=admin.id)
+        )
+    db_session.commit()
+
+    headers = get_admin_headers(client)
+    listed = client.get("/api/v1/patients/", headers=headers).json()
+    streamed = client.get(
+        "/api/v1/patients/", headers=headers, params={"stream": "ndjson"}
+    )
+    assert streamed.status_code == 200
+    assert [json.loads(line) for line in streamed.text.splitlines()] == listed
@@ -0,0 +1,73 @@
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.principal_cache import TTLCache, principal_cache, token_cache
+
+from .conftest import engine
+from .test_auth import get_admin_headers
+
+
+def _count_user_queries(client, headers, path: str) -> tuple[int, int]:
+    statements = []
+
+    def before_execute(conn, cursor, statement, parameters, context, executemany):
+        if "FROM users" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_execute)
+    try:
+        status_code = client.get(path, headers=headers).status_code
+    finally:
+        event.remove(engine, "before_cursor_execute", before_execute)
+    return status_code, len(statements)
+
+
+def test_repeat_requests_skip_user_lookup(client):
+    headers = get_admin_headers(client)
+
+    status_code, _ = _count_user_queries(client, headers, "/api/v1/audit-logs/")
+    assert status_code == 200
+    status_code, queries = _count_user_queries(client, headers, "/api/v1/audit-logs/")
+    assert status_code == 200
+    assert queries == 0
+    assert token_cache.hits >= 1
+
+
+def test_profile_update_invalidates_principal(client):
+    headers = get_admin_headers(client)
+    client.get("/api/v1/audit-logs/", headers=headers)
+    admin_id = client.get("/api/v1/users/me", headers=headers).json()["id"]
+    assert principal_cache.get(admin_id).full_name == "Admin User"
+
+    response = client.patch(
+        "/api/v1/users/me",
+        headers=headers,
+        json={"first_name": "Renamed", "last_name": "Admin"},
+    )
+    assert response.status_code == 200
+    assert principal_cache.get(admin_id) is None
+
+    client.get("/api/v1/audit-logs/", headers=headers)
+    assert principal_cache.get(admin_id).full_name == "Renamed Admin"
+
+
+def test_deleted_account_token_is_rejected(client, monkeypatch):
+    monkeypatch.setattr(settings, "ENABLE_ACCOUNT_DELETION", True)
+    headers = get_admin_headers(client)
+    assert client.get("/api/v1/audit-logs/", headers=headers).status_code == 200
+
+    assert client.delete("/api/v1/users/me", headers=headers).status_code == 204
+    assert client.get("/api/v1/audit-logs/", headers=headers).status_code == 401
+
+
+def test_ttl_cache_evicts_least_recently_used_and_expired():
+    cache = TTLCache(max_entries=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("short", 4, ttl=0)
+    assert cache.get("short") is None
@@ -1,13 +1,27 @@
+import threading
+import time
 from datetime import datetime, timedelta
 
+from sqlalchemy import event
+
+from app.core.config import settings
 from app.models.appointment import Appointment, AppointmentStatus
 from app.models.patient import Patient
 from app.models.user import User
+from app.services import email as email_service
 from app.services import reminder_service
 
+from .conftest import TestingSessionLocal, engine
+
 BASE_TIME = datetime(2030, 1, 1, 9, 0, 0)
 
 
+def _patch_send(monkeypatch, send) -> None:
+    """Route reminder batches through the SMTP fan-out into ``send``."""
+    monkeypatch.setattr(settings, "EMAIL_PROVIDER", "smtp")
+    monkeypatch.setattr(email_service, "send_email", send)
+
+
 def _create_patient(db_session, email: str | None) -> Patient:
     admin = db_session.query(User).first()
     patient = Patient(
@@ -30,6 +44,9 @@ def test_reminder_sends_once_and_sets_timestamp(db_session, monkeypatch):
         appointment_datetime=BASE_TIME + timedelta(hours=2),
         status=AppointmentStatus.confirmed,
         owner_user_id=patient.owner_user_id,
+        reminder_email_enabled=True,
+        reminder_email_minutes_before=180,
+        reminder_next_run_at=BASE_TIME - timedelta(hours=1),
     )
     db_session.add(appointment)
     db_session.commit()
@@ -40,7 +57,7 @@ def test_reminder_sends_once_and_sets_timestamp(db_session, monkeypatch):
     def fake_send_email(to, subject, html_body, text_body=None):
         sent.append({"to": to, "subject": subject})
 
-    monkeypatch.setattr(reminder_service, "send_email", fake_send_email)
+    _patch_send(monkeypatch, fake_send_email)
 
     result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
     assert result["sent"] == 1
@@ -62,7 +79,10 @@ def test_reminder_not_sent_if_already_sent(db_session, monkeypatch):
         appointment_datetime=BASE_TIME + timedelta(hours=3),
         status=AppointmentStatus.confirmed,
         reminder_sent_at=BASE_TIME,
+        reminder_email_sent_at=BASE_TIME,
         owner_user_id=patient.owner_user_id,
+        reminder_email_enabled=True,
+        reminder_next_run_at=BASE_TIME - timedelta(hours=1),
     )
     db_session.add(appointment)
     db_session.commit()
@@ -73,8 +93,293 @@ def test_reminder_not_sent_if_already_sent(db_session, monkeypatch):
     def fake_send_email(to, subject, html_body, text_body=None):
         sent.append({"to": to, "subject": subject})
 
-    monkeypatch.setattr(reminder_service, "send_email", fake_send_email)
+    _patch_send(monkeypatch, fake_send_email)
 
     result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
     assert result["sent"] == 0
     assert len(sent) == 0
+
+
+def _fake_sender(monkeypatch) -> list:
+    sent = []
+
+    def fake_send_email(to, subject, html_body, text_body=None):
+        sent.append(to)
+
+    _patch_send(monkeypatch, fake_send_email)
+    return sent
+
+
+def _channel_appointment(db_session, patient, **overrides) -> Appointment:
+    values = {
+        "patient_id": patient.id,
+        "doctor_name": "Dr. Queue",
+        "appointment_datetime": BASE_TIME + timedelta(hours=24),
+        "status": AppointmentStatus.confirmed,
+        "owner_user_id": patient.owner_user_id,
+        "reminder_email_enabled": True,
+        "reminder_email_minutes_before": 1440,
+        "reminder_sms_enabled": False,
+        "reminder_sms_minutes_before": 120,
+    }
+    values.update(overrides)
+    appointment = Appointment(**values)
+    appointment.reminder_next_run_at = reminder_service.next_reminder_run_at(appointment)
+    db_session.add(appointment)
+    db_session.commit()
+    db_session.refresh(appointment)
+    return appointment
+
+
+def test_reminder_respects_minutes_before(db_session, monkeypatch):
+    patient = _create_patient(db_session, "minutes@example.com")
+    appointment = _channel_appointment(
+        db_session, patient, reminder_email_minutes_before=60
+    )
+    sent = _fake_sender(monkeypatch)
+
+    early = reminder_service.dispatch_reminders(
+        db_session, now=BASE_TIME + timedelta(hours=22, minutes=59)
+    )
+    assert early["processed"] == 0
+    assert sent == []
+
+    due = reminder_service.dispatch_reminders(
+        db_session, now=BASE_TIME + timedelta(hours=23)
+    )
+    assert due["sent"] == 1
+    db_session.refresh(appointment)
+    assert appointment.reminder_email_sent_at == BASE_TIME + timedelta(hours=23)
+    assert appointment.reminder_next_run_at is None
+
+
+def test_email_and_sms_channels_fire_independently(db_session, monkeypatch):
+    patient = _create_patient(db_session, "channels@example.com")
+    appointment = _channel_appointment(
+        db_session,
+        patient,
+        reminder_sms_enabled=True,
+        reminder_sms_minutes_before=120,
+    )
+    sent = _fake_sender(monkeypatch)
+    sms_sent = []
+    monkeypatch.setitem(
+        reminder_service.CHANNEL_SENDERS,
+        "sms",
+        lambda jobs: [sms_sent.append(appt.id) or "sent" for appt, _ in jobs],
+    )
+
+    reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+    db_session.refresh(appointment)
+    assert sent == ["channels@example.com"]
+    assert sms_sent == []
+    assert appointment.reminder_next_run_at == BASE_TIME + timedelta(hours=22)
+
+    reminder_service.dispatch_reminders(db_session, now=BASE_TIME + timedelta(hours=22))
+    db_session.refresh(appointment)
+    assert sms_sent == [appointment.id]
+    assert len(sent) == 1
+    assert appointment.reminder_sms_sent_at is not None
+    assert appointment.reminder_next_run_at is None
+
+
+def test_failed_reminder_is_retried_later(db_session, monkeypatch):
+    patient = _create_patient(db_session, "retry@example.com")
+    appointment = _channel_appointment(db_session, patient)
+
+    def failing_send(*_args, **_kwargs):
+        raise email_service.EmailSendError("provider down")
+
+    _patch_send(monkeypatch, failing_send)
+
+    result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+    assert result == {"processed": 1, "sent": 0, "skipped": 0, "deferred": 0, "failed": 1}
+    db_session.refresh(appointment)
+    assert appointment.reminder_email_sent_at is None
+    assert appointment.reminder_next_run_at == BASE_TIME + timedelta(
+        minutes=settings.REMINDER_RETRY_MINUTES
+    )
+
+
+def test_missing_recipient_is_skipped_and_unavailable_provider_deferred(
+    db_session, monkeypatch
+):
+    patient = _create_patient(db_session, None)
+    appointment = _channel_appointment(
+        db_session, patient, reminder_sms_enabled=True, reminder_sms_minutes_before=1440
+    )
+    sent = _fake_sender(monkeypatch)
+    monkeypatch.setattr(settings, "SMS_ENABLED", True)
+    monkeypatch.setattr(settings, "SMS_PROVIDER", "http")
+    monkeypatch.setattr(settings, "SMS_HTTP_URL", None)
+
+    result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+    assert result == {"processed": 2, "sent": 0, "skipped": 1, "deferred": 1, "failed": 0}
+    db_session.refresh(appointment)
+    retry = timedelta(minutes=settings.REMINDER_RETRY_MINUTES)
+    assert appointment.reminder_next_run_at == BASE_TIME + retry
+
+    # Each further deferral waits as long as the reminder is already overdue.
+    later = reminder_service.dispatch_reminders(db_session, now=BASE_TIME + retry * 3)
+    assert later == {"processed": 2, "sent": 0, "skipped": 1, "deferred": 1, "failed": 0}
+    db_session.refresh(appointment)
+    assert appointment.reminder_next_run_at == BASE_TIME + retry * 6
+
+    monkeypatch.setattr(settings, "SMS_PROVIDER", "dev")
+    recovered = reminder_service.dispatch_reminders(db_session, now=BASE_TIME + retry * 6)
+    assert recovered["sent"] == 1
+    db_session.refresh(appointment)
+    assert appointment.reminder_sms_sent_at is not None
+    assert appointment.reminder_next_run_at is None
+    assert sent == []
+
+
+def test_past_appointments_leave_the_due_queue(db_session, monkeypatch):
+    patient = _create_patient(db_session, "past@example.com")
+    appointment = _channel_appointment(
+        db_session, patient, appointment_datetime=BASE_TIME - timedelta(hours=1)
+    )
+    sent = _fake_sender(monkeypatch)
+
+    result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+
+    assert result["processed"] == 0
+    assert sent == []
+    db_session.refresh(appointment)
+    assert appointment.reminder_next_run_at is None
+
+
+def test_parallel_dispatchers_send_each_reminder_once(db_session, monkeypatch):
+    patient_ids = [
+        _create_patient(db_session, f"parallel{index}@example.com").id
+        for index in range(24)
+    ]
+    for patient_id in patient_ids:
+        _channel_appointment(db_session, db_session.get(Patient, patient_id))
+    monkeypatch.setattr(settings, "REMINDER_BATCH_SIZE", 5)
+
+    sent = []
+    lock = threading.Lock()
+
+    def slow_send(to, subject, html_body, text_body=None):
+        time.sleep(0.002)
+        with lock:
+            sent.append(to)
+
+    _patch_send(monkeypatch, slow_send)
+    results = []
+    errors = []
+
+    def run_dispatcher():
+        session = TestingSessionLocal()
+        try:
+            results.append(reminder_service.dispatch_reminders(session, now=BASE_TIME))
+        except Exception as exc:  # surfaced by the assertion below
+            errors.append(exc)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=run_dispatcher) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(30)
+
+    assert errors == []
+    assert sorted(sent) == sorted(f"parallel{index}@example.com" for index in range(24))
+    assert sum(result["sent"] for result in results) == 24
+    db_session.expire_all()
+    assert (
+        db_session.query(Appointment)
+        .filter(Appointment.reminder_locked_by.isnot(None))
+        .count()
+        == 0
+    )
+
+
+def test_leased_reminder_is_skipped_until_lease_expires(db_session, monkeypatch):
+    patient = _create_patient(db_session, "leased@example.com")
+    appointment = _channel_appointment(db_session, patient)
+    appointment.reminder_locked_by = "crashed-worker"
+    appointment.reminder_locked_until = BASE_TIME + timedelta(minutes=1)
+    db_session.commit()
+    sent = _fake_sender(monkeypatch)
+
+    assert reminder_service.dispatch_reminders(db_session, now=BASE_TIME)["processed"] == 0
+    assert sent == []
+
+    later = BASE_TIME + timedelta(minutes=2)
+    assert reminder_service.dispatch_reminders(db_session, now=later)["sent"] == 1
+    assert sent == ["leased@example.com"]
+
+
+def test_dispatch_reads_are_constant_per_batch(db_session, monkeypatch):
+    admin = db_session.query(User).first()
+    admin.clinic_name = "First Clinic"
+    other = User(
+        email="second@test.com",
+        hashed_password="x",
+        full_name="Second Owner",
+        clinic_name="Second Clinic",
+        role=admin.role,
+    )
+    db_session.add(other)
+    db_session.commit()
+    for index in range(20):
+        owner = admin if index % 2 else other
+        patient = Patient(
+            full_name=f"Batch Patient {index}",
+            email=f"batch{index}@example.com",
+            owner_user_id=owner.id,
+        )
+        db_session.add(patient)
+        db_session.commit()
+        _channel_appointment(db_session, patient)
+
+    clinics = []
+
+    def fake_send_email(to, subject, html_body, text_body=None):
+        clinics.append("First Clinic" in html_body)
+
+    _patch_send(monkeypatch, fake_send_email)
+    selects = []
+
+    def on_execute(conn, cursor, statement, *_args):
+        if statement.lstrip().upper().startswith("SELECT"):
+            selects.append(statement)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    assert result["sent"] == 20
+    assert len(selects) <= 4
+    assert clinics.count(True) == 10
+
+
+def test_batch_reports_partial_failures(db_session, monkeypatch):
+    for email in ("ok1@example.com", "bounce@example.com", "ok2@example.com"):
+        _channel_appointment(db_session, _create_patient(db_session, email))
+    _channel_appointment(db_session, _create_patient(db_session, None))
+    delivered = []
+
+    def flaky_send(to, subject, html_body, text_body=None):
+        if to.startswith("bounce"):
+            raise email_service.EmailSendError("mailbox unavailable")
+        delivered.append(to)
+
+    _patch_send(monkeypatch, flaky_send)
+
+    result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+
+    assert result == {"processed": 4, "sent": 2, "skipped": 1, "deferred": 0, "failed": 1}
+    assert sorted(delivered) == ["ok1@example.com", "ok2@example.com"]
+    retried = (
+        db_session.query(Appointment)
+        .filter(Appointment.reminder_next_run_at.isnot(None))
+        .count()
+    )
+    # Only the failed send is retried; the patient without an email is not.
+    assert retried == 1
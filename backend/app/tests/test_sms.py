@@ -0,0 +1,123 @@
+import json
+from datetime import timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.core.config import settings
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.patient import Patient
+from app.models.user import User
+from app.services import reminder_service, sms
+from app.services.sms import HttpSmsProvider, SmsProvider, send_sms_batch
+
+from .test_reminders import BASE_TIME
+
+
+@pytest.fixture(autouse=True)
+def reset_sms_provider():
+    sms.close_sms_provider()
+    yield
+    sms.close_sms_provider()
+
+
+def _use_file_stub(monkeypatch, tmp_path):
+    path = tmp_path / "sms.jsonl"
+    monkeypatch.setattr(settings, "SMS_ENABLED", True)
+    monkeypatch.setattr(settings, "SMS_PROVIDER", "file")
+    monkeypatch.setattr(settings, "SMS_STUB_PATH", str(path))
+    return path
+
+
+def test_file_stub_records_each_message(monkeypatch, tmp_path):
+    path = _use_file_stub(monkeypatch, tmp_path)
+
+    errors = send_sms_batch([("+15550001", "one"), ("+15550002", "two")])
+
+    assert errors == [None, None]
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(line["to"], line["body"]) for line in lines] == [
+        ("+15550001", "one"),
+        ("+15550002", "two"),
+    ]
+
+
+def test_http_provider_chunks_and_maps_per_message_errors(monkeypatch):
+    calls = []
+
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        calls.append(json["messages"])
+        results = [
+            {"error": "invalid number"} if message["to"] == "bad" else {"id": "ok"}
+            for message in json["messages"]
+        ]
+        return SimpleNamespace(status_code=200, text="", json=lambda: {"results": results})
+
+    monkeypatch.setattr(sms.requests.Session, "post", fake_post)
+    provider = HttpSmsProvider(
+        "http://sms.test/send", "key", "Clinic", batch_size=2, workers=2, rate=0, timeout=5
+    )
+
+    errors = provider.send_batch([("a", "1"), ("bad", "2"), ("c", "3")])
+
+    assert errors == [None, "invalid number", None]
+    assert sorted(len(chunk) for chunk in calls) == [1, 2]
+
+
+def test_http_provider_fails_whole_chunk_on_gateway_error(monkeypatch):
+    def fake_post(session, url, headers=None, json=None, timeout=None):
+        return SimpleNamespace(status_code=503, text="down")
+
+    monkeypatch.setattr(sms.requests.Session, "post", fake_post)
+    provider = HttpSmsProvider(
+        "http://sms.test/send", None, None, batch_size=10, workers=1, rate=0, timeout=5
+    )
+
+    errors = provider.send_batch([("a", "1"), ("b", "2")])
+
+    assert all(error and "503" in error for error in errors)
+
+
+def test_reminder_dispatch_delivers_sms_channel(db_session, monkeypatch, tmp_path):
+    path = _use_file_stub(monkeypatch, tmp_path)
+    admin = db_session.query(User).first()
+    with_phone = Patient(full_name="Text Me", phone="+15550100", owner_user_id=admin.id)
+    without_phone = Patient(full_name="No Phone", owner_user_id=admin.id)
+    db_session.add_all([with_phone, without_phone])
+    db_session.commit()
+    for patient in (with_phone, without_phone):
+        appointment = Appointment(
+            patient_id=patient.id,
+            owner_user_id=admin.id,
+            doctor_name="Dr. Sms",
+            appointment_datetime=BASE_TIME + timedelta(hours=1),
+            status=AppointmentStatus.confirmed,
+            reminder_email_enabled=False,
+            reminder_email_minutes_before=1440,
+            reminder_sms_enabled=True,
+            reminder_sms_minutes_before=120,
+        )
+        appointment.reminder_next_run_at = reminder_service.next_reminder_run_at(appointment)
+        db_session.add(appointment)
+    db_session.commit()
+
+    result = reminder_service.dispatch_reminders(db_session, now=BASE_TIME)
+
+    assert result == {"processed": 2, "sent": 1, "skipped": 1, "deferred": 0, "failed": 0}
+    messages = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [message["to"] for message in messages] == ["+15550100"]
+    assert "Dr. Sms" in messages[0]["body"]
+    sent = (
+        db_session.query(Appointment)
+        .filter(Appointment.reminder_sms_sent_at.isnot(None))
+        .count()
+    )
+    assert sent == 1
+
+
+def test_provider_must_implement_send_batch():
+    class Incomplete(SmsProvider):
+        name = "incomplete"
+
+    with pytest.raises(TypeError):
+        Incomplete()
@@ -0,0 +1,98 @@
+import threading
+from types import SimpleNamespace
+
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from fastapi.testclient import TestClient
+
+from app import worker
+from app.core.config import settings
+from app.main import app
+from app.services.scheduler import build_scheduler, scheduler, scheduler_lock
+
+from .conftest import engine
+
+JOB_IDS = {"reminder_job", "email_outbox_job", "audit_retention_job"}
+
+
+def test_persistent_jobstore_keeps_jobs_and_misfire_policy():
+    jobstore = SQLAlchemyJobStore(engine=engine, tablename="test_apscheduler_jobs")
+    first = build_scheduler(jobstore)
+    first.start(paused=True)
+    try:
+        jobs = {job.id: job for job in first.get_jobs()}
+        assert set(jobs) == JOB_IDS
+        assert jobs["reminder_job"].misfire_grace_time == settings.SCHEDULER_MISFIRE_GRACE_SECONDS
+        assert jobs["reminder_job"].coalesce is True
+        assert jobs["reminder_job"].max_instances == 1
+    finally:
+        first.shutdown(wait=False)
+
+    reloaded = SQLAlchemyJobStore(engine=engine, tablename="test_apscheduler_jobs")
+    restarted = build_scheduler(reloaded)
+    restarted.start(paused=True)
+    try:
+        assert {job.id for job in restarted.get_jobs()} == JOB_IDS
+    finally:
+        restarted.shutdown(wait=False)
+        reloaded.jobs_t.drop(engine)
+
+
+def test_worker_drains_and_stops_on_signal(monkeypatch):
+    events = []
+    monkeypatch.setattr(worker, "close_transports", lambda: events.append("transports"))
+    monkeypatch.setattr(worker.audit_writer, "stop", lambda: events.append("audit"))
+    jobstore = SQLAlchemyJobStore(engine=engine, tablename="test_worker_jobs")
+    stop_event = threading.Event()
+    thread = threading.Thread(target=worker.run_worker, args=(stop_event, jobstore))
+    thread.start()
+
+    stop_event.set()
+    thread.join(10)
+
+    assert not thread.is_alive()
+    assert events == ["audit", "transports"]
+    jobstore.jobs_t.drop(engine)
+
+
+def test_web_app_can_start_without_scheduler(db_session, monkeypatch):
+    monkeypatch.setattr(settings, "RUN_SCHEDULER_IN_WEB", False)
+    if scheduler.running:
+        scheduler.shutdown(wait=False)
+
+    with TestClient(app) as client:
+        assert client.get("/api/health").status_code == 200
+        assert not scheduler.running
+
+
+class _HeldLockConnection:
+    """Postgres connection stand-in on which another worker holds the lock."""
+
+    def __init__(self) -> None:
+        self.statements = []
+        self.closed = False
+
+    def execute(self, statement):
+        self.statements.append(str(statement))
+        return SimpleNamespace(scalar=lambda: False)
+
+    def commit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def test_standby_worker_waits_for_the_scheduler_lock(monkeypatch):
+    monkeypatch.setattr(settings, "SCHEDULER_LOCK_RETRY_SECONDS", 0)
+    connection = _HeldLockConnection()
+    bind = SimpleNamespace(
+        dialect=SimpleNamespace(name="postgresql"), connect=lambda: connection
+    )
+    stop_event = threading.Event()
+    stop_event.set()
+
+    with scheduler_lock(bind, stop_event) as acquired:
+        assert acquired is False
+
+    assert connection.statements == ["SELECT pg_try_advisory_lock(:key)"]
+    assert connection.closed
@@ -0,0 +1,72 @@
+"""Background worker: hosts the scheduled jobs outside the web process.
+
+Run from ``backend/``::
+
+    python -m app.worker
+
+Jobs are kept in a persistent SQLAlchemy job store (``SCHEDULER_JOBSTORE_URL``,
+defaulting to the application database), so schedules and missed runs survive
+restarts. Pair it with ``RUN_SCHEDULER_IN_WEB=false`` on the web replicas.
+Only one worker runs the jobs: on Postgres the others wait on an advisory
+lock (see ``scheduler_lock``) and take over when it exits.
+SIGTERM/SIGINT stop new runs and wait for the ones in flight before exiting.
+"""
+
+import logging
+import signal
+import threading
+
+from app.services.audit_log import audit_writer
+from app.services.email_transport import close_transports
+from app.services.scheduler import build_persistent_jobstore, build_scheduler, scheduler_lock
+from app.services.sms import close_sms_provider
+
+logger = logging.getLogger("meditrack.worker")
+
+
+def _run_scheduler(jobstore, stop_event: threading.Event) -> None:
+    scheduler = build_scheduler(jobstore)
+    scheduler.start()
+    logger.info(
+        "Worker started with jobs: %s",
+        ", ".join(job.id for job in scheduler.get_jobs()),
+    )
+    try:
+        stop_event.wait()
+    finally:
+        logger.info("Worker draining in-flight jobs")
+        scheduler.shutdown(wait=True)
+
+
+def run_worker(stop_event: threading.Event | None = None, jobstore=None) -> None:
+    stop_event = stop_event or threading.Event()
+    jobstore = jobstore or build_persistent_jobstore()
+    try:
+        # The lock lives in the job store's database, next to the jobs it guards.
+        with scheduler_lock(jobstore.engine, stop_event) as acquired:
+            if acquired:
+                _run_scheduler(jobstore, stop_event)
+    finally:
+        audit_writer.stop()
+        close_transports()
+        close_sms_provider()
+        logger.info("Worker stopped")
+
+
+def main() -> None:
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    )
+    stop_event = threading.Event()
+
+    def request_stop(signum, _frame) -> None:
+        logger.info("Received %s, shutting down", signal.Signals(signum).name)
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+    run_worker(stop_event)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,207 @@
+"""Deep-page latency of the audit log: OFFSET on the 0008 indexes vs keyset.
+
+Seeds ``audit_logs`` with SQL only (a recursive CTE on SQLite,
+``generate_series`` on Postgres), so tens of millions of rows load in minutes.
+Most rows belong to one large tenant. Each depth is fetched twice:
+
+* ``offset``: the old ``OFFSET n LIMIT 50`` query with the single-column
+  indexes from migration 0008.
+* ``keyset``: the ``before`` cursor query with the composite indexes from
+  migration 0019.
+
+The plan of each query is printed. A plan that sorts, with a temp B-tree or a
+Sort node, is flagged.
+
+Run from ``backend/``::
+
+    python -m benchmarks.audit_log_pagination                    # 1M rows on SQLite
+    python -m benchmarks.audit_log_pagination 50000000 --depths 0 100000 10000000
+    python -m benchmarks.audit_log_pagination 50000000 --url postgresql://...
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.pagination import apply_keyset, encode_cursor
+from app.db.base import Base
+from app.models.audit_log import AuditLog
+from app.models.user import User, UserRole
+
+OWNERS = 10
+LIMIT = 50
+FILTERS = {
+    "none": {},
+    "entity_type": {"entity_type": "appointment"},
+    "action": {"action": "patient.update"},
+}
+LEGACY_INDEXES = {
+    "ix_audit_logs_owner_user_id": "owner_user_id",
+    "ix_audit_logs_action": "action",
+    "ix_audit_logs_entity_type": "entity_type",
+    "ix_audit_logs_entity_id": "entity_id",
+}
+KEYSET_INDEXES = {
+    "ix_audit_logs_owner_created_id": "owner_user_id, created_at DESC, id DESC",
+    "ix_audit_logs_owner_entity_type_created_id": (
+        "owner_user_id, entity_type, created_at DESC, id DESC"
+    ),
+    "ix_audit_logs_owner_action_created_id": "owner_user_id, action, created_at DESC, id DESC",
+    "ix_audit_logs_owner_entity_id_created_id": (
+        "owner_user_id, entity_id, created_at DESC, id DESC"
+    ),
+}
+
+# Owner 1 gets nine rows in ten; actions and entity types rotate.
+SQLITE_SEED = """
+INSERT INTO audit_logs (owner_user_id, created_at, action, entity_type, entity_id, summary)
+WITH RECURSIVE seq(n) AS (SELECT 1 UNION ALL SELECT n + 1 FROM seq WHERE n < :rows)
+SELECT
+    CASE WHEN n % 10 = 0 THEN 2 + (n / 10) % (:owners - 1) ELSE 1 END,
+    strftime('%Y-%m-%d %H:%M:%f', '2020-01-01', '+' || (n / 3) || ' seconds') || '000',
+    CASE n % 4 WHEN 0 THEN 'patient.create' WHEN 1 THEN 'patient.update'
+         WHEN 2 THEN 'appointment.update' ELSE 'auth.login' END,
+    CASE n % 4 WHEN 2 THEN 'appointment' WHEN 3 THEN 'user' ELSE 'patient' END,
+    n % 50000,
+    'Seeded event'
+FROM seq
+"""
+POSTGRES_SEED = """
+INSERT INTO audit_logs (owner_user_id, created_at, action, entity_type, entity_id, summary)
+SELECT
+    CASE WHEN n % 10 = 0 THEN 2 + (n / 10) % (:owners - 1) ELSE 1 END,
+    timestamptz '2020-01-01 00:00:00+00' + (n / 3) * interval '1 second',
+    (ARRAY['patient.create', 'patient.update', 'appointment.update', 'auth.login'])[n % 4 + 1],
+    (ARRAY['patient', 'patient', 'appointment', 'user'])[n % 4 + 1],
+    n % 50000,
+    'Seeded event'
+FROM generate_series(1, :rows) AS n
+"""
+
+
+def _drop_indexes(connection, names) -> None:
+    for name in names:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def _seed(engine, rows: int) -> None:
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, future=True)
+    with factory() as db:
+        db.add_all(
+            User(
+                email=f"owner{index}@bench.test",
+                hashed_password="x",
+                full_name=f"Owner {index}",
+                role=UserRole.admin,
+            )
+            for index in range(OWNERS)
+        )
+        db.commit()
+    with engine.begin() as connection:
+        _drop_indexes(connection, [*LEGACY_INDEXES, *KEYSET_INDEXES])
+        seed = POSTGRES_SEED if engine.dialect.name == "postgresql" else SQLITE_SEED
+        connection.execute(text(seed), {"rows": rows, "owners": OWNERS})
+
+
+def _build(engine, indexes: dict) -> float:
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for name, columns in indexes.items():
+            connection.execute(text(f"CREATE INDEX {name} ON audit_logs ({columns})"))
+        connection.execute(text("ANALYZE"))
+    return time.perf_counter() - started
+
+
+def _query(db, filters: dict):
+    query = db.query(AuditLog).filter(AuditLog.owner_user_id == 1)
+    for column, value in filters.items():
+        query = query.filter(getattr(AuditLog, column) == value)
+    return query
+
+
+def _explain(db, query) -> str:
+    statement = str(
+        query.statement.compile(
+            dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}
+        )
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        rows = db.execute(text(f"EXPLAIN (ANALYZE, BUFFERS) {statement}")).scalars()
+        plan = list(rows)
+        sorts = any("Sort" in line for line in plan)
+    else:
+        plan = [row[3] for row in db.execute(text(f"EXPLAIN QUERY PLAN {statement}"))]
+        sorts = any("TEMP B-TREE" in line for line in plan)
+    flag = "  ** sorts **" if sorts else ""
+    return " | ".join(line.strip() for line in plan[:3]) + flag
+
+
+def _time(db, query, runs: int) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        query.all()
+        timings.append((time.perf_counter() - started) * 1000)
+        db.expunge_all()
+    return statistics.median(timings)
+
+
+def _run(db, label: str, depths: list[int], runs: int) -> None:
+    for name, filters in FILTERS.items():
+        print(f"  [{label}] filter={name}")
+        ordered = _query(db, filters).order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+        for depth in depths:
+            if label == "offset":
+                page = ordered.offset(depth).limit(LIMIT)
+            else:
+                anchor = (
+                    ordered.with_entities(AuditLog.created_at, AuditLog.id)
+                    .offset(depth - 1)
+                    .first()
+                    if depth
+                    else None
+                )
+                if depth and anchor is None:
+                    continue
+                cursor = encode_cursor(*anchor) if anchor else None
+                page = apply_keyset(
+                    _query(db, filters), AuditLog.created_at, AuditLog.id, cursor, descending=True
+                ).limit(LIMIT)
+            median = _time(db, page, runs)
+            print(f"    depth {depth:>10}: {median:>9.2f} ms   {_explain(db, page)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", nargs="?", type=int, default=1_000_000)
+    parser.add_argument("--depths", nargs="*", type=int, default=[0, 10_000, 100_000, 500_000])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--url", help="database URL; defaults to a temporary SQLite file")
+    args = parser.parse_args()
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'audit_bench.db')}"
+    engine = create_engine(url, future=True)
+    started = time.perf_counter()
+    _seed(engine, args.rows)
+    print(f"seeded {args.rows} audit rows in {time.perf_counter() - started:.1f}s")
+    factory = sessionmaker(bind=engine, future=True)
+
+    print(f"legacy indexes built in {_build(engine, LEGACY_INDEXES):.1f}s")
+    with factory() as db:
+        _run(db, "offset", args.depths, args.runs)
+    with engine.begin() as connection:
+        _drop_indexes(connection, LEGACY_INDEXES)
+
+    print(f"keyset indexes built in {_build(engine, KEYSET_INDEXES):.1f}s")
+    with factory() as db:
+        _run(db, "keyset", args.depths, args.runs)
+
+
+if __name__ == "__main__":
+    main()
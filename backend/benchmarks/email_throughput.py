@@ -0,0 +1,121 @@
+"""SMTP delivery throughput: one connection per message vs the pooled transport.
+
+Starts a minimal local SMTP stand-in that accepts and discards mail, with an
+optional per-connection handshake delay to mimic STARTTLS/AUTH round trips.
+
+Run from ``backend/``::
+
+    python -m benchmarks.email_throughput                 # 500 messages
+    python -m benchmarks.email_throughput 2000 --delay 0.05
+"""
+
+import argparse
+import smtplib
+import socketserver
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+
+from app.services.email_transport import SMTPConnectionPool
+
+
+class _SMTPHandler(socketserver.StreamRequestHandler):
+    handshake_delay = 0.0
+
+    def _reply(self, line: str) -> None:
+        self.wfile.write(f"{line}\r\n".encode("ascii"))
+
+    def handle(self) -> None:
+        time.sleep(self.handshake_delay)
+        self._reply("220 bench ESMTP")
+        while True:
+            raw = self.rfile.readline()
+            if not raw:
+                return
+            command = raw.decode("ascii", "replace").strip().upper()
+            if command.startswith(("EHLO", "HELO")):
+                self._reply("250 bench")
+            elif command == "DATA":
+                self._reply("354 end with .")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                self._reply("250 queued")
+            elif command == "QUIT":
+                self._reply("221 bye")
+                return
+            else:
+                self._reply("250 OK")
+
+
+class _SMTPServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+
+def _message(index: int) -> EmailMessage:
+    message = EmailMessage()
+    message["From"] = "bench@example.com"
+    message["To"] = f"patient{index}@example.com"
+    message["Subject"] = "Appointment reminder"
+    message.set_content("Reminder body " * 20)
+    return message
+
+
+def _send_unpooled(host: str, port: int, message: EmailMessage) -> None:
+    with smtplib.SMTP(host, port) as server:
+        server.send_message(message)
+
+
+def _run(label: str, count: int, workers: int, send) -> None:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(send, (_message(index) for index in range(count))))
+    elapsed = time.perf_counter() - started
+    print(f"{label:<28} {count / elapsed:>10.1f} msg/s  ({elapsed:.2f}s)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("count", nargs="?", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument(
+        "--delay",
+        type=float,
+        default=0.02,
+        help="seconds added to each new connection's greeting",
+    )
+    args = parser.parse_args()
+
+    _SMTPHandler.handshake_delay = args.delay
+    server = _SMTPServer(("127.0.0.1", 0), _SMTPHandler)
+    host, port = server.server_address
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    pool = SMTPConnectionPool(
+        host,
+        port,
+        username=None,
+        password=None,
+        use_tls=False,
+        size=args.workers,
+        timeout=10,
+        noop_after=30,
+        max_idle=240,
+    )
+    try:
+        print(f"{args.count} messages, {args.workers} workers, {args.delay}s handshake")
+        _run(
+            "connection per message",
+            args.count,
+            args.workers,
+            lambda message: _send_unpooled(host, port, message),
+        )
+        _run("pooled connections", args.count, args.workers, pool.send)
+    finally:
+        pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""Requests/second and CPU per response for the appointment and audit-log lists.
+
+Serves the real ``/appointments/`` and ``/audit-logs/`` routers next to
+copies of their previous implementations. The old versions returned ORM
+rows or per-row models through ``response_model``, and FastAPI's default
+encoder wrote the JSON. Authentication and the session are overridden so
+only querying and serialisation are measured. CPU is process time per
+response, which includes the in-process test client.
+
+Run from ``backend/``::
+
+    python -m benchmarks.list_serialization                # 500-row pages
+    python -m benchmarks.list_serialization --rows 200 --requests 300
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, selectinload, sessionmaker
+
+from app.api.v1 import appointments, audit_logs
+from app.api.v1.audit_logs import _parse_metadata
+from app.core.principal_cache import Principal
+from app.core.security import get_current_admin
+from app.db.base import Base
+from app.db.session import get_db
+from app.models.appointment import Appointment
+from app.models.audit_log import AuditLog
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+from app.schemas.appointment import AppointmentResponse
+from app.schemas.audit_log import AuditLogResponse
+
+
+def _seed(factory, rows: int) -> int:
+    with factory() as db:
+        owner = User(
+            email="owner@bench.test", hashed_password="x", full_name="Owner", role=UserRole.admin
+        )
+        db.add(owner)
+        db.commit()
+        patients = [
+            Patient(
+                owner_user_id=owner.id,
+                full_name=f"Patient {index}",
+                email=f"patient{index}@example.com",
+                phone=f"555-{index:04d}",
+                medical_history="History " * 40,
+                notes="Notes " * 40,
+            )
+            for index in range(max(rows // 10, 1))
+        ]
+        db.add_all(patients)
+        db.commit()
+        start = datetime(2030, 1, 1, 9, 0)
+        db.bulk_insert_mappings(
+            Appointment,
+            [
+                {
+                    "patient_id": patients[index % len(patients)].id,
+                    "owner_user_id": owner.id,
+                    "doctor_name": "Dr. Bench",
+                    "department": "Cardiology",
+                    "appointment_datetime": start + timedelta(minutes=30 * index),
+                    "notes": "Routine check",
+                }
+                for index in range(rows)
+            ],
+        )
+        db.bulk_insert_mappings(
+            AuditLog,
+            [
+                {
+                    "owner_user_id": owner.id,
+                    "created_at": start + timedelta(seconds=index),
+                    "action": "patient.update",
+                    "entity_type": "patient",
+                    "entity_id": index,
+                    "summary": f"Updated patient {index}",
+                    "metadata_json": '{"fields": ["phone", "email"]}',
+                    "ip_address": "127.0.0.1",
+                    "user_agent": "bench",
+                    "request_id": f"req-{index}",
+                }
+                for index in range(rows)
+            ],
+        )
+        db.commit()
+        return owner.id
+
+
+def _build_app(factory, owner_id: int) -> FastAPI:
+    app = FastAPI()
+    app.include_router(appointments.router)
+    app.include_router(audit_logs.router)
+
+    def _db():
+        with factory() as db:
+            yield db
+
+    @app.get("/legacy/appointments", response_model=list[AppointmentResponse])
+    def legacy_appointments(limit: int, db: Session = Depends(get_db)):
+        return (
+            db.query(Appointment)
+            .options(selectinload(Appointment.patient))
+            .filter(Appointment.owner_user_id == owner_id)
+            .order_by(Appointment.appointment_datetime, Appointment.id)
+            .limit(limit)
+            .all()
+        )
+
+    @app.get("/legacy/audit-logs", response_model=list[AuditLogResponse])
+    def legacy_audit_logs(limit: int, db: Session = Depends(get_db)):
+        logs = (
+            db.query(AuditLog)
+            .filter(AuditLog.owner_user_id == owner_id)
+            .order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+            .limit(limit)
+            .all()
+        )
+        return [
+            AuditLogResponse(
+                id=log.id,
+                created_at=log.created_at,
+                action=log.action,
+                entity_type=log.entity_type,
+                entity_id=log.entity_id,
+                summary=log.summary,
+                metadata=_parse_metadata(log.metadata_json),
+                ip_address=log.ip_address,
+                user_agent=log.user_agent,
+                request_id=log.request_id,
+            )
+            for log in logs
+        ]
+
+    app.dependency_overrides[get_db] = _db
+    app.dependency_overrides[get_current_admin] = lambda: Principal(
+        owner_id, "owner@bench.test", "Owner", UserRole.admin
+    )
+    return app
+
+
+def _measure(client: TestClient, label: str, url: str, requests: int, accept: str) -> None:
+    headers = {"Accept": accept}
+    response = client.get(url, headers=headers)
+    response.raise_for_status()
+    size = len(response.content)
+    wall_started = time.perf_counter()
+    cpu_started = time.process_time()
+    for _ in range(requests):
+        client.get(url, headers=headers)
+    cpu = time.process_time() - cpu_started
+    wall = time.perf_counter() - wall_started
+    print(
+        f"  {label:<18} {requests / wall:>8.1f} req/s  "
+        f"{cpu / requests * 1000:>7.2f} ms CPU/response  {size / 1024:>7.1f} KiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "serialization_bench.db")
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, future=True)
+    owner_id = _seed(factory, args.rows)
+    client = TestClient(_build_app(factory, owner_id))
+
+    limit = f"limit={min(args.rows, 500)}"
+    audit_limit = f"limit={min(args.rows, 200)}"
+    cases = {
+        "appointments": [
+            ("legacy", f"/legacy/appointments?{limit}", "application/json"),
+            ("orjson", f"/appointments/?{limit}", "application/json"),
+            ("orjson normalized", f"/appointments/?{limit}&normalize=true", "application/json"),
+            ("msgpack", f"/appointments/?{limit}", "application/msgpack"),
+        ],
+        "audit logs": [
+            ("legacy", f"/legacy/audit-logs?{audit_limit}", "application/json"),
+            ("orjson", f"/audit-logs/?{audit_limit}", "application/json"),
+            ("msgpack", f"/audit-logs/?{audit_limit}", "application/msgpack"),
+        ],
+    }
+    for title, variants in cases.items():
+        print(title)
+        for label, url, accept in variants:
+            _measure(client, label, url, args.requests, accept)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Login throughput and health-check latency under a concurrent login burst.
+
+Runs the same mixed workload twice: bcrypt called inline on the request's
+worker thread, then through the bounded password-hash pool with admission
+control. Rate limiting is disabled so the numbers reflect hashing cost.
+
+Run from ``backend/``::
+
+    python -m benchmarks.login_throughput                   # 200 logins, 32 clients
+    python -m benchmarks.login_throughput 500 --clients 64 --workers 4
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.api.v1 import auth as auth_module
+from app.core import password_pool as password_pool_module
+from app.core.limiter import limiter
+from app.core.password_pool import PasswordHashPool
+from app.core.security import get_password_hash, verify_password
+from app.db.base import Base
+from app.db.session import get_db
+from app.main import app
+from app.models.user import User, UserRole
+
+EMAIL = "bench@example.com"
+PASSWORD = "bench-password"
+
+
+def _session_factory():
+    path = os.path.join(tempfile.mkdtemp(), "login_bench.db")
+    engine = create_engine(
+        f"sqlite:///{path}", connect_args={"check_same_thread": False}, future=True
+    )
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine, future=True)
+    with factory() as session:
+        session.add(
+            User(
+                email=EMAIL,
+                hashed_password=get_password_hash(PASSWORD),
+                full_name="Bench Admin",
+                role=UserRole.admin,
+            )
+        )
+        session.commit()
+    return factory
+
+
+def _run(label: str, client: TestClient, logins: int, clients: int) -> None:
+    stop = threading.Event()
+    health_ms: list[float] = []
+
+    def probe_health() -> None:
+        while not stop.is_set():
+            started = time.perf_counter()
+            client.get("/api/health")
+            health_ms.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.01)
+
+    def login(_index: int) -> int:
+        return client.post(
+            "/api/v1/auth/login", json={"email": EMAIL, "password": PASSWORD}
+        ).status_code
+
+    prober = threading.Thread(target=probe_health, daemon=True)
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        statuses = list(executor.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    prober.join()
+
+    ok = statuses.count(200)
+    busy = statuses.count(503)
+    p99 = statistics.quantiles(health_ms, n=100)[98] if len(health_ms) > 1 else 0.0
+    print(
+        f"{label:<16} {ok / elapsed:>8.1f} logins/s  ok={ok} busy={busy}  "
+        f"health p50={statistics.median(health_ms):.1f}ms p99={p99:.1f}ms"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("logins", nargs="?", type=int, default=200)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--max-pending", type=int, default=16)
+    args = parser.parse_args()
+
+    factory = _session_factory()
+
+    def override_get_db():
+        session = factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    limiter.enabled = False
+    client = TestClient(app)
+    print(f"{args.logins} logins, {args.clients} concurrent clients")
+    try:
+        original = auth_module.verify_password_pooled
+        auth_module.verify_password_pooled = verify_password
+        _run("inline bcrypt", client, args.logins, args.clients)
+        auth_module.verify_password_pooled = original
+
+        pool = PasswordHashPool(args.workers, args.max_pending)
+        password_pool_module.password_pool = pool
+        _run(f"pool({args.workers}/{args.max_pending})", client, args.logins, args.clients)
+        pool.shutdown()
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        limiter.enabled = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Latency of the appointment overlap check as an owner's history grows.
+
+Run from ``backend/``::
+
+    python -m benchmarks.overlap_check            # 100 .. 1,000,000 rows
+    python -m benchmarks.overlap_check 100 10000  # custom sizes
+
+Set ``BENCH_DATABASE_URL`` to benchmark against Postgres instead of a
+throwaway SQLite file.
+"""
+
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.appointment import Appointment, AppointmentStatus
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+from app.services.appointment_overlap import (
+    OverlapIndexRegistry,
+    find_overlapping_appointment,
+)
+
+DEFAULT_SIZES = (100, 10_000, 100_000, 1_000_000)
+QUERIES = 200
+HISTORY_START = datetime(2020, 1, 1, 8, 0)
+STATUSES = list(AppointmentStatus)
+
+
+def _engine():
+    url = os.getenv("BENCH_DATABASE_URL")
+    if url:
+        return create_engine(url, future=True)
+    path = os.path.join(tempfile.mkdtemp(), "overlap_bench.db")
+    return create_engine(f"sqlite:///{path}", future=True)
+
+
+def _seed(session, owner_id: int, patient_id: int, count: int) -> None:
+    batch = []
+    for offset in range(count):
+        start = HISTORY_START + timedelta(minutes=45 * offset)
+        batch.append(
+            {
+                "patient_id": patient_id,
+                "owner_user_id": owner_id,
+                "doctor_name": "Dr. Bench",
+                "appointment_datetime": start,
+                "appointment_end_datetime": start + timedelta(minutes=30)
+                if offset % 2
+                else None,
+                "status": random.choice(STATUSES),
+                "created_at": start,
+            }
+        )
+        if len(batch) == 10_000:
+            session.execute(insert(Appointment), batch)
+            batch = []
+    if batch:
+        session.execute(insert(Appointment), batch)
+    session.commit()
+
+
+def _time_queries(check, count: int) -> list[float]:
+    latencies = []
+    for _ in range(QUERIES):
+        start = HISTORY_START + timedelta(minutes=45 * random.randrange(count) + 10)
+        began = time.perf_counter()
+        check(start, start + timedelta(minutes=30))
+        latencies.append((time.perf_counter() - began) * 1000)
+    return latencies
+
+
+def run(sizes) -> None:
+    engine = _engine()
+    Session = sessionmaker(bind=engine, future=True)
+    print(f"{'rows':>10} {'sql p50 ms':>11} {'sql p99 ms':>11} {'tree p50 ms':>12}")
+    for size in sizes:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        with Session() as session:
+            owner = User(
+                email="bench@example.com",
+                hashed_password="x",
+                full_name="Bench Owner",
+                role=UserRole.admin,
+            )
+            session.add(owner)
+            session.flush()
+            patient = Patient(full_name="Bench Patient", owner_user_id=owner.id)
+            session.add(patient)
+            session.commit()
+            _seed(session, owner.id, patient.id, size)
+
+            sql = _time_queries(
+                lambda s, e: find_overlapping_appointment(session, owner.id, s, e),
+                size,
+            )
+            registry = OverlapIndexRegistry()
+            registry.find_overlap(session, owner.id, HISTORY_START, HISTORY_START)
+            tree = _time_queries(
+                lambda s, e: registry.find_overlap(session, owner.id, s, e), size
+            )
+        sql.sort()
+        print(
+            f"{size:>10} {statistics.median(sql):>11.3f} "
+            f"{sql[int(len(sql) * 0.99) - 1]:>11.3f} {statistics.median(tree):>12.4f}"
+        )
+
+
+if __name__ == "__main__":
+    run([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
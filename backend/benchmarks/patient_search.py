@@ -0,0 +1,103 @@
+"""Patient search latency for one large tenant on the SQLite FTS5 index.
+
+Seeds ``patients`` rows for one owner (plus a second owner with the same
+volume, so tenant filtering is exercised) and times ``search_patients`` for
+prefix, substring, multi-term, phone and fuzzy queries.
+
+Run from ``backend/``::
+
+    python -m benchmarks.patient_search                 # 100k patients per tenant
+    python -m benchmarks.patient_search 1000000 --runs 50
+"""
+
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.base import Base
+from app.models.patient import Patient
+from app.models.user import User, UserRole
+from app.services.patient_search import rebuild_owner_search_index, search_patients
+
+FIRST_NAMES = ["John", "Maria", "Anna", "Peter", "Joanna", "Liam", "Olivia", "Noah", "Emma", "Lucas"]
+LAST_NAMES = ["Smith", "Lopez", "Novak", "Berg", "Smithers", "Nguyen", "Kowalski", "Rossi", "Okafor", "Larsen"]
+QUERIES = ["jo", "smi", "ithers", "maria lop", "anna berg4", "555-01", "marla lopes"]
+
+
+def _seed(factory, patients: int) -> int:
+    rng = random.Random(7)
+    with factory() as db:
+        owners = [
+            User(
+                email=f"owner{index}@bench.test",
+                hashed_password="x",
+                full_name=f"Owner {index}",
+                role=UserRole.admin,
+            )
+            for index in range(2)
+        ]
+        db.add_all(owners)
+        db.commit()
+        for owner in owners:
+            rows = []
+            for index in range(patients):
+                first = rng.choice(FIRST_NAMES)
+                last = f"{rng.choice(LAST_NAMES)}{index % 1000 or ''}"
+                rows.append(
+                    {
+                        "owner_user_id": owner.id,
+                        "first_name": first,
+                        "last_name": last,
+                        "full_name": f"{first} {last}",
+                        "email": f"{first}.{last}{index}@example.com".lower(),
+                        "phone": f"555-{index // 10000:02d}{index % 10000:04d}",
+                    }
+                )
+                if len(rows) == 10000:
+                    db.bulk_insert_mappings(Patient, rows)
+                    rows = []
+            db.bulk_insert_mappings(Patient, rows)
+            rebuild_owner_search_index(db, owner.id)
+            db.commit()
+        return owners[0].id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("patients", nargs="?", type=int, default=100_000)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=25)
+    args = parser.parse_args()
+
+    path = os.path.join(tempfile.mkdtemp(), "search_bench.db")
+    engine = create_engine(f"sqlite:///{path}", future=True)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, future=True)
+
+    started = time.perf_counter()
+    owner_id = _seed(factory, args.patients)
+    print(f"seeded 2 x {args.patients} patients in {time.perf_counter() - started:.1f}s")
+
+    with factory() as db:
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.runs):
+                started = time.perf_counter()
+                results = search_patients(db, owner_id, query, args.limit)
+                timings.append((time.perf_counter() - started) * 1000)
+                db.expunge_all()
+            p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+            print(
+                f"{query!r:<16} {len(results):>3} hits  "
+                f"p50={statistics.median(timings):.1f}ms p95={p95:.1f}ms"
+            )
+
+
+if __name__ == "__main__":
+    main()
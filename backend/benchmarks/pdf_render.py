@@ -0,0 +1,136 @@
+"""Patient record PDF render time and peak memory for growing histories.
+
+Compares the original inline renderer (fresh stylesheet per call, a Paragraph
+for every cell, one table buffered in memory) with ``app.services.patient_pdf``
+writing straight to a file. Peak memory is measured with ``tracemalloc``,
+which slows both paths; the legacy 10000-row case takes several minutes.
+
+Run from ``backend/``::
+
+    python -m benchmarks.pdf_render                  # 10, 1000 and 10000 rows
+    python -m benchmarks.pdf_render 10 500 --repeat 3
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from io import BytesIO
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import LETTER
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from app.services.patient_pdf import _format_time_range, render_patient_pdf
+
+
+def _snapshot(rows: int) -> dict:
+    start = datetime(2030, 1, 1, 9, 0)
+    return {
+        "clinic_name": "Medyra",
+        "patient": {
+            "id": 1,
+            "full_name": "Bench Patient",
+            "date_of_birth": "1980-04-02",
+            "sex": "F",
+            "email": "bench@example.com",
+            "phone": "555-0100",
+            "address": "1 Bench Street",
+            "notes": "Allergic to penicillin.\nFollow up yearly.",
+        },
+        "appointments": [
+            {
+                "start": start + timedelta(days=index),
+                "end": start + timedelta(days=index, minutes=30),
+                "doctor": "Dr. Bench",
+                "department": "Cardiology",
+                "status": "completed",
+                "notes": "Routine check" if index % 4 else "Adjusted dosage after reviewing the latest labs.",
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+def _render_legacy(snapshot: dict) -> bytes:
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer, pagesize=LETTER, leftMargin=36, rightMargin=36, topMargin=36, bottomMargin=36
+    )
+    styles = getSampleStyleSheet()
+    patient = snapshot["patient"]
+    story = [
+        Paragraph(snapshot["clinic_name"], styles["Title"]),
+        Paragraph("Patient Record Export", styles["Heading2"]),
+        Spacer(1, 12),
+    ]
+    demographics = Table(
+        [[label, patient[key]] for label, key in (("Full name", "full_name"), ("Email", "email"))],
+        colWidths=[140, 360],
+    )
+    demographics.setStyle(
+        TableStyle([("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey)])
+    )
+    story += [demographics, Paragraph(patient["notes"].replace("\n", "<br/>"), styles["BodyText"])]
+    table_data = [["Start / End", "Doctor", "Department", "Status", "Notes"]]
+    for row in snapshot["appointments"]:
+        table_data.append(
+            [
+                Paragraph(_format_time_range(row["start"], row["end"]), styles["BodyText"]),
+                Paragraph(row["doctor"], styles["BodyText"]),
+                Paragraph(row["department"], styles["BodyText"]),
+                Paragraph(row["status"], styles["BodyText"]),
+                Paragraph(row["notes"], styles["BodyText"]),
+            ]
+        )
+    history = Table(table_data, colWidths=[150, 90, 90, 70, 160])
+    history.setStyle(
+        TableStyle(
+            [
+                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+                ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+                ("GRID", (0, 0), (-1, -1), 0.25, colors.lightgrey),
+                ("VALIGN", (0, 0), (-1, -1), "TOP"),
+            ]
+        )
+    )
+    story.append(history)
+    doc.build(story)
+    return buffer.getvalue()
+
+
+def _render_streaming(snapshot: dict) -> None:
+    with tempfile.TemporaryFile() as handle:
+        render_patient_pdf(snapshot, handle)
+
+
+def _measure(label: str, render, snapshot: dict, repeat: int) -> None:
+    timings = []
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        started = time.perf_counter()
+        render(snapshot)
+        timings.append(time.perf_counter() - started)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    print(f"  {label:<10} {min(timings) * 1000:>10.1f} ms  peak {peak / 1_048_576:>7.1f} MiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("rows", nargs="*", type=int, default=[10, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    for rows in args.rows:
+        snapshot = _snapshot(rows)
+        print(f"{rows} appointments")
+        _measure("legacy", _render_legacy, snapshot, args.repeat)
+        _measure("streaming", _render_streaming, snapshot, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,64 @@
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import {
+  keepPreviousData,
+  useInfiniteQuery,
+  useMutation,
+  useQueries,
+  useQueryClient
+} from "@tanstack/react-query";
 
 import {
-  Appointment,
+  AppointmentFilters,
+  AppointmentStatus,
   AppointmentUpdatePayload,
   cancelAppointment,
   completeAppointment,
   createAppointment,
-  fetchAppointments,
+  fetchAppointmentPage,
   updateAppointment
 } from "../services/appointments";
 
-export const useAppointments = () => {
-  return useQuery<Appointment[]>({
-    queryKey: ["appointments"],
-    queryFn: fetchAppointments
+export const useAppointments = (filters: AppointmentFilters = {}) => {
+  const query = useInfiniteQuery({
+    queryKey: ["appointments", filters],
+    queryFn: ({ pageParam }) => fetchAppointmentPage(filters, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    placeholderData: keepPreviousData
+  });
+  const pages = query.data?.pages;
+  return {
+    ...query,
+    data: pages?.flatMap((page) => page.items),
+    totalCount: pages?.[0]?.totalCount ?? null,
+    totalIsEstimate: pages?.[0]?.totalIsEstimate ?? false
+  };
+};
+
+export type AppointmentCount = { count: number | null; isEstimate: boolean };
+
+/** Server-side totals for each status group, e.g. the list page's status tabs. */
+export const useAppointmentCounts = <K extends string>(
+  filters: AppointmentFilters,
+  groups: Record<K, AppointmentStatus[] | undefined>
+): Record<K, AppointmentCount> => {
+  const keys = Object.keys(groups) as K[];
+  return useQueries({
+    queries: keys.map((key) => ({
+      queryKey: ["appointments", "count", filters, groups[key]],
+      queryFn: () =>
+        fetchAppointmentPage({ ...filters, status: groups[key], limit: 1, include_total: true }),
+      placeholderData: keepPreviousData
+    })),
+    combine: (results) =>
+      Object.fromEntries(
+        keys.map((key, index) => [
+          key,
+          {
+            count: results[index].data?.totalCount ?? null,
+            isEstimate: results[index].data?.totalIsEstimate ?? false
+          }
+        ])
+      ) as Record<K, AppointmentCount>
   });
 };
 
@@ -1,4 +1,10 @@
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import {
+  keepPreviousData,
+  useInfiniteQuery,
+  useMutation,
+  useQuery,
+  useQueryClient
+} from "@tanstack/react-query";
 
 import {
   Patient,
@@ -7,9 +13,12 @@ import {
   createPatient,
   fetchPatient,
   fetchPatientAppointments,
+  fetchPatientPage,
   fetchPatients,
+  searchPatients,
   updatePatientNotes
 } from "../services/patients";
+import type { AppointmentFilters } from "../services/appointments";
 
 export const usePatients = () => {
   return useQuery<Patient[]>({
@@ -18,6 +27,35 @@ export const usePatients = () => {
   });
 };
 
+/** The patient list one page at a time, with the total from the first page. */
+export const usePatientPages = () => {
+  const query = useInfiniteQuery({
+    queryKey: ["patients", "pages"],
+    queryFn: ({ pageParam }) => fetchPatientPage(pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor
+  });
+  const pages = query.data?.pages;
+  return {
+    ...query,
+    data: pages?.flatMap((page) => page.items),
+    totalCount: pages?.[0]?.totalCount ?? null,
+    totalIsEstimate: pages?.[0]?.totalIsEstimate ?? false
+  };
+};
+
+export const usePatientSearch = (query: string) => {
+  const result = useInfiniteQuery({
+    queryKey: ["patients", "search", query],
+    queryFn: ({ pageParam }) => searchPatients(query, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
+    enabled: !!query,
+    placeholderData: keepPreviousData
+  });
+  return { ...result, data: result.data?.pages.flatMap((page) => page.items) };
+};
+
 export const usePatient = (patientId: number) => {
   return useQuery<Patient>({
     queryKey: ["patient", patientId],
@@ -26,12 +64,24 @@ export const usePatient = (patientId: number) => {
   });
 };
 
-export const usePatientAppointments = (patientId: number) => {
-  return useQuery({
-    queryKey: ["patients", patientId, "appointments"],
-    queryFn: () => fetchPatientAppointments(patientId),
+export const usePatientAppointments = (
+  patientId: number,
+  filters: AppointmentFilters = {}
+) => {
+  const query = useInfiniteQuery({
+    queryKey: ["patients", patientId, "appointments", filters],
+    queryFn: ({ pageParam }) => fetchPatientAppointments(patientId, filters, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.nextCursor,
     enabled: !!patientId
   });
+  const pages = query.data?.pages;
+  return {
+    ...query,
+    data: pages?.flatMap((page) => page.items),
+    totalCount: pages?.[0]?.totalCount ?? null,
+    totalIsEstimate: pages?.[0]?.totalIsEstimate ?? false
+  };
 };
 
 export const useCreatePatient = () => {
@@ -11,6 +11,7 @@ import { DateTimePicker } from "../components/ui/DateTimePicker";
 import { InputField, TextAreaField } from "../components/ui/FormField";
 import { SectionHeader } from "../components/ui/SectionHeader";
 import {
+  useAppointmentCounts,
   useAppointments,
   useCancelAppointment,
   useCompleteAppointment,
@@ -18,7 +19,12 @@ import {
 } from "../hooks/useAppointments";
 import { usePatients } from "../hooks/usePatients";
 import { usePageTitle } from "../hooks/usePageTitle";
-import { Appointment, AppointmentStatus, simulateAppointmentReminder } from "../services/appointments";
+import {
+  Appointment,
+  AppointmentFilters,
+  AppointmentStatus,
+  simulateAppointmentReminder
+} from "../services/appointments";
 import { toast } from "../lib/toast";
 
 type AppointmentFormState = {
@@ -53,6 +59,15 @@ const STATUS_TABS: { key: StatusTab; label: string }[] = [
   { key: "cancelled", label: "Cancelled" }
 ];
 
+// "Scheduled" is shown as Unconfirmed, so that tab asks the server for both.
+const STATUS_FILTERS: Record<StatusTab, AppointmentStatus[] | undefined> = {
+  all: undefined,
+  completed: ["Completed"],
+  confirmed: ["Confirmed"],
+  unconfirmed: ["Unconfirmed", "Scheduled"],
+  cancelled: ["Cancelled"]
+};
+
 const REMINDER_EMAIL_OPTIONS = [1440, 720, 240, 120, 60, 30];
 const REMINDER_SMS_OPTIONS = [240, 120, 60, 30, 15];
 
@@ -66,6 +81,35 @@ const toInputValue = (value?: string) => {
   )}:${pad(date.getMinutes())}`;
 };
 
+// Appointment times are stored as local wall-clock values, so the date
+// filters are sent as local times too; date_to is inclusive.
+const getDateBounds = (
+  dateRange: DateRangeFilter,
+  customStart: string,
+  customEnd: string
+): Pick<AppointmentFilters, "date_from" | "date_to"> => {
+  const now = new Date();
+  const day = (offset: number) =>
+    toInputValue(
+      new Date(now.getFullYear(), now.getMonth(), now.getDate() + offset).toISOString()
+    ).slice(0, 10);
+  if (dateRange === "today") {
+    return { date_from: `${day(0)}T00:00:00`, date_to: `${day(0)}T23:59:59` };
+  }
+  if (dateRange === "next7" || dateRange === "next30") {
+    const days = dateRange === "next7" ? 7 : 30;
+    return { date_from: `${day(0)}T00:00:00`, date_to: `${day(days)}T00:00:00` };
+  }
+  if (dateRange === "custom") {
+    // The range picker yields local YYYY-MM-DD dates.
+    return {
+      date_from: customStart ? `${customStart}T00:00:00` : undefined,
+      date_to: customEnd ? `${customEnd}T23:59:59` : undefined
+    };
+  }
+  return {};
+};
+
 const formatDateTimeCell = (appointment: Appointment) => {
   const start = new Date(appointment.appointment_datetime);
   if (Number.isNaN(start.getTime())) {
@@ -106,8 +150,6 @@ const getApiErrorMessage = (error: any) => {
 
 const AppointmentListPage = () => {
   usePageTitle("Appointments");
-  const { data, isLoading, error } = useAppointments();
-  const { data: patients } = usePatients();
   const updateAppointment = useUpdateAppointment();
   const cancelAppointment = useCancelAppointment();
   const completeAppointment = useCompleteAppointment();
@@ -123,6 +165,35 @@ const AppointmentListPage = () => {
   const [departmentFilter, setDepartmentFilter] = useState("all");
   const [doctorFilter, setDoctorFilter] = useState("all");
   const [sortOption, setSortOption] = useState<SortOption>("date_asc");
+  // Status, dates, doctor, department and date order are filtered on the server,
+  // so "Load more" pages through matching rows only. The search box and the
+  // patient-name sort apply to the rows loaded so far.
+  const baseFilters = useMemo<AppointmentFilters>(
+    () => ({
+      ...getDateBounds(dateRange, customStart, customEnd),
+      doctor_name: doctorFilter === "all" ? undefined : doctorFilter,
+      department: departmentFilter === "all" ? undefined : departmentFilter
+    }),
+    [dateRange, customStart, customEnd, doctorFilter, departmentFilter]
+  );
+  const listFilters = useMemo<AppointmentFilters>(
+    () => ({
+      ...baseFilters,
+      status: STATUS_FILTERS[statusTab],
+      order: sortOption === "date_desc" ? "desc" : "asc"
+    }),
+    [baseFilters, statusTab, sortOption]
+  );
+  const {
+    data,
+    isLoading,
+    error,
+    hasNextPage,
+    fetchNextPage,
+    isFetchingNextPage
+  } = useAppointments(listFilters);
+  const statusCounts = useAppointmentCounts(baseFilters, STATUS_FILTERS);
+  const { data: patients } = usePatients();
   const filterRef = useRef<HTMLDivElement | null>(null);
   const filterPanelRef = useRef<HTMLDivElement | null>(null);
   const modalRef = useRef<HTMLDivElement | null>(null);
@@ -287,138 +358,55 @@ const AppointmentListPage = () => {
     return { enabled: true, message: "" };
   };
 
-  const statusCounts = useMemo(() => {
-    const counts = {
-      all: 0,
-      completed: 0,
-      confirmed: 0,
-      unconfirmed: 0,
-      cancelled: 0
-    };
-    (data ?? []).forEach((appointment) => {
-      const derived = getDerivedStatus(appointment);
-      counts.all += 1;
-      if (derived === "Cancelled") {
-        counts.cancelled += 1;
-      }
-      if (derived === "Completed") counts.completed += 1;
-      if (derived === "Confirmed") counts.confirmed += 1;
-      if (derived === "Unconfirmed") counts.unconfirmed += 1;
-    });
-    return counts;
-  }, [data]);
-
-  const departments = useMemo(() => {
-    const values = new Set<string>();
-    (data ?? []).forEach((appointment) => {
-      if (appointment.department) values.add(appointment.department);
-    });
-    return Array.from(values).sort();
-  }, [data]);
+  const [departments, setDepartments] = useState<string[]>([]);
+  const [doctors, setDoctors] = useState<string[]>([]);
 
-  const doctors = useMemo(() => {
-    const values = new Set<string>();
-    (data ?? []).forEach((appointment) => {
-      if (appointment.doctor_name) values.add(appointment.doctor_name);
-    });
-    return Array.from(values).sort();
+  // Filter options are collected from every page seen, so picking a doctor
+  // does not shrink the list to that doctor alone.
+  useEffect(() => {
+    const merge = (previous: string[], values: (string | undefined | null)[]) => {
+      const next = new Set(previous);
+      values.forEach((value) => {
+        if (value) next.add(value);
+      });
+      return next.size === previous.length ? previous : Array.from(next).sort();
+    };
+    setDepartments((previous) =>
+      merge(previous, (data ?? []).map((appointment) => appointment.department))
+    );
+    setDoctors((previous) =>
+      merge(previous, (data ?? []).map((appointment) => appointment.doctor_name))
+    );
   }, [data]);
 
   const filteredAppointments = useMemo(() => {
     const appointments = data ?? [];
     const term = searchTerm.trim().toLowerCase();
-    const now = new Date();
-    const startOfToday = new Date(now.getFullYear(), now.getMonth(), now.getDate());
-    const endOfToday = new Date(now.getFullYear(), now.getMonth(), now.getDate() + 1);
-    const next7 = new Date(now.getFullYear(), now.getMonth(), now.getDate() + 7);
-    const next30 = new Date(now.getFullYear(), now.getMonth(), now.getDate() + 30);
 
     const filtered = appointments.filter((appointment) => {
-      const derivedStatus = getDerivedStatus(appointment);
-      if (statusTab !== "all" && derivedStatus.toLowerCase() !== statusTab) return false;
-
+      if (!term) return true;
       const patientInfo = appointment.patient ?? patientById.get(appointment.patient_id);
       const patientName = patientInfo?.full_name?.toLowerCase() ?? "";
       const email = patientInfo?.email?.toLowerCase() ?? "";
       const phone = patientInfo?.phone?.toLowerCase() ?? "";
       const doctor = appointment.doctor_name?.toLowerCase() ?? "";
       const department = appointment.department?.toLowerCase() ?? "";
-
-      if (term) {
-        const matches =
-          patientName.includes(term) ||
-          doctor.includes(term) ||
-          department.includes(term) ||
-          email.includes(term) ||
-          phone.includes(term);
-        if (!matches) return false;
-      }
-
-      if (departmentFilter !== "all" && appointment.department !== departmentFilter) {
-        return false;
-      }
-      if (doctorFilter !== "all" && appointment.doctor_name !== doctorFilter) {
-        return false;
-      }
-
-      const appointmentDate = new Date(appointment.appointment_datetime);
-      if (Number.isNaN(appointmentDate.getTime())) return false;
-
-      if (dateRange === "today") {
-        if (appointmentDate < startOfToday || appointmentDate >= endOfToday) return false;
-      }
-      if (dateRange === "next7") {
-        if (appointmentDate < startOfToday || appointmentDate > next7) return false;
-      }
-      if (dateRange === "next30") {
-        if (appointmentDate < startOfToday || appointmentDate > next30) return false;
-      }
-      if (dateRange === "custom") {
-        if (customStart) {
-          const start = new Date(customStart);
-          if (!Number.isNaN(start.getTime()) && appointmentDate < start) return false;
-        }
-        if (customEnd) {
-          const end = new Date(customEnd);
-          if (!Number.isNaN(end.getTime())) {
-            const endOfDay = new Date(end.getFullYear(), end.getMonth(), end.getDate() + 1);
-            if (appointmentDate >= endOfDay) return false;
-          }
-        }
-      }
-
-      return true;
-    });
-
-    return filtered.sort((a, b) => {
-      if (sortOption === "date_desc") {
-        return (
-          new Date(b.appointment_datetime).getTime() -
-          new Date(a.appointment_datetime).getTime()
-        );
-      }
-      if (sortOption === "patient_asc") {
-        const nameA = (a.patient?.full_name ?? patientById.get(a.patient_id)?.full_name ?? "").toLowerCase();
-        const nameB = (b.patient?.full_name ?? patientById.get(b.patient_id)?.full_name ?? "").toLowerCase();
-        return nameA.localeCompare(nameB);
-      }
       return (
-        new Date(a.appointment_datetime).getTime() -
-        new Date(b.appointment_datetime).getTime()
+        patientName.includes(term) ||
+        doctor.includes(term) ||
+        department.includes(term) ||
+        email.includes(term) ||
+        phone.includes(term)
       );
     });
-  }, [
-    data,
-    statusTab,
-    searchTerm,
-    dateRange,
-    customStart,
-    customEnd,
-    departmentFilter,
-    doctorFilter,
-    sortOption,
-    patientById
-  ]);
+
+    if (sortOption !== "patient_asc") return filtered;
+    return [...filtered].sort((a, b) => {
+      const nameA = (a.patient?.full_name ?? patientById.get(a.patient_id)?.full_name ?? "").toLowerCase();
+      const nameB = (b.patient?.full_name ?? patientById.get(b.patient_id)?.full_name ?? "").toLowerCase();
+      return nameA.localeCompare(nameB);
+    });
+  }, [data, searchTerm, sortOption, patientById]);
 
   const handleView = (appointment: Appointment) => {
     setSelectedAppointment(appointment);
@@ -623,7 +611,7 @@ const AppointmentListPage = () => {
         <div className="no-scrollbar flex items-center gap-2 overflow-x-auto">
           {STATUS_TABS.map((tab) => {
             const isActive = statusTab === tab.key;
-            const count = statusCounts[tab.key];
+            const { count, isEstimate } = statusCounts[tab.key];
             return (
               <button
                 key={tab.key}
@@ -635,7 +623,10 @@ const AppointmentListPage = () => {
                     : "text-text-muted hover:bg-surface/70 hover:text-text"
                 }`}
               >
-                {tab.label} <span className="text-text-subtle">({count})</span>
+                {tab.label}{" "}
+                <span className="text-text-subtle">
+                  ({count === null ? "…" : `${count}${isEstimate ? "+" : ""}`})
+                </span>
               </button>
             );
           })}
@@ -1045,6 +1036,20 @@ const AppointmentListPage = () => {
         </>
       )}
 
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <Button
+            variant="secondary"
+            size="sm"
+            type="button"
+            onClick={() => fetchNextPage()}
+            disabled={isFetchingNextPage}
+          >
+            {isFetchingNextPage ? "Loading..." : "Load more appointments"}
+          </Button>
+        </div>
+      )}
+
       {!filteredAppointments.length && (
         <div className="rounded-2xl border border-border/60 bg-surface/70 px-4 py-6 text-center text-sm text-text-muted shadow-sm backdrop-blur">
           <p>
@@ -11,7 +11,7 @@ import { InputField, TextAreaField } from "../components/ui/FormField";
 import { MicroHint } from "../components/ui/MicroHint";
 import { SectionHeader } from "../components/ui/SectionHeader";
 import { usePageTitle } from "../hooks/usePageTitle";
-import { useCreatePatient, usePatients } from "../hooks/usePatients";
+import { useCreatePatient, usePatientPages, usePatientSearch } from "../hooks/usePatients";
 import { toast } from "../lib/toast";
 import { PatientCreatePayload } from "../services/patients";
 
@@ -39,11 +39,14 @@ const initialFormState: PatientFormState = {
 
 const PatientListPage = () => {
   usePageTitle("Patients");
-  const { data, isLoading, error } = usePatients();
+  const patientPages = usePatientPages();
+  const { data, isLoading, error, totalCount, totalIsEstimate } = patientPages;
   const createPatient = useCreatePatient();
   const navigate = useNavigate();
   const location = useLocation();
   const [searchTerm, setSearchTerm] = useState("");
+  const [debouncedSearch, setDebouncedSearch] = useState("");
+  const searchResults = usePatientSearch(debouncedSearch);
   const [isModalOpen, setIsModalOpen] = useState(false);
   const modalRef = useRef<HTMLDivElement | null>(null);
   const lastFocusRef = useRef<HTMLElement | null>(null);
@@ -84,22 +87,20 @@ const PatientListPage = () => {
     };
   }, [isModalOpen]);
 
-  const { filteredPatients, totalCount, hasSearch } = useMemo(() => {
-    const patients = data ?? [];
-    const trimmed = searchTerm.trim().toLowerCase();
-    if (!trimmed) {
-      return { filteredPatients: patients, totalCount: patients.length, hasSearch: false };
-    }
-
-    const filtered = patients.filter((patient) => {
-      const name = patient.full_name?.toLowerCase() ?? "";
-      const email = patient.email?.toLowerCase() ?? "";
-      const phone = patient.phone?.toLowerCase() ?? "";
-      return name.includes(trimmed) || email.includes(trimmed) || phone.includes(trimmed);
-    });
+  useEffect(() => {
+    const timer = window.setTimeout(() => setDebouncedSearch(searchTerm.trim()), 250);
+    return () => window.clearTimeout(timer);
+  }, [searchTerm]);
 
-    return { filteredPatients: filtered, totalCount: patients.length, hasSearch: true };
-  }, [data, searchTerm]);
+  // The list and the search results are both paged on the server; "Load more"
+  // pages whichever one is showing.
+  const hasSearch = !!debouncedSearch;
+  const activeQuery = hasSearch ? searchResults : patientPages;
+  const filteredPatients = useMemo(
+    () => (hasSearch ? searchResults.data : data) ?? [],
+    [hasSearch, searchResults.data, data]
+  );
+  const totalLabel = `${totalCount ?? filteredPatients.length}${totalIsEstimate ? "+" : ""}`;
 
   if (isLoading) return <LoadingSpinner />;
   if (error)
@@ -221,8 +222,10 @@ const PatientListPage = () => {
         </div>
         <p className="text-sm text-text-muted">
           {hasSearch
-            ? `Showing ${filteredPatients.length} of ${totalCount} patients`
-            : `${totalCount} patients`}
+            ? `Showing ${filteredPatients.length}${
+                searchResults.hasNextPage ? "+" : ""
+              } of ${totalLabel} patients`
+            : `${totalLabel} patients`}
         </p>
       </div>
 
@@ -331,6 +334,20 @@ const PatientListPage = () => {
         </>
       )}
 
+      {activeQuery.hasNextPage && (
+        <div className="flex justify-center">
+          <Button
+            variant="secondary"
+            size="sm"
+            type="button"
+            onClick={() => activeQuery.fetchNextPage()}
+            disabled={activeQuery.isFetchingNextPage}
+          >
+            {activeQuery.isFetchingNextPage ? "Loading..." : "Load more patients"}
+          </Button>
+        </div>
+      )}
+
       {isModalOpen &&
         createPortal(
           <div className="fixed inset-0 z-50 flex items-center justify-center bg-slate-900/50 p-4 sm:p-6 animate-fadeIn">
@@ -96,7 +96,10 @@ const PatientDetailPage = () => {
   const {
     data: appointments,
     isLoading: appointmentsLoading,
-    error: appointmentsError
+    error: appointmentsError,
+    hasNextPage: hasMoreAppointments,
+    fetchNextPage: fetchMoreAppointments,
+    isFetchingNextPage: fetchingMoreAppointments
   } = usePatientAppointments(patientId);
   const updateNotes = useUpdatePatientNotes();
   const { token } = useAuth();
@@ -172,17 +175,37 @@ const PatientDetailPage = () => {
     setExporting(true);
     try {
       const baseUrl = import.meta.env.VITE_API_BASE_URL || "/api/v1";
-      const response = await fetch(`${baseUrl}/patients/${patient.id}/export`, {
-        headers: {
-          Authorization: `Bearer ${token}`
-        }
-      });
-      if (!response.ok) {
+      const headers = { Authorization: `Bearer ${token}` };
+      const readError = async (response: Response) => {
         const errorPayload = await response.json().catch(() => null);
-        const message =
+        return new Error(
           errorPayload?.detail ||
-          "We couldn't export this patient record. Please try again.";
-        throw new Error(message);
+            "We couldn't export this patient record. Please try again."
+        );
+      };
+      const jobResponse = await fetch(`${baseUrl}/patients/${patient.id}/export-jobs`, {
+        method: "POST",
+        headers
+      });
+      if (!jobResponse.ok) {
+        throw await readError(jobResponse);
+      }
+      let job = await jobResponse.json();
+      const jobUrl = `${baseUrl}/patients/export-jobs/${job.job_id}`;
+      while (job.status === "pending" || job.status === "running") {
+        await new Promise((resolve) => setTimeout(resolve, 1000));
+        const statusResponse = await fetch(jobUrl, { headers });
+        if (!statusResponse.ok) {
+          throw await readError(statusResponse);
+        }
+        job = await statusResponse.json();
+      }
+      if (job.status !== "done") {
+        throw new Error(job.error || "We couldn't export this patient record.");
+      }
+      const response = await fetch(`${jobUrl}/download`, { headers });
+      if (!response.ok) {
+        throw await readError(response);
       }
       const blob = await response.blob();
       const url = window.URL.createObjectURL(blob);
@@ -377,6 +400,17 @@ const PatientDetailPage = () => {
                     </p>
                   )}
                 </div>
+                {hasMoreAppointments && (
+                  <Button
+                    variant="secondary"
+                    size="sm"
+                    type="button"
+                    onClick={() => fetchMoreAppointments()}
+                    disabled={fetchingMoreAppointments}
+                  >
+                    {fetchingMoreAppointments ? "Loading..." : "Load older appointments"}
+                  </Button>
+                )}
               </>
             )}
           </div>
@@ -38,9 +38,56 @@ export interface AppointmentUpdatePayload {
   reminder_sms_minutes_before?: number;
 }
 
-export const fetchAppointments = async (): Promise<Appointment[]> => {
-  const { data } = await apiClient.get<Appointment[]>("/appointments/");
-  return data;
+export interface AppointmentFilters {
+  date_from?: string;
+  date_to?: string;
+  status?: AppointmentStatus[];
+  doctor_name?: string;
+  department?: string;
+  order?: "asc" | "desc";
+  limit?: number;
+  include_total?: boolean;
+}
+
+export interface AppointmentPage {
+  items: Appointment[];
+  nextCursor: string | null;
+  totalCount: number | null;
+  totalIsEstimate: boolean;
+}
+
+export const toAppointmentPage = (
+  items: Appointment[],
+  headers: Record<string, unknown>
+): AppointmentPage => {
+  const total = headers["x-total-count"];
+  return {
+    items,
+    nextCursor: (headers["x-next-cursor"] as string | undefined) ?? null,
+    totalCount: total === undefined ? null : Number(total),
+    totalIsEstimate: headers["x-total-count-estimated"] === "true"
+  };
+};
+
+interface NormalizedAppointments {
+  appointments: Appointment[];
+  patients: Patient[];
+}
+
+export const fetchAppointmentPage = async (
+  filters: AppointmentFilters = {},
+  cursor?: string | null
+): Promise<AppointmentPage> => {
+  const { data, headers } = await apiClient.get<NormalizedAppointments>("/appointments/", {
+    params: { ...filters, cursor: cursor ?? undefined, normalize: true },
+    paramsSerializer: { indexes: null }
+  });
+  const patientById = new Map(data.patients.map((patient) => [patient.id, patient]));
+  const items = data.appointments.map((appointment) => ({
+    ...appointment,
+    patient: patientById.get(appointment.patient_id)
+  }));
+  return toAppointmentPage(items, headers);
 };
 
 export const createAppointment = async (payload: Partial<Appointment>) => {
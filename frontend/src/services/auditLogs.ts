@@ -19,6 +19,7 @@ export interface AuditLogQuery {
   entity_id?: number;
   limit?: number;
   offset?: number;
+  before?: string;
   since?: string;
 }
 
@@ -1,5 +1,10 @@
 import { apiClient } from "./api";
-import type { Appointment } from "./appointments";
+import {
+  toAppointmentPage,
+  type Appointment,
+  type AppointmentFilters,
+  type AppointmentPage
+} from "./appointments";
 
 export interface Patient {
   id: number;
@@ -31,11 +36,49 @@ export interface PatientNotesUpdatePayload {
   notes: string | null;
 }
 
+export interface PatientPage {
+  items: Patient[];
+  nextCursor: string | null;
+  totalCount: number | null;
+  totalIsEstimate: boolean;
+}
+
+const toPatientPage = (items: Patient[], headers: Record<string, unknown>): PatientPage => {
+  const total = headers["x-total-count"];
+  return {
+    items,
+    nextCursor: (headers["x-next-cursor"] as string | undefined) ?? null,
+    totalCount: total === undefined ? null : Number(total),
+    totalIsEstimate: headers["x-total-count-estimated"] === "true"
+  };
+};
+
 export const fetchPatients = async (): Promise<Patient[]> => {
   const { data } = await apiClient.get<Patient[]>("/patients/");
   return data;
 };
 
+export const fetchPatientPage = async (
+  cursor?: string | null,
+  limit = 50
+): Promise<PatientPage> => {
+  const { data, headers } = await apiClient.get<Patient[]>("/patients/", {
+    params: { limit, cursor: cursor ?? undefined, include_total: !cursor }
+  });
+  return toPatientPage(data, headers);
+};
+
+export const searchPatients = async (
+  query: string,
+  cursor?: string | null,
+  limit = 50
+): Promise<PatientPage> => {
+  const { data, headers } = await apiClient.get<Patient[]>("/patients/search", {
+    params: { q: query, limit, cursor: cursor ?? undefined }
+  });
+  return toPatientPage(data, headers);
+};
+
 export const fetchPatient = async (patientId: number): Promise<Patient> => {
   const { data } = await apiClient.get<Patient>(`/patients/${patientId}`);
   return data;
@@ -47,12 +90,18 @@ export const createPatient = async (payload: PatientCreatePayload) => {
 };
 
 export const fetchPatientAppointments = async (
-  patientId: number
-): Promise<Appointment[]> => {
-  const { data } = await apiClient.get<Appointment[]>(
-    `/patients/${patientId}/appointments`
+  patientId: number,
+  filters: AppointmentFilters = {},
+  cursor?: string | null
+): Promise<AppointmentPage> => {
+  const { data, headers } = await apiClient.get<Appointment[]>(
+    `/patients/${patientId}/appointments`,
+    {
+      params: { ...filters, cursor: cursor ?? undefined },
+      paramsSerializer: { indexes: null }
+    }
   );
-  return data;
+  return toAppointmentPage(data, headers);
 };
 
 export const updatePatientNotes = async (